@@ -3,6 +3,7 @@ from typing import TYPE_CHECKING, List
 from django.db.models import Q, Value, prefetch_related_objects
 
 from ..core.postgres import NoValidationSearchVector
+from ..core.search import SearchEntity, get_search_backend
 
 if TYPE_CHECKING:
     from .models import Address, User
@@ -107,6 +108,12 @@ def generate_address_search_vector_value(
 
 
 def search_users(qs, value):
+    if value:
+        qs = get_search_backend(SearchEntity.USER).search(qs, value)
+    return qs
+
+
+def search_users_in_postgres(qs, value):
     if value:
         lookup = Q()
         for val in value.split():
@@ -0,0 +1,152 @@
+"""Product attribute facets.
+
+Facets are a denormalized copy of the attribute values assigned to products and
+their variants, stored in a single table with an index on `(value, product)`.
+Products matching an attribute filter are found with one grouped scan of the
+table instead of the correlated subqueries over product and variant assignments,
+and the same table gives the number of products for every attribute value.
+
+Sort keys keep the names of the values of every product attribute concatenated
+in the values order, one row per product and attribute, so products are sorted
+by an attribute with an indexed join instead of a grouped aggregation.
+"""
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import Count
+
+from .models import (
+    AssignedProductAttributeValue,
+    AssignedVariantAttributeValue,
+    AttributeValue,
+    ProductAttributeFacet,
+    ProductAttributeSortKey,
+)
+
+SORT_KEY_DELIMITER = ","
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+
+def update_products_attribute_facets(product_ids: Iterable[int]):
+    """Recreate attribute facets of the given products from the assigned values."""
+    product_ids = list(product_ids)
+    product_values = AssignedProductAttributeValue.objects.filter(
+        assignment__product_id__in=product_ids
+    ).values_list("pk", "assignment__product_id", "value__attribute_id", "value_id")
+    variant_values = AssignedVariantAttributeValue.objects.filter(
+        assignment__variant__product_id__in=product_ids
+    ).values_list(
+        "pk", "assignment__variant__product_id", "value__attribute_id", "value_id"
+    )
+
+    facets = [
+        ProductAttributeFacet(
+            product_id=product_id,
+            attribute_id=attribute_id,
+            value_id=value_id,
+            product_value_assignment_id=pk,
+        )
+        for pk, product_id, attribute_id, value_id in product_values
+    ]
+    facets += [
+        ProductAttributeFacet(
+            product_id=product_id,
+            attribute_id=attribute_id,
+            value_id=value_id,
+            variant_value_assignment_id=pk,
+        )
+        for pk, product_id, attribute_id, value_id in variant_values
+    ]
+
+    with transaction.atomic():
+        ProductAttributeFacet.objects.filter(product_id__in=product_ids).delete()
+        ProductAttributeFacet.objects.bulk_create(facets, ignore_conflicts=True)
+
+
+def update_products_attribute_sort_keys(
+    product_ids: Iterable[int], attribute_id: Optional[int] = None
+):
+    """Recreate attribute sort keys of the given products from the assigned values.
+
+    When the attribute is given, only the sort keys of that attribute are updated.
+    """
+    product_ids = list(product_ids)
+    product_values = AssignedProductAttributeValue.objects.filter(
+        assignment__product_id__in=product_ids
+    )
+    sort_keys = ProductAttributeSortKey.objects.filter(product_id__in=product_ids)
+    if attribute_id is not None:
+        product_values = product_values.filter(value__attribute_id=attribute_id)
+        sort_keys = sort_keys.filter(attribute_id=attribute_id)
+
+    value_names: Dict[tuple, List[str]] = defaultdict(list)
+    for product_id, value_attribute_id, name in product_values.order_by(
+        *[f"value__{field_name}" for field_name in AttributeValue._meta.ordering]
+    ).values_list("assignment__product_id", "value__attribute_id", "value__name"):
+        value_names[(product_id, value_attribute_id)].append(name)
+
+    with transaction.atomic():
+        sort_keys.delete()
+        ProductAttributeSortKey.objects.bulk_create(
+            [
+                ProductAttributeSortKey(
+                    product_id=product_id,
+                    attribute_id=value_attribute_id,
+                    value_names=SORT_KEY_DELIMITER.join(names),
+                )
+                for (product_id, value_attribute_id), names in value_names.items()
+            ]
+        )
+
+
+def join_sort_key_value_names(values: Iterable[AttributeValue]) -> str:
+    """Join names of the values ordered the same way as in the database."""
+    values = sorted(
+        values,
+        key=lambda value: (value.sort_order is None, value.sort_order or 0, value.pk),
+    )
+    return SORT_KEY_DELIMITER.join(value.name for value in values)
+
+
+def get_product_ids_by_attribute_values(
+    values_by_attribute: Dict[int, List[int]]
+) -> "QuerySet":
+    """Return ids of products having any of the given values for every attribute.
+
+    The values of all attributes are scanned at once and the products are grouped,
+    so a product is returned when the number of its distinct matching attributes
+    equals the number of filtered attributes.
+    """
+    value_ids = [pk for values in values_by_attribute.values() for pk in values]
+    return (
+        ProductAttributeFacet.objects.filter(value_id__in=value_ids)
+        .order_by()
+        .values("product_id")
+        .annotate(attributes_count=Count("attribute_id", distinct=True))
+        .filter(attributes_count=len(values_by_attribute))
+        .values("product_id")
+    )
+
+
+def get_attribute_facet_counts(
+    products: "QuerySet", attribute_ids: Optional[Iterable[int]] = None
+) -> Dict[int, Dict[int, int]]:
+    """Return the number of given products for each value, grouped by attribute."""
+    facets = ProductAttributeFacet.objects.using(products.db).filter(
+        product_id__in=products.order_by().values("pk")
+    )
+    if attribute_ids is not None:
+        facets = facets.filter(attribute_id__in=attribute_ids)
+
+    counts: Dict[int, Dict[int, int]] = defaultdict(dict)
+    for attribute_id, value_id, products_count in (
+        facets.order_by()
+        .values("attribute_id", "value_id")
+        .annotate(products_count=Count("product_id", distinct=True))
+        .values_list("attribute_id", "value_id", "products_count")
+    ):
+        counts[attribute_id][value_id] = products_count
+    return counts
@@ -0,0 +1,103 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+# The facets of existing assignments are created with set-based inserts, so the
+# attribute filters work right after the migration.
+POPULATE_PRODUCT_ATTRIBUTE_FACETS = """
+    INSERT INTO attribute_productattributefacet (
+        product_id, attribute_id, value_id, product_value_assignment_id
+    )
+    SELECT assignment.product_id, value.attribute_id, value.id, value_assignment.id
+    FROM attribute_assignedproductattributevalue value_assignment
+    INNER JOIN attribute_assignedproductattribute assignment
+        ON assignment.id = value_assignment.assignment_id
+    INNER JOIN attribute_attributevalue value
+        ON value.id = value_assignment.value_id;
+
+    INSERT INTO attribute_productattributefacet (
+        product_id, attribute_id, value_id, variant_value_assignment_id
+    )
+    SELECT variant.product_id, value.attribute_id, value.id, value_assignment.id
+    FROM attribute_assignedvariantattributevalue value_assignment
+    INNER JOIN attribute_assignedvariantattribute assignment
+        ON assignment.id = value_assignment.assignment_id
+    INNER JOIN product_productvariant variant
+        ON variant.id = assignment.variant_id
+    INNER JOIN attribute_attributevalue value
+        ON value.id = value_assignment.value_id;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("product", "0186_remove_product_charge_taxes"),
+        ("attribute", "0030_merge_20231110_1243"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductAttributeFacet",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "attribute",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="product_facets",
+                        to="attribute.attribute",
+                    ),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attribute_facets",
+                        to="product.product",
+                    ),
+                ),
+                (
+                    "product_value_assignment",
+                    models.OneToOneField(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="facet",
+                        to="attribute.assignedproductattributevalue",
+                    ),
+                ),
+                (
+                    "value",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="product_facets",
+                        to="attribute.attributevalue",
+                    ),
+                ),
+                (
+                    "variant_value_assignment",
+                    models.OneToOneField(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="facet",
+                        to="attribute.assignedvariantattributevalue",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="productattributefacet",
+            index=models.Index(
+                fields=["value", "product"], name="attribute_facet_value_product"
+            ),
+        ),
+        migrations.RunSQL(
+            POPULATE_PRODUCT_ATTRIBUTE_FACETS, reverse_sql=migrations.RunSQL.noop
+        ),
+    ]
@@ -0,0 +1,67 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+# The sort keys of existing assignments are created with a set-based insert, so
+# sorting by attributes works right after the migration.
+POPULATE_PRODUCT_ATTRIBUTE_SORT_KEYS = """
+    INSERT INTO attribute_productattributesortkey (
+        product_id, attribute_id, value_names
+    )
+    SELECT
+        assignment.product_id,
+        value.attribute_id,
+        string_agg(value.name, ',' ORDER BY value.sort_order, value.id)
+    FROM attribute_assignedproductattributevalue value_assignment
+    INNER JOIN attribute_assignedproductattribute assignment
+        ON assignment.id = value_assignment.assignment_id
+    INNER JOIN attribute_attributevalue value
+        ON value.id = value_assignment.value_id
+    GROUP BY assignment.product_id, value.attribute_id;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("product", "0186_remove_product_charge_taxes"),
+        ("attribute", "0031_productattributefacet"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductAttributeSortKey",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("value_names", models.TextField()),
+                (
+                    "attribute",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="product_sort_keys",
+                        to="attribute.attribute",
+                    ),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attribute_sort_keys",
+                        to="product.product",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("product", "attribute")},
+            },
+        ),
+        migrations.RunSQL(
+            POPULATE_PRODUCT_ATTRIBUTE_SORT_KEYS, reverse_sql=migrations.RunSQL.noop
+        ),
+    ]
@@ -4,6 +4,7 @@ from .base import (
     AttributeValue,
     AttributeValueTranslation,
 )
+from .facet import ProductAttributeFacet, ProductAttributeSortKey
 from .page import AssignedPageAttribute, AssignedPageAttributeValue, AttributePage
 from .product import (
     AssignedProductAttribute,
@@ -30,4 +31,6 @@ __all__ = [
     "AssignedVariantAttribute",
     "AssignedVariantAttributeValue",
     "AttributeVariant",
+    "ProductAttributeFacet",
+    "ProductAttributeSortKey",
 ]
@@ -0,0 +1,63 @@
+from django.db import models
+
+from ...product.models import Product
+from .product import AssignedProductAttributeValue
+from .product_variant import AssignedVariantAttributeValue
+
+
+class ProductAttributeFacet(models.Model):
+    """Attribute value assigned to a product or to one of its variants.
+
+    Denormalized copy of the product and variant value assignments used to filter
+    products by attribute values and to count products per value. Every row is
+    bound to the assignment it was created from, so it's deleted together with it.
+    """
+
+    product = models.ForeignKey(
+        Product, related_name="attribute_facets", on_delete=models.CASCADE
+    )
+    attribute = models.ForeignKey(
+        "Attribute", related_name="product_facets", on_delete=models.CASCADE
+    )
+    value = models.ForeignKey(
+        "AttributeValue", related_name="product_facets", on_delete=models.CASCADE
+    )
+    product_value_assignment = models.OneToOneField(
+        AssignedProductAttributeValue,
+        related_name="facet",
+        on_delete=models.CASCADE,
+        null=True,
+    )
+    variant_value_assignment = models.OneToOneField(
+        AssignedVariantAttributeValue,
+        related_name="facet",
+        on_delete=models.CASCADE,
+        null=True,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["value", "product"], name="attribute_facet_value_product"
+            ),
+        ]
+
+
+class ProductAttributeSortKey(models.Model):
+    """Names of the values of a product attribute concatenated in their order.
+
+    Denormalized copy of the product value assignments used to sort products by
+    an attribute with a join on `(product, attribute)` instead of aggregating the
+    values of all filtered products. Products without values have no key.
+    """
+
+    product = models.ForeignKey(
+        Product, related_name="attribute_sort_keys", on_delete=models.CASCADE
+    )
+    attribute = models.ForeignKey(
+        "Attribute", related_name="product_sort_keys", on_delete=models.CASCADE
+    )
+    value_names = models.TextField()
+
+    class Meta:
+        unique_together = (("product", "attribute"),)
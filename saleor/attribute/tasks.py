@@ -1,12 +1,22 @@
 from celery.utils.log import get_task_logger
-from django.db.models import Exists, OuterRef, Q
 
-from ..attribute.models import AttributeValue
+from ..attribute.facets import update_products_attribute_sort_keys
+from ..attribute.models import (
+    AssignedProductAttributeValue,
+    AttributeValue,
+    ProductAttributeSortKey,
+)
 from ..celeryconf import app
-from ..product.models import Product, ProductVariant
+from ..product.search_invalidation import (
+    SearchIndexPriority,
+    get_products_with_attribute_values,
+    mark_products_search_index_dirty,
+)
 
 task_logger = get_task_logger(__name__)
 
+SORT_KEYS_BATCH_SIZE = 1000
+
 
 @app.task
 def update_associated_products_search_vector(attribute_value_pk: int):
@@ -22,10 +32,30 @@ def update_associated_products_search_vector(attribute_value_pk: int):
         )
         return
 
-    variants = ProductVariant.objects.filter(
-        Exists(instance.variantassignments.filter(variant_id=OuterRef("id")))
+    mark_products_search_index_dirty(
+        get_products_with_attribute_values([instance.pk]), SearchIndexPriority.LOW
     )
-    Product.objects.filter(
-        Q(Exists(instance.productassignments.filter(product_id=OuterRef("id"))))
-        | Q(Exists(variants.filter(product_id=OuterRef("id"))))
-    ).update(search_index_dirty=True)
+
+
+@app.task
+def update_attribute_sort_keys_task(attribute_pk: int):
+    """Recreate sort keys of all products having values of the attribute.
+
+    Called after the names or the order of the attribute values change.
+    """
+    product_ids = set(
+        AssignedProductAttributeValue.objects.filter(
+            value__attribute_id=attribute_pk
+        ).values_list("assignment__product_id", flat=True)
+    )
+    product_ids.update(
+        ProductAttributeSortKey.objects.filter(attribute_id=attribute_pk).values_list(
+            "product_id", flat=True
+        )
+    )
+    product_ids_list = sorted(product_ids)
+    for index in range(0, len(product_ids_list), SORT_KEYS_BATCH_SIZE):
+        update_products_attribute_sort_keys(
+            product_ids_list[index : index + SORT_KEYS_BATCH_SIZE],
+            attribute_id=attribute_pk,
+        )
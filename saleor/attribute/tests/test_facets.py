@@ -0,0 +1,171 @@
+from ...product.models import Product
+from ..facets import (
+    get_attribute_facet_counts,
+    get_product_ids_by_attribute_values,
+    update_products_attribute_facets,
+    update_products_attribute_sort_keys,
+)
+from ..models import AttributeValue, ProductAttributeFacet, ProductAttributeSortKey
+from ..tasks import update_attribute_sort_keys_task
+from ..utils import associate_attribute_values_to_instance
+
+
+def get_facets(product):
+    return set(
+        ProductAttributeFacet.objects.filter(product=product).values_list(
+            "attribute_id", "value_id"
+        )
+    )
+
+
+def test_associate_attribute_values_updates_facets(product):
+    # given
+    product_attribute = product.product_type.product_attributes.first()
+    variant_attribute = product.product_type.variant_attributes.first()
+    variant = product.variants.get()
+    product_value = product_attribute.values.first()
+    variant_value = variant_attribute.values.first()
+    new_variant_value = variant_attribute.values.last()
+
+    assert get_facets(product) == {
+        (product_attribute.pk, product_value.pk),
+        (variant_attribute.pk, variant_value.pk),
+    }
+
+    # when
+    associate_attribute_values_to_instance(
+        variant, {variant_attribute.pk: [new_variant_value]}
+    )
+
+    # then
+    assert get_facets(product) == {
+        (product_attribute.pk, product_value.pk),
+        (variant_attribute.pk, new_variant_value.pk),
+    }
+
+
+def test_facets_deleted_with_variant(product):
+    # given
+    product_attribute = product.product_type.product_attributes.first()
+    product_value = product_attribute.values.first()
+
+    # when
+    product.variants.all().delete()
+
+    # then
+    assert get_facets(product) == {(product_attribute.pk, product_value.pk)}
+
+
+def test_update_products_attribute_facets_restores_missing_facets(product):
+    # given
+    expected_facets = get_facets(product)
+    ProductAttributeFacet.objects.all().delete()
+
+    # when
+    update_products_attribute_facets([product.pk])
+
+    # then
+    assert get_facets(product) == expected_facets
+
+
+def test_get_product_ids_by_attribute_values(
+    product_list, color_attribute, size_attribute
+):
+    # given
+    product_type = product_list[0].product_type
+    product_type.product_attributes.add(color_attribute, size_attribute)
+    red, blue = color_attribute.values.all()[:2]
+    small = size_attribute.values.first()
+
+    first_product, second_product, third_product = product_list
+    associate_attribute_values_to_instance(
+        first_product, {color_attribute.pk: [red], size_attribute.pk: [small]}
+    )
+    associate_attribute_values_to_instance(
+        second_product, {color_attribute.pk: [blue], size_attribute.pk: [small]}
+    )
+    associate_attribute_values_to_instance(third_product, {color_attribute.pk: [red]})
+
+    # when
+    product_ids = get_product_ids_by_attribute_values(
+        {color_attribute.pk: [red.pk, blue.pk], size_attribute.pk: [small.pk]}
+    )
+
+    # then
+    assert set(product_ids.values_list("product_id", flat=True)) == {
+        first_product.pk,
+        second_product.pk,
+    }
+
+
+def test_get_attribute_facet_counts(product_list, color_attribute):
+    # given
+    product_type = product_list[0].product_type
+    product_type.product_attributes.add(color_attribute)
+    red, blue = color_attribute.values.all()[:2]
+    for product, value in zip(product_list, [red, red, blue]):
+        associate_attribute_values_to_instance(product, {color_attribute.pk: [value]})
+    products = Product.objects.exclude(pk=product_list[1].pk)
+
+    # when
+    counts = get_attribute_facet_counts(products, [color_attribute.pk])
+
+    # then
+    assert counts == {color_attribute.pk: {red.pk: 1, blue.pk: 1}}
+
+
+def get_sort_keys(product):
+    return dict(
+        ProductAttributeSortKey.objects.filter(product=product).values_list(
+            "attribute_id", "value_names"
+        )
+    )
+
+
+def test_associate_attribute_values_updates_sort_keys(product, color_attribute):
+    # given
+    product.product_type.product_attributes.add(color_attribute)
+    red, blue = color_attribute.values.all()[:2]
+    red.sort_order, blue.sort_order = 1, 0
+    AttributeValue.objects.bulk_update([red, blue], ["sort_order"])
+
+    # when
+    associate_attribute_values_to_instance(product, {color_attribute.pk: [red, blue]})
+
+    # then
+    assert get_sort_keys(product)[color_attribute.pk] == f"{blue.name},{red.name}"
+
+    # when
+    associate_attribute_values_to_instance(product, {color_attribute.pk: []})
+
+    # then
+    assert color_attribute.pk not in get_sort_keys(product)
+
+
+def test_update_products_attribute_sort_keys_for_attribute(product_list):
+    # given
+    product = product_list[0]
+    expected_sort_keys = get_sort_keys(product)
+    ProductAttributeSortKey.objects.filter(product=product).update(value_names="")
+    attribute_id = next(iter(expected_sort_keys))
+
+    # when
+    update_products_attribute_sort_keys([product.pk], attribute_id=attribute_id)
+
+    # then
+    assert get_sort_keys(product) == expected_sort_keys
+
+
+def test_update_attribute_sort_keys_task_after_value_rename(product_list):
+    # given
+    attribute = product_list[0].product_type.product_attributes.first()
+    value = attribute.values.first()
+    value.name = "Renamed"
+    value.save(update_fields=["name"])
+
+    # when
+    update_attribute_sort_keys_task(attribute.pk)
+
+    # then
+    for product in product_list:
+        assert get_sort_keys(product)[attribute.pk] == "Renamed"
@@ -3,6 +3,10 @@ from typing import Union
 
 from ..page.models import Page
 from ..product.models import Product, ProductVariant
+from .facets import (
+    update_products_attribute_facets,
+    update_products_attribute_sort_keys,
+)
 from .models import (
     AssignedPageAttribute,
     AssignedPageAttributeValue,
@@ -40,12 +44,15 @@ instance_to_function_variables_mapping = {
 
 
 def associate_attribute_values_to_instance(
-    instance: T_INSTANCE, attr_val_map: dict[int, list]
+    instance: T_INSTANCE, attr_val_map: dict[int, list], update_facets: bool = True
 ):
     """Assign given attribute values to a product, variant or page.
 
     Note: be aware any values already assigned or concurrently
     assigned will be overridden by this call.
+
+    Callers assigning values to many instances can pass `update_facets=False`
+    and call `update_products_attribute_facets` once for all products.
     """
 
     # Ensure the values are actually form the given attribute
@@ -54,6 +61,13 @@ def associate_attribute_values_to_instance(
     # Associate the attribute and the passed values
     _associate_attribute_to_instance(instance, attr_val_map)
 
+    if isinstance(instance, Product):
+        if update_facets:
+            update_products_attribute_facets([instance.pk])
+        update_products_attribute_sort_keys([instance.pk])
+    elif isinstance(instance, ProductVariant) and update_facets:
+        update_products_attribute_facets([instance.product_id])
+
 
 def _associate_attribute_to_instance(
     instance: T_INSTANCE, attr_val_map: dict[int, list]
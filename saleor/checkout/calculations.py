@@ -1,5 +1,6 @@
 from decimal import Decimal
-from typing import TYPE_CHECKING, Iterable, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, NamedTuple, Optional, Tuple
+from uuid import UUID
 
 from django.conf import settings
 from django.utils import timezone
@@ -26,6 +27,12 @@ if TYPE_CHECKING:
     from .fetch import CheckoutInfo, CheckoutLineInfo
 
 
+class CheckoutLinePrices(NamedTuple):
+    total_price: TaxedMoney
+    unit_price: TaxedMoney
+    tax_rate: Decimal
+
+
 def checkout_shipping_price(
     *,
     manager: "PluginsManager",
@@ -215,6 +222,37 @@ def checkout_line_tax_rate(
     return checkout_line_info.line.tax_rate
 
 
+def checkout_lines_prices(
+    *,
+    manager: "PluginsManager",
+    checkout_info: "CheckoutInfo",
+    lines: Iterable["CheckoutLineInfo"],
+) -> Dict[UUID, CheckoutLinePrices]:
+    """Return the total price, unit price and tax rate of all checkout lines.
+
+    It takes in account all plugins. Unlike `checkout_line_total`,
+    `checkout_line_unit_price` and `checkout_line_tax_rate` the prices of all lines
+    are fetched at once, so it should be used when the prices of every line are needed.
+    """
+    currency = checkout_info.checkout.currency
+    address = checkout_info.shipping_address or checkout_info.billing_address
+    _, lines = fetch_checkout_data(
+        checkout_info,
+        manager=manager,
+        lines=lines,
+        address=address,
+    )
+    lines_prices = {}
+    for line_info in lines:
+        line = line_info.line
+        lines_prices[line.pk] = CheckoutLinePrices(
+            total_price=quantize_price(line.total_price, currency),
+            unit_price=quantize_price(line.total_price / line.quantity, currency),
+            tax_rate=line.tax_rate,
+        )
+    return lines_prices
+
+
 def _fetch_checkout_prices_if_expired(
     checkout_info: "CheckoutInfo",
     manager: "PluginsManager",
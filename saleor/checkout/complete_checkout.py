@@ -19,6 +19,7 @@ from django.conf import settings
 from django.contrib.sites.models import Site
 from django.core.exceptions import ValidationError
 from django.db import transaction
+from django.db.models import prefetch_related_objects
 from django.utils import timezone
 from prices import Money, TaxedMoney
 
@@ -74,7 +75,7 @@ from .base_calculations import (
     calculate_undiscounted_base_line_total_price,
     calculate_undiscounted_base_line_unit_price,
 )
-from .calculations import fetch_checkout_data
+from .calculations import CheckoutLinePrices, fetch_checkout_data
 from .checkout_cleaner import (
     _validate_gift_cards,
     clean_billing_address,
@@ -88,6 +89,7 @@ from .fetch import (
     fetch_checkout_lines,
 )
 from .models import Checkout
+from .tasks import order_created_from_checkout_task
 from .utils import (
     get_checkout_metadata,
     get_or_create_checkout_metadata,
@@ -188,18 +190,14 @@ def _process_user_data_for_order(checkout_info: "CheckoutInfo", manager):
 
 
 def _create_line_for_order(
-    manager: "PluginsManager",
     checkout_info: "CheckoutInfo",
-    lines: Iterable["CheckoutLineInfo"],
     checkout_line_info: "CheckoutLineInfo",
+    line_prices: CheckoutLinePrices,
     products_translation: Dict[int, Optional[str]],
     variants_translation: Dict[int, Optional[str]],
     prices_entered_with_tax: bool,
 ) -> OrderLineInfo:
-    """Create a line for the given order.
-
-    :raises InsufficientStock: when there is not enough items in stock for this variant.
-    """
+    """Create a line for the given order."""
     checkout_line = checkout_line_info.line
     quantity = checkout_line.quantity
     variant = checkout_line_info.variant
@@ -239,25 +237,10 @@ def _create_line_for_order(
         net=undiscounted_base_total_price, gross=undiscounted_base_total_price
     )
     # total price after applying all discounts - sales and vouchers
-    total_line_price = calculations.checkout_line_total(
-        manager=manager,
-        checkout_info=checkout_info,
-        lines=lines,
-        checkout_line_info=checkout_line_info,
-    )
+    total_line_price = line_prices.total_price
     # unit price after applying all discounts - sales and vouchers
-    unit_price = calculations.checkout_line_unit_price(
-        manager=manager,
-        checkout_info=checkout_info,
-        lines=lines,
-        checkout_line_info=checkout_line_info,
-    )
-    tax_rate = calculations.checkout_line_tax_rate(
-        manager=manager,
-        checkout_info=checkout_info,
-        lines=lines,
-        checkout_line_info=checkout_line_info,
-    )
+    unit_price = line_prices.unit_price
+    tax_rate = line_prices.tax_rate
 
     discount = checkout_line_info.get_sale_discount()
     sale_id = discount.sale.id if discount and discount.sale else None
@@ -379,12 +362,17 @@ def _create_lines_for_order(
         replace=True,
         check_reservations=True,
     )
+    lines_prices = calculations.checkout_lines_prices(
+        manager=manager, checkout_info=checkout_info, lines=lines
+    )
+    # prefetch for all variants, so the number of queries doesn't depend on
+    # which lines are digital
+    prefetch_related_objects(variants, "digital_content")
     return [
         _create_line_for_order(
-            manager,
             checkout_info,
-            lines,
             checkout_line_info,
+            lines_prices[checkout_line_info.line.pk],
             product_translations,
             variants_translation,
             prices_entered_with_tax,
@@ -593,34 +581,21 @@ def _create_order(
 
     update_order_charge_data(order, with_save=False)
     update_order_authorize_data(order, with_save=False)
-    order.search_vector = FlatConcatSearchVector(
-        *prepare_order_search_vector_value(order)
-    )
+    if not settings.CHECKOUT_COMPLETE_DEFER_ORDER_ACTIONS:
+        order.search_vector = FlatConcatSearchVector(
+            *prepare_order_search_vector_value(order)
+        )
     order.save()
 
-    order_info = OrderInfo(
+    _post_create_order_actions(
         order=order,
-        customer_email=order_data["user_email"],
-        channel=checkout_info.channel,
-        payment=order.get_last_payment(),
-        lines_data=order_lines_info,
-    )
-
-    transaction.on_commit(
-        lambda: order_created(
-            order_info=order_info,
-            user=user,
-            app=app,
-            manager=manager,
-            site_settings=site_settings,
-        )
-    )
-
-    # Send the order confirmation email
-    transaction.on_commit(
-        lambda: send_order_confirmation(order_info, checkout.redirect_url, manager)
+        checkout_info=checkout_info,
+        order_lines_info=order_lines_info,
+        manager=manager,
+        user=user,
+        app=app,
+        site_settings=site_settings,
     )
-
     return order
 
 
@@ -1022,6 +997,22 @@ def _post_create_order_actions(
     app: Optional["App"],
     site_settings: "SiteSettings",
 ):
+    """Run the order created actions after the transaction commits.
+
+    With `CHECKOUT_COMPLETE_DEFER_ORDER_ACTIONS` enabled, the actions are run by
+    a Celery task instead, together with the order search vector update.
+    """
+    redirect_url = checkout_info.checkout.redirect_url
+    if settings.CHECKOUT_COMPLETE_DEFER_ORDER_ACTIONS:
+        user_id = user.pk if user else None
+        app_id = app.pk if app else None
+        transaction.on_commit(
+            lambda: order_created_from_checkout_task.delay(
+                str(order.pk), user_id, app_id, redirect_url
+            )
+        )
+        return
+
     order_info = OrderInfo(
         order=order,
         customer_email=order.user_email,
@@ -1030,22 +1021,18 @@ def _post_create_order_actions(
         lines_data=order_lines_info,
     )
 
-    transaction.on_commit(
-        lambda: order_created(
+    def _order_created_actions():
+        order_created(
             order_info=order_info,
             user=user,
             app=app,
             manager=manager,
             site_settings=site_settings,
         )
-    )
+        # Send the order confirmation email
+        send_order_confirmation(order_info, redirect_url, manager)
 
-    # Send the order confirmation email
-    transaction.on_commit(
-        lambda: send_order_confirmation(
-            order_info, checkout_info.checkout.redirect_url, manager
-        )
-    )
+    transaction.on_commit(_order_created_actions)
 
 
 def _create_order_from_checkout(
@@ -1197,9 +1184,10 @@ def _create_order_from_checkout(
     update_order_display_gross_prices(order)
 
     # order search
-    order.search_vector = FlatConcatSearchVector(
-        *prepare_order_search_vector_value(order)
-    )
+    if not settings.CHECKOUT_COMPLETE_DEFER_ORDER_ACTIONS:
+        order.search_vector = FlatConcatSearchVector(
+            *prepare_order_search_vector_value(order)
+        )
     order.save()
 
     # post create actions
@@ -1,14 +1,22 @@
 import logging
 from decimal import Decimal
-from typing import Tuple
+from typing import Optional, Tuple
 
 from celery.utils.log import get_task_logger
 from django.conf import settings
 from django.db.models import Exists, OuterRef, Q, QuerySet, Subquery
 from django.utils import timezone
 
+from ..account.models import User
+from ..app.models import App
 from ..celeryconf import app
+from ..order.actions import order_created
+from ..order.fetch import fetch_order_info
+from ..order.models import Order
+from ..order.notifications import send_order_confirmation
+from ..order.search import update_order_search_vector
 from ..payment.models import TransactionItem
+from ..plugins.manager import get_plugins_manager
 from .models import Checkout, CheckoutLine
 
 task_logger: logging.Logger = get_task_logger(__name__)
@@ -110,3 +118,33 @@ def delete_expired_checkouts(
         else:
             task_logger.warning("Invocation limit reached, aborting task")
     return total_deleted, has_more
+
+
+@app.task
+def order_created_from_checkout_task(
+    order_id: str,
+    user_id: Optional[int],
+    app_id: Optional[int],
+    redirect_url: Optional[str],
+):
+    """Run the actions deferred by the checkout completion for the created order.
+
+    Used when ``settings.CHECKOUT_COMPLETE_DEFER_ORDER_ACTIONS`` is enabled: updates
+    the order search vector, triggers the order created events and sends the order
+    confirmation.
+    """
+    order = Order.objects.select_related("channel").filter(pk=order_id).first()
+    if not order:
+        task_logger.warning("Order %s does not exist, skipping", order_id)
+        return
+
+    update_order_search_vector(order)
+
+    user = User.objects.filter(pk=user_id).first() if user_id else None
+    requestor_app = App.objects.filter(pk=app_id).first() if app_id else None
+    manager = get_plugins_manager(
+        allow_replica=False, requestor_getter=lambda: requestor_app or user
+    )
+    order_info = fetch_order_info(order)
+    order_created(order_info=order_info, user=user, app=requestor_app, manager=manager)
+    send_order_confirmation(order_info, redirect_url, manager)
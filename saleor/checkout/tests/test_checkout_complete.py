@@ -5,7 +5,9 @@ from unittest import mock
 import before_after
 import pytest
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from prices import TaxedMoney
 
@@ -30,6 +32,7 @@ from ...product.models import ProductTranslation, ProductVariantTranslation
 from ...tests.utils import flush_post_commit_hooks
 from .. import calculations
 from ..complete_checkout import (
+    _create_lines_for_order,
     _create_order,
     _prepare_order_data,
     _process_shipping_data_for_order,
@@ -549,6 +552,58 @@ def test_create_order_preauth_payment_creates_expected_events_anonymous_user(
     assert not CustomerEvent.objects.exists()  # should not have created any event
 
 
+@mock.patch("saleor.checkout.complete_checkout.order_created_from_checkout_task.delay")
+@mock.patch("saleor.plugins.manager.PluginsManager.notify")
+def test_create_order_defers_order_actions(
+    mock_notify,
+    mock_order_created_task,
+    checkout_with_item,
+    customer_user,
+    shipping_method,
+    payment_txn_captured,
+    settings,
+):
+    # given
+    settings.CHECKOUT_COMPLETE_DEFER_ORDER_ACTIONS = True
+    checkout = checkout_with_item
+    checkout.user = customer_user
+    checkout.billing_address = customer_user.default_billing_address
+    checkout.shipping_address = customer_user.default_shipping_address
+    checkout.shipping_method = shipping_method
+    checkout.payments.add(payment_txn_captured)
+    checkout.redirect_url = "https://www.example.com"
+    checkout.save()
+
+    manager = get_plugins_manager(allow_replica=False)
+    lines, _ = fetch_checkout_lines(checkout)
+    checkout_info = fetch_checkout_info(checkout, lines, manager)
+
+    # when
+    order = _create_order(
+        checkout_info=checkout_info,
+        checkout_lines=lines,
+        order_data=_prepare_order_data(
+            manager=manager,
+            checkout_info=checkout_info,
+            lines=lines,
+            prices_entered_with_tax=True,
+        ),
+        user=customer_user,
+        app=None,
+        manager=manager,
+    )
+    flush_post_commit_hooks()
+
+    # then
+    mock_order_created_task.assert_called_once_with(
+        str(order.pk), customer_user.pk, None, checkout.redirect_url
+    )
+    mock_notify.assert_not_called()
+    assert not order.events.exists()
+    order.refresh_from_db()
+    assert order.search_vector is None
+
+
 def test_create_order_insufficient_stock(
     checkout, customer_user, product_without_shipping
 ):
@@ -729,6 +784,68 @@ def test_create_order_with_gift_card_partial_use(
     )
 
 
+def test_create_lines_for_order(checkout_with_items, address):
+    # given
+    checkout = checkout_with_items
+    checkout.shipping_address = address
+    checkout.save(update_fields=["shipping_address"])
+    manager = get_plugins_manager(allow_replica=False)
+    lines, _ = fetch_checkout_lines(checkout)
+    checkout_info = fetch_checkout_info(checkout, lines, manager)
+
+    # when
+    lines_info = _create_lines_for_order(
+        manager, checkout_info, lines, prices_entered_with_tax=True
+    )
+
+    # then
+    assert len(lines_info) == len(lines)
+    for line_info, checkout_line_info in zip(lines_info, lines):
+        checkout_line = checkout_line_info.line
+        assert line_info.line.variant == checkout_line.variant
+        assert line_info.line.quantity == checkout_line.quantity
+        assert line_info.line.total_price == calculations.checkout_line_total(
+            manager=manager,
+            checkout_info=checkout_info,
+            lines=lines,
+            checkout_line_info=checkout_line_info,
+        )
+        assert line_info.line.unit_price == calculations.checkout_line_unit_price(
+            manager=manager,
+            checkout_info=checkout_info,
+            lines=lines,
+            checkout_line_info=checkout_line_info,
+        )
+
+
+def test_create_lines_for_order_number_of_queries_does_not_depend_on_lines(
+    checkout_with_items, address
+):
+    # given
+    checkout = checkout_with_items
+    checkout.shipping_address = address
+    checkout.save(update_fields=["shipping_address"])
+    manager = get_plugins_manager(allow_replica=False)
+    lines, _ = fetch_checkout_lines(checkout)
+    checkout_info = fetch_checkout_info(checkout, lines, manager)
+    calculations.fetch_checkout_data(checkout_info, manager, lines)
+    lines = list(lines)
+    assert len(lines) > 1
+
+    # when
+    with CaptureQueriesContext(connection) as single_line_queries:
+        _create_lines_for_order(
+            manager, checkout_info, lines[:1], prices_entered_with_tax=True
+        )
+    with CaptureQueriesContext(connection) as all_lines_queries:
+        _create_lines_for_order(
+            manager, checkout_info, lines, prices_entered_with_tax=True
+        )
+
+    # then
+    assert len(all_lines_queries) == len(single_line_queries)
+
+
 def test_create_order_with_many_gift_cards(
     checkout_with_item,
     gift_card_created_by_staff,
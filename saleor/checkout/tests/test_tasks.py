@@ -6,8 +6,10 @@ from uuid import UUID
 import pytest
 from django.utils import timezone
 
+from ...core.notify_events import NotifyEventType
+from ...order import OrderEvents
 from ..models import Checkout
-from ..tasks import delete_expired_checkouts
+from ..tasks import delete_expired_checkouts, order_created_from_checkout_task
 
 
 def test_delete_expired_anonymous_checkouts(checkouts_list, variant, customer_user):
@@ -449,3 +451,25 @@ def test_aborts_deleting_checkouts_when_invocation_count_exhausted(
 
     # Should have stopped there
     mocked_task.assert_not_called()
+
+
+@mock.patch("saleor.plugins.manager.PluginsManager.notify")
+def test_order_created_from_checkout_task(mock_notify, order_with_lines, customer_user):
+    # given
+    order = order_with_lines
+    order.search_vector = None
+    order.save(update_fields=["search_vector"])
+    redirect_url = "https://www.example.com"
+
+    # when
+    order_created_from_checkout_task(
+        str(order.pk), customer_user.pk, None, redirect_url
+    )
+
+    # then
+    order.refresh_from_db()
+    assert order.search_vector
+    placed_event = order.events.get(type=OrderEvents.PLACED)
+    assert placed_event.user == customer_user
+    notify_events = [call.args[0] for call in mock_notify.call_args_list]
+    assert NotifyEventType.ORDER_CONFIRMATION in notify_events
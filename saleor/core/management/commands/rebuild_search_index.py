@@ -0,0 +1,129 @@
+import multiprocessing
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from ...search import SearchEntity, get_search_backend
+
+DEFAULT_BATCH_SIZE = 500
+# Primary keys are split into more ranges than workers, so workers which finish
+# their range early take the next one.
+PK_RANGES_PER_WORKER = 4
+
+
+def get_peak_memory_usage() -> int:
+    """Return the peak memory usage of the current process in kilobytes."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def rebuild_index_range(
+    entity: str, start_pk: Optional[int], end_pk: Optional[int], batch_size: int
+) -> Tuple[int, int]:
+    """Index a range of objects in a worker process.
+
+    Return the number of indexed objects and the peak memory usage of the worker.
+    """
+    indexed_count = get_search_backend(entity).rebuild_index_range(
+        start_pk, end_pk, batch_size
+    )
+    return indexed_count, get_peak_memory_usage()
+
+
+class Command(BaseCommand):
+    help = (
+        "Index all objects of the given entities with their configured search "
+        "backend. A local index is built in a new file which replaces the current "
+        "one when finished, so searching works during the rebuild."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "entities",
+            nargs="*",
+            help=(
+                "Entities to index, one of: "
+                + ", ".join(choice for choice, _ in SearchEntity.CHOICES)
+                + ". All entities are indexed when not provided."
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Number of objects indexed at once.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help=(
+                "Number of processes indexing ranges of objects at the same time. "
+                "Used only by backends which support parallel indexing."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("Batch size must be a positive number.")
+        workers = options["workers"]
+        if workers < 1:
+            raise CommandError("Number of workers must be a positive number.")
+
+        all_entities = [choice for choice, _ in SearchEntity.CHOICES]
+        entities = options["entities"] or all_entities
+        if unknown_entities := set(entities) - set(all_entities):
+            raise CommandError(
+                f"Unknown entities: {', '.join(sorted(unknown_entities))}."
+            )
+
+        for entity in entities:
+            self.stdout.write(f"Indexing {entity} objects")
+            backend = get_search_backend(entity)
+            started_at = time.monotonic()
+            if workers > 1 and backend.supports_parallel_rebuild:
+                indexed_count, peak_memory = self.rebuild_in_parallel(
+                    entity, workers, batch_size
+                )
+            else:
+                if workers > 1:
+                    self.stdout.write(
+                        f"The {entity} search backend doesn't support parallel "
+                        "indexing, using a single worker."
+                    )
+                indexed_count = backend.rebuild_index(batch_size)
+                peak_memory = get_peak_memory_usage()
+            duration = max(time.monotonic() - started_at, 0.001)
+            self.stdout.write(
+                f"Indexed {indexed_count} {entity} objects in {duration:.1f}s "
+                f"({indexed_count / duration:.1f} objects/s, peak memory usage per "
+                f"worker {peak_memory // 1024} MB)."
+            )
+
+    def rebuild_in_parallel(
+        self, entity: str, workers: int, batch_size: int
+    ) -> Tuple[int, int]:
+        pk_ranges = get_search_backend(entity).split_into_pk_ranges(
+            workers * PK_RANGES_PER_WORKER
+        )
+        # Forked workers can't share the database connections of this process.
+        connections.close_all()
+        indexed_count, peak_memory = 0, 0
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("fork")
+        ) as executor:
+            futures = [
+                executor.submit(
+                    rebuild_index_range, entity, start_pk, end_pk, batch_size
+                )
+                for start_pk, end_pk in pk_ranges
+            ]
+            for future in futures:
+                range_count, range_peak_memory = future.result()
+                indexed_count += range_count
+                peak_memory = max(peak_memory, range_peak_memory)
+        return indexed_count, peak_memory
@@ -0,0 +1,36 @@
+"""Search backends of products, orders and users.
+
+Each searchable entity is searched and indexed with the backend configured for
+it in `settings.SEARCH_BACKENDS`. The default backend keeps using the search
+columns of the entity's table, other backends keep their own index and use the
+database only to fetch the found objects.
+"""
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+if TYPE_CHECKING:
+    from .base import BaseSearchBackend
+
+
+class SearchEntity:
+    PRODUCT = "product"
+    ORDER = "order"
+    USER = "user"
+
+    CHOICES = [
+        (PRODUCT, "Products"),
+        (ORDER, "Orders"),
+        (USER, "Users"),
+    ]
+
+
+def get_search_backend(entity: str) -> "BaseSearchBackend":
+    return _get_search_backend(entity, settings.SEARCH_BACKENDS[entity])
+
+
+@lru_cache(maxsize=None)
+def _get_search_backend(entity: str, backend_path: str) -> "BaseSearchBackend":
+    return import_string(backend_path)(entity)
@@ -0,0 +1,123 @@
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple
+
+from django.db.models import Max, Min
+
+from .entities import SearchEntityDefinition, get_search_entity
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+
+class BaseSearchBackend:
+    """Search and index the objects of a single entity."""
+
+    # Whether primary key ranges of the entity can be indexed at the same time.
+    supports_parallel_rebuild = False
+
+    def __init__(self, entity: str):
+        self.entity = entity
+
+    @property
+    def definition(self) -> SearchEntityDefinition:
+        return get_search_entity(self.entity)
+
+    def search(self, qs: "QuerySet", value: str) -> "QuerySet":
+        """Filter the queryset by the search value and annotate `search_rank`."""
+        raise NotImplementedError()
+
+    def update_index(self, instances: List[Any]):
+        """Index the given objects, prefetched with the entity's fields.
+
+        Clears the dirty flag of the objects when the entity has one.
+        """
+        raise NotImplementedError()
+
+    def update_suggestions(self, instances: List[Any]):
+        """Update the search-as-you-type suggestions of the indexed objects.
+
+        Suggestions are kept in the database whichever backend is used.
+        """
+        if update_suggestions := self.definition.update_suggestions:
+            update_suggestions(instances)
+
+    def update_stale_index(self, batch_size: int) -> int:
+        """Index objects changed since they were indexed and return their number.
+
+        A single batch of the objects with the dirty flag set is indexed. Entities
+        without the flag are kept up to date when the objects are saved.
+        """
+        definition = self.definition
+        if not definition.dirty_field:
+            return 0
+        instances = list(
+            definition.model.objects.filter(**{definition.dirty_field: True})
+            .order_by(*definition.dirty_ordering)
+            .prefetch_related(*definition.fields_to_prefetch)[:batch_size]
+        )
+        if instances:
+            self.update_index(instances)
+            self.update_suggestions(instances)
+        return len(instances)
+
+    def rebuild_index(self, batch_size: int) -> int:
+        """Index all objects of the entity and return their number."""
+        return self.rebuild_index_range(None, None, batch_size)
+
+    def rebuild_index_range(
+        self, start_pk: Optional[int], end_pk: Optional[int], batch_size: int
+    ) -> int:
+        """Index objects with primary keys in the range and return their number.
+
+        The range includes both ends, a missing end doesn't limit the range.
+        """
+        indexed_count = 0
+        for instances in self.iterate_in_batches(
+            self.get_pk_range_queryset(start_pk, end_pk), batch_size
+        ):
+            self.update_index(instances)
+            self.update_suggestions(instances)
+            indexed_count += len(instances)
+        return indexed_count
+
+    def get_pk_range_queryset(
+        self, start_pk: Optional[int], end_pk: Optional[int]
+    ) -> "QuerySet":
+        qs = self.definition.model.objects.all()
+        if start_pk is not None:
+            qs = qs.filter(pk__gte=start_pk)
+        if end_pk is not None:
+            qs = qs.filter(pk__lte=end_pk)
+        return qs
+
+    def split_into_pk_ranges(
+        self, ranges_count: int
+    ) -> List[Tuple[Optional[int], Optional[int]]]:
+        """Split primary keys of all objects into ranges of the same width.
+
+        Objects with non-numeric primary keys are returned as a single range.
+        """
+        pk_range = self.definition.model.objects.aggregate(
+            start_pk=Min("pk"), end_pk=Max("pk")
+        )
+        start_pk, end_pk = pk_range["start_pk"], pk_range["end_pk"]
+        if start_pk is None:
+            return []
+        if not isinstance(start_pk, int):
+            return [(None, None)]
+        width = max((end_pk - start_pk + 1) // ranges_count, 1)
+        ranges: List[Tuple[Optional[int], Optional[int]]] = []
+        while start_pk <= end_pk:
+            ranges.append((start_pk, min(start_pk + width - 1, end_pk)))
+            start_pk += width
+        return ranges
+
+    def iterate_in_batches(self, qs: "QuerySet", batch_size: int):
+        qs = qs.order_by("pk").prefetch_related(*self.definition.fields_to_prefetch)
+        last_pk = None
+        while True:
+            batch_qs = qs if last_pk is None else qs.filter(pk__gt=last_pk)
+            instances = list(batch_qs[:batch_size])
+            if not instances:
+                break
+            yield instances
+            last_pk = instances[-1].pk
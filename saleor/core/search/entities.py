@@ -0,0 +1,133 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Tuple, Type
+
+from django.db.models import Value
+
+from . import SearchEntity
+
+if TYPE_CHECKING:
+    from django.db.models import Model, QuerySet
+
+    from ..postgres import NoValidationSearchVector
+
+# A searchable text with its weight, from "A" (the most important) to "D".
+SearchDocument = List[Tuple[str, str]]
+
+
+@dataclass(frozen=True)
+class SearchEntityDefinition:
+    model: Type["Model"]
+    fields_to_prefetch: List[str]
+    # Return the texts the object is found by, the object's fields are prefetched.
+    prepare_document: Callable[[Any], SearchDocument]
+    # Search and index with the search columns of the entity's table.
+    search_in_postgres: Callable[["QuerySet", str], "QuerySet"]
+    update_postgres_index: Callable[[List[Any]], Any]
+    # Index the objects with the given primary keys, including their suggestions,
+    # without loading model instances.
+    update_postgres_index_by_pks: Optional[Callable[[List[int]], Any]] = None
+    # Boolean field set on objects that need to be indexed again. When the entity
+    # has no such field, the objects updated since the last indexing are indexed.
+    dirty_field: Optional[str] = None
+    # Order in which objects with the dirty flag are indexed.
+    dirty_ordering: Tuple[str, ...] = ()
+    # Set the dirty flag on the given objects.
+    mark_dirty: Optional[Callable[["QuerySet"], Any]] = None
+    # Update the search-as-you-type suggestions of the indexed objects.
+    update_suggestions: Optional[Callable[[List[Any]], Any]] = None
+
+
+def get_search_vectors_document(
+    search_vectors: List["NoValidationSearchVector"],
+) -> SearchDocument:
+    """Return texts and weights of the values of the given search vectors."""
+    document = []
+    for search_vector in search_vectors:
+        weight = search_vector.weight.value if search_vector.weight else "D"
+        for expression in search_vector.get_source_expressions():
+            if isinstance(expression, Value) and expression.value:
+                document.append((str(expression.value), weight))
+    return document
+
+
+def get_search_entity(entity: str) -> SearchEntityDefinition:
+    if entity == SearchEntity.PRODUCT:
+        return _get_product_search_entity()
+    if entity == SearchEntity.ORDER:
+        return _get_order_search_entity()
+    if entity == SearchEntity.USER:
+        return _get_user_search_entity()
+    raise ValueError(f"Unknown search entity: {entity}.")
+
+
+def _get_product_search_entity():
+    from ...product.models import Product
+    from ...product.search import (
+        PRODUCT_FIELDS_TO_PREFETCH,
+        prepare_product_search_vector_value,
+        search_products_in_postgres,
+        update_products_search_vector,
+    )
+    from ...product.search_index import update_products_search_index
+    from ...product.search_invalidation import mark_products_search_index_dirty
+    from ...product.search_suggestions import update_products_search_suggestions
+
+    return SearchEntityDefinition(
+        model=Product,
+        fields_to_prefetch=PRODUCT_FIELDS_TO_PREFETCH,
+        prepare_document=lambda product: get_search_vectors_document(
+            prepare_product_search_vector_value(product, already_prefetched=True)
+        ),
+        search_in_postgres=search_products_in_postgres,
+        update_postgres_index=lambda products: update_products_search_vector(
+            products, use_batches=False
+        ),
+        update_postgres_index_by_pks=update_products_search_index,
+        dirty_field="search_index_dirty",
+        dirty_ordering=("-search_index_priority", "search_index_dirty_since"),
+        mark_dirty=mark_products_search_index_dirty,
+        update_suggestions=update_products_search_suggestions,
+    )
+
+
+def _get_order_search_entity():
+    from ...order.models import Order
+    from ...order.search import (
+        ORDER_FIELDS_TO_PREFETCH,
+        prepare_order_search_vector_value,
+        search_orders_in_postgres,
+    )
+    from ..search_tasks import set_search_vector_values
+
+    return SearchEntityDefinition(
+        model=Order,
+        fields_to_prefetch=ORDER_FIELDS_TO_PREFETCH,
+        prepare_document=lambda order: get_search_vectors_document(
+            prepare_order_search_vector_value(order, already_prefetched=True)
+        ),
+        search_in_postgres=search_orders_in_postgres,
+        update_postgres_index=lambda orders: set_search_vector_values(
+            orders, prepare_order_search_vector_value
+        ),
+    )
+
+
+def _get_user_search_entity():
+    from ...account.models import User
+    from ...account.search import (
+        prepare_user_search_document_value,
+        search_users_in_postgres,
+    )
+    from ..search_tasks import set_search_document_values
+
+    return SearchEntityDefinition(
+        model=User,
+        fields_to_prefetch=["addresses"],
+        prepare_document=lambda user: [
+            (prepare_user_search_document_value(user, already_prefetched=True), "A")
+        ],
+        search_in_postgres=search_users_in_postgres,
+        update_postgres_index=lambda users: set_search_document_values(
+            users, prepare_user_search_document_value
+        ),
+    )
@@ -0,0 +1,329 @@
+"""Search backend keeping an inverted index in a local SQLite file.
+
+The index maps every token of the searchable texts to the objects containing it,
+with a score based on the weight of the text. It's written by the worker tasks
+and read by the API processes, so the database only fetches the found objects.
+Query tokens also match the indexed tokens they are a prefix of and the tokens
+with a single typo.
+"""
+import heapq
+import os
+import re
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db.models import Case, FloatField, Q, Value, When
+from django.utils import timezone
+
+from .base import BaseSearchBackend
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+# Default weights of the Postgres `ts_rank` function.
+WEIGHT_SCORES = {"A": 1.0, "B": 0.4, "C": 0.2, "D": 0.1}
+PREFIX_MATCH_FACTOR = 0.5
+TYPO_MATCH_FACTOR = 0.5
+MIN_TYPO_TOKEN_LENGTH = 4
+MAX_PREFIX_MATCHES = 50
+TOKEN_RE = re.compile(r"\w+")
+# Greater than any character, used as the upper bound of prefix ranges.
+MAX_CHARACTER = "\U0010ffff"
+
+INDEX_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS postings (
+        token TEXT NOT NULL,
+        object_id TEXT NOT NULL,
+        score REAL NOT NULL,
+        PRIMARY KEY (token, object_id)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS postings_object_id ON postings (object_id);
+    CREATE TABLE IF NOT EXISTS tokens (token TEXT PRIMARY KEY) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+INDEXED_UNTIL_KEY = "indexed_until"
+INDEXED_UNTIL_PK_KEY = "indexed_until_pk"
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def is_single_edit_away(first: str, second: str) -> bool:
+    """Return whether the strings differ by one changed, added or removed character.
+
+    Swapped adjacent characters are also counted as a single edit.
+    """
+    if abs(len(first) - len(second)) > 1 or first == second:
+        return False
+    prefix_length = 0
+    for first_char, second_char in zip(first, second):
+        if first_char != second_char:
+            break
+        prefix_length += 1
+    first_rest, second_rest = first[prefix_length:], second[prefix_length:]
+    return (
+        first_rest[1:] == second_rest[1:]
+        or first_rest[1:] == second_rest
+        or first_rest == second_rest[1:]
+        or (
+            len(first) == len(second)
+            and len(first_rest) > 1
+            and first_rest[0] == second_rest[1]
+            and first_rest[1] == second_rest[0]
+            and first_rest[2:] == second_rest[2:]
+        )
+    )
+
+
+class LocalIndexSearchBackend(BaseSearchBackend):
+    @property
+    def path(self) -> str:
+        """Return the path of the current index file.
+
+        Rebuilt indexes are written to new files, so the name of the current one
+        is kept in a pointer file replaced when the rebuild is finished.
+        """
+        try:
+            with open(self._get_pointer_path()) as pointer_file:
+                file_name = pointer_file.read().strip()
+        except FileNotFoundError:
+            file_name = f"{self.entity}.sqlite3"
+        return os.path.join(settings.SEARCH_LOCAL_INDEX_DIR, file_name)
+
+    def _get_pointer_path(self) -> str:
+        return os.path.join(settings.SEARCH_LOCAL_INDEX_DIR, f"{self.entity}.current")
+
+    def connect(self, path: Optional[str] = None) -> sqlite3.Connection:
+        path = path or self.path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        connection = sqlite3.connect(path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(INDEX_SCHEMA)
+        return connection
+
+    def search(self, qs: "QuerySet", value: str) -> "QuerySet":
+        tokens = tokenize(value)
+        path = self.path
+        if not tokens or not os.path.exists(path):
+            return qs.none()
+
+        scores: Dict[str, float] = {}
+        with closing(self.connect(path)) as connection:
+            for index, token in enumerate(tokens):
+                token_scores = self._get_token_scores(connection, token)
+                if index == 0:
+                    scores = token_scores
+                else:
+                    # All tokens of the value must match, like in a web search.
+                    scores = {
+                        pk: score + token_scores[pk]
+                        for pk, score in scores.items()
+                        if pk in token_scores
+                    }
+                if not scores:
+                    return qs.none()
+
+        max_results = settings.SEARCH_LOCAL_INDEX_MAX_RESULTS
+        if len(scores) > max_results:
+            # Only objects matching the filters applied to the queryset so far
+            # count towards the limit, so they aren't cut off by objects the
+            # queryset excludes. Filters applied after the search still narrow
+            # down the limited results.
+            matching_pks = {
+                str(pk)
+                for pk in qs.filter(pk__in=list(scores)).values_list("pk", flat=True)
+            }
+            scores = {pk: score for pk, score in scores.items() if pk in matching_pks}
+        best_scores = heapq.nlargest(
+            max_results,
+            scores.items(),
+            key=lambda item: item[1],
+        )
+        return qs.filter(pk__in=[pk for pk, _ in best_scores]).annotate(
+            search_rank=Case(
+                *[When(pk=pk, then=Value(score)) for pk, score in best_scores],
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+        )
+
+    def _get_token_scores(
+        self, connection: sqlite3.Connection, token: str
+    ) -> Dict[str, float]:
+        match_factors = {token: 1.0}
+        for (indexed_token,) in connection.execute(
+            "SELECT token FROM tokens WHERE token > ? AND token < ? LIMIT ?",
+            (token, token + MAX_CHARACTER, MAX_PREFIX_MATCHES),
+        ):
+            match_factors[indexed_token] = PREFIX_MATCH_FACTOR
+        if len(token) >= MIN_TYPO_TOKEN_LENGTH:
+            # Typos are looked for in the tokens starting with the same two
+            # characters, to not compare the token with the whole vocabulary.
+            for (indexed_token,) in connection.execute(
+                "SELECT token FROM tokens WHERE token >= ? AND token < ? "
+                "AND length(token) BETWEEN ? AND ?",
+                (token[:2], token[:2] + MAX_CHARACTER, len(token) - 1, len(token) + 1),
+            ):
+                if indexed_token not in match_factors and is_single_edit_away(
+                    token, indexed_token
+                ):
+                    match_factors[indexed_token] = TYPO_MATCH_FACTOR
+
+        token_scores: Dict[str, float] = {}
+        placeholders = ", ".join("?" * len(match_factors))
+        for indexed_token, pk, score in connection.execute(
+            f"SELECT token, object_id, score FROM postings "
+            f"WHERE token IN ({placeholders})",
+            list(match_factors),
+        ):
+            score *= match_factors[indexed_token]
+            token_scores[pk] = max(token_scores.get(pk, 0.0), score)
+        return token_scores
+
+    def update_index(self, instances: List[Any]):
+        if not instances:
+            return
+        with closing(self.connect()) as connection:
+            self._write_documents(connection, instances)
+        self._clear_dirty_flag(instances)
+
+    def update_stale_index(self, batch_size: int) -> int:
+        """Index objects changed since they were indexed and return their number.
+
+        Entities without the dirty flag are indexed by their update date, from
+        the date of the last indexed object.
+        """
+        if self.definition.dirty_field:
+            return super().update_stale_index(batch_size)
+
+        indexed_count = 0
+        with closing(self.connect()) as connection:
+            indexed_until = self._get_state(connection, INDEXED_UNTIL_KEY)
+            indexed_until_pk = self._get_state(connection, INDEXED_UNTIL_PK_KEY)
+            qs = self.definition.model.objects.order_by("updated_at", "pk")
+            while True:
+                batch_qs = qs
+                if indexed_until:
+                    updated_at = datetime.fromisoformat(indexed_until)
+                    same_date_lookup = Q(updated_at=updated_at)
+                    if indexed_until_pk:
+                        same_date_lookup &= Q(pk__gt=indexed_until_pk)
+                    batch_qs = qs.filter(
+                        Q(updated_at__gt=updated_at) | same_date_lookup
+                    )
+                instances = list(
+                    batch_qs.prefetch_related(*self.definition.fields_to_prefetch)[
+                        :batch_size
+                    ]
+                )
+                if not instances:
+                    break
+                indexed_until = instances[-1].updated_at.isoformat()
+                indexed_until_pk = str(instances[-1].pk)
+                self._write_documents(
+                    connection,
+                    instances,
+                    state={
+                        INDEXED_UNTIL_KEY: indexed_until,
+                        INDEXED_UNTIL_PK_KEY: indexed_until_pk,
+                    },
+                )
+                indexed_count += len(instances)
+        return indexed_count
+
+    def rebuild_index(self, batch_size: int) -> int:
+        """Build a new index of all objects and replace the current one with it."""
+        started_at = timezone.now()
+        old_path = self.path
+        new_file_name = f"{self.entity}.{started_at:%Y%m%d%H%M%S%f}.sqlite3"
+        new_path = os.path.join(settings.SEARCH_LOCAL_INDEX_DIR, new_file_name)
+
+        indexed_count = 0
+        with closing(self.connect(new_path)) as connection:
+            for instances in self.iterate_in_batches(
+                self.definition.model.objects.all(), batch_size
+            ):
+                self._write_documents(connection, instances)
+                self._clear_dirty_flag(instances)
+                self.update_suggestions(instances)
+                indexed_count += len(instances)
+            # Objects updated during the rebuild are indexed again by
+            # `update_stale_index`, either from this watermark or, for entities
+            # with a dirty flag, after they are marked dirty below.
+            self._set_state(
+                connection,
+                {INDEXED_UNTIL_KEY: started_at.isoformat(), INDEXED_UNTIL_PK_KEY: ""},
+            )
+            connection.commit()
+
+        pointer_path = self._get_pointer_path()
+        with open(f"{pointer_path}.tmp", "w") as pointer_file:
+            pointer_file.write(new_file_name)
+        os.replace(f"{pointer_path}.tmp", pointer_path)
+        if mark_dirty := self.definition.mark_dirty:
+            # An object updated before the pointer swap could have been written
+            # to the old file only and have its dirty flag cleared.
+            mark_dirty(self.definition.model.objects.filter(updated_at__gte=started_at))
+        for path in (old_path, f"{old_path}-wal", f"{old_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+        return indexed_count
+
+    def _write_documents(
+        self,
+        connection: sqlite3.Connection,
+        instances: List[Any],
+        state: Optional[Dict[str, str]] = None,
+    ):
+        postings = []
+        for instance in instances:
+            token_scores: Dict[str, float] = {}
+            for text, weight in self.definition.prepare_document(instance):
+                for token in tokenize(text):
+                    token_scores[token] = max(
+                        token_scores.get(token, 0.0), WEIGHT_SCORES[weight]
+                    )
+            postings += [
+                (token, str(instance.pk), score)
+                for token, score in token_scores.items()
+            ]
+
+        with connection:
+            connection.executemany(
+                "DELETE FROM postings WHERE object_id = ?",
+                [(str(instance.pk),) for instance in instances],
+            )
+            connection.executemany(
+                "INSERT INTO postings (token, object_id, score) VALUES (?, ?, ?)",
+                postings,
+            )
+            connection.executemany(
+                "INSERT OR IGNORE INTO tokens (token) VALUES (?)",
+                [(token,) for token in {token for token, _, _ in postings}],
+            )
+            if state:
+                self._set_state(connection, state)
+
+    def _clear_dirty_flag(self, instances: Iterable[Any]):
+        if dirty_field := self.definition.dirty_field:
+            self.definition.model.objects.filter(
+                pk__in=[instance.pk for instance in instances]
+            ).update(**{dirty_field: False})
+
+    @staticmethod
+    def _get_state(connection: sqlite3.Connection, key: str) -> Optional[str]:
+        row = connection.execute(
+            "SELECT value FROM state WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _set_state(connection: sqlite3.Connection, state: Dict[str, str]):
+        connection.executemany(
+            "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+            list(state.items()),
+        )
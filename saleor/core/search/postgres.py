@@ -0,0 +1,54 @@
+from typing import TYPE_CHECKING, Any, List, Optional
+
+from .base import BaseSearchBackend
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """Search with the search vector or document columns of the entity's table.
+
+    This is the default backend.
+    """
+
+    supports_parallel_rebuild = True
+
+    def search(self, qs: "QuerySet", value: str) -> "QuerySet":
+        return self.definition.search_in_postgres(qs, value)
+
+    def update_index(self, instances: List[Any]):
+        if instances:
+            self.definition.update_postgres_index(instances)
+
+    def update_stale_index(self, batch_size: int) -> int:
+        definition = self.definition
+        if not (definition.dirty_field and definition.update_postgres_index_by_pks):
+            return super().update_stale_index(batch_size)
+        pks = list(
+            definition.model.objects.filter(**{definition.dirty_field: True})
+            .order_by(*definition.dirty_ordering)
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if pks:
+            definition.update_postgres_index_by_pks(pks)
+        return len(pks)
+
+    def rebuild_index_range(
+        self, start_pk: Optional[int], end_pk: Optional[int], batch_size: int
+    ) -> int:
+        update_index_by_pks = self.definition.update_postgres_index_by_pks
+        if not update_index_by_pks:
+            return super().rebuild_index_range(start_pk, end_pk, batch_size)
+        qs = self.get_pk_range_queryset(start_pk, end_pk).order_by("pk")
+        indexed_count = 0
+        last_pk = None
+        while True:
+            batch_qs = qs if last_pk is None else qs.filter(pk__gt=last_pk)
+            pks = list(batch_qs.values_list("pk", flat=True)[:batch_size])
+            if not pks:
+                break
+            update_index_by_pks(pks)
+            indexed_count += len(pks)
+            last_pk = pks[-1]
+        return indexed_count
@@ -1,6 +1,7 @@
 from typing import List
 
 from celery.utils.log import get_task_logger
+from django.conf import settings
 
 from ..account.models import User
 from ..account.search import prepare_user_search_document_value
@@ -13,6 +14,7 @@ from ..product.search import (
     prepare_product_search_vector_value,
 )
 from .postgres import FlatConcatSearchVector
+from .search import SearchEntity, get_search_backend
 
 task_logger = get_task_logger(__name__)
 
@@ -110,6 +112,21 @@ def set_product_search_document_values(updated_count: int = 0) -> None:
     set_product_search_document_values.delay(updated_count)
 
 
+@app.task(
+    queue=settings.UPDATE_SEARCH_VECTOR_INDEX_QUEUE_NAME,
+    expires=settings.BEAT_UPDATE_SEARCH_EXPIRE_AFTER_SEC,
+)
+def update_search_indexes_task() -> None:
+    """Index orders and users changed since they were indexed.
+
+    Products are indexed by `update_products_search_vector_task`.
+    """
+    for entity in [SearchEntity.ORDER, SearchEntity.USER]:
+        indexed_count = get_search_backend(entity).update_stale_index(BATCH_SIZE)
+        if indexed_count:
+            task_logger.info("Indexed %d objects of %s.", indexed_count, entity)
+
+
 def set_search_document_values(instances: List, prepare_search_document_func):
     if not instances:
         return 0
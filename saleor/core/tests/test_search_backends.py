@@ -0,0 +1,207 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from ...account.models import User
+from ...account.search import search_users
+from ...order.models import Order
+from ...order.search import search_orders
+from ...product.models import Product
+from ...product.search import search_products
+from ...product.tasks import update_products_search_vector_task
+from ..search import SearchEntity, get_search_backend
+from ..search.local import is_single_edit_away
+from ..search_tasks import update_search_indexes_task
+
+
+@pytest.fixture
+def local_search_index(settings, tmp_path):
+    settings.SEARCH_LOCAL_INDEX_DIR = str(tmp_path)
+    settings.SEARCH_BACKENDS = {
+        entity: settings.LOCAL_INDEX_SEARCH_BACKEND
+        for entity, _ in SearchEntity.CHOICES
+    }
+
+
+def test_is_single_edit_away():
+    assert is_single_edit_away("shirt", "shirts")
+    assert is_single_edit_away("shirt", "shit")
+    assert is_single_edit_away("shirt", "skirt")
+    assert is_single_edit_away("shirt", "shrit")
+    assert not is_single_edit_away("shirt", "shirt")
+    assert not is_single_edit_away("shirt", "skirts")
+
+
+def test_local_index_search_products(local_search_index, product_list):
+    # given
+    get_search_backend(SearchEntity.PRODUCT).rebuild_index(batch_size=2)
+
+    # when
+    products = search_products(Product.objects.all(), "prodcut orange")
+
+    # then
+    assert list(products) == [product_list[1]]
+    assert products.get().search_rank > 0
+
+
+def test_local_index_search_products_by_prefix(local_search_index, product_list):
+    # given
+    get_search_backend(SearchEntity.PRODUCT).rebuild_index(batch_size=10)
+
+    # when
+    products = search_products(Product.objects.all(), "or")
+
+    # then
+    assert list(products) == [product_list[1]]
+
+
+def test_local_index_search_limits_results_matching_queryset(
+    local_search_index, product_list, settings
+):
+    # given
+    settings.SEARCH_LOCAL_INDEX_MAX_RESULTS = 1
+    get_search_backend(SearchEntity.PRODUCT).rebuild_index(batch_size=10)
+    qs = Product.objects.filter(pk=product_list[2].pk)
+
+    # when
+    products = search_products(qs, "test")
+
+    # then
+    assert list(products) == [product_list[2]]
+
+
+def test_local_index_rebuild_marks_products_updated_during_rebuild_dirty(
+    local_search_index, product_list
+):
+    # given
+    product = product_list[0]
+    Product.objects.filter(pk=product.pk).update(
+        updated_at=timezone.now() + timedelta(minutes=1)
+    )
+
+    # when
+    get_search_backend(SearchEntity.PRODUCT).rebuild_index(batch_size=10)
+
+    # then
+    assert set(
+        Product.objects.filter(search_index_dirty=True).values_list("pk", flat=True)
+    ) == {product.pk}
+
+
+def test_local_index_updates_dirty_products(local_search_index, product_list):
+    # given
+    get_search_backend(SearchEntity.PRODUCT).rebuild_index(batch_size=10)
+    product = product_list[0]
+    product.name = "Renamed"
+    product.search_index_dirty = True
+    product.save(update_fields=["name", "search_index_dirty"])
+
+    # when
+    update_products_search_vector_task()
+
+    # then
+    assert list(search_products(Product.objects.all(), "renamed")) == [product]
+    product.refresh_from_db()
+    assert not product.search_index_dirty
+
+
+def test_local_index_updates_changed_orders_and_users(
+    local_search_index, order_list, customer_user
+):
+    # given
+    update_search_indexes_task()
+    customer_user.last_name = "Kowalsky"
+    customer_user.save(update_fields=["last_name", "updated_at"])
+
+    # when
+    update_search_indexes_task()
+
+    # then
+    assert list(search_users(User.objects.all(), "kowalski")) == [customer_user]
+    assert set(search_orders(Order.objects.all(), customer_user.email)) == set(
+        order_list
+    )
+
+
+def test_rebuild_search_index_command(product_list):
+    # given
+    Product.objects.update(search_vector=None)
+
+    # when
+    call_command("rebuild_search_index", "product")
+
+    # then
+    assert not Product.objects.filter(search_vector=None).exists()
+
+
+def test_rebuild_search_index_command_unknown_entity():
+    # when
+    with pytest.raises(CommandError) as e:
+        call_command("rebuild_search_index", "category")
+
+    # then
+    assert str(e.value) == "Unknown entities: category."
+
+
+def test_split_into_pk_ranges(product_list):
+    # given
+    pks = sorted(product.pk for product in product_list)
+
+    # when
+    pk_ranges = get_search_backend(SearchEntity.PRODUCT).split_into_pk_ranges(2)
+
+    # then
+    assert pk_ranges[0][0] == pks[0]
+    assert pk_ranges[-1][1] == pks[-1]
+    for (_, end_pk), (start_pk, _) in zip(pk_ranges, pk_ranges[1:]):
+        assert start_pk == end_pk + 1
+
+
+def test_split_into_pk_ranges_without_objects(db):
+    assert get_search_backend(SearchEntity.PRODUCT).split_into_pk_ranges(2) == []
+
+
+def test_rebuild_index_range(product_list):
+    # given
+    Product.objects.update(search_vector=None)
+    pks = sorted(product.pk for product in product_list)
+
+    # when
+    indexed_count = get_search_backend(SearchEntity.PRODUCT).rebuild_index_range(
+        pks[1], None, batch_size=1
+    )
+
+    # then
+    assert indexed_count == 2
+    assert list(Product.objects.filter(search_vector=None)) == [
+        Product.objects.get(pk=pks[0])
+    ]
+
+
+def test_rebuild_search_index_command_reports_throughput(product_list):
+    # given
+    out = StringIO()
+
+    # when
+    call_command("rebuild_search_index", "product", stdout=out)
+
+    # then
+    assert "Indexed 3 product objects in" in out.getvalue()
+    assert "objects/s" in out.getvalue()
+
+
+def test_rebuild_search_index_command_workers_not_supported(
+    local_search_index, product_list
+):
+    # given
+    out = StringIO()
+
+    # when
+    call_command("rebuild_search_index", "product", "--workers", "2", stdout=out)
+
+    # then
+    assert "doesn't support parallel indexing" in out.getvalue()
+    assert list(search_products(Product.objects.all(), "orange")) == [product_list[1]]
@@ -28,6 +28,10 @@ from ...account.search import (
     generate_user_fields_search_document_value,
 )
 from ...account.utils import store_user_address
+from ...attribute.facets import (
+    update_products_attribute_facets,
+    update_products_attribute_sort_keys,
+)
 from ...attribute.models import (
     AssignedPageAttribute,
     AssignedProductAttribute,
@@ -82,6 +86,11 @@ from ...product.models import (
     VariantMedia,
 )
 from ...product.search import update_products_search_vector
+from ...product.search_suggestions import (
+    update_categories_search_suggestions,
+    update_collections_search_suggestions,
+    update_products_search_suggestions,
+)
 from ...product.tasks import update_products_discounted_prices_of_sale_task
 from ...product.utils.variant_prices import update_products_discounted_prices
 from ...shipping.models import (
@@ -465,6 +474,8 @@ def create_products_by_schema(placeholder_dir, create_images):
     assign_attribute_values_to_variants(
         types["attribute.assignedvariantattributevalue"]
     )
+    update_products_attribute_facets(Product.objects.values_list("pk", flat=True))
+    update_products_attribute_sort_keys(Product.objects.values_list("pk", flat=True))
     assign_attributes_to_pages(page_attributes=types["attribute.assignedpageattribute"])
     create_collections(
         data=types["product.collection"], placeholder_dir=placeholder_dir
@@ -476,6 +487,9 @@ def create_products_by_schema(placeholder_dir, create_images):
 
     all_products_qs = Product.objects.all()
     update_products_search_vector(all_products_qs)
+    update_products_search_suggestions(list(all_products_qs))
+    update_categories_search_suggestions(Category.objects.all())
+    update_collections_search_suggestions(Collection.objects.all())
     update_products_discounted_prices(all_products_qs)
 
 
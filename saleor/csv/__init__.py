@@ -24,11 +24,29 @@ class ExportEvents:
     ]
 
 
+class ImportEvents:
+    """The different csv import events types."""
+
+    IMPORT_PENDING = "import_pending"
+    IMPORT_SUCCESS = "import_success"
+    IMPORT_FAILED = "import_failed"
+    IMPORT_ROWS_REJECTED = "import_rows_rejected"
+
+    CHOICES = [
+        (IMPORT_PENDING, "Data import was started."),
+        (IMPORT_SUCCESS, "Data import was completed successfully."),
+        (IMPORT_FAILED, "Data import failed."),
+        (IMPORT_ROWS_REJECTED, "Some rows of the imported file were rejected."),
+    ]
+
+
 class FileTypes:
     CSV = "csv"
+    CSV_GZ = "csv_gz"
     XLSX = "xlsx"
 
     CHOICES = [
         (CSV, "Plain CSV file."),
+        (CSV_GZ, "CSV file compressed with gzip."),
         (XLSX, "Excel XLSX file."),
     ]
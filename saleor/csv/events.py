@@ -1,12 +1,12 @@
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, List, Optional
 
-from . import ExportEvents
-from .models import ExportEvent
+from . import ExportEvents, ImportEvents
+from .models import ExportEvent, ImportEvent
 
 if TYPE_CHECKING:
     from ..account.models import User
     from ..app.models import App
-    from .models import ExportFile
+    from .models import ExportFile, ImportFile
 
 
 def export_started_event(
@@ -73,3 +73,62 @@ def export_failed_info_sent_event(*, export_file_id: int, user_id: int) -> None:
         user_id=user_id,
         type=ExportEvents.EXPORT_FAILED_INFO_SENT,
     )
+
+
+def import_started_event(
+    *,
+    import_file: "ImportFile",
+    user: Optional["User"] = None,
+    app: Optional["App"] = None
+) -> None:
+    ImportEvent.objects.create(
+        import_file=import_file, user=user, app=app, type=ImportEvents.IMPORT_PENDING
+    )
+
+
+def import_success_event(
+    *,
+    import_file: "ImportFile",
+    user: Optional["User"] = None,
+    app: Optional["App"] = None
+) -> None:
+    ImportEvent.objects.create(
+        import_file=import_file,
+        user=user,
+        app=app,
+        type=ImportEvents.IMPORT_SUCCESS,
+        parameters={"message": import_file.message or ""},
+    )
+
+
+def import_failed_event(
+    *,
+    import_file: "ImportFile",
+    user: Optional["User"] = None,
+    app: Optional["App"] = None,
+    message: str,
+    error_type: str
+) -> None:
+    ImportEvent.objects.create(
+        import_file=import_file,
+        user=user,
+        app=app,
+        type=ImportEvents.IMPORT_FAILED,
+        parameters={"message": message, "error_type": error_type},
+    )
+
+
+def import_rows_rejected_event(
+    *,
+    import_file: "ImportFile",
+    user: Optional["User"] = None,
+    app: Optional["App"] = None,
+    errors: List[str]
+) -> None:
+    ImportEvent.objects.create(
+        import_file=import_file,
+        user=user,
+        app=app,
+        type=ImportEvents.IMPORT_ROWS_REJECTED,
+        parameters={"message": "\n".join(errors), "errors": errors},
+    )
@@ -0,0 +1,41 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("csv", "0005_importfile_importevent"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExportFilePart",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("after_pk", models.PositiveIntegerField()),
+                ("last_pk", models.PositiveIntegerField()),
+                (
+                    "content_file",
+                    models.FileField(null=True, upload_to="export_files/parts"),
+                ),
+                ("completed", models.BooleanField(default=False)),
+                (
+                    "export_file",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="parts",
+                        to="csv.exportfile",
+                    ),
+                ),
+            ],
+            options={"ordering": ("after_pk",)},
+        ),
+    ]
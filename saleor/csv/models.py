@@ -6,7 +6,7 @@ from ..account.models import User
 from ..app.models import App
 from ..core.models import Job
 from ..core.utils.json_serializer import CustomJsonEncoder
-from . import ExportEvents
+from . import ExportEvents, ImportEvents
 
 
 class ExportFile(Job):
@@ -19,6 +19,25 @@ class ExportFile(Job):
     content_file = models.FileField(upload_to="export_files", null=True)
 
 
+class ExportFilePart(models.Model):
+    """Model used to store a part of the export file, exported by a separate task.
+
+    The part contains objects with primary keys greater than `after_pk` and lower or
+    equal to `last_pk`, without the headers.
+    """
+
+    export_file = models.ForeignKey(
+        ExportFile, related_name="parts", on_delete=models.CASCADE
+    )
+    after_pk = models.PositiveIntegerField()
+    last_pk = models.PositiveIntegerField()
+    content_file = models.FileField(upload_to="export_files/parts", null=True)
+    completed = models.BooleanField(default=False)
+
+    class Meta:
+        ordering = ("after_pk",)
+
+
 class ExportEvent(models.Model):
     """Model used to store events that happened during the export file lifecycle."""
 
@@ -34,3 +53,30 @@ class ExportEvent(models.Model):
     app = models.ForeignKey(
         App, related_name="export_csv_events", on_delete=models.SET_NULL, null=True
     )
+
+
+class ImportFile(Job):
+    user = models.ForeignKey(
+        User, related_name="import_files", on_delete=models.CASCADE, null=True
+    )
+    app = models.ForeignKey(
+        App, related_name="import_files", on_delete=models.CASCADE, null=True
+    )
+    content_file = models.FileField(upload_to="import_files", null=True)
+
+
+class ImportEvent(models.Model):
+    """Model used to store events that happened during the import file lifecycle."""
+
+    date = models.DateTimeField(default=timezone.now, editable=False)
+    type = models.CharField(max_length=255, choices=ImportEvents.CHOICES)
+    parameters = JSONField(blank=True, default=dict, encoder=CustomJsonEncoder)
+    import_file = models.ForeignKey(
+        ImportFile, related_name="events", on_delete=models.CASCADE
+    )
+    user = models.ForeignKey(
+        User, related_name="import_csv_events", on_delete=models.SET_NULL, null=True
+    )
+    app = models.ForeignKey(
+        App, related_name="import_csv_events", on_delete=models.SET_NULL, null=True
+    )
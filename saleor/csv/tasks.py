@@ -11,9 +11,19 @@ from django.utils import timezone
 from ..celeryconf import app
 from ..core import JobStatus
 from . import events
-from .models import ExportEvent, ExportFile
+from .models import ExportEvent, ExportFile, ExportFilePart, ImportFile
 from .notifications import send_export_failed_info
-from .utils.export import export_gift_cards, export_products
+from .utils.export import (
+    create_export_file_parts,
+    export_gift_cards,
+    export_gift_cards_part,
+    export_orders,
+    export_products,
+    export_products_part,
+    get_gift_cards_queryset,
+    get_products_queryset,
+)
+from .utils.import_products import import_products
 
 task_logger = get_task_logger(__name__)
 
@@ -23,6 +33,9 @@ class ExportTask(celery.Task):
     TASK_NAME_TO_DATA_TYPE_MAPPING = {
         "export-products": "products",
         "export-gift-cards": "gift cards",
+        "export-orders": "orders",
+        "export-products-part": "products",
+        "export-gift-cards-part": "gift cards",
     }
 
     def on_failure(self, exc, task_id, args, kwargs, einfo):
@@ -47,6 +60,11 @@ class ExportTask(celery.Task):
         send_export_failed_info(export_file, data_type)
 
     def on_success(self, retval, task_id, args, kwargs):
+        if retval is False:
+            # the export was split into parts, the export is completed by the task
+            # exporting the last part
+            return
+
         export_file_id = args[0]
 
         export_file = ExportFile.objects.get(pk=export_file_id)
@@ -57,6 +75,44 @@ class ExportTask(celery.Task):
         )
 
 
+class ExportPartTask(ExportTask):
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        export_file_id = args[0]
+        # the failure is reported only once, even if more parts failed
+        if ExportFile.objects.filter(
+            pk=export_file_id, status=JobStatus.FAILED
+        ).exists():
+            return
+        super().on_failure(exc, task_id, args, kwargs, einfo)
+
+
+class ImportTask(celery.Task):
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        import_file_id = args[0]
+        import_file = ImportFile.objects.get(pk=import_file_id)
+
+        import_file.status = JobStatus.FAILED
+        import_file.save(update_fields=["status", "updated_at"])
+
+        events.import_failed_event(
+            import_file=import_file,
+            user=import_file.user,
+            app=import_file.app,
+            message=str(exc),
+            error_type=str(einfo.type),
+        )
+
+    def on_success(self, retval, task_id, args, kwargs):
+        import_file_id = args[0]
+
+        import_file = ImportFile.objects.get(pk=import_file_id)
+        import_file.status = JobStatus.SUCCESS
+        import_file.save(update_fields=["status", "updated_at"])
+        events.import_success_event(
+            import_file=import_file, user=import_file.user, app=import_file.app
+        )
+
+
 @app.task(name="export-products", base=ExportTask)
 def export_products_task(
     export_file_id: int,
@@ -66,9 +122,32 @@ def export_products_task(
     delimiter: str = ",",
 ):
     export_file = ExportFile.objects.get(pk=export_file_id)
+    queryset = get_products_queryset(scope)
+    if parts := create_export_file_parts(export_file, queryset):
+        for part in parts:
+            export_products_part_task.delay(
+                export_file_id, part.pk, scope, export_info, file_type, delimiter
+            )
+        return False
+
     export_products(export_file, scope, export_info, file_type, delimiter)
 
 
+@app.task(name="export-products-part", base=ExportPartTask)
+def export_products_part_task(
+    export_file_id: int,
+    export_file_part_id: int,
+    scope: Dict[str, Union[str, dict]],
+    export_info: Dict[str, list],
+    file_type: str,
+    delimiter: str = ",",
+):
+    export_file_part = ExportFilePart.objects.get(pk=export_file_part_id)
+    return export_products_part(
+        export_file_part, scope, export_info, file_type, delimiter
+    )
+
+
 @app.task(name="export-gift-cards", base=ExportTask)
 def export_gift_cards_task(
     export_file_id: int,
@@ -77,9 +156,46 @@ def export_gift_cards_task(
     delimiter: str = ",",
 ):
     export_file = ExportFile.objects.get(pk=export_file_id)
+    queryset = get_gift_cards_queryset(scope)
+    if parts := create_export_file_parts(export_file, queryset):
+        for part in parts:
+            export_gift_cards_part_task.delay(
+                export_file_id, part.pk, scope, file_type, delimiter
+            )
+        return False
+
     export_gift_cards(export_file, scope, file_type, delimiter)
 
 
+@app.task(name="export-gift-cards-part", base=ExportPartTask)
+def export_gift_cards_part_task(
+    export_file_id: int,
+    export_file_part_id: int,
+    scope: Dict[str, Union[str, dict]],
+    file_type: str,
+    delimiter: str = ",",
+):
+    export_file_part = ExportFilePart.objects.get(pk=export_file_part_id)
+    return export_gift_cards_part(export_file_part, scope, file_type, delimiter)
+
+
+@app.task(name="export-orders", base=ExportTask)
+def export_orders_task(
+    export_file_id: int,
+    scope: Dict[str, Union[str, dict]],
+    file_type: str,
+    delimiter: str = ",",
+):
+    export_file = ExportFile.objects.get(pk=export_file_id)
+    export_orders(export_file, scope, file_type, delimiter)
+
+
+@app.task(name="import-products", base=ImportTask)
+def import_products_task(import_file_id: int, file_type: str, delimiter: str = ","):
+    import_file = ImportFile.objects.get(pk=import_file_id)
+    import_products(import_file, file_type, delimiter)
+
+
 @app.task
 def delete_old_export_files():
     now = timezone.now()
@@ -90,11 +206,19 @@ def delete_old_export_files():
     export_files = ExportFile.objects.filter(
         Q(events__isnull=True) | Exists(events.filter(export_file_id=OuterRef("id")))
     )
-
-    if not export_files:
-        return
+    # uploaded import files are kept as long as the exported ones
+    import_files = ImportFile.objects.filter(
+        updated_at__lte=now - settings.EXPORT_FILES_TIMEDELTA
+    )
 
     paths_to_delete = list(export_files.values_list("content_file", flat=True))
+    # parts are left when the export failed
+    paths_to_delete += ExportFilePart.objects.filter(
+        export_file__in=export_files
+    ).values_list("content_file", flat=True)
+    paths_to_delete += import_files.values_list("content_file", flat=True)
+    if not paths_to_delete:
+        return
 
     counter = 0
     for path in paths_to_delete:
@@ -103,5 +227,6 @@ def delete_old_export_files():
             counter += 1
 
     export_files.delete()
+    import_files.delete()
 
-    task_logger.debug("Delete %s export files.", counter)
+    task_logger.debug("Delete %s export and import files.", counter)
@@ -1,12 +1,11 @@
 import datetime
+import gzip
 import json
 import shutil
-from tempfile import NamedTemporaryFile
 from unittest.mock import ANY, MagicMock, patch
 
 import graphene
 import openpyxl
-import petl as etl
 import pytest
 from django.core.files import File
 from freezegun import freeze_time
@@ -15,16 +14,22 @@ from ....core import JobStatus
 from ....giftcard.models import GiftCard
 from ....graphql.csv.enums import ProductFieldEnum
 from ....graphql.product.filters import ProductFilter
+from ....order import OrderStatus
 from ....product.models import Product, ProductChannelListing
 from ... import FileTypes
 from ...utils.export import (
-    append_to_file,
+    ExportFileWriter,
+    create_export_file_parts,
     create_file_with_headers,
     export_gift_cards,
     export_gift_cards_in_batches,
+    export_gift_cards_part,
+    export_orders,
     export_products,
     export_products_in_batches,
+    export_products_part,
     get_filename,
+    get_pk_ranges,
     get_queryset,
     parse_input,
     save_csv_file_in_export_file,
@@ -60,8 +65,9 @@ def test_export_products(
         "channels": [],
     }
 
-    mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock(spec=ExportFileWriter)
+    create_file_with_headers_mock.return_value = mock_writer
+    mock_file = mock_writer.close.return_value
 
     product_list[0].variants.update(sku=None)
 
@@ -81,9 +87,8 @@ def test_export_products(
         export_info,
         {"id", "name", "variants__id", "variants__sku"},
         ["id", "name", "variants__id", "variants__sku"],
-        ",",
-        mock_file,
-        file_type,
+        mock_writer,
+        user_export_file,
     )
     send_email_mock.assert_called_once_with(user_export_file, "products")
     save_file_mock.assert_called_once_with(user_export_file, mock_file, ANY)
@@ -109,8 +114,9 @@ def test_export_products_ids(
     assert user_export_file.status == JobStatus.PENDING
     assert not user_export_file.content_file
 
-    mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock(spec=ExportFileWriter)
+    create_file_with_headers_mock.return_value = mock_writer
+    mock_file = mock_writer.close.return_value
 
     # when
     export_products(user_export_file, {"ids": pks}, export_info, file_type)
@@ -128,9 +134,8 @@ def test_export_products_ids(
         export_info,
         {"id"},
         ["id"],
-        ",",
-        mock_file,
-        file_type,
+        mock_writer,
+        user_export_file,
     )
     send_email_mock.assert_called_once_with(user_export_file, "products")
     save_file_mock.assert_called_once_with(user_export_file, mock_file, ANY)
@@ -160,8 +165,9 @@ def test_export_products_filter_is_published(
     assert user_export_file.status == JobStatus.PENDING
     assert not user_export_file.content_file
 
-    mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock(spec=ExportFileWriter)
+    create_file_with_headers_mock.return_value = mock_writer
+    mock_file = mock_writer.close.return_value
 
     # when
     export_products(
@@ -185,9 +191,8 @@ def test_export_products_filter_is_published(
         export_info,
         {"id"},
         ["id"],
-        ",",
-        mock_file,
-        file_type,
+        mock_writer,
+        user_export_file,
     )
     send_email_mock.assert_called_once_with(user_export_file, "products")
     save_file_mock.assert_called_once_with(user_export_file, mock_file, ANY)
@@ -216,8 +221,9 @@ def test_export_products_filter_collections(
     assert user_export_file.status == JobStatus.PENDING
     assert not user_export_file.content_file
 
-    mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock(spec=ExportFileWriter)
+    create_file_with_headers_mock.return_value = mock_writer
+    mock_file = mock_writer.close.return_value
 
     # when
     export_products(
@@ -237,7 +243,13 @@ def test_export_products_filter_collections(
     assert export_products_in_batches_mock.call_count == 1
     batch_args, _ = export_products_in_batches_mock.call_args
     assert set(batch_args[0].values_list("pk", flat=True)) == {product_list[-1].pk}
-    assert batch_args[1:] == (export_info, {"id"}, ["id"], ",", mock_file, file_type)
+    assert batch_args[1:] == (
+        export_info,
+        {"id"},
+        ["id"],
+        mock_writer,
+        user_export_file,
+    )
     send_email_mock.assert_called_once_with(user_export_file, "products")
     save_file_mock.assert_called_once_with(user_export_file, mock_file, ANY)
 
@@ -263,8 +275,9 @@ def test_export_products_by_app(
     }
     file_type = FileTypes.CSV
 
-    mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock(spec=ExportFileWriter)
+    create_file_with_headers_mock.return_value = mock_writer
+    mock_file = mock_writer.close.return_value
 
     # when
     export_products(app_export_file, {"all": ""}, export_info, file_type)
@@ -283,9 +296,8 @@ def test_export_products_by_app(
         export_info,
         {"id", "name"},
         ["id", "name"],
-        ",",
-        mock_file,
-        file_type,
+        mock_writer,
+        app_export_file,
     )
 
     send_email_mock.assert_called_once_with(app_export_file, "products")
@@ -309,8 +321,9 @@ def test_export_gift_cards(
 ):
     file_type = FileTypes.CSV
 
-    mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock(spec=ExportFileWriter)
+    create_file_with_headers_mock.return_value = mock_writer
+    mock_file = mock_writer.close.return_value
 
     # when
     export_gift_cards(user_export_file, {"all": ""}, file_type)
@@ -325,9 +338,8 @@ def test_export_gift_cards(
     )
     assert args[1:] == (
         ["code"],
-        ",",
-        mock_file,
-        file_type,
+        mock_writer,
+        user_export_file,
     )
 
     send_email_mock.assert_called_once_with(user_export_file, "gift cards")
@@ -351,8 +363,9 @@ def test_export_gift_cards_by_app(
 ):
     file_type = FileTypes.CSV
 
-    mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock(spec=ExportFileWriter)
+    create_file_with_headers_mock.return_value = mock_writer
+    mock_file = mock_writer.close.return_value
 
     # when
     export_gift_cards(app_export_file, {"all": ""}, file_type)
@@ -367,9 +380,8 @@ def test_export_gift_cards_by_app(
     )
     assert args[1:] == (
         ["code"],
-        ",",
-        mock_file,
-        file_type,
+        mock_writer,
+        app_export_file,
     )
 
     send_email_mock.assert_called_once_with(app_export_file, "gift cards")
@@ -393,8 +405,9 @@ def test_export_gift_cards_ids(
 ):
     file_type = FileTypes.CSV
 
-    mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock(spec=ExportFileWriter)
+    create_file_with_headers_mock.return_value = mock_writer
+    mock_file = mock_writer.close.return_value
     pks = [gift_card.pk]
 
     # when
@@ -408,9 +421,8 @@ def test_export_gift_cards_ids(
     assert set(args[0].values_list("pk", flat=True)) == set(pks)
     assert args[1:] == (
         ["code"],
-        ",",
-        mock_file,
-        file_type,
+        mock_writer,
+        user_export_file,
     )
 
     send_email_mock.assert_called_once_with(user_export_file, "gift cards")
@@ -435,8 +447,9 @@ def test_export_gift_cards_with_filter(
 ):
     file_type = FileTypes.CSV
 
-    mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock(spec=ExportFileWriter)
+    create_file_with_headers_mock.return_value = mock_writer
+    mock_file = mock_writer.close.return_value
 
     gift_card_expiry_date.product = shippable_gift_card_product
     gift_card_used.product = shippable_gift_card_product
@@ -465,9 +478,8 @@ def test_export_gift_cards_with_filter(
     assert set(args[0].values_list("pk", flat=True)) == {gift_card_expiry_date.pk}
     assert args[1:] == (
         ["code"],
-        ",",
-        mock_file,
-        file_type,
+        mock_writer,
+        user_export_file,
     )
 
     send_email_mock.assert_called_once_with(user_export_file, "gift cards")
@@ -514,6 +526,11 @@ def get_product_queryset_filter(product_list):
     assert queryset.count() == len(product_list) - 1
 
 
+def read_xlsx_rows(file):
+    sheet_obj = openpyxl.load_workbook(file).active
+    return [list(row) for row in sheet_obj.values]
+
+
 def test_create_file_with_headers_csv(user_export_file, tmpdir, media_root):
     # given
     file_headers = ["id", "name", "collections"]
@@ -521,7 +538,8 @@ def test_create_file_with_headers_csv(user_export_file, tmpdir, media_root):
     assert not user_export_file.content_file
 
     # when
-    csv_file = create_file_with_headers(file_headers, ",", FileTypes.CSV)
+    writer = create_file_with_headers(file_headers, ",", FileTypes.CSV)
+    csv_file = writer.close()
 
     # then
     assert csv_file
@@ -540,18 +558,37 @@ def test_create_file_with_headers_xlsx(user_export_file, tmpdir, media_root):
     assert not user_export_file.content_file
 
     # when
-    xlsx_file = create_file_with_headers(file_headers, ",", FileTypes.XLSX)
+    writer = create_file_with_headers(file_headers, ",", FileTypes.XLSX)
+    xlsx_file = writer.close()
 
     # then
     assert xlsx_file
+    assert read_xlsx_rows(xlsx_file) == [file_headers]
 
-    wb_obj = openpyxl.load_workbook(xlsx_file)
+    shutil.rmtree(tmpdir)
 
-    sheet_obj = wb_obj.active
-    max_col = sheet_obj.max_column
-    headers = [sheet_obj.cell(row=1, column=i).value for i in range(1, max_col + 1)]
 
-    assert headers == file_headers
+@patch("saleor.csv.utils.export.BATCH_SIZE", 1)
+@patch("saleor.csv.utils.export.send_export_download_link_notification")
+def test_export_products_keeps_progress_message(
+    send_email_mock, product_list, user_export_file, tmpdir, media_root
+):
+    # given
+    export_info = {
+        "fields": [ProductFieldEnum.NAME.value],
+        "warehouses": [],
+        "attributes": [],
+        "channels": [],
+    }
+
+    # when
+    export_products(user_export_file, {"all": ""}, export_info, FileTypes.CSV)
+
+    # then
+    assert user_export_file.message == "Exported 3 of 3 products."
+    user_export_file.refresh_from_db()
+    assert user_export_file.content_file
+    assert user_export_file.message == "Exported 3 of 3 products."
 
     shutil.rmtree(tmpdir)
 
@@ -571,77 +608,54 @@ def test_save_csv_file_in_export_file(user_export_file, tmpdir, media_root):
     shutil.rmtree(tmpdir)
 
 
-def test_append_to_file_for_csv(user_export_file, tmpdir, media_root):
+def test_export_file_writer_write_rows_for_csv(tmpdir, media_root):
     # given
     export_data = [
         {"id": "123", "name": "test1", "collections": "coll1"},
         {"id": "345", "name": "test2"},
     ]
-    headers = ["id", "name", "collections"]
-    delimiter = ","
-
-    table = etl.fromdicts([{"id": "1", "name": "A"}], header=headers, missing=" ")
-
-    temp_file = NamedTemporaryFile()
-    etl.tocsv(table, temp_file.name, delimiter=delimiter)
+    file_headers = ["id", "name", "collections"]
+    writer = ExportFileWriter(file_headers, ";", FileTypes.CSV)
 
     # when
-    append_to_file(export_data, headers, temp_file, FileTypes.CSV, delimiter)
+    writer.write_rows(export_data[:1], file_headers)
+    writer.write_rows(export_data[1:], file_headers)
+    temp_file = writer.close()
 
     # then
-    user_export_file.refresh_from_db()
-
     file_content = temp_file.read().decode().split("\r\n")
-    assert ",".join(headers) in file_content
-    assert ",".join(export_data[0].values()) in file_content
-    assert (",".join(export_data[1].values()) + ", ") in file_content
+    assert file_content == [
+        "id;name;collections",
+        "123;test1;coll1",
+        "345;test2; ",
+        "",
+    ]
 
     temp_file.close()
     shutil.rmtree(tmpdir)
 
 
-def test_append_to_file_for_xlsx(user_export_file, tmpdir, media_root):
+def test_export_file_writer_write_rows_for_xlsx(tmpdir, media_root):
     # given
     export_data = [
         {"id": "123", "name": "test1", "collections": "coll1"},
         {"id": "345", "name": "test2"},
     ]
-    expected_headers = ["id", "name", "collections"]
-    delimiter = ","
-
-    table = etl.fromdicts(
-        [{"id": "1", "name": "A"}], header=expected_headers, missing=" "
-    )
-
-    temp_file = NamedTemporaryFile(suffix=".xlsx")
-    etl.io.xlsx.toxlsx(table, temp_file.name)
+    file_headers = ["id", "name", "collections"]
+    writer = ExportFileWriter(file_headers, ",", FileTypes.XLSX)
 
     # when
-    append_to_file(export_data, expected_headers, temp_file, FileTypes.XLSX, delimiter)
+    writer.write_rows(export_data[:1], file_headers)
+    writer.write_rows(export_data[1:], file_headers)
+    temp_file = writer.close()
 
     # then
-    user_export_file.refresh_from_db()
-
-    wb_obj = openpyxl.load_workbook(temp_file)
-
-    sheet_obj = wb_obj.active
-    max_col = sheet_obj.max_column
-    max_row = sheet_obj.max_row
-    expected_headers = expected_headers
-    headers = [sheet_obj.cell(row=1, column=i).value for i in range(1, max_col + 1)]
-    data = []
-    for i in range(2, max_row + 1):
-        row = []
-        for j in range(1, max_col + 1):
-            row.append(sheet_obj.cell(row=i, column=j).value)
-        data.append(row)
-
-    assert headers == expected_headers
-    assert list(export_data[0].values()) in data
-    row2 = list(export_data[1].values())
-    # add string with space for collections column
-    row2.append(" ")
-    assert row2 in data
+    assert read_xlsx_rows(temp_file) == [
+        file_headers,
+        ["123", "test1", "coll1"],
+        # missing values are written as a space
+        ["345", "test2", " "],
+    ]
 
     temp_file.close()
     shutil.rmtree(tmpdir)
@@ -669,10 +683,7 @@ def test_export_products_in_batches_for_csv(
     export_fields = ["id", "name", "variants__sku"]
     expected_headers = ["id", "name", "variant sku"]
 
-    table = etl.wrap([expected_headers])
-
-    temp_file = NamedTemporaryFile()
-    etl.tocsv(table, temp_file.name, delimiter=",")
+    writer = ExportFileWriter(expected_headers, ",", FileTypes.CSV)
 
     # when
     export_products_in_batches(
@@ -680,13 +691,11 @@ def test_export_products_in_batches_for_csv(
         export_info,
         set(export_fields),
         export_fields,
-        ",",
-        temp_file,
-        FileTypes.CSV,
+        writer,
+        user_export_file,
     )
 
     # then
-
     expected_data = []
     for product in qs.order_by("pk"):
         product_data = []
@@ -698,6 +707,7 @@ def test_export_products_in_batches_for_csv(
             product_data.append(str(variant.sku))
             expected_data.append(product_data)
 
+    temp_file = writer.close()
     file_content = temp_file.read().decode().split("\r\n")
 
     # ensure headers are in file
@@ -706,6 +716,11 @@ def test_export_products_in_batches_for_csv(
     for row in expected_data:
         assert ",".join(row) in file_content
 
+    user_export_file.refresh_from_db()
+    assert user_export_file.message == (
+        f"Exported {len(product_list)} of {len(product_list)} products."
+    )
+
     shutil.rmtree(tmpdir)
 
 
@@ -739,10 +754,7 @@ def test_export_products_in_batches_for_xlsx(
     export_fields = ["id", "name", "description_as_str", "variants__sku"]
     expected_headers = ["id", "name", "description", "variant sku"]
 
-    table = etl.wrap([expected_headers])
-
-    temp_file = NamedTemporaryFile(suffix=".xlsx")
-    etl.io.xlsx.toxlsx(table, temp_file.name)
+    writer = ExportFileWriter(expected_headers, ",", FileTypes.XLSX)
 
     # when
     export_products_in_batches(
@@ -750,9 +762,7 @@ def test_export_products_in_batches_for_xlsx(
         export_info,
         set(export_fields),
         export_fields,
-        ",",
-        temp_file,
-        FileTypes.XLSX,
+        writer,
     )
 
     # then
@@ -768,18 +778,7 @@ def test_export_products_in_batches_for_xlsx(
             product_data.append(variant.sku)
             expected_data.append(product_data)
 
-    wb_obj = openpyxl.load_workbook(temp_file)
-
-    sheet_obj = wb_obj.active
-    max_col = sheet_obj.max_column
-    max_row = sheet_obj.max_row
-    headers = [sheet_obj.cell(row=1, column=i).value for i in range(1, max_col + 1)]
-    data = []
-    for i in range(2, max_row + 1):
-        row = []
-        for j in range(1, max_col + 1):
-            row.append(sheet_obj.cell(row=i, column=j).value)
-        data.append(row)
+    headers, *data = read_xlsx_rows(writer.close())
 
     assert headers == expected_headers
     for row in expected_data:
@@ -793,26 +792,18 @@ def test_export_gift_cards_in_batches_to_csv(
     gift_card,
     gift_card_expiry_date,
     gift_card_used,
+    user_export_file,
     tmpdir,
 ):
     # given
     gift_cards = GiftCard.objects.exclude(id=gift_card_used.id).order_by("pk")
-
-    table = etl.wrap([["code"]])
-    temp_file = NamedTemporaryFile()
-    etl.tocsv(table, temp_file.name, delimiter=",")
+    writer = ExportFileWriter(["code"], ",", FileTypes.CSV)
 
     # when
-    export_gift_cards_in_batches(
-        gift_cards,
-        ["code"],
-        ",",
-        temp_file,
-        "csv",
-    )
+    export_gift_cards_in_batches(gift_cards, ["code"], writer, user_export_file)
 
     # then
-    file_content = temp_file.read().decode().split("\r\n")
+    file_content = writer.close().read().decode().split("\r\n")
 
     # ensure headers are in the file
     assert "code" in file_content
@@ -820,6 +811,9 @@ def test_export_gift_cards_in_batches_to_csv(
     for card in gift_cards:
         assert card.code in file_content
 
+    user_export_file.refresh_from_db()
+    assert user_export_file.message == "Exported 2 of 2 gift cards."
+
     shutil.rmtree(tmpdir)
 
 
@@ -832,33 +826,13 @@ def test_export_gift_cards_in_batches_to_xlsx(
 ):
     # given
     gift_cards = GiftCard.objects.exclude(id=gift_card_used.id).order_by("pk")
-
-    table = etl.wrap([["code"]])
-    temp_file = NamedTemporaryFile(suffix=".xlsx")
-    etl.io.xlsx.toxlsx(table, temp_file.name)
+    writer = ExportFileWriter(["code"], ",", FileTypes.XLSX)
 
     # when
-    export_gift_cards_in_batches(
-        gift_cards,
-        ["code"],
-        ",",
-        temp_file,
-        "xlsx",
-    )
+    export_gift_cards_in_batches(gift_cards, ["code"], writer)
 
     # then
-    wb_obj = openpyxl.load_workbook(temp_file)
-
-    sheet_obj = wb_obj.active
-    max_col = sheet_obj.max_column
-    max_row = sheet_obj.max_row
-    headers = [sheet_obj.cell(row=1, column=i).value for i in range(1, max_col + 1)]
-    data = []
-    for i in range(2, max_row + 1):
-        row = []
-        for j in range(1, max_col + 1):
-            row.append(sheet_obj.cell(row=i, column=j).value)
-        data.append(row)
+    headers, *data = read_xlsx_rows(writer.close())
 
     assert headers == ["code"]
     for card in gift_cards:
@@ -867,6 +841,145 @@ def test_export_gift_cards_in_batches_to_xlsx(
     shutil.rmtree(tmpdir)
 
 
+def test_export_file_writer_write_rows_for_csv_gz(tmpdir, media_root):
+    # given
+    file_headers = ["id", "name"]
+    writer = ExportFileWriter(file_headers, ",", FileTypes.CSV_GZ)
+
+    # when
+    writer.write_rows([{"id": "123", "name": "test1"}], file_headers)
+    temp_file = writer.close()
+
+    # then
+    assert gzip.decompress(temp_file.read()) == b"id,name\r\n123,test1\r\n"
+
+    temp_file.close()
+    shutil.rmtree(tmpdir)
+
+
+@patch("saleor.csv.utils.export.BATCH_SIZE", 1)
+@patch("saleor.csv.utils.export.send_export_download_link_notification")
+def test_export_orders(
+    send_email_mock, order_list, user_export_file, tmpdir, media_root
+):
+    # given
+    draft_order = order_list[-1]
+    draft_order.status = OrderStatus.DRAFT
+    draft_order.save(update_fields=["status"])
+    orders = order_list[:-1]
+
+    # when
+    export_orders(user_export_file, {"all": ""}, FileTypes.CSV_GZ)
+
+    # then
+    send_email_mock.assert_called_once_with(user_export_file, "orders")
+    user_export_file.refresh_from_db()
+    assert user_export_file.content_file.name.endswith(".csv.gz")
+    assert user_export_file.message == "Exported 2 of 2 orders."
+
+    file_content = gzip.decompress(user_export_file.content_file.read())
+    headers, *rows = file_content.decode().splitlines()
+    assert headers.startswith("id,number,created,status,")
+    assert [row.split(",")[:2] for row in rows] == [
+        [graphene.Node.to_global_id("Order", order.pk), str(order.number)]
+        for order in sorted(orders, key=lambda order: order.number)
+    ]
+
+    shutil.rmtree(tmpdir)
+
+
+def test_get_pk_ranges(product_list):
+    # given
+    pks = sorted(product.pk for product in product_list)
+
+    # when
+    pk_ranges = get_pk_ranges(Product.objects.all(), 2)
+
+    # then
+    assert pk_ranges == [(0, pks[1]), (pks[1], pks[2])]
+
+
+def test_create_export_file_parts_fits_into_single_part(
+    product_list, user_export_file, settings
+):
+    # given
+    settings.EXPORT_FILE_PART_SIZE = len(product_list)
+
+    # when
+    parts = create_export_file_parts(user_export_file, Product.objects.all())
+
+    # then
+    assert parts == []
+    assert not user_export_file.parts.exists()
+
+
+@patch("saleor.csv.utils.export.send_export_download_link_notification")
+def test_export_products_part(
+    send_email_mock, product_list, user_export_file, settings, tmpdir, media_root
+):
+    # given
+    settings.EXPORT_FILE_PART_SIZE = 2
+    scope = {"all": ""}
+    export_info = {
+        "fields": [ProductFieldEnum.NAME.value],
+        "warehouses": [],
+        "attributes": [],
+        "channels": [],
+    }
+    first_part, last_part = create_export_file_parts(
+        user_export_file, Product.objects.all()
+    )
+
+    # when
+    first_completed = export_products_part(last_part, scope, export_info, FileTypes.CSV)
+    last_completed = export_products_part(first_part, scope, export_info, FileTypes.CSV)
+
+    # then
+    assert first_completed is False
+    assert last_completed is True
+    send_email_mock.assert_called_once_with(user_export_file, "products")
+
+    user_export_file.refresh_from_db()
+    assert not user_export_file.parts.exists()
+    file_content = user_export_file.content_file.read().decode().split("\r\n")
+    assert file_content == ["id,name"] + [
+        f"{graphene.Node.to_global_id('Product', product.pk)},{product.name}"
+        for product in Product.objects.order_by("pk")
+    ] + [""]
+
+    shutil.rmtree(tmpdir)
+
+
+@patch("saleor.csv.utils.export.send_export_download_link_notification")
+def test_export_gift_cards_part_to_xlsx(
+    send_email_mock,
+    gift_card,
+    gift_card_expiry_date,
+    user_export_file,
+    settings,
+    tmpdir,
+    media_root,
+):
+    # given
+    settings.EXPORT_FILE_PART_SIZE = 1
+    parts = create_export_file_parts(user_export_file, GiftCard.objects.all())
+
+    # when
+    for part in parts:
+        export_gift_cards_part(part, {"all": ""}, FileTypes.XLSX)
+
+    # then
+    send_email_mock.assert_called_once_with(user_export_file, "gift cards")
+    user_export_file.refresh_from_db()
+    assert read_xlsx_rows(user_export_file.content_file) == [
+        ["code"],
+        [gift_card.code],
+        [gift_card_expiry_date.code],
+    ]
+
+    shutil.rmtree(tmpdir)
+
+
 def test_parse_input():
     data = {
         "collections": None,
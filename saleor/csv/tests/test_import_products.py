@@ -0,0 +1,209 @@
+import csv
+import io
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from django.core.files.base import ContentFile
+
+from ...attribute.models import AttributeValue
+from ...product.models import Product, ProductVariant
+from .. import FileTypes, ImportEvents
+from ..models import ImportFile
+from ..utils.import_products import import_products
+
+
+def create_import_file(user, rows):
+    content = io.StringIO()
+    csv.writer(content).writerows(rows)
+    return ImportFile.objects.create(
+        user=user,
+        content_file=ContentFile(content.getvalue().encode(), name="products.csv"),
+    )
+
+
+@patch("saleor.csv.utils.import_products.update_products_discounted_prices_task")
+def test_import_products(
+    update_discounted_prices_task_mock,
+    staff_user,
+    product_type,
+    category,
+    channel_USD,
+    warehouse,
+    django_capture_on_commit_callbacks,
+    media_root,
+):
+    # given
+    import_file = create_import_file(
+        staff_user,
+        [
+            [
+                "id",
+                "name",
+                "product type",
+                "category",
+                "variant sku",
+                "color (product attribute)",
+                "size (variant attribute)",
+                f"{warehouse.slug} (warehouse quantity)",
+                f"{channel_USD.slug} (channel published)",
+                f"{channel_USD.slug} (channel price amount)",
+            ],
+            ["1", "Shirt", product_type.name, category.slug, "S-1", "Red", "Small"]
+            + ["10", "True", "12.50"],
+            ["1", "Shirt", product_type.name, category.slug, "S-2", "Red", "Large"]
+            + ["5", "True", "15"],
+            ["2", "Hat", product_type.name, "", "H-1", "Green", ""] + ["", "", ""],
+        ],
+    )
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        import_products(import_file, FileTypes.CSV)
+
+    # then
+    shirt = Product.objects.get(name="Shirt")
+    assert shirt.product_type == product_type
+    assert shirt.category == category
+    assert shirt.search_index_dirty
+    assert shirt.default_variant.sku == "S-1"
+    assert list(shirt.variants.values_list("sku", flat=True)) == ["S-1", "S-2"]
+    assert [
+        value.name
+        for attribute in shirt.attributes.all()
+        for value in attribute.values.all()
+    ] == ["Red"]
+    assert shirt.attribute_sort_keys.get().value_names == "Red"
+
+    listing = shirt.channel_listings.get()
+    assert listing.channel == channel_USD
+    assert listing.is_published
+    assert listing.published_at
+
+    variant = ProductVariant.objects.get(sku="S-2")
+    assert variant.channel_listings.get().price_amount == Decimal("15")
+    assert variant.stocks.get(warehouse=warehouse).quantity == 5
+    assert [
+        value.name
+        for attribute in variant.attributes.all()
+        for value in attribute.values.all()
+    ] == ["Large"]
+
+    hat = Product.objects.get(name="Hat")
+    assert hat.category is None
+    assert not hat.channel_listings.exists()
+    assert AttributeValue.objects.filter(slug="green").count() == 1
+
+    update_discounted_prices_task_mock.delay.assert_called_once_with([shirt.pk, hat.pk])
+    import_file.refresh_from_db()
+    assert import_file.message == "Imported 2 products with 3 variants."
+    assert not import_file.events.exists()
+
+
+def test_import_products_rejects_invalid_products(
+    staff_user, product_type, product_variant_list, media_root
+):
+    # given
+    existing_sku = product_variant_list[0].sku
+    import_file = create_import_file(
+        staff_user,
+        [
+            ["id", "name", "product type", "variant sku"],
+            ["1", "Shirt", product_type.name, "S-1"],
+            ["2", "Hat", "Not existing type", "H-1"],
+            ["3", "Cap", product_type.name, "C-1"],
+            ["3", "Cap", product_type.name, existing_sku],
+        ],
+    )
+
+    # when
+    import_products(import_file, FileTypes.CSV)
+
+    # then
+    assert Product.objects.filter(name="Shirt").exists()
+    assert not Product.objects.filter(name__in=["Hat", "Cap"]).exists()
+    assert not ProductVariant.objects.filter(sku="C-1").exists()
+
+    event = import_file.events.get()
+    assert event.type == ImportEvents.IMPORT_ROWS_REJECTED
+    assert event.parameters["errors"] == [
+        'Row 3: Product type "Not existing type" does not exist.',
+        f'Row 5: Variant with SKU "{existing_sku}" already exists.',
+    ]
+    import_file.refresh_from_db()
+    assert import_file.message == "Imported 1 products with 1 variants."
+
+
+def test_import_products_rejects_not_finite_numbers(
+    staff_user, product_type, warehouse, media_root
+):
+    # given
+    import_file = create_import_file(
+        staff_user,
+        [
+            [
+                "name",
+                "product type",
+                "variant sku",
+                f"{warehouse.slug} (warehouse quantity)",
+            ],
+            ["Shirt", product_type.name, "S-1", "inf"],
+            ["Hat", product_type.name, "H-1", "NaN"],
+        ],
+    )
+
+    # when
+    import_products(import_file, FileTypes.CSV)
+
+    # then
+    assert not Product.objects.filter(name__in=["Shirt", "Hat"]).exists()
+    event = import_file.events.get()
+    assert event.parameters["errors"] == [
+        'Row 2: Invalid number "inf".',
+        'Row 3: Invalid number "NaN".',
+    ]
+
+
+def test_import_products_not_existing_column_object(
+    staff_user, product_type, media_root
+):
+    # given
+    import_file = create_import_file(
+        staff_user,
+        [
+            ["name", "product type", "missing (warehouse quantity)"],
+            ["Shirt", product_type.name, "10"],
+        ],
+    )
+
+    # when
+    with pytest.raises(ValueError) as e:
+        import_products(import_file, FileTypes.CSV)
+
+    # then
+    assert str(e.value) == (
+        'Column "missing (warehouse quantity)": warehouse "missing" does not exist.'
+    )
+    assert not Product.objects.filter(name="Shirt").exists()
+
+
+def test_import_products_number_of_queries_does_not_depend_on_rows(
+    staff_user, product_type, django_assert_max_num_queries, media_root
+):
+    # given
+    headers = ["name", "product type", "variant sku", "size (variant attribute)"]
+    import_file = create_import_file(
+        staff_user,
+        [headers]
+        + [
+            [f"Product {i}", product_type.name, f"SKU-{i}", f"Size {i}"]
+            for i in range(50)
+        ],
+    )
+
+    # when
+    with django_assert_max_num_queries(25):
+        import_products(import_file, FileTypes.CSV)
+
+    # then
+    assert Product.objects.filter(name__startswith="Product ").count() == 50
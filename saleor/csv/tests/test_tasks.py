@@ -8,14 +8,18 @@ from django.utils import timezone
 from freezegun import freeze_time
 
 from ...core import JobStatus
-from .. import ExportEvents, FileTypes
-from ..models import ExportEvent, ExportFile
+from ...product.models import Product
+from .. import ExportEvents, FileTypes, ImportEvents
+from ..models import ExportEvent, ExportFile, ImportFile
 from ..tasks import (
     ExportTask,
     delete_old_export_files,
     export_gift_cards_task,
+    export_products_part_task,
     export_products_task,
+    import_products_task,
 )
+from ..utils.export import create_export_file_parts
 
 
 @patch("saleor.csv.tasks.export_products")
@@ -58,6 +62,98 @@ def test_export_products_task_failed(
     send_export_failed_info_mock.assert_called_once_with(user_export_file, "products")
 
 
+@patch("saleor.csv.tasks.export_products_part_task.delay")
+@patch("saleor.csv.tasks.export_products")
+def test_export_products_task_split_into_parts(
+    export_products_mock,
+    export_products_part_task_mock,
+    product_list,
+    user_export_file,
+    settings,
+):
+    # given
+    settings.EXPORT_FILE_PART_SIZE = 2
+    scope = {"all": ""}
+    export_info = {"fields": "name"}
+    file_type = FileTypes.CSV
+
+    # when
+    export_products_task.delay(user_export_file.id, scope, export_info, file_type)
+
+    # then
+    export_products_mock.assert_not_called()
+    parts = list(user_export_file.parts.all())
+    assert len(parts) == 2
+    for part in parts:
+        export_products_part_task_mock.assert_any_call(
+            user_export_file.id, part.pk, scope, export_info, file_type, ","
+        )
+    user_export_file.refresh_from_db()
+    assert user_export_file.status == JobStatus.PENDING
+    assert not user_export_file.events.exists()
+
+
+@patch("saleor.csv.tasks.send_export_failed_info")
+@patch("saleor.csv.tasks.export_products_part")
+def test_export_products_part_task_failed_reported_once(
+    export_products_part_mock,
+    send_export_failed_info_mock,
+    product_list,
+    user_export_file,
+    settings,
+):
+    # given
+    settings.EXPORT_FILE_PART_SIZE = 2
+    export_products_part_mock.side_effect = Exception("Test error")
+    parts = create_export_file_parts(user_export_file, Product.objects.all())
+
+    # when
+    for part in parts:
+        export_products_part_task.delay(
+            user_export_file.id, part.pk, {"all": ""}, {}, FileTypes.CSV
+        )
+
+    # then
+    send_export_failed_info_mock.assert_called_once_with(user_export_file, "products")
+    user_export_file.refresh_from_db()
+    assert user_export_file.status == JobStatus.FAILED
+    assert user_export_file.events.get().type == ExportEvents.EXPORT_FAILED
+
+
+@patch("saleor.csv.tasks.import_products")
+def test_import_products_task(import_products_mock, staff_user):
+    # given
+    import_file = ImportFile.objects.create(user=staff_user)
+
+    # when
+    import_products_task.delay(import_file.id, FileTypes.CSV)
+
+    # then
+    import_products_mock.assert_called_once_with(import_file, FileTypes.CSV, ",")
+    import_file.refresh_from_db()
+    assert import_file.status == JobStatus.SUCCESS
+    assert import_file.events.get().type == ImportEvents.IMPORT_SUCCESS
+
+
+@patch("saleor.csv.tasks.import_products")
+def test_import_products_task_failed(import_products_mock, staff_user):
+    # given
+    import_file = ImportFile.objects.create(user=staff_user)
+    exc_message = "Test error"
+    import_products_mock.side_effect = ValueError(exc_message)
+
+    # when
+    import_products_task.delay(import_file.id, FileTypes.CSV)
+
+    # then
+    import_file.refresh_from_db()
+    assert import_file.status == JobStatus.FAILED
+    event = import_file.events.get()
+    assert event.type == ImportEvents.IMPORT_FAILED
+    assert event.user == staff_user
+    assert event.parameters["message"] == exc_message
+
+
 @patch("saleor.csv.tasks.export_gift_cards")
 def test_export_gift_cards_task(export_gift_cards_mock, user_export_file):
     # given
@@ -304,3 +400,36 @@ def test_delete_old_export_files(default_storage_delete_mock, staff_user):
             id__in=[export_file.id for export_file in not_expired_export_files]
         )
     ) == len(not_expired_export_files)
+
+
+@override_settings(EXPORT_FILES_TIMEDELTA=datetime.timedelta(days=5))
+@patch("django.core.files.storage.default_storage.exists", lambda x: True)
+@patch("django.core.files.storage.default_storage.delete")
+def test_delete_old_export_files_deletes_old_import_files(
+    default_storage_delete_mock, staff_user
+):
+    # given
+    expired_file_mock = MagicMock(spec=File)
+    expired_file_mock.name = "expired_import.csv"
+    not_expired_file_mock = MagicMock(spec=File)
+    not_expired_file_mock.name = "not_expired_import.csv"
+
+    expired_import_file, not_expired_import_file = ImportFile.objects.bulk_create(
+        [ImportFile(user=staff_user), ImportFile(user=staff_user)]
+    )
+    expired_import_file.content_file = expired_file_mock
+    not_expired_import_file.content_file = not_expired_file_mock
+    ImportFile.objects.bulk_update(
+        [expired_import_file, not_expired_import_file], ["content_file"]
+    )
+    ImportFile.objects.filter(pk=expired_import_file.pk).update(
+        updated_at=timezone.now() - datetime.timedelta(days=6)
+    )
+
+    # when
+    delete_old_export_files()
+
+    # then
+    default_storage_delete_mock.assert_called_once_with(expired_file_mock.name)
+    assert not ImportFile.objects.filter(pk=expired_import_file.pk).exists()
+    assert ImportFile.objects.filter(pk=not_expired_import_file.pk).exists()
@@ -88,3 +88,23 @@ class ProductExportFields:
             "variants__channel_listings__preorder_quantity_threshold"
         ),
     }
+
+
+class OrderExportFields:
+    """Data structure with fields for order export."""
+
+    HEADERS_TO_FIELDS_MAPPING = {
+        "id": "id",
+        "number": "number",
+        "created": "created_at",
+        "status": "status",
+        "charge status": "charge_status",
+        "channel": "channel__slug",
+        "customer email": "user_email",
+        "currency": "currency",
+        "shipping method": "shipping_method_name",
+        "shipping net": "shipping_price_net_amount",
+        "shipping gross": "shipping_price_gross_amount",
+        "total net": "total_net_amount",
+        "total gross": "total_gross_amount",
+    }
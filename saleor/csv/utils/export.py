@@ -1,26 +1,48 @@
+import csv
+import gzip
+import io
+import shutil
 import uuid
 from datetime import date, datetime
 from tempfile import NamedTemporaryFile
-from typing import IO, TYPE_CHECKING, Any, Dict, List, Set, Union
-
-import petl as etl
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+import graphene
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
 from django.utils import timezone
+from openpyxl import Workbook, load_workbook
 
 from ...giftcard.models import GiftCard
+from ...order.models import Order
 from ...product.models import Product
 from .. import FileTypes
+from ..models import ExportFile, ExportFilePart
 from ..notifications import send_export_download_link_notification
+from . import OrderExportFields
 from .product_headers import get_product_export_fields_and_headers_info
 from .products_data import get_products_data
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet
 
-    from ..models import ExportFile
-
 
 BATCH_SIZE = 10000
 
+FILE_EXTENSIONS = {FileTypes.CSV_GZ: "csv.gz"}
+
 
 def export_products(
     export_file: "ExportFile",
@@ -29,10 +51,8 @@ def export_products(
     file_type: str,
     delimiter: str = ",",
 ):
-    from ...graphql.product.filters import ProductFilter
-
     file_name = get_filename("product", file_type)
-    queryset = get_queryset(Product, ProductFilter, scope)
+    queryset = get_products_queryset(scope)
 
     (
         export_fields,
@@ -40,18 +60,18 @@ def export_products(
         data_headers,
     ) = get_product_export_fields_and_headers_info(export_info)
 
-    temporary_file = create_file_with_headers(file_headers, delimiter, file_type)
+    writer = create_file_with_headers(file_headers, delimiter, file_type)
 
     export_products_in_batches(
         queryset,
         export_info,
         set(export_fields),
         data_headers,
-        delimiter,
-        temporary_file,
-        file_type,
+        writer,
+        export_file,
     )
 
+    temporary_file = writer.close()
     save_csv_file_in_export_file(export_file, temporary_file, file_name)
     temporary_file.close()
 
@@ -64,38 +84,124 @@ def export_gift_cards(
     file_type: str,
     delimiter: str = ",",
 ):
-    from ...graphql.giftcard.filters import GiftCardFilter
-
     file_name = get_filename("gift_card", file_type)
-
-    queryset = get_queryset(GiftCard, GiftCardFilter, scope)
-    # only unused gift cards codes can be exported
-    queryset = queryset.filter(used_by_email__isnull=True)
+    queryset = get_gift_cards_queryset(scope)
 
     export_fields = ["code"]
-    temporary_file = create_file_with_headers(export_fields, delimiter, file_type)
+    writer = create_file_with_headers(export_fields, delimiter, file_type)
 
-    export_gift_cards_in_batches(
-        queryset,
-        export_fields,
-        delimiter,
-        temporary_file,
-        file_type,
-    )
+    export_gift_cards_in_batches(queryset, export_fields, writer, export_file)
 
+    temporary_file = writer.close()
     save_csv_file_in_export_file(export_file, temporary_file, file_name)
     temporary_file.close()
 
     send_export_download_link_notification(export_file, "gift cards")
 
 
+def export_orders(
+    export_file: "ExportFile",
+    scope: Dict[str, Union[str, dict]],
+    file_type: str,
+    delimiter: str = ",",
+):
+    file_name = get_filename("order", file_type)
+    queryset = get_orders_queryset(scope)
+
+    file_headers = list(OrderExportFields.HEADERS_TO_FIELDS_MAPPING.keys())
+    writer = create_file_with_headers(file_headers, delimiter, file_type)
+
+    export_orders_in_batches(queryset, writer, export_file)
+
+    temporary_file = writer.close()
+    save_csv_file_in_export_file(export_file, temporary_file, file_name)
+    temporary_file.close()
+
+    send_export_download_link_notification(export_file, "orders")
+
+
+def export_products_part(
+    export_file_part: "ExportFilePart",
+    scope: Dict[str, Union[str, dict]],
+    export_info: Dict[str, list],
+    file_type: str,
+    delimiter: str = ",",
+) -> bool:
+    """Export products of a single export file part.
+
+    The part which is completed as the last one merges all parts into the export
+    file. Return whether the export file is completed.
+    """
+    queryset = get_products_queryset(scope).filter(
+        pk__gt=export_file_part.after_pk, pk__lte=export_file_part.last_pk
+    )
+
+    (
+        export_fields,
+        file_headers,
+        data_headers,
+    ) = get_product_export_fields_and_headers_info(export_info)
+
+    writer = ExportFileWriter(None, delimiter, file_type)
+    export_products_in_batches(
+        queryset, export_info, set(export_fields), data_headers, writer
+    )
+    save_export_file_part(export_file_part, writer, file_type)
+
+    if not complete_export_file_part(export_file_part):
+        return False
+
+    export_file = export_file_part.export_file
+    file_name = get_filename("product", file_type)
+    merge_export_file_parts(export_file, file_headers, file_name, delimiter, file_type)
+    send_export_download_link_notification(export_file, "products")
+    return True
+
+
+def export_gift_cards_part(
+    export_file_part: "ExportFilePart",
+    scope: Dict[str, Union[str, dict]],
+    file_type: str,
+    delimiter: str = ",",
+) -> bool:
+    """Export gift cards of a single export file part.
+
+    The part which is completed as the last one merges all parts into the export
+    file. Return whether the export file is completed.
+    """
+    queryset = get_gift_cards_queryset(scope).filter(
+        pk__gt=export_file_part.after_pk, pk__lte=export_file_part.last_pk
+    )
+
+    export_fields = ["code"]
+    writer = ExportFileWriter(None, delimiter, file_type)
+    export_gift_cards_in_batches(queryset, export_fields, writer)
+    save_export_file_part(export_file_part, writer, file_type)
+
+    if not complete_export_file_part(export_file_part):
+        return False
+
+    export_file = export_file_part.export_file
+    file_name = get_filename("gift_card", file_type)
+    merge_export_file_parts(export_file, export_fields, file_name, delimiter, file_type)
+    send_export_download_link_notification(export_file, "gift cards")
+    return True
+
+
 def get_filename(model_name: str, file_type: str) -> str:
     hash = uuid.uuid4()
     return "{}_data_{}_{}.{}".format(
-        model_name, timezone.now().strftime("%d_%m_%Y_%H_%M_%S"), hash, file_type
+        model_name,
+        timezone.now().strftime("%d_%m_%Y_%H_%M_%S"),
+        hash,
+        get_file_extension(file_type),
     )
 
 
+def get_file_extension(file_type: str) -> str:
+    return FILE_EXTENSIONS.get(file_type, file_type)
+
+
 def get_queryset(model, filter, scope: Dict[str, Union[str, dict]]) -> "QuerySet":
     queryset = model.objects.all()
     if "ids" in scope:
@@ -108,6 +214,28 @@ def get_queryset(model, filter, scope: Dict[str, Union[str, dict]]) -> "QuerySet
     return queryset
 
 
+def get_products_queryset(scope: Dict[str, Union[str, dict]]) -> "QuerySet":
+    from ...graphql.product.filters import ProductFilter
+
+    return get_queryset(Product, ProductFilter, scope)
+
+
+def get_gift_cards_queryset(scope: Dict[str, Union[str, dict]]) -> "QuerySet":
+    from ...graphql.giftcard.filters import GiftCardFilter
+
+    queryset = get_queryset(GiftCard, GiftCardFilter, scope)
+    # only unused gift cards codes can be exported
+    return queryset.filter(used_by_email__isnull=True)
+
+
+def get_orders_queryset(scope: Dict[str, Union[str, dict]]) -> "QuerySet":
+    from ...graphql.order.filters import OrderFilter
+
+    queryset = get_queryset(Order, OrderFilter, scope)
+    # draft orders are not exported
+    return queryset.non_draft()
+
+
 def parse_input(data: Any) -> Dict[str, Union[str, dict]]:
     """Parse input into correct data types.
 
@@ -137,17 +265,91 @@ def parse_input(data: Any) -> Dict[str, Union[str, dict]]:
     return data
 
 
-def create_file_with_headers(file_headers: List[str], delimiter: str, file_type: str):
-    table = etl.wrap([file_headers])
+class ExportFileWriter:
+    """Write the exported rows to a temporary CSV or XLSX file as they come.
 
-    if file_type == FileTypes.CSV:
-        temp_file = NamedTemporaryFile("ab+", suffix=".csv")
-        etl.tocsv(table, temp_file.name, delimiter=delimiter)
-    else:
-        temp_file = NamedTemporaryFile("ab+", suffix=".xlsx")
-        etl.io.xlsx.toxlsx(table, temp_file.name)
+    CSV rows are written with the `csv` module, optionally compressed with gzip, and
+    XLSX rows with a write-only `openpyxl` workbook, so the file is never read back
+    and the memory usage does not depend on the number of exported rows.
+    """
 
-    return temp_file
+    def __init__(
+        self, file_headers: Optional[List[str]], delimiter: str, file_type: str
+    ):
+        self.file_type = file_type
+        self.delimiter = delimiter
+        self.temporary_file = NamedTemporaryFile(
+            "wb+", suffix=f".{get_file_extension(file_type)}"
+        )
+
+        if file_type == FileTypes.XLSX:
+            self._workbook = Workbook(write_only=True)
+            self._sheet = self._workbook.create_sheet()
+        else:
+            self._open_csv_writer()
+
+        if file_headers is not None:
+            self.write_row(file_headers)
+
+    def _open_csv_writer(self):
+        file: IO[bytes] = self.temporary_file
+        if self.file_type == FileTypes.CSV_GZ:
+            self._gzip_file = file = gzip.GzipFile(fileobj=file, mode="wb")
+        self._text_file = io.TextIOWrapper(
+            file, encoding="utf-8", newline="", write_through=True
+        )
+        self._csv_writer = csv.writer(self._text_file, delimiter=self.delimiter)
+
+    def _close_csv_writer(self):
+        # detach the wrapper, so it doesn't close the temporary file
+        self._text_file.detach()
+        if self.file_type == FileTypes.CSV_GZ:
+            # writes the gzip trailer, the underlying temporary file stays open
+            self._gzip_file.close()
+
+    def write_row(self, values: Iterable[Any]):
+        if self.file_type == FileTypes.XLSX:
+            self._sheet.append(values)
+        else:
+            self._csv_writer.writerow(values)
+
+    def write_rows(self, rows: Iterable[Dict[str, Any]], headers: List[str]):
+        """Write values of the given headers; missing values are written as spaces."""
+        rows_values = ([row.get(header, " ") for header in headers] for row in rows)
+        if self.file_type == FileTypes.XLSX:
+            for row_values in rows_values:
+                self._sheet.append(row_values)
+        else:
+            self._csv_writer.writerows(rows_values)
+
+    def write_file(self, file: IO[bytes]):
+        """Append all rows of a file written by another writer of the same type."""
+        if self.file_type == FileTypes.XLSX:
+            workbook = load_workbook(file, read_only=True)
+            for row_values in workbook.active.iter_rows(values_only=True):
+                self._sheet.append(row_values)
+            workbook.close()
+        else:
+            # CSV files written with the same delimiter, as well as gzip members,
+            # can be concatenated without decoding
+            self._close_csv_writer()
+            shutil.copyfileobj(file, self.temporary_file)
+            self._open_csv_writer()
+
+    def close(self) -> IO[bytes]:
+        """Finish writing and return the temporary file rewound to its beginning."""
+        if self.file_type == FileTypes.XLSX:
+            self._workbook.save(self.temporary_file)
+        else:
+            self._close_csv_writer()
+        self.temporary_file.seek(0)
+        return self.temporary_file
+
+
+def create_file_with_headers(
+    file_headers: List[str], delimiter: str, file_type: str
+) -> ExportFileWriter:
+    return ExportFileWriter(file_headers, delimiter, file_type)
 
 
 def export_products_in_batches(
@@ -155,44 +357,104 @@ def export_products_in_batches(
     export_info: Dict[str, list],
     export_fields: Set[str],
     headers: List[str],
-    delimiter: str,
-    temporary_file: Any,
-    file_type: str,
+    writer: ExportFileWriter,
+    export_file: Optional["ExportFile"] = None,
 ):
     warehouses = export_info.get("warehouses")
     attributes = export_info.get("attributes")
     channels = export_info.get("channels")
 
+    total_count = queryset.count() if export_file else 0
+    exported_count = 0
     for batch_pks in queryset_in_batches(queryset):
-        product_batch = Product.objects.filter(pk__in=batch_pks).prefetch_related(
-            "attributes",
-            "variants",
-            "collections",
-            "media",
-            "product_type",
-            "category",
-        )
+        product_batch = Product.objects.filter(pk__in=batch_pks)
 
         export_data = get_products_data(
             product_batch, export_fields, attributes, warehouses, channels
         )
 
-        append_to_file(export_data, headers, temporary_file, file_type, delimiter)
+        writer.write_rows(export_data, headers)
+
+        exported_count += len(batch_pks)
+        if export_file:
+            update_export_progress(export_file, exported_count, total_count, "products")
 
 
 def export_gift_cards_in_batches(
     queryset: "QuerySet",
     export_fields: List[str],
-    delimiter: str,
-    temporary_file: Any,
-    file_type: str,
+    writer: ExportFileWriter,
+    export_file: Optional["ExportFile"] = None,
 ):
+    total_count = queryset.count() if export_file else 0
+    exported_count = 0
     for batch_pks in queryset_in_batches(queryset):
-        gift_card_batch = GiftCard.objects.filter(pk__in=batch_pks)
+        gift_card_batch = GiftCard.objects.filter(pk__in=batch_pks).order_by("pk")
 
-        export_data = list(gift_card_batch.values(*export_fields))
+        writer.write_rows(gift_card_batch.values(*export_fields), export_fields)
 
-        append_to_file(export_data, export_fields, temporary_file, file_type, delimiter)
+        exported_count += len(batch_pks)
+        if export_file:
+            update_export_progress(
+                export_file, exported_count, total_count, "gift cards"
+            )
+
+
+def export_orders_in_batches(
+    queryset: "QuerySet",
+    writer: ExportFileWriter,
+    export_file: Optional["ExportFile"] = None,
+):
+    """Write orders in batches paginated by the order number.
+
+    Orders are identified by UUIDs, so the sequential number is used as the key.
+    """
+    headers_to_fields = OrderExportFields.HEADERS_TO_FIELDS_MAPPING
+    headers = list(headers_to_fields.keys())
+    fields = list(headers_to_fields.values())
+
+    total_count = queryset.count() if export_file else 0
+    exported_count = 0
+    last_number = 0
+    while True:
+        orders_data = list(
+            queryset.filter(number__gt=last_number)
+            .order_by("number")
+            .values(*fields)[:BATCH_SIZE]
+        )
+        if not orders_data:
+            break
+
+        export_data = []
+        for order_data in orders_data:
+            order_data["id"] = graphene.Node.to_global_id("Order", order_data["id"])
+            # Excel doesn't support timezones, so dates are exported in ISO format
+            order_data["created_at"] = order_data["created_at"].isoformat()
+            export_data.append(
+                {
+                    header: order_data[field]
+                    for header, field in headers_to_fields.items()
+                }
+            )
+        writer.write_rows(export_data, headers)
+
+        last_number = orders_data[-1]["number"]
+        exported_count += len(orders_data)
+        if export_file:
+            update_export_progress(export_file, exported_count, total_count, "orders")
+
+
+def update_export_progress(
+    export_file: "ExportFile", exported_count: int, total_count: int, data_type: str
+):
+    """Store the export progress in the job message.
+
+    Only the message is saved, so it can't override the file or the status changed
+    in the meantime. It's also set on the instance, so saving the instance later
+    doesn't restore the previous message.
+    """
+    export_file.message = f"Exported {exported_count} of {total_count} {data_type}."
+    export_file.save(update_fields=["message", "updated_at"])
 
 
 def queryset_in_batches(queryset):
@@ -214,22 +476,107 @@ def queryset_in_batches(queryset):
         start_pk = pks[-1]
 
 
-def append_to_file(
-    export_data: List[Dict[str, Union[str, bool]]],
-    headers: List[str],
-    temporary_file: Any,
-    file_type: str,
-    delimiter: str,
+def save_csv_file_in_export_file(
+    export_file: "ExportFile", temporary_file: IO[bytes], file_name: str
 ):
-    table = etl.fromdicts(export_data, header=headers, missing=" ")
+    # only the file fields are saved, so the progress message isn't overridden
+    export_file.content_file.save(file_name, temporary_file, save=False)
+    export_file.save(update_fields=["content_file", "updated_at"])
 
-    if file_type == FileTypes.CSV:
-        etl.io.csv.appendcsv(table, temporary_file.name, delimiter=delimiter)
-    else:
-        etl.io.xlsx.appendxlsx(table, temporary_file.name)
 
+def create_export_file_parts(
+    export_file: "ExportFile", queryset: "QuerySet"
+) -> List["ExportFilePart"]:
+    """Split the export into parts of `EXPORT_FILE_PART_SIZE` objects.
 
-def save_csv_file_in_export_file(
-    export_file: "ExportFile", temporary_file: IO[bytes], file_name: str
+    Return an empty list when the queryset fits into a single part, so the file
+    can be exported by a single task.
+    """
+    part_size = settings.EXPORT_FILE_PART_SIZE
+    if not part_size:
+        return []
+
+    pk_ranges = get_pk_ranges(queryset, part_size)
+    if len(pk_ranges) < 2:
+        return []
+
+    return ExportFilePart.objects.bulk_create(
+        [
+            ExportFilePart(export_file=export_file, after_pk=after_pk, last_pk=last_pk)
+            for after_pk, last_pk in pk_ranges
+        ]
+    )
+
+
+def get_pk_ranges(queryset: "QuerySet", size: int) -> List[Tuple[int, int]]:
+    """Return `(after_pk, last_pk)` ranges containing up to `size` objects each."""
+    pk_ranges = []
+    after_pk = 0
+    while True:
+        pks = (
+            queryset.order_by("pk").filter(pk__gt=after_pk).values_list("pk", flat=True)
+        )
+        last_pks = list(pks[size - 1 : size])
+        if not last_pks:
+            # the remaining objects fit into the last range
+            if (last_pk := pks.last()) is not None:
+                pk_ranges.append((after_pk, last_pk))
+            return pk_ranges
+
+        pk_ranges.append((after_pk, last_pks[0]))
+        after_pk = last_pks[0]
+
+
+def save_export_file_part(
+    export_file_part: "ExportFilePart", writer: ExportFileWriter, file_type: str
+):
+    temporary_file = writer.close()
+    export_file_part.content_file.save(
+        get_filename("part", file_type), temporary_file, save=False
+    )
+    temporary_file.close()
+
+
+def complete_export_file_part(export_file_part: "ExportFilePart") -> bool:
+    """Mark the part as completed and return whether all parts are completed.
+
+    The export file row is locked while the part is marked, so only the task
+    completing the last part gets `True`.
+    """
+    with transaction.atomic():
+        export_file = ExportFile.objects.select_for_update().get(
+            pk=export_file_part.export_file_id
+        )
+        export_file_part.completed = True
+        export_file_part.save(update_fields=["content_file", "completed"])
+
+        parts_count = export_file.parts.count()
+        completed_count = export_file.parts.filter(completed=True).count()
+        export_file.message = f"Exported {completed_count} of {parts_count} parts."
+        export_file.save(update_fields=["message", "updated_at"])
+
+    return completed_count == parts_count
+
+
+def merge_export_file_parts(
+    export_file: "ExportFile",
+    file_headers: List[str],
+    file_name: str,
+    delimiter: str,
+    file_type: str,
 ):
-    export_file.content_file.save(file_name, temporary_file)
+    """Save parts of the export file as a single file with the headers."""
+    parts = list(export_file.parts.all())
+
+    writer = ExportFileWriter(file_headers, delimiter, file_type)
+    for part in parts:
+        with part.content_file.open("rb") as part_file:
+            writer.write_file(part_file)
+
+    temporary_file = writer.close()
+    save_csv_file_in_export_file(export_file, temporary_file, file_name)
+    temporary_file.close()
+
+    for part in parts:
+        default_storage.delete(part.content_file.name)
+    export_file.parts.all().delete()
@@ -0,0 +1,873 @@
+"""Import products and variants from CSV, gzip compressed CSV and XLSX files.
+
+The imported file uses the headers of the product export, so an exported file can
+be imported back. Every row describes a single variant; consecutive rows with the
+same `id` (or the same `name` when `id` is empty) describe variants of one product
+and the product fields are taken from the first of them.
+
+Supported columns:
+- `name` and `product type` (name of the product type) are required,
+- `category` (slug), `description`, `product weight`,
+- `variant sku`, `variant weight`, `variant is preorder`,
+  `variant preorder global threshold`, `variant preorder end date`,
+- `<slug> (product attribute)` and `<slug> (variant attribute)` for dropdown,
+  multiselect and swatch attributes; multiselect values are separated with `, `,
+- `<slug> (warehouse quantity)`,
+- `<slug> (channel published)`, `<slug> (channel published at)`,
+  `<slug> (channel searchable)`, `<slug> (channel available for purchase)`,
+  `<slug> (channel price amount)` and `<slug> (channel variant cost price)`.
+Other columns of the export, like currency codes, are ignored.
+
+Rows are processed in batches of products, each batch in a separate transaction.
+Product types, categories, attribute values, attribute assignments, SKUs and slugs
+are fetched with a single query per batch and cached for the next batches; the
+objects are saved with bulk inserts. Products with invalid rows are skipped and
+reported in an import event. The imported products are marked for the search index
+update and their discounted prices are recalculated in a separate task.
+"""
+import csv
+import gzip
+import io
+import json
+import re
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, time
+from decimal import Decimal, InvalidOperation
+from itertools import groupby, islice
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.text import slugify
+from measurement.measures import Weight
+from text_unidecode import unidecode
+
+from ...attribute import AttributeInputType
+from ...attribute.facets import join_sort_key_value_names
+from ...attribute.models import (
+    AssignedProductAttribute,
+    AssignedProductAttributeValue,
+    AssignedVariantAttribute,
+    AssignedVariantAttributeValue,
+    Attribute,
+    AttributeProduct,
+    AttributeValue,
+    AttributeVariant,
+    ProductAttributeFacet,
+    ProductAttributeSortKey,
+)
+from ...channel.models import Channel
+from ...core.units import WeightUnits
+from ...core.utils import prepare_unique_slug
+from ...core.utils.editorjs import clean_editor_js
+from ...product.models import (
+    Category,
+    Product,
+    ProductChannelListing,
+    ProductType,
+    ProductVariant,
+    ProductVariantChannelListing,
+)
+from ...product.search_invalidation import SearchIndexPriority
+from ...product.tasks import update_products_discounted_prices_task
+from ...warehouse.models import Stock, Warehouse
+from .. import FileTypes
+from ..events import import_rows_rejected_event
+
+if TYPE_CHECKING:
+    from ..models import ImportFile
+
+
+BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 100
+
+HEADER_RE = re.compile(r"^(?P<slug>.+) \((?P<kind>[a-z ]+)\)$")
+PRODUCT_ATTRIBUTE = "product attribute"
+VARIANT_ATTRIBUTE = "variant attribute"
+WAREHOUSE_QUANTITY = "warehouse quantity"
+CHANNEL_PREFIX = "channel "
+
+SUPPORTED_ATTRIBUTE_INPUT_TYPES = [
+    AttributeInputType.DROPDOWN,
+    AttributeInputType.MULTISELECT,
+    AttributeInputType.SWATCH,
+]
+# swatch values have files or colors assigned, so only existing ones can be used
+CREATE_VALUES_INPUT_TYPES = [
+    AttributeInputType.DROPDOWN,
+    AttributeInputType.MULTISELECT,
+]
+PRODUCT_CHANNEL_FIELDS = [
+    "published",
+    "published at",
+    "publication date",
+    "searchable",
+    "available for purchase",
+]
+VARIANT_CHANNEL_FIELDS = ["price amount", "variant cost price"]
+
+Row = Tuple[int, Dict[str, str]]
+
+
+class ProductRowError(Exception):
+    def __init__(self, row_number: int, message: str):
+        super().__init__(f"Row {row_number}: {message}")
+
+
+@dataclass
+class ProductImportColumns:
+    """Objects referenced by the file headers, keyed by header."""
+
+    product_attributes: Dict[str, Attribute] = field(default_factory=dict)
+    variant_attributes: Dict[str, Attribute] = field(default_factory=dict)
+    warehouses: Dict[str, Warehouse] = field(default_factory=dict)
+    channels: Dict[str, Tuple[Channel, str]] = field(default_factory=dict)
+
+
+@dataclass
+class ProductImportBatch:
+    """Objects created from the rows, saved with bulk inserts."""
+
+    products: List[Product] = field(default_factory=list)
+    variants: List[ProductVariant] = field(default_factory=list)
+    default_variants: List[Tuple[Product, ProductVariant]] = field(default_factory=list)
+    new_attribute_values: Dict[Tuple[int, str], AttributeValue] = field(
+        default_factory=dict
+    )
+    product_attributes: List[
+        Tuple[AssignedProductAttribute, List[AttributeValue]]
+    ] = field(default_factory=list)
+    # the product is kept with the assignment, as saving the assignment drops
+    # the cached variant
+    variant_attributes: List[
+        Tuple[Product, AssignedVariantAttribute, List[AttributeValue]]
+    ] = field(default_factory=list)
+    product_listings: List[ProductChannelListing] = field(default_factory=list)
+    variant_listings: List[ProductVariantChannelListing] = field(default_factory=list)
+    stocks: List[Stock] = field(default_factory=list)
+    skus: Set[str] = field(default_factory=set)
+
+    def extend(self, other: "ProductImportBatch"):
+        self.products += other.products
+        self.variants += other.variants
+        self.default_variants += other.default_variants
+        self.new_attribute_values.update(other.new_attribute_values)
+        self.product_attributes += other.product_attributes
+        self.variant_attributes += other.variant_attributes
+        self.product_listings += other.product_listings
+        self.variant_listings += other.variant_listings
+        self.stocks += other.stocks
+        self.skus |= other.skus
+
+
+def import_products(import_file: "ImportFile", file_type: str, delimiter: str = ","):
+    importer = ProductImporter()
+    with import_file.content_file.open("rb") as file:
+        rows = read_rows(file, file_type, delimiter)
+        headers = next(rows, None)
+        if not headers:
+            raise ValueError("The imported file is empty.")
+        importer.prepare_columns(headers)
+
+        products_rows = group_product_rows(headers, rows)
+        while batch := list(islice(products_rows, BATCH_SIZE)):
+            importer.import_batch(batch)
+
+    import_file.message = (
+        f"Imported {importer.products_count} products "
+        f"with {importer.variants_count} variants."
+    )
+    import_file.save(update_fields=["message", "updated_at"])
+
+    if importer.errors:
+        import_rows_rejected_event(
+            import_file=import_file,
+            user=import_file.user,
+            app=import_file.app,
+            errors=importer.errors[:MAX_REPORTED_ERRORS],
+        )
+
+
+def read_rows(
+    file: IO[bytes], file_type: str, delimiter: str = ","
+) -> Iterator[List[str]]:
+    """Yield the file rows as lists of stripped strings, starting with the headers."""
+    rows: Iterable[Iterable]
+    if file_type == FileTypes.XLSX:
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file, read_only=True, data_only=True)
+        rows = workbook.active.iter_rows(values_only=True)
+    else:
+        if file_type == FileTypes.CSV_GZ:
+            file = gzip.GzipFile(fileobj=file, mode="rb")
+        text_file = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        rows = csv.reader(text_file, delimiter=delimiter)
+
+    for row in rows:
+        yield ["" if value is None else str(value).strip() for value in row]
+
+
+def group_product_rows(
+    headers: List[str], rows: Iterator[List[str]]
+) -> Iterator[List[Row]]:
+    """Group the consecutive rows describing variants of a single product."""
+
+    def _rows_with_data() -> Iterator[Row]:
+        # the first row of the file contains the headers
+        for row_number, row in enumerate(rows, start=2):
+            if any(row):
+                yield row_number, dict(zip(headers, row))
+
+    def _product_key(row: Row):
+        _, data = row
+        return data.get("id") or data.get("name")
+
+    for _, product_rows in groupby(_rows_with_data(), key=_product_key):
+        yield list(product_rows)
+
+
+class ProductImporter:
+    def __init__(self):
+        self.columns = ProductImportColumns()
+        self.errors: List[str] = []
+        self.products_count = 0
+        self.variants_count = 0
+
+        # data cached between the batches
+        self.product_types: Dict[str, Optional[ProductType]] = {}
+        self.categories: Dict[str, Optional[Category]] = {}
+        self.product_type_attributes: Dict[int, Dict[int, int]] = {}
+        self.product_type_variant_attributes: Dict[int, Dict[int, int]] = {}
+        self.attribute_values: Dict[Tuple[int, str], AttributeValue] = {}
+        self.attribute_values_by_slug: Dict[Tuple[int, str], AttributeValue] = {}
+        self.skus: Set[str] = set()
+
+    def prepare_columns(self, headers: List[str]):
+        """Resolve attributes, warehouses and channels referenced by the headers."""
+        columns = []
+        for header in headers:
+            if match := HEADER_RE.match(header):
+                columns.append((header, match["slug"], match["kind"]))
+
+        attributes = Attribute.objects.in_bulk(
+            {
+                slug
+                for _, slug, kind in columns
+                if kind in [PRODUCT_ATTRIBUTE, VARIANT_ATTRIBUTE]
+            },
+            field_name="slug",
+        )
+        warehouses = Warehouse.objects.in_bulk(
+            {slug for _, slug, kind in columns if kind == WAREHOUSE_QUANTITY},
+            field_name="slug",
+        )
+        channels = Channel.objects.in_bulk(
+            {slug for _, slug, kind in columns if kind.startswith(CHANNEL_PREFIX)},
+            field_name="slug",
+        )
+
+        for header, slug, kind in columns:
+            if kind in [PRODUCT_ATTRIBUTE, VARIANT_ATTRIBUTE]:
+                attribute = _get_column_object(attributes, header, slug, "attribute")
+                if attribute.input_type not in SUPPORTED_ATTRIBUTE_INPUT_TYPES:
+                    raise ValueError(
+                        f'Column "{header}": importing values of '
+                        f"{attribute.input_type} attributes is not supported."
+                    )
+                if kind == PRODUCT_ATTRIBUTE:
+                    self.columns.product_attributes[header] = attribute
+                else:
+                    self.columns.variant_attributes[header] = attribute
+            elif kind == WAREHOUSE_QUANTITY:
+                self.columns.warehouses[header] = _get_column_object(
+                    warehouses, header, slug, "warehouse"
+                )
+            elif kind.startswith(CHANNEL_PREFIX):
+                channel_field = kind[len(CHANNEL_PREFIX) :]
+                if channel_field in PRODUCT_CHANNEL_FIELDS + VARIANT_CHANNEL_FIELDS:
+                    channel = _get_column_object(channels, header, slug, "channel")
+                    self.columns.channels[header] = (channel, channel_field)
+
+    def import_batch(self, products_rows: List[List[Row]]):
+        self.fetch_batch_data(products_rows)
+        slugs = self.get_existing_slugs(products_rows)
+
+        batch = ProductImportBatch()
+        for rows in products_rows:
+            product_batch = ProductImportBatch()
+            try:
+                self.prepare_product(product_batch, rows, slugs)
+            except ProductRowError as e:
+                self.errors.append(str(e))
+                continue
+            batch.extend(product_batch)
+            self.attribute_values_by_slug.update(product_batch.new_attribute_values)
+            self.skus |= product_batch.skus
+
+        self.save_batch(batch)
+        self.products_count += len(batch.products)
+        self.variants_count += len(batch.variants)
+
+    def fetch_batch_data(self, products_rows: List[List[Row]]):
+        """Fetch the objects referenced by the rows which are not cached yet."""
+        first_rows = [rows[0][1] for rows in products_rows]
+        all_rows = [data for rows in products_rows for _, data in rows]
+
+        _fetch_missing(
+            self.product_types,
+            {data.get("product type", "") for data in first_rows},
+            lambda names: {
+                # the product type names are not unique, prefer the oldest one
+                product_type.name: product_type
+                for product_type in ProductType.objects.filter(name__in=names).order_by(
+                    "-pk"
+                )
+            },
+        )
+        _fetch_missing(
+            self.categories,
+            {data["category"] for data in first_rows if data.get("category")},
+            lambda slugs: Category.objects.in_bulk(slugs, field_name="slug"),
+        )
+
+        product_type_ids = {
+            product_type.pk
+            for product_type in self.product_types.values()
+            if product_type
+        }
+        _fetch_missing(
+            self.product_type_attributes,
+            product_type_ids,
+            lambda ids: _get_attribute_assignments(AttributeProduct, ids),
+        )
+        _fetch_missing(
+            self.product_type_variant_attributes,
+            product_type_ids,
+            lambda ids: _get_attribute_assignments(AttributeVariant, ids),
+        )
+
+        self.fetch_attribute_values(
+            {
+                (attribute.pk, value)
+                for data in first_rows
+                for header, attribute in self.columns.product_attributes.items()
+                for value in _split_attribute_values(attribute, data.get(header))
+            }
+            | {
+                (attribute.pk, value)
+                for data in all_rows
+                for header, attribute in self.columns.variant_attributes.items()
+                for value in _split_attribute_values(attribute, data.get(header))
+            }
+        )
+
+        skus = {data["variant sku"] for data in all_rows if data.get("variant sku")}
+        self.skus.update(
+            ProductVariant.objects.filter(sku__in=skus).values_list("sku", flat=True)
+        )
+
+    def fetch_attribute_values(self, values: Set[Tuple[int, str]]):
+        missing = {
+            (attribute_id, value)
+            for attribute_id, value in values
+            if self.get_attribute_value(attribute_id, value) is None
+        }
+        if not missing:
+            return
+        names = {value for _, value in missing}
+        attribute_values = AttributeValue.objects.filter(
+            Q(name__in=names) | Q(slug__in={_slugify(value) for value in names}),
+            attribute_id__in={attribute_id for attribute_id, _ in missing},
+        )
+        for attribute_value in attribute_values:
+            attribute_id = attribute_value.attribute_id
+            self.attribute_values[
+                (attribute_id, attribute_value.name)
+            ] = attribute_value
+            self.attribute_values_by_slug[
+                (attribute_id, attribute_value.slug)
+            ] = attribute_value
+
+    def get_attribute_value(
+        self, attribute_id: int, value: str
+    ) -> Optional[AttributeValue]:
+        return self.attribute_values.get(
+            (attribute_id, value)
+        ) or self.attribute_values_by_slug.get((attribute_id, _slugify(value)))
+
+    def get_existing_slugs(self, products_rows: List[List[Row]]) -> Set[str]:
+        """Return slugs of the existing products which may clash with the new ones."""
+        base_slugs = {
+            _slugify(rows[0][1]["name"])
+            for rows in products_rows
+            if rows[0][1].get("name")
+        }
+        if not base_slugs:
+            return set()
+        pattern = "|".join(re.escape(slug) for slug in base_slugs)
+        return set(
+            Product.objects.filter(slug__regex=rf"^({pattern})(-\d+)?$").values_list(
+                "slug", flat=True
+            )
+        )
+
+    def prepare_product(
+        self, batch: ProductImportBatch, rows: List[Row], slugs: Set[str]
+    ):
+        row_number, data = rows[0]
+        with _row_error(row_number):
+            product = self.prepare_product_instance(data, len(rows), slugs)
+            batch.products.append(product)
+            self.prepare_attributes(
+                batch,
+                product,
+                data,
+                self.columns.product_attributes,
+                self.product_type_attributes[product.product_type_id],
+            )
+            channels = self.prepare_product_listings(batch, product, data)
+
+        for sort_order, (row_number, data) in enumerate(rows):
+            with _row_error(row_number):
+                variant = self.prepare_variant_instance(batch, product, data)
+                variant.sort_order = sort_order
+                batch.variants.append(variant)
+                self.prepare_attributes(
+                    batch,
+                    variant,
+                    data,
+                    self.columns.variant_attributes,
+                    self.product_type_variant_attributes[product.product_type_id],
+                )
+                self.prepare_variant_listings(batch, product, variant, data, channels)
+                self.prepare_stocks(batch, variant, data)
+
+        batch.default_variants.append((product, batch.variants[0]))
+        slugs.add(product.slug)
+
+    def prepare_product_instance(
+        self, data: Dict[str, str], variants_count: int, slugs: Set[str]
+    ) -> Product:
+        name = data.get("name")
+        if not name:
+            raise ValueError("Product name is required.")
+
+        product_type_name = data.get("product type")
+        if not product_type_name:
+            raise ValueError("Product type is required.")
+        product_type = self.product_types.get(product_type_name)
+        if not product_type:
+            raise ValueError(f'Product type "{product_type_name}" does not exist.')
+        if not product_type.has_variants and variants_count > 1:
+            raise ValueError(
+                f'Product type "{product_type_name}" does not allow variants, '
+                "a product of this type can have a single row."
+            )
+
+        category = None
+        if category_slug := data.get("category"):
+            category = self.categories.get(category_slug)
+            if not category:
+                raise ValueError(f'Category "{category_slug}" does not exist.')
+
+        description = _parse_description(data.get("description"))
+        return Product(
+            name=name,
+            slug=prepare_unique_slug(_slugify(name), slugs),
+            product_type=product_type,
+            category=category,
+            description=description,
+            description_plaintext=(
+                clean_editor_js(description, to_string=True) if description else ""
+            ),
+            weight=_parse_weight(data.get("product weight")),
+            search_index_dirty=True,
+            # Imports change many products at once, so they are indexed after
+            # products changed individually.
+            search_index_priority=SearchIndexPriority.LOW,
+            search_index_dirty_since=timezone.now(),
+        )
+
+    def prepare_variant_instance(
+        self, batch: ProductImportBatch, product: Product, data: Dict[str, str]
+    ) -> ProductVariant:
+        sku = data.get("variant sku") or None
+        if sku:
+            if sku in self.skus or sku in batch.skus:
+                raise ValueError(f'Variant with SKU "{sku}" already exists.')
+            batch.skus.add(sku)
+
+        return ProductVariant(
+            product=product,
+            sku=sku,
+            weight=_parse_weight(data.get("variant weight")),
+            is_preorder=bool(_parse_bool(data.get("variant is preorder"))),
+            preorder_global_threshold=_parse_int(
+                data.get("variant preorder global threshold")
+            ),
+            preorder_end_date=_parse_datetime(data.get("variant preorder end date")),
+        )
+
+    def prepare_attributes(
+        self,
+        batch: ProductImportBatch,
+        instance: Union[Product, ProductVariant],
+        data: Dict[str, str],
+        columns: Dict[str, Attribute],
+        assignments: Dict[int, int],
+    ):
+        for header, attribute in columns.items():
+            values = _split_attribute_values(attribute, data.get(header))
+            if not values:
+                continue
+            assignment_id = assignments.get(attribute.pk)
+            if assignment_id is None:
+                raise ValueError(
+                    f'Attribute "{attribute.slug}" is not assigned to the product '
+                    "type."
+                )
+            attribute_values = [
+                self.get_or_prepare_attribute_value(batch, attribute, value)
+                for value in values
+            ]
+            if isinstance(instance, Product):
+                batch.product_attributes.append(
+                    (
+                        AssignedProductAttribute(
+                            product=instance, assignment_id=assignment_id
+                        ),
+                        attribute_values,
+                    )
+                )
+            else:
+                batch.variant_attributes.append(
+                    (
+                        instance.product,
+                        AssignedVariantAttribute(
+                            variant=instance, assignment_id=assignment_id
+                        ),
+                        attribute_values,
+                    )
+                )
+
+    def get_or_prepare_attribute_value(
+        self, batch: ProductImportBatch, attribute: Attribute, value: str
+    ) -> AttributeValue:
+        if attribute_value := self.get_attribute_value(attribute.pk, value):
+            return attribute_value
+        slug = _slugify(value)
+        if attribute_value := batch.new_attribute_values.get((attribute.pk, slug)):
+            return attribute_value
+        if attribute.input_type not in CREATE_VALUES_INPUT_TYPES:
+            raise ValueError(
+                f'Value "{value}" of attribute "{attribute.slug}" does not exist.'
+            )
+        attribute_value = AttributeValue(attribute=attribute, name=value, slug=slug)
+        batch.new_attribute_values[(attribute.pk, slug)] = attribute_value
+        return attribute_value
+
+    def prepare_product_listings(
+        self, batch: ProductImportBatch, product: Product, data: Dict[str, str]
+    ) -> Dict[int, ProductChannelListing]:
+        listings_data: Dict[Channel, Dict[str, str]] = defaultdict(dict)
+        for header, (channel, channel_field) in self.columns.channels.items():
+            if channel_field in PRODUCT_CHANNEL_FIELDS:
+                listings_data[channel][channel_field] = data.get(header, "")
+
+        listings = {}
+        for channel, listing_data in listings_data.items():
+            listing = ProductChannelListing(
+                product=product, channel=channel, currency=channel.currency_code
+            )
+            listing.is_published = bool(_parse_bool(listing_data.get("published")))
+            listing.published_at = _parse_datetime(
+                listing_data.get("published at") or listing_data.get("publication date")
+            )
+            if listing.is_published and not listing.published_at:
+                listing.published_at = timezone.now()
+            listing.visible_in_listings = bool(
+                _parse_bool(listing_data.get("searchable"))
+            )
+            listing.available_for_purchase_at = _parse_datetime(
+                listing_data.get("available for purchase")
+            )
+            listings[channel.pk] = listing
+            if any(listing_data.values()):
+                batch.product_listings.append(listing)
+        return listings
+
+    def prepare_variant_listings(
+        self,
+        batch: ProductImportBatch,
+        product: Product,
+        variant: ProductVariant,
+        data: Dict[str, str],
+        product_listings: Dict[int, ProductChannelListing],
+    ):
+        prices: Dict[Channel, Dict[str, Optional[Decimal]]] = defaultdict(dict)
+        for header, (channel, channel_field) in self.columns.channels.items():
+            if channel_field in VARIANT_CHANNEL_FIELDS:
+                prices[channel][channel_field] = _parse_decimal(data.get(header))
+
+        for channel, channel_prices in prices.items():
+            price_amount = channel_prices.get("price amount")
+            cost_price_amount = channel_prices.get("variant cost price")
+            if price_amount is None:
+                if cost_price_amount is not None:
+                    raise ValueError(
+                        f'Price in channel "{channel.slug}" is required when the '
+                        "cost price is given."
+                    )
+                continue
+            batch.variant_listings.append(
+                ProductVariantChannelListing(
+                    variant=variant,
+                    channel=channel,
+                    currency=channel.currency_code,
+                    price_amount=price_amount,
+                    discounted_price_amount=price_amount,
+                    cost_price_amount=cost_price_amount,
+                )
+            )
+            # the product is listed in every channel its variants are available in
+            product_listing = product_listings[channel.pk]
+            if product_listing not in batch.product_listings:
+                batch.product_listings.append(product_listing)
+
+    def prepare_stocks(
+        self, batch: ProductImportBatch, variant: ProductVariant, data: Dict[str, str]
+    ):
+        for header, warehouse in self.columns.warehouses.items():
+            quantity = _parse_int(data.get(header))
+            if quantity is None:
+                continue
+            batch.stocks.append(
+                Stock(warehouse=warehouse, product_variant=variant, quantity=quantity)
+            )
+
+    def save_batch(self, batch: ProductImportBatch):
+        if not batch.products:
+            return
+
+        with transaction.atomic():
+            AttributeValue.objects.bulk_create(batch.new_attribute_values.values())
+            Product.objects.bulk_create(batch.products)
+            ProductVariant.objects.bulk_create(batch.variants)
+            for product, variant in batch.default_variants:
+                product.default_variant = variant
+            Product.objects.bulk_update(batch.products, ["default_variant"])
+
+            AssignedProductAttribute.objects.bulk_create(
+                [assignment for assignment, _ in batch.product_attributes]
+            )
+            # the facets are built from the objects in memory, as saving the
+            # assigned values drops their cached related objects
+            product_values = [
+                (
+                    assignment.product_id,
+                    value,
+                    AssignedProductAttributeValue(
+                        assignment=assignment, value=value, sort_order=sort_order
+                    ),
+                )
+                for assignment, values in batch.product_attributes
+                for sort_order, value in enumerate(values)
+            ]
+            AssignedProductAttributeValue.objects.bulk_create(
+                [assigned_value for _, _, assigned_value in product_values]
+            )
+            AssignedVariantAttribute.objects.bulk_create(
+                [assignment for _, assignment, _ in batch.variant_attributes]
+            )
+            variant_values = [
+                (
+                    product.pk,
+                    value,
+                    AssignedVariantAttributeValue(
+                        assignment=assignment, value=value, sort_order=sort_order
+                    ),
+                )
+                for product, assignment, values in batch.variant_attributes
+                for sort_order, value in enumerate(values)
+            ]
+            AssignedVariantAttributeValue.objects.bulk_create(
+                [assigned_value for _, _, assigned_value in variant_values]
+            )
+            ProductAttributeFacet.objects.bulk_create(
+                [
+                    ProductAttributeFacet(
+                        product_id=product_id,
+                        attribute_id=value.attribute_id,
+                        value_id=value.pk,
+                        product_value_assignment_id=assigned_value.pk,
+                    )
+                    for product_id, value, assigned_value in product_values
+                ]
+                + [
+                    ProductAttributeFacet(
+                        product_id=product_id,
+                        attribute_id=value.attribute_id,
+                        value_id=value.pk,
+                        variant_value_assignment_id=assigned_value.pk,
+                    )
+                    for product_id, value, assigned_value in variant_values
+                ]
+            )
+            ProductAttributeSortKey.objects.bulk_create(
+                [
+                    ProductAttributeSortKey(
+                        product_id=assignment.product_id,
+                        attribute_id=values[0].attribute_id,
+                        value_names=join_sort_key_value_names(values),
+                    )
+                    for assignment, values in batch.product_attributes
+                    if values
+                ]
+            )
+
+            ProductChannelListing.objects.bulk_create(batch.product_listings)
+            ProductVariantChannelListing.objects.bulk_create(batch.variant_listings)
+            Stock.objects.bulk_create(batch.stocks)
+
+            product_ids = [product.pk for product in batch.products]
+            transaction.on_commit(
+                lambda: update_products_discounted_prices_task.delay(product_ids)
+            )
+
+
+@contextmanager
+def _row_error(row_number: int):
+    try:
+        yield
+    except ValueError as e:
+        raise ProductRowError(row_number, str(e))
+
+
+def _fetch_missing(cache: dict, keys: Iterable, fetch: Callable[[set], dict]) -> None:
+    """Fetch the keys missing in the cache; not found keys are cached as `None`."""
+    missing = set(keys) - cache.keys()
+    if not missing:
+        return
+    fetched = fetch(missing)
+    for key in missing:
+        cache[key] = fetched.get(key)
+
+
+def _get_attribute_assignments(model, product_type_ids: Set[int]):
+    assignments: Dict[int, Dict[int, int]] = defaultdict(dict)
+    for product_type_id, attribute_id, pk in model.objects.filter(
+        product_type_id__in=product_type_ids
+    ).values_list("product_type_id", "attribute_id", "pk"):
+        assignments[product_type_id][attribute_id] = pk
+    return {pk: assignments[pk] for pk in product_type_ids}
+
+
+def _get_column_object(objects: dict, header: str, slug: str, name: str):
+    if obj := objects.get(slug):
+        return obj
+    raise ValueError(f'Column "{header}": {name} "{slug}" does not exist.')
+
+
+def _split_attribute_values(attribute: Attribute, value: Optional[str]) -> List[str]:
+    if not value:
+        return []
+    if attribute.input_type == AttributeInputType.MULTISELECT:
+        return [item.strip() for item in value.split(", ") if item.strip()]
+    return [value]
+
+
+def _slugify(value: str) -> str:
+    # `slugify` returns an empty string when the value contains only characters
+    # not allowed in slugs
+    return slugify(unidecode(value)) or "-"
+
+
+def _parse_description(value: Optional[str]) -> Optional[dict]:
+    if not value:
+        return None
+    try:
+        description = json.loads(value)
+    except ValueError:
+        description = None
+    if isinstance(description, dict) and "blocks" in description:
+        return description
+    return {
+        "blocks": [{"type": "paragraph", "data": {"text": value}}],
+        "version": "2.24.3",
+    }
+
+
+def _parse_weight(value: Optional[str]) -> Optional[Weight]:
+    if not value:
+        return None
+    amount, _, unit = value.partition(" ")
+    unit = unit or WeightUnits.G
+    if unit not in dict(WeightUnits.CHOICES):
+        raise ValueError(f'Invalid weight unit "{unit}".')
+    return Weight(**{unit: _parse_decimal(amount)})
+
+
+def _parse_decimal(value: Optional[str]) -> Optional[Decimal]:
+    if not value:
+        return None
+    try:
+        number = Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f'Invalid number "{value}".')
+    # infinity can't be stored and converting it to an integer overflows
+    if not number.is_finite():
+        raise ValueError(f'Invalid number "{value}".')
+    return number
+
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    number = _parse_decimal(value)
+    if number is None:
+        return None
+    if number != number.to_integral_value():
+        raise ValueError(f'Invalid integer "{value}".')
+    return int(number)
+
+
+def _parse_bool(value: Optional[str]) -> Optional[bool]:
+    if not value:
+        return None
+    value = value.lower()
+    if value in ["true", "yes", "1"]:
+        return True
+    if value in ["false", "no", "0"]:
+        return False
+    raise ValueError(f'Invalid boolean value "{value}".')
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None and (date := parse_date(value)):
+            parsed = datetime.combine(date, time.min)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValueError(f'Invalid date "{value}".')
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, timezone.utc)
+    return parsed
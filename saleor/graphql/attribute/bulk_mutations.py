@@ -1,9 +1,13 @@
 import graphene
-from django.db.models import Exists, OuterRef, Q
 
 from ...attribute import models
 from ...permission.enums import PageTypePermissions
-from ...product import models as product_models
+from ...product.search_invalidation import (
+    SearchIndexPriority,
+    get_products_with_attribute_values,
+    get_products_with_attributes,
+    mark_products_search_index_dirty,
+)
 from ...webhook.event_types import WebhookEventAsyncType
 from ...webhook.utils import get_webhooks_for_event
 from ..core import ResolveInfo
@@ -44,35 +48,14 @@ class AttributeBulkDelete(ModelBulkDeleteMutation):
         _, attribute_pks = resolve_global_ids_to_primary_keys(ids, "Attribute")
         product_ids = cls.get_product_ids_to_update(attribute_pks)
         response = super().perform_mutation(root, info, ids=ids)
-        product_models.Product.objects.filter(id__in=product_ids).update(
-            search_index_dirty=True
-        )
+        mark_products_search_index_dirty(product_ids, SearchIndexPriority.LOW)
         return response
 
     @classmethod
     def get_product_ids_to_update(cls, attribute_pks):
-        attribute_product = models.AttributeProduct.objects.filter(
-            attribute_id__in=attribute_pks
-        )
-        assigned_product_attrs = models.AssignedProductAttribute.objects.filter(
-            Exists(attribute_product.filter(id=OuterRef("assignment_id")))
-        )
-
-        attribute_variant = models.AttributeVariant.objects.filter(
-            attribute_id__in=attribute_pks
+        return list(
+            get_products_with_attributes(attribute_pks).values_list("id", flat=True)
         )
-        assigned_variant_attrs = models.AssignedVariantAttribute.objects.filter(
-            Exists(attribute_variant.filter(id=OuterRef("assignment_id")))
-        )
-        variants = product_models.ProductVariant.objects.filter(
-            Exists(assigned_variant_attrs.filter(variant_id=OuterRef("id")))
-        )
-
-        product_ids = product_models.Product.objects.filter(
-            Exists(assigned_product_attrs.filter(product_id=OuterRef("id")))
-            | Q(Exists(variants.filter(product_id=OuterRef("id"))))
-        ).values_list("id", flat=True)
-        return list(product_ids)
 
     @classmethod
     def bulk_action(cls, info: ResolveInfo, queryset, /):
@@ -119,9 +102,7 @@ class AttributeValueBulkDelete(ModelBulkDeleteMutation):
         _, attribute_pks = resolve_global_ids_to_primary_keys(ids, "AttributeValue")
         product_ids = cls.get_product_ids_to_update(attribute_pks)
         response = super().perform_mutation(root, info, ids=ids)
-        product_models.Product.objects.filter(id__in=product_ids).update(
-            search_index_dirty=True
-        )
+        mark_products_search_index_dirty(product_ids, SearchIndexPriority.LOW)
         return response
 
     @classmethod
@@ -139,25 +120,6 @@ class AttributeValueBulkDelete(ModelBulkDeleteMutation):
 
     @classmethod
     def get_product_ids_to_update(cls, value_pks):
-        assigned_product_values = models.AssignedProductAttributeValue.objects.filter(
-            value_id__in=value_pks
-        )
-        assigned_product_attrs = models.AssignedProductAttribute.objects.filter(
-            Exists(assigned_product_values.filter(assignment_id=OuterRef("id")))
-        )
-
-        assigned_variant_values = models.AssignedVariantAttributeValue.objects.filter(
-            value_id__in=value_pks
+        return list(
+            get_products_with_attribute_values(value_pks).values_list("id", flat=True)
         )
-        assigned_variant_attrs = models.AssignedVariantAttribute.objects.filter(
-            Exists(assigned_variant_values.filter(assignment_id=OuterRef("id")))
-        )
-        variants = product_models.ProductVariant.objects.filter(
-            Exists(assigned_variant_attrs.filter(variant_id=OuterRef("id")))
-        )
-
-        product_ids = product_models.Product.objects.filter(
-            Exists(assigned_product_attrs.filter(product_id=OuterRef("id")))
-            | Q(Exists(variants.filter(product_id=OuterRef("id"))))
-        ).values_list("id", flat=True)
-        return list(product_ids)
@@ -3,6 +3,7 @@ from django.core.exceptions import ObjectDoesNotExist, ValidationError
 
 from ....attribute import models as models
 from ....attribute.error_codes import AttributeErrorCode
+from ....attribute.tasks import update_attribute_sort_keys_task
 from ....core.tracing import traced_atomic_transaction
 from ....permission.enums import ProductTypePermissions
 from ....webhook.event_types import WebhookEventAsyncType
@@ -94,6 +95,7 @@ class AttributeReorderValues(BaseMutation):
         with traced_atomic_transaction():
             perform_reordering(values_m2m, operations)
         attribute.refresh_from_db(fields=["values"])
+        update_attribute_sort_keys_task.delay(attribute.pk)
         manager = get_plugin_manager_promise(info.context).get()
         events_list = [v for v in values_m2m if v.id in operations.keys()]
         for value in events_list:
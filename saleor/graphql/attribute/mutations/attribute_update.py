@@ -3,6 +3,7 @@ from django.core.exceptions import ValidationError
 
 from ....attribute import models as models
 from ....attribute.error_codes import AttributeErrorCode
+from ....attribute.tasks import update_attribute_sort_keys_task
 from ....permission.enums import ProductTypePermissions
 from ....webhook.event_types import WebhookEventAsyncType
 from ...core import ResolveInfo
@@ -127,8 +128,11 @@ class AttributeUpdate(AttributeMixin, ModelWithExtRefMutation):
     @classmethod
     def _save_m2m(cls, info: ResolveInfo, instance, cleaned_data):
         super()._save_m2m(info, instance, cleaned_data)
-        for attribute_value in cleaned_data.get("remove_values", []):
+        remove_values = cleaned_data.get("remove_values", [])
+        for attribute_value in remove_values:
             attribute_value.delete()
+        if remove_values:
+            update_attribute_sort_keys_task.delay(instance.pk)
 
     @classmethod
     def perform_mutation(  # type: ignore[override]
@@ -1,9 +1,13 @@
 import graphene
-from django.db.models import Exists, OuterRef, Q
 
 from ....attribute import models as models
+from ....attribute.tasks import update_attribute_sort_keys_task
 from ....permission.enums import ProductTypePermissions
-from ....product import models as product_models
+from ....product.search_invalidation import (
+    SearchIndexPriority,
+    get_products_with_attribute_values,
+    mark_products_search_index_dirty,
+)
 from ....webhook.event_types import WebhookEventAsyncType
 from ...core import ResolveInfo
 from ...core.descriptions import ADDED_IN_310
@@ -51,9 +55,8 @@ class AttributeValueDelete(ModelDeleteMutation, ModelWithExtRefMutation):
         response = super().perform_mutation(
             _root, info, external_reference=external_reference, id=id
         )
-        product_models.Product.objects.filter(id__in=product_ids).update(
-            search_index_dirty=True
-        )
+        mark_products_search_index_dirty(product_ids, SearchIndexPriority.LOW)
+        update_attribute_sort_keys_task.delay(instance.attribute_id)
         manager = get_plugin_manager_promise(info.context).get()
         cls.call_event(manager.attribute_value_deleted, instance)
         cls.call_event(manager.attribute_updated, instance.attribute)
@@ -61,14 +64,11 @@ class AttributeValueDelete(ModelDeleteMutation, ModelWithExtRefMutation):
 
     @classmethod
     def get_product_ids_to_update(cls, instance):
-        variants = product_models.ProductVariant.objects.filter(
-            Exists(instance.variantassignments.filter(variant_id=OuterRef("id")))
+        return list(
+            get_products_with_attribute_values([instance.pk]).values_list(
+                "id", flat=True
+            )
         )
-        product_ids = product_models.Product.objects.filter(
-            Q(Exists(instance.productassignments.filter(product_id=OuterRef("id"))))
-            | Q(Exists(variants.filter(product_id=OuterRef("id"))))
-        ).values_list("id", flat=True)
-        return list(product_ids)
 
     @classmethod
     def success_response(cls, instance):
@@ -1,10 +1,12 @@
 import graphene
-from django.db import transaction
-from django.db.models import Exists, OuterRef, Q
 
 from ....attribute import models as models
+from ....attribute.tasks import (
+    update_associated_products_search_vector,
+    update_attribute_sort_keys_task,
+)
 from ....permission.enums import ProductTypePermissions
-from ....product import models as product_models
+from ....product.search_invalidation import SEARCHABLE_ATTRIBUTE_VALUE_FIELDS
 from ....webhook.event_types import WebhookEventAsyncType
 from ...core import ResolveInfo
 from ...core.descriptions import ADDED_IN_310
@@ -16,27 +18,6 @@ from ..types import Attribute, AttributeValue
 from .attribute_update import AttributeValueUpdateInput
 from .attribute_value_create import AttributeValueCreate
 
-PRODUCTS_BATCH_SIZE = 10000
-
-
-def queryset_in_batches(queryset):
-    """Slice a queryset into batches.
-
-    Input queryset should be sorted be pk.
-    """
-    start_pk = 0
-
-    while True:
-        qs = queryset.filter(pk__gt=start_pk)[:PRODUCTS_BATCH_SIZE]
-        pks = list(qs.values_list("pk", flat=True))
-
-        if not pks:
-            break
-
-        yield pks
-
-        start_pk = pks[-1]
-
 
 class AttributeValueUpdate(AttributeValueCreate, ModelWithExtRefMutation):
     attribute = graphene.Field(Attribute, description="The updated attribute.")
@@ -93,33 +74,9 @@ class AttributeValueUpdate(AttributeValueCreate, ModelWithExtRefMutation):
 
     @classmethod
     def post_save_action(cls, info: ResolveInfo, instance, cleaned_input):
-        with transaction.atomic():
-            variants = product_models.ProductVariant.objects.filter(
-                Exists(instance.variantassignments.filter(variant_id=OuterRef("id")))
-            )
-            # SELECT … FOR UPDATE needs to lock rows in a consistent order
-            # to avoid deadlocks between updates touching the same rows.
-            qs = (
-                product_models.Product.objects.select_for_update(of=("self",))
-                .filter(
-                    Q(search_index_dirty=False)
-                    & (
-                        Q(
-                            Exists(
-                                instance.productassignments.filter(
-                                    product_id=OuterRef("id")
-                                )
-                            )
-                        )
-                        | Q(Exists(variants.filter(product_id=OuterRef("id"))))
-                    )
-                )
-                .order_by("pk")
-            )
-            for batch_pks in queryset_in_batches(qs):
-                product_models.Product.objects.filter(pk__in=batch_pks).update(
-                    search_index_dirty=True
-                )
+        if SEARCHABLE_ATTRIBUTE_VALUE_FIELDS.intersection(cleaned_input):
+            update_associated_products_search_vector.delay(instance.pk)
+        update_attribute_sort_keys_task.delay(instance.attribute_id)
 
         manager = get_plugin_manager_promise(info.context).get()
         cls.call_event(manager.attribute_value_updated, instance)
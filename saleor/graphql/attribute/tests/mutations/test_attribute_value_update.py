@@ -108,6 +108,29 @@ def test_update_attribute_value_update_search_index_dirty_in_product(
     assert product.search_index_dirty is True
 
 
+def test_update_attribute_value_external_reference_search_index_not_dirty(
+    staff_api_client,
+    product,
+    permission_manage_product_types_and_attributes,
+):
+    # given
+    query = UPDATE_ATTRIBUTE_VALUE_MUTATION
+    product.search_index_dirty = False
+    product.save(update_fields=["search_index_dirty"])
+    value = product.attributes.all()[0].values.first()
+    node_id = graphene.Node.to_global_id("AttributeValue", value.id)
+    variables = {"input": {"externalReference": "test-ext-ref"}, "id": node_id}
+
+    # when
+    staff_api_client.post_graphql(
+        query, variables, permissions=[permission_manage_product_types_and_attributes]
+    )
+    product.refresh_from_db(fields=["search_index_dirty"])
+
+    # then
+    assert product.search_index_dirty is False
+
+
 @freeze_time("2022-05-12 12:00:00")
 @mock.patch("saleor.plugins.webhook.plugin.get_webhooks_for_event")
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_async")
@@ -2159,3 +2159,25 @@ def test_prepare_attribute_values_that_gives_the_same_slug(color_attribute):
     assert result[0] == existing_value
     assert result[1].name == new_value
     assert result[2].name == new_value_2
+
+
+def test_save_removes_sort_keys_of_cleared_attributes(product):
+    # given
+    attribute = product.product_type.product_attributes.first()
+    assert product.attribute_sort_keys.filter(attribute=attribute).exists()
+    input_data = [
+        (
+            attribute,
+            AttrValuesInput(
+                global_id=graphene.Node.to_global_id("Attribute", attribute.pk),
+                dropdown=None,
+            ),
+        )
+    ]
+
+    # when
+    AttributeAssignmentMixin.save(product, input_data)
+
+    # then
+    assert not product.attributes.filter(assignment__attribute=attribute).exists()
+    assert not product.attribute_sort_keys.filter(attribute=attribute).exists()
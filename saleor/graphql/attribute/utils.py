@@ -375,13 +375,20 @@ class AttributeAssignmentMixin:
             raise ValidationError(errors)
 
     @classmethod
-    def save(cls, instance: T_INSTANCE, cleaned_input: T_INPUT_MAP):
+    def save(
+        cls,
+        instance: T_INSTANCE,
+        cleaned_input: T_INPUT_MAP,
+        update_facets: bool = True,
+    ):
         """Save the cleaned input into the database against the given instance.
 
         Note: this should always be ran inside a transaction.
 
         :param instance: the product or variant to associate the attribute against.
         :param cleaned_input: the cleaned user input (refer to clean_attributes)
+        :param update_facets: whether to recreate the attribute facets of the product;
+            bulk mutations pass False and update the facets of all products at once.
         """
         pre_save_methods_mapping = {
             AttributeInputType.BOOLEAN: cls._pre_save_boolean_values,
@@ -420,14 +427,17 @@ class AttributeAssignmentMixin:
             else:
                 attr_val_map[attribute.pk].extend(attribute_values)
 
-        associate_attribute_values_to_instance(instance, attr_val_map)
-
-        # drop attribute assignment model when values are unassigned from instance
+        # drop attribute assignment model when values are unassigned from instance;
+        # it's done first, so the sort keys rebuilt below don't include them
         if clean_assignment:
             instance.attributes.filter(
                 assignment__attribute_id__in=clean_assignment
             ).delete()
 
+        associate_attribute_values_to_instance(
+            instance, attr_val_map, update_facets=update_facets
+        )
+
     @classmethod
     def _pre_save_dropdown_value(
         cls,
@@ -1,11 +1,14 @@
 import datetime
+import uuid
 from decimal import Decimal
 from unittest import mock
 
 import graphene
 import pytest
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.db.models import Sum
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 from django_countries.fields import Country
@@ -19,6 +22,7 @@ from ....checkout.checkout_cleaner import (
 )
 from ....checkout.error_codes import CheckoutErrorCode
 from ....checkout.fetch import fetch_checkout_info, fetch_checkout_lines
+from ....checkout.models import CheckoutLine
 from ....checkout.utils import add_voucher_to_checkout
 from ....core.prices import quantize_price
 from ....discount import DiscountValueType, VoucherType
@@ -1963,6 +1967,60 @@ def test_query_checkouts(
     assert str(checkout.token) == received_checkout["token"]
 
 
+QUERY_CHECKOUTS_PRICES = """
+    {
+        checkouts(first: 20) {
+            edges {
+                node {
+                    token
+                    subtotalPrice {
+                        gross {
+                            amount
+                        }
+                    }
+                    totalPrice {
+                        gross {
+                            amount
+                        }
+                    }
+                }
+            }
+        }
+    }
+"""
+
+
+def test_query_checkouts_prices_number_of_queries_does_not_depend_on_checkouts(
+    checkout_with_items, staff_api_client, permission_manage_checkouts
+):
+    # given
+    staff_api_client.user.user_permissions.add(permission_manage_checkouts)
+    checkout = checkout_with_items
+    checkout.price_expiration = timezone.now() + datetime.timedelta(days=1)
+    checkout.save(update_fields=["price_expiration"])
+    lines = list(checkout.lines.all())
+
+    with CaptureQueriesContext(connection) as single_checkout_queries:
+        get_graphql_content(staff_api_client.post_graphql(QUERY_CHECKOUTS_PRICES))
+
+    for _ in range(3):
+        checkout.pk = uuid.uuid4()
+        checkout.save()
+        for line in lines:
+            line.pk = uuid.uuid4()
+            line.checkout = checkout
+        CheckoutLine.objects.bulk_create(lines)
+
+    # when
+    with CaptureQueriesContext(connection) as multiple_checkouts_queries:
+        response = staff_api_client.post_graphql(QUERY_CHECKOUTS_PRICES)
+
+    # then
+    content = get_graphql_content(response)
+    assert len(content["data"]["checkouts"]["edges"]) == 4
+    assert len(multiple_checkouts_queries) == len(single_checkout_queries)
+
+
 def test_query_with_channel(
     checkouts_list, staff_api_client, permission_manage_checkouts, channel_USD
 ):
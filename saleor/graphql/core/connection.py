@@ -360,6 +360,8 @@ def create_connection_slice(
             edge.node = ChannelContext(node=node, channel_slug=iterable.channel_slug)
             edges_with_context.append(edge)
         slice.edges = edges_with_context
+        # Keep the whole filtered queryset for fields computed over all results.
+        slice.channel_qs = iterable
 
     return slice
 
@@ -7,7 +7,12 @@ from promise import Promise
 from promise.dataloader import DataLoader as BaseLoader
 
 from ...thumbnail.models import Thumbnail
-from ...thumbnail.utils import get_thumbnail_format
+from ...thumbnail.utils import (
+    cache_thumbnails,
+    get_cached_thumbnail_names,
+    get_thumbnail_cache_key,
+    get_thumbnail_format,
+)
 from . import SaleorContext
 from .context import get_database_connection_name
 
@@ -58,21 +63,47 @@ class DataLoader(BaseLoader, Generic[K, R]):
 class BaseThumbnailBySizeAndFormatLoader(
     DataLoader[Tuple[int, int, Optional[str]], Thumbnail]
 ):
+    """Load thumbnails of instances by the instance id, size and format.
+
+    Thumbnails found in the cache are returned as unsaved `Thumbnail` instances
+    with only the image, size and format set; the database is queried only for
+    the ones missing in the cache.
+    """
+
     model_name: str
 
     def batch_load(self, keys: Iterable[Tuple[int, int, Optional[str]]]):
         model_name = self.model_name.lower()
-        instance_ids = [id for id, _, _ in keys]
+        keys = list(keys)
+        cache_keys = {key: get_thumbnail_cache_key(model_name, *key) for key in keys}
+        cached_names = get_cached_thumbnail_names(cache_keys.values())
+        thumbnails_by_instance_id_size_and_format_map: DefaultDict[
+            Tuple[int, int, Optional[str]], Thumbnail
+        ] = defaultdict()
+        for key in keys:
+            if name := cached_names.get(cache_keys[key]):
+                _, size, format = key
+                thumbnails_by_instance_id_size_and_format_map[key] = Thumbnail(
+                    image=name, size=size, format=format
+                )
+
+        missing_keys = [
+            key
+            for key in keys
+            if key not in thumbnails_by_instance_id_size_and_format_map
+        ]
+        if not missing_keys:
+            return [thumbnails_by_instance_id_size_and_format_map[key] for key in keys]
+
+        instance_ids = {id for id, _, _ in missing_keys}
         lookup = {f"{model_name}_id__in": instance_ids}
         thumbnails = Thumbnail.objects.using(self.database_connection_name).filter(
             **lookup
         )
-        thumbnails_by_instance_id_size_and_format_map: DefaultDict[
-            Tuple[int, int, Optional[str]], Thumbnail
-        ] = defaultdict()
         for thumbnail in thumbnails:
             format = get_thumbnail_format(thumbnail.format)
             thumbnails_by_instance_id_size_and_format_map[
                 (getattr(thumbnail, f"{model_name}_id"), thumbnail.size, format)
             ] = thumbnail
+        cache_thumbnails(thumbnails)
         return [thumbnails_by_instance_id_size_and_format_map.get(key) for key in keys]
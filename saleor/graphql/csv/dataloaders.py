@@ -1,6 +1,6 @@
 from collections import defaultdict
 
-from ...csv.models import ExportEvent
+from ...csv.models import ExportEvent, ImportEvent
 from ..core.dataloaders import DataLoader
 
 
@@ -18,3 +18,16 @@ class EventsByExportFileIdLoader(DataLoader):
         for event in events:
             events_map[event.export_file_id].append(event)
         return [events_map.get(export_file_id) for export_file_id in keys]
+
+
+class EventsByImportFileIdLoader(DataLoader):
+    context_key = "events_by_import_file_id"
+
+    def batch_load(self, keys):
+        events = ImportEvent.objects.using(self.database_connection_name).filter(
+            import_file_id__in=keys
+        )
+        events_map = defaultdict(list)
+        for event in events:
+            events_map[event.import_file_id].append(event)
+        return [events_map.get(import_file_id) for import_file_id in keys]
@@ -1,9 +1,10 @@
-from ...csv import ExportEvents, FileTypes
+from ...csv import ExportEvents, FileTypes, ImportEvents
 from ..core.doc_category import DOC_CATEGORY_PRODUCTS
 from ..core.enums import to_enum
 from ..core.types import BaseEnum
 
 ExportEventEnum = to_enum(ExportEvents)
+ImportEventEnum = to_enum(ImportEvents)
 FileTypeEnum = to_enum(FileTypes)
 
 
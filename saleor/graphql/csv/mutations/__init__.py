@@ -1,4 +1,6 @@
 from .export_gift_cards import ExportGiftCards
+from .export_orders import ExportOrders
 from .export_products import ExportProducts
+from .import_products import ImportProducts
 
-__all__ = ["ExportGiftCards", "ExportProducts"]
+__all__ = ["ExportGiftCards", "ExportOrders", "ExportProducts", "ImportProducts"]
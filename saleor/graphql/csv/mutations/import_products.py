@@ -0,0 +1,78 @@
+import graphene
+from django.core.exceptions import ValidationError
+
+from ....csv import models as csv_models
+from ....csv.error_codes import ExportErrorCode
+from ....csv.events import import_started_event
+from ....csv.tasks import import_products_task
+from ....permission.enums import ProductPermissions
+from ...app.dataloaders import get_app_promise
+from ...core import ResolveInfo
+from ...core.descriptions import ADDED_IN_315, PREVIEW_FEATURE
+from ...core.doc_category import DOC_CATEGORY_PRODUCTS
+from ...core.mutations import BaseMutation
+from ...core.types import BaseInputObjectType, ExportError, Upload
+from ..enums import FileTypeEnum
+from ..types import ImportFile
+
+
+class ImportProductsInput(BaseInputObjectType):
+    file = Upload(
+        required=True,
+        description=(
+            "File with products data in the format of the products export. "
+            "Represents a file in a multipart request."
+        ),
+    )
+    file_type = FileTypeEnum(description="Type of imported file.", required=True)
+
+    class Meta:
+        doc_category = DOC_CATEGORY_PRODUCTS
+
+
+class ImportProducts(BaseMutation):
+    import_file = graphene.Field(
+        ImportFile,
+        description=(
+            "The newly created import file job which is responsible for import data."
+        ),
+    )
+
+    class Arguments:
+        input = ImportProductsInput(
+            required=True, description="Fields required to import products data."
+        )
+
+    class Meta:
+        description = (
+            "Import products and their variants from csv or xlsx file. The file is "
+            "processed in the background, the result of the import is available in "
+            "the events of the import file." + ADDED_IN_315 + PREVIEW_FEATURE
+        )
+        doc_category = DOC_CATEGORY_PRODUCTS
+        permissions = (ProductPermissions.MANAGE_PRODUCTS,)
+        error_type_class = ExportError
+
+    @classmethod
+    def perform_mutation(  # type: ignore[override]
+        cls, _root, info: ResolveInfo, /, input
+    ):
+        file_data = info.context.FILES.get(input["file"])
+        if not file_data:
+            raise ValidationError(
+                {
+                    "file": ValidationError(
+                        "File is required.", code=ExportErrorCode.REQUIRED.value
+                    )
+                }
+            )
+
+        app = get_app_promise(info.context).get()
+        import_file = csv_models.ImportFile.objects.create(
+            app=app, user=info.context.user, content_file=file_data
+        )
+        import_started_event(import_file=import_file, app=app, user=info.context.user)
+        import_products_task.delay(import_file.pk, input["file_type"])
+
+        import_file.refresh_from_db()
+        return cls(import_file=import_file)
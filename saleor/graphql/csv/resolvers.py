@@ -14,3 +14,11 @@ def resolve_export_files(info):
     return models.ExportFile.objects.using(
         get_database_connection_name(info.context)
     ).all()
+
+
+def resolve_import_file(info, id):
+    return (
+        models.ImportFile.objects.using(get_database_connection_name(info.context))
+        .filter(id=id)
+        .first()
+    )
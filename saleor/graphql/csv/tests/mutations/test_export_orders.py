@@ -0,0 +1,79 @@
+from unittest.mock import patch
+
+import graphene
+
+from .....csv import ExportEvents
+from .....csv.models import ExportEvent
+from ....tests.utils import assert_no_permission, get_graphql_content
+from ...enums import ExportScope, FileTypeEnum
+
+EXPORT_ORDERS_MUTATION = """
+    mutation ExportOrders($input: ExportOrdersInput!){
+        exportOrders(input: $input){
+            exportFile {
+                id
+                status
+                user {
+                    email
+                }
+            }
+            errors {
+                field
+                code
+                message
+            }
+        }
+    }
+"""
+
+
+@patch("saleor.graphql.csv.mutations.export_orders.export_orders_task.delay")
+def test_export_orders_mutation_ids_scope(
+    export_orders_mock, staff_api_client, order_list, permission_manage_orders
+):
+    # given
+    orders = order_list[:2]
+    variables = {
+        "input": {
+            "scope": ExportScope.IDS.name,
+            "ids": [graphene.Node.to_global_id("Order", order.pk) for order in orders],
+            "fileType": FileTypeEnum.CSV_GZ.name,
+        }
+    }
+
+    # when
+    response = staff_api_client.post_graphql(
+        EXPORT_ORDERS_MUTATION, variables, permissions=[permission_manage_orders]
+    )
+
+    # then
+    content = get_graphql_content(response)
+    data = content["data"]["exportOrders"]
+    assert not data["errors"]
+    assert data["exportFile"]["user"]["email"] == staff_api_client.user.email
+
+    export_orders_mock.assert_called_once()
+    call_args, _ = export_orders_mock.call_args
+    assert set(call_args[1]["ids"]) == {str(order.pk) for order in orders}
+    assert call_args[2] == FileTypeEnum.CSV_GZ.value
+    assert ExportEvent.objects.filter(
+        user=staff_api_client.user, type=ExportEvents.EXPORT_PENDING
+    ).exists()
+
+
+@patch("saleor.graphql.csv.mutations.export_orders.export_orders_task.delay")
+def test_export_orders_mutation_no_permission(export_orders_mock, staff_api_client):
+    # given
+    variables = {
+        "input": {
+            "scope": ExportScope.ALL.name,
+            "fileType": FileTypeEnum.CSV.name,
+        }
+    }
+
+    # when
+    response = staff_api_client.post_graphql(EXPORT_ORDERS_MUTATION, variables)
+
+    # then
+    assert_no_permission(response)
+    export_orders_mock.assert_not_called()
@@ -0,0 +1,84 @@
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from .....csv import FileTypes, ImportEvents
+from .....csv.models import ImportEvent
+from ....tests.utils import (
+    assert_no_permission,
+    get_graphql_content,
+    get_multipart_request_body,
+)
+from ...enums import FileTypeEnum
+
+IMPORT_PRODUCTS_MUTATION = """
+    mutation ImportProducts($input: ImportProductsInput!){
+        importProducts(input: $input){
+            importFile {
+                id
+                status
+                createdAt
+                user {
+                    email
+                }
+                events {
+                    type
+                }
+            }
+            errors {
+                field
+                code
+                message
+            }
+        }
+    }
+"""
+
+
+@patch("saleor.graphql.csv.mutations.import_products.import_products_task.delay")
+def test_import_products_mutation(
+    import_products_mock, staff_api_client, permission_manage_products, media_root
+):
+    # given
+    file_name = "products.csv"
+    file = SimpleUploadedFile(file_name, b"name,product type\n", "text/csv")
+    variables = {"input": {"file": file_name, "fileType": FileTypeEnum.CSV.name}}
+    body = get_multipart_request_body(
+        IMPORT_PRODUCTS_MUTATION, variables, file, file_name
+    )
+    # the permission is granted up front, as posting twice would drain the file
+    staff_api_client.user.user_permissions.add(permission_manage_products)
+
+    # when
+    response = staff_api_client.post_multipart(body)
+
+    # then
+    content = get_graphql_content(response)
+    data = content["data"]["importProducts"]
+    import_file_data = data["importFile"]
+    assert not data["errors"]
+    assert import_file_data["status"] == "PENDING"
+    assert import_file_data["user"]["email"] == staff_api_client.user.email
+    assert import_file_data["events"] == [{"type": ImportEvents.IMPORT_PENDING.upper()}]
+
+    event = ImportEvent.objects.get(type=ImportEvents.IMPORT_PENDING)
+    import_file = event.import_file
+    assert import_file.content_file.read() == b"name,product type\n"
+    import_products_mock.assert_called_once_with(import_file.pk, FileTypes.CSV)
+
+
+def test_import_products_mutation_no_permission(staff_api_client, media_root):
+    # given
+    file_name = "products.csv"
+    file = SimpleUploadedFile(file_name, b"name,product type\n", "text/csv")
+    variables = {"input": {"file": file_name, "fileType": FileTypeEnum.CSV.name}}
+    body = get_multipart_request_body(
+        IMPORT_PRODUCTS_MUTATION, variables, file, file_name
+    )
+
+    # when
+    response = staff_api_client.post_multipart(body)
+
+    # then
+    assert_no_permission(response)
+    assert not ImportEvent.objects.exists()
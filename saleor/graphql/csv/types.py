@@ -12,8 +12,8 @@ from ..core import ResolveInfo
 from ..core.connection import CountableConnection
 from ..core.types import Job, ModelObjectType, NonNullList
 from ..utils import get_user_or_app_from_context
-from .dataloaders import EventsByExportFileIdLoader
-from .enums import ExportEventEnum
+from .dataloaders import EventsByExportFileIdLoader, EventsByImportFileIdLoader
+from .enums import ExportEventEnum, ImportEventEnum
 
 
 class ExportEvent(ModelObjectType[models.ExportEvent]):
@@ -120,3 +120,96 @@ class ExportFile(ModelObjectType[models.ExportFile]):
 class ExportFileCountableConnection(CountableConnection):
     class Meta:
         node = ExportFile
+
+
+class ImportEvent(ModelObjectType[models.ImportEvent]):
+    date = graphene.types.datetime.DateTime(
+        description="Date when event happened at in ISO 8601 format.",
+        required=True,
+    )
+    type = ImportEventEnum(description="Import event type.", required=True)
+    user = graphene.Field(
+        User,
+        description=(
+            "User who performed the action. Requires one of the following "
+            f"permissions: {AuthorizationFilters.OWNER.name}, "
+            f"{AccountPermissions.MANAGE_STAFF.name}."
+        ),
+        required=False,
+    )
+    app = graphene.Field(
+        App,
+        description=(
+            "App which performed the action. Requires one of the following "
+            f"permissions: {AuthorizationFilters.OWNER.name}, "
+            f"{AppPermission.MANAGE_APPS.name}."
+        ),
+        required=False,
+    )
+    message = graphene.String(
+        description="Content of the event.",
+        required=True,
+    )
+
+    class Meta:
+        description = "History log of import file."
+        model = models.ImportEvent
+        interfaces = [graphene.relay.Node]
+
+    @staticmethod
+    def resolve_user(root: models.ImportEvent, info: ResolveInfo):
+        requestor = get_user_or_app_from_context(info.context)
+        check_is_owner_or_has_one_of_perms(
+            requestor, root.user, AccountPermissions.MANAGE_STAFF
+        )
+        return root.user
+
+    @staticmethod
+    def resolve_app(root: models.ImportEvent, info: ResolveInfo):
+        requestor = get_user_or_app_from_context(info.context)
+        check_is_owner_or_has_one_of_perms(
+            requestor, root.user, AppPermission.MANAGE_APPS
+        )
+        return AppByIdLoader(info.context).load(root.app_id) if root.app_id else None
+
+    @staticmethod
+    def resolve_message(root: models.ImportEvent, _info: ResolveInfo):
+        return root.parameters.get("message", "")
+
+
+class ImportFile(ModelObjectType[models.ImportFile]):
+    id = graphene.GlobalID(required=True, description="The ID of the import file.")
+    events = NonNullList(
+        ImportEvent,
+        description="List of events associated with the import.",
+    )
+    user = graphene.Field(User, description="The user who requests file import.")
+    app = graphene.Field(App, description="The app which requests file import.")
+
+    class Meta:
+        description = "Represents a job data of imported file."
+        interfaces = [graphene.relay.Node, Job]
+        model = models.ImportFile
+
+    @staticmethod
+    def resolve_user(root: models.ImportFile, info: ResolveInfo):
+        requestor = get_user_or_app_from_context(info.context)
+        check_is_owner_or_has_one_of_perms(
+            requestor, root.user, AccountPermissions.MANAGE_STAFF
+        )
+        return root.user
+
+    @staticmethod
+    def resolve_app(root: models.ImportFile, info: ResolveInfo):
+        requestor = get_user_or_app_from_context(info.context)
+        check_is_owner_or_has_one_of_perms(
+            requestor, root.user, AppPermission.MANAGE_APPS
+        )
+        return AppByIdLoader(info.context).load(root.app_id) if root.app_id else None
+
+    @staticmethod
+    def resolve_events(root: models.ImportFile, info):
+        def _sort_by_pk(records):
+            return sorted(records or [], key=lambda r: r.pk)
+
+        return EventsByImportFileIdLoader(info.context).load(root.pk).then(_sort_by_pk)
@@ -0,0 +1,95 @@
+import json
+import sys
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from graphql.execution.values import coerce_value
+from graphql.utils.is_valid_value import is_valid_value
+
+from ....order import StockUpdatePolicy
+from ....plugins.manager import get_plugins_manager
+from ...api import schema
+from ...core.enums import ErrorPolicy
+from ...order.bulk_mutations.order_bulk_create import OrderBulkCreate
+
+DEFAULT_BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = (
+        "Import orders from a NDJSON file. Every line of the file is a JSON object "
+        "in the format of the `OrderBulkCreateInput` GraphQL input. The orders are "
+        "created in batches, each batch in a separate transaction, so the error "
+        "policy applies to a single batch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path", type=str, help="Path to the file, `-` to read from stdin."
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Number of orders created in a single transaction.",
+        )
+        parser.add_argument(
+            "--error-policy",
+            choices=[choice for choice, _ in ErrorPolicy.CHOICES],
+            default=ErrorPolicy.REJECT_FAILED_ROWS,
+        )
+        parser.add_argument(
+            "--stock-update-policy",
+            choices=[choice for choice, _ in StockUpdatePolicy.CHOICES],
+            default=StockUpdatePolicy.UPDATE,
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("Batch size must be a positive number.")
+
+        path = options["path"]
+        try:
+            file = sys.stdin if path == "-" else open(path)
+        except OSError as e:
+            raise CommandError(f"Cannot open file {path}: {e}")
+
+        manager = get_plugins_manager(allow_replica=False)
+        total_count = created_count = 0
+        with file:
+            orders = self.read_orders(file)
+            while batch := list(islice(orders, batch_size)):
+                line_numbers = [line_number for line_number, _ in batch]
+                orders_data = OrderBulkCreate.create_orders(
+                    [order_input for _, order_input in batch],
+                    manager,
+                    error_policy=options["error_policy"],
+                    stock_update_policy=options["stock_update_policy"],
+                )
+                for line_number, order_data in zip(line_numbers, orders_data):
+                    for error in order_data.errors:
+                        self.write_error(line_number, f"{error.path}: {error.message}")
+                total_count += len(batch)
+                created_count += sum(
+                    order_data.order is not None for order_data in orders_data
+                )
+                self.stdout.write(f"Created {created_count} of {total_count} orders.")
+
+    def read_orders(self, file):
+        input_type = schema.get_type("OrderBulkCreateInput")
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                value = json.loads(line)
+            except ValueError as e:
+                self.write_error(line_number, f"Invalid JSON: {e}")
+                continue
+            if errors := is_valid_value(value, input_type):
+                self.write_error(line_number, " ".join(errors))
+                continue
+            yield line_number, coerce_value(input_type, value)
+
+    def write_error(self, line_number: int, message: str):
+        self.stderr.write(f"Line {line_number}: {message}")
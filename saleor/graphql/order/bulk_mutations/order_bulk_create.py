@@ -1,17 +1,16 @@
-import copy
 from collections import defaultdict
 from dataclasses import dataclass
 from dataclasses import field as dataclass_field
 from dataclasses import fields as dataclass_fields
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 from uuid import UUID
 
 import graphene
 from django.core.exceptions import ValidationError
 from django.core.validators import URLValidator
-from django.db.models import Q
+from django.db.models import Q, prefetch_related_objects
 from django.utils import timezone
 from graphql import GraphQLError
 from prices import Money
@@ -71,6 +70,9 @@ from ..mutations.order_discount_common import (
 from ..types import Order as OrderType
 from .utils import get_instance
 
+if TYPE_CHECKING:
+    from ....plugins.manager import PluginsManager
+
 MINUTES_DIFF = 5
 MAX_ORDERS = 50
 MAX_NOTE_LENGTH = 255
@@ -147,9 +149,13 @@ class OrderBulkCreateData:
             for event in transaction_data.events:
                 event.transaction = transaction_data.transaction
 
-    def link_gift_cards(self):
-        if self.order:
-            self.order.gift_cards.add(*self.gift_cards)
+    @property
+    def all_order_gift_cards(self) -> list:
+        OrderGiftCard = Order.gift_cards.through
+        return [
+            OrderGiftCard(order_id=self.order.pk, giftcard_id=gift_card.pk)
+            for gift_card in self.gift_cards
+        ]
 
     def post_create_order_update(self):
         if self.order:
@@ -1966,22 +1972,18 @@ class OrderBulkCreate(BaseMutation, I18nMixin):
     def handle_stocks(
         cls, orders_data: List[OrderBulkCreateData], stock_update_policy: str
     ) -> List[Stock]:
-        variant_ids: List[int] = sum(
-            [
-                order_data.unique_variant_ids
-                for order_data in orders_data
-                if order_data.order
-            ],
-            [],
-        )
-        warehouse_ids: List[UUID] = sum(
-            [
-                order_data.unique_warehouse_ids
-                for order_data in orders_data
-                if order_data.order
-            ],
-            [],
-        )
+        variant_ids: List[int] = [
+            variant_id
+            for order_data in orders_data
+            if order_data.order
+            for variant_id in order_data.unique_variant_ids
+        ]
+        warehouse_ids: List[UUID] = [
+            warehouse_id
+            for order_data in orders_data
+            if order_data.order
+            for warehouse_id in order_data.unique_warehouse_ids
+        ]
         stocks = Stock.objects.filter(
             warehouse__id__in=warehouse_ids, product_variant__id__in=variant_ids
         ).all()
@@ -1991,10 +1993,11 @@ class OrderBulkCreate(BaseMutation, I18nMixin):
         }
 
         for order_data in orders_data:
-            # Create a copy of stocks. If full iteration over order lines
-            # and fulfillments will not produce error, which disqualify whole order,
-            # than replace the copy with original stocks.
-            stocks_map_copy = copy.deepcopy(stocks_map)
+            # Collect the stock changes of the order separately. If full iteration over
+            # order lines and fulfillments will not produce error, which disqualify
+            # whole order, than apply the changes to the stocks.
+            quantity_changes: Dict[str, int] = defaultdict(int)
+            quantity_allocated_changes: Dict[str, int] = defaultdict(int)
             line_index = 0
             for line in order_data.lines:
                 order_line = line.line
@@ -2019,7 +2022,8 @@ class OrderBulkCreate(BaseMutation, I18nMixin):
                     order_data.is_critical_error = True
                     break
 
-                stock = stocks_map_copy.get(f"{variant_id}_{warehouse_id}")
+                stock_key = f"{variant_id}_{warehouse_id}"
+                stock = stocks_map.get(stock_key)
                 if not stock:
                     order_data.errors.append(
                         OrderBulkError(
@@ -2033,7 +2037,9 @@ class OrderBulkCreate(BaseMutation, I18nMixin):
                     order_data.is_critical_error = True
                     break
 
-                available_quantity = stock.quantity - stock.quantity_allocated
+                available_quantity = (stock.quantity + quantity_changes[stock_key]) - (
+                    stock.quantity_allocated + quantity_allocated_changes[stock_key]
+                )
                 if (
                     quantity_to_fulfill > available_quantity
                     and stock_update_policy != StockUpdatePolicy.FORCE
@@ -2049,17 +2055,20 @@ class OrderBulkCreate(BaseMutation, I18nMixin):
                     )
                     order_data.is_critical_error = True
 
-                stock.quantity_allocated += quantity_to_allocate
+                quantity_allocated_changes[stock_key] += quantity_to_allocate
 
                 fulfillment_lines: List[OrderBulkFulfillmentLine] = (
                     order_data.orderline_fulfillmentlines_map.get(order_line.id) or []
                 )
                 for fulfillment_line in fulfillment_lines:
-                    stock.quantity -= fulfillment_line.line.quantity
+                    quantity_changes[stock_key] -= fulfillment_line.line.quantity
                 line_index += 1
 
             if not order_data.is_critical_error:
-                stocks_map = stocks_map_copy
+                for stock_key, quantity_change in quantity_changes.items():
+                    stocks_map[stock_key].quantity += quantity_change
+                for stock_key, quantity_change in quantity_allocated_changes.items():
+                    stocks_map[stock_key].quantity_allocated += quantity_change
 
         return [stock for stock in stocks_map.values()]
 
@@ -2097,14 +2106,12 @@ class OrderBulkCreate(BaseMutation, I18nMixin):
         orders = [order_data.order for order_data in orders_data if order_data.order]
         Order.objects.bulk_create(orders)
 
-        order_lines: List[OrderLine] = sum(
-            [
-                order_data.all_order_lines
-                for order_data in orders_data
-                if order_data.order
-            ],
-            [],
-        )
+        order_lines: List[OrderLine] = [
+            order_line
+            for order_data in orders_data
+            if order_data.order
+            for order_line in order_data.all_order_lines
+        ]
         OrderLine.objects.bulk_create(order_lines)
 
         notes = [
@@ -2124,57 +2131,71 @@ class OrderBulkCreate(BaseMutation, I18nMixin):
         Fulfillment.objects.bulk_create(fulfillments)
         for order_data in orders_data:
             order_data.set_fulfillment_id()
-        fulfillment_lines: List[FulfillmentLine] = sum(
-            [
-                order_data.all_fulfillment_lines
-                for order_data in orders_data
-                if order_data.order
-            ],
-            [],
-        )
+        fulfillment_lines: List[FulfillmentLine] = [
+            fulfillment_line
+            for order_data in orders_data
+            if order_data.order
+            for fulfillment_line in order_data.all_fulfillment_lines
+        ]
         FulfillmentLine.objects.bulk_create(fulfillment_lines)
 
         Stock.objects.bulk_update(stocks, ["quantity"])
 
-        transactions: List[TransactionItem] = sum(
-            [
-                order_data.all_transactions
-                for order_data in orders_data
-                if order_data.order
-            ],
-            [],
-        )
+        transactions: List[TransactionItem] = [
+            transaction_item
+            for order_data in orders_data
+            if order_data.order
+            for transaction_item in order_data.all_transactions
+        ]
         TransactionItem.objects.bulk_create(transactions)
         for order_data in orders_data:
             order_data.set_transaction_id()
-        transaction_events: List[TransactionEvent] = sum(
-            [
-                order_data.all_transaction_events
-                for order_data in orders_data
-                if order_data.order
-            ],
-            [],
-        )
+        transaction_events: List[TransactionEvent] = [
+            transaction_event
+            for order_data in orders_data
+            if order_data.order
+            for transaction_event in order_data.all_transaction_events
+        ]
         TransactionEvent.objects.bulk_create(transaction_events)
 
-        invoices: List[Invoice] = sum(
-            [order_data.all_invoices for order_data in orders_data if order_data.order],
-            [],
-        )
+        invoices: List[Invoice] = [
+            invoice
+            for order_data in orders_data
+            if order_data.order
+            for invoice in order_data.all_invoices
+        ]
         Invoice.objects.bulk_create(invoices)
 
-        discounts: List[OrderDiscount] = sum(
-            [
-                order_data.all_discounts
-                for order_data in orders_data
-                if order_data.order
-            ],
-            [],
-        )
+        discounts: List[OrderDiscount] = [
+            discount
+            for order_data in orders_data
+            if order_data.order
+            for discount in order_data.all_discounts
+        ]
         OrderDiscount.objects.bulk_create(discounts)
 
+        order_gift_cards = [
+            order_gift_card
+            for order_data in orders_data
+            if order_data.order
+            for order_gift_card in order_data.all_order_gift_cards
+        ]
+        Order.gift_cards.through.objects.bulk_create(order_gift_cards)
+
+        # prefetch the objects used by amounts and search vector updates for all
+        # orders at once, instead of fetching them for every order separately
+        prefetch_related_objects(
+            orders,
+            "user",
+            "billing_address",
+            "shipping_address",
+            "payments",
+            "discounts",
+            "lines",
+            "payment_transactions__events",
+            "granted_refunds",
+        )
         for order_data in orders_data:
-            order_data.link_gift_cards()
             order_data.post_create_order_update()
 
         Order.objects.bulk_update(
@@ -2192,16 +2213,19 @@ class OrderBulkCreate(BaseMutation, I18nMixin):
         return orders_data
 
     @classmethod
-    def perform_mutation(cls, _root, info: ResolveInfo, /, **data):
-        orders_input = data["orders"]
-        if len(orders_input) > MAX_ORDERS:
-            error = OrderBulkError(
-                message=f"Number of orders exceeds limit: {MAX_ORDERS}.",
-                code=OrderBulkCreateErrorCode.BULK_LIMIT,
-            )
-            result = OrderBulkCreateResult(order=None, error=error)
-            return OrderBulkCreate(count=0, results=result)
-
+    def create_orders(
+        cls,
+        orders_input: List[Dict[str, Any]],
+        manager: "PluginsManager",
+        error_policy: str = ErrorPolicy.REJECT_EVERYTHING,
+        stock_update_policy: str = StockUpdatePolicy.UPDATE,
+    ) -> List[OrderBulkCreateData]:
+        """Validate and save the given orders in a single transaction.
+
+        The referenced objects are fetched and the orders are saved with a fixed number
+        of queries, so the orders imported with the `import_orders` command can be
+        processed in chunks bigger than the mutation limit.
+        """
         orders_data: List[OrderBulkCreateData] = []
         with traced_atomic_transaction():
             # Create dictionary, which stores already resolved objects:
@@ -2211,26 +2235,41 @@ class OrderBulkCreate(BaseMutation, I18nMixin):
             for order_input in orders_input:
                 orders_data.append(cls.create_single_order(order_input, object_storage))
 
-            error_policy = data.get("error_policy") or ErrorPolicy.REJECT_EVERYTHING
-            stock_update_policy = (
-                data.get("stock_update_policy") or StockUpdatePolicy.UPDATE
-            )
             stocks: List[Stock] = []
-
             cls.handle_error_policy(orders_data, error_policy)
             if stock_update_policy != StockUpdatePolicy.SKIP:
                 stocks = cls.handle_stocks(orders_data, stock_update_policy)
             cls.save_data(orders_data, stocks)
 
-            manager = get_plugin_manager_promise(info.context).get()
             if created_orders := [
                 order_data.order for order_data in orders_data if order_data.order
             ]:
                 cls.call_event(manager.order_bulk_created, created_orders)
+        return orders_data
+
+    @classmethod
+    def perform_mutation(cls, _root, info: ResolveInfo, /, **data):
+        orders_input = data["orders"]
+        if len(orders_input) > MAX_ORDERS:
+            error = OrderBulkError(
+                message=f"Number of orders exceeds limit: {MAX_ORDERS}.",
+                code=OrderBulkCreateErrorCode.BULK_LIMIT,
+            )
+            result = OrderBulkCreateResult(order=None, error=error)
+            return OrderBulkCreate(count=0, results=result)
 
-            results = [
-                OrderBulkCreateResult(order=order_data.order, errors=order_data.errors)
-                for order_data in orders_data
-            ]
-            count = sum([order_data.order is not None for order_data in orders_data])
-            return OrderBulkCreate(count=count, results=results)
+        manager = get_plugin_manager_promise(info.context).get()
+        orders_data = cls.create_orders(
+            orders_input,
+            manager,
+            error_policy=data.get("error_policy") or ErrorPolicy.REJECT_EVERYTHING,
+            stock_update_policy=(
+                data.get("stock_update_policy") or StockUpdatePolicy.UPDATE
+            ),
+        )
+        results = [
+            OrderBulkCreateResult(order=order_data.order, errors=order_data.errors)
+            for order_data in orders_data
+        ]
+        count = sum([order_data.order is not None for order_data in orders_data])
+        return OrderBulkCreate(count=count, results=results)
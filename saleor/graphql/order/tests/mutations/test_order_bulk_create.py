@@ -1,10 +1,14 @@
 import copy
+import json
 from datetime import timedelta
 from decimal import Decimal
+from io import StringIO
 from unittest.mock import patch
 
 import graphene
 import pytest
+from django.core.management import call_command
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
 
 from .....account.models import Address
@@ -17,6 +21,7 @@ from .....order import (
     OrderEvents,
     OrderOrigin,
     OrderStatus,
+    StockUpdatePolicy,
 )
 from .....order.error_codes import OrderBulkCreateErrorCode
 from .....order.models import (
@@ -3497,3 +3502,39 @@ def test_order_bulk_create_error_invalid_status(
     assert error["message"] == "Invalid order status."
     assert error["path"] == "status"
     assert error["code"] == OrderBulkCreateErrorCode.INVALID.name
+
+
+def test_import_orders_command(order_bulk_input, tmp_path):
+    # given
+    invalid_order = copy.deepcopy(order_bulk_input)
+    invalid_order["status"] = "INVALID"
+    orders_file = tmp_path / "orders.ndjson"
+    orders_file.write_text(
+        "\n".join(
+            [
+                json.dumps(order_bulk_input, cls=DjangoJSONEncoder),
+                "not a json",
+                json.dumps(invalid_order, cls=DjangoJSONEncoder),
+            ]
+        )
+    )
+    stdout, stderr = StringIO(), StringIO()
+
+    # when
+    call_command(
+        "import_orders",
+        str(orders_file),
+        "--stock-update-policy",
+        StockUpdatePolicy.SKIP,
+        stdout=stdout,
+        stderr=stderr,
+    )
+
+    # then
+    order = Order.objects.get()
+    assert order.origin == OrderOrigin.BULK_CREATE
+    assert order.lines.count() == 1
+    assert "Created 1 of 1 orders." in stdout.getvalue()
+    errors = stderr.getvalue()
+    assert "Line 2: Invalid JSON" in errors
+    assert "Line 3:" in errors
@@ -12,7 +12,7 @@ from ...plugins.manager import PluginsManager
 from ...product.models import Product, ProductChannelListing, ProductVariant
 from ...shipping.interface import ShippingMethodData
 from ...shipping.utils import convert_to_shipping_method_data
-from ...warehouse.availability import check_stock_and_preorder_quantity
+from ...warehouse.availability import check_stock_and_preorder_quantity_in_orders
 from ..core.validators import validate_variants_available_in_channel
 
 if TYPE_CHECKING:
@@ -131,6 +131,7 @@ def validate_shipping_address(order: "Order", errors: T_ERRORS):
 
 
 def validate_order_lines(order: "Order", country: str, errors: T_ERRORS):
+    variants, quantities = [], []
     for line in order.lines.all():
         if line.variant is None:
             errors["lines"].append(
@@ -140,14 +141,18 @@ def validate_order_lines(order: "Order", country: str, errors: T_ERRORS):
                 )
             )
         elif line.variant.track_inventory:
-            try:
-                check_stock_and_preorder_quantity(
-                    line.variant, country, order.channel.slug, line.quantity
-                )
-            except InsufficientStock as exc:
-                errors["lines"].extend(
-                    prepare_insufficient_stock_order_validation_errors(exc)
-                )
+            variants.append(line.variant)
+            quantities.append(line.quantity)
+
+    if variants:
+        try:
+            check_stock_and_preorder_quantity_in_orders(
+                variants, quantities, country, order.channel.slug
+            )
+        except InsufficientStock as exc:
+            errors["lines"].extend(
+                prepare_insufficient_stock_order_validation_errors(exc)
+            )
 
 
 def validate_variants_is_available(order: "Order", errors: T_ERRORS):
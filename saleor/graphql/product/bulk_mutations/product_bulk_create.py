@@ -12,6 +12,7 @@ from django.utils.text import slugify
 from graphene.utils.str_converters import to_camel_case
 from text_unidecode import unidecode
 
+from ....attribute.facets import update_products_attribute_facets
 from ....core.tracing import traced_atomic_transaction
 from ....core.utils import prepare_unique_slug
 from ....core.utils.editorjs import clean_editor_js
@@ -19,7 +20,9 @@ from ....core.utils.validators import get_oembed_data
 from ....permission.enums import ProductPermissions
 from ....product import ProductMediaTypes, models
 from ....product.error_codes import ProductBulkCreateErrorCode
+from ....product.search_invalidation import set_product_search_index_dirty
 from ....product.tasks import update_products_discounted_prices_task
+from ....thumbnail.tasks import schedule_product_media_thumbnails
 from ....thumbnail.utils import get_filename_from_url
 from ....warehouse.models import Warehouse
 from ....webhook.event_types import WebhookEventAsyncType
@@ -640,7 +643,7 @@ class ProductBulkCreate(BaseMutation):
                     instance, metadata_list, private_metadata_list
                 )
                 cls.clean_instance(info, instance)
-                instance.search_index_dirty = True
+                set_product_search_index_dirty(instance)
 
                 instances_data_and_errors_list.append(
                     {
@@ -754,10 +757,15 @@ class ProductBulkCreate(BaseMutation):
 
         models.Product.objects.bulk_create(products_to_create)
         models.ProductMedia.objects.bulk_create(media_to_create)
+        schedule_product_media_thumbnails(media_to_create)
         models.ProductChannelListing.objects.bulk_create(listings_to_create)
 
         for product, attributes in attributes_to_save:
-            AttributeAssignmentMixin.save(product, attributes)
+            AttributeAssignmentMixin.save(product, attributes, update_facets=False)
+        if attributes_to_save:
+            update_products_attribute_facets(
+                [product.pk for product, _ in attributes_to_save]
+            )
 
         if variants_input_data:
             variants = cls.save_variants(info, variants_input_data)
@@ -8,10 +8,15 @@ from django.db.models import F
 from graphene.utils.str_converters import to_camel_case
 
 from ....attribute import AttributeType
+from ....attribute.facets import update_products_attribute_facets
 from ....core.tracing import traced_atomic_transaction
 from ....permission.enums import ProductPermissions
 from ....product import models
 from ....product.error_codes import ProductVariantBulkErrorCode
+from ....product.search_invalidation import (
+    SEARCH_INDEX_DIRTY_FIELDS,
+    set_product_search_index_dirty,
+)
 from ....product.tasks import update_product_discounted_price_task
 from ....warehouse import models as warehouse_models
 from ....webhook.event_types import WebhookEventAsyncType
@@ -893,7 +898,11 @@ class ProductVariantBulkCreate(BaseMutation):
         models.ProductVariant.objects.bulk_create(variants_to_create)
 
         for variant, attributes in attributes_to_save:
-            AttributeAssignmentMixin.save(variant, attributes)
+            AttributeAssignmentMixin.save(variant, attributes, update_facets=False)
+        if attributes_to_save:
+            update_products_attribute_facets(
+                {variant.product_id for variant, _ in attributes_to_save}
+            )
 
         warehouse_models.Stock.objects.bulk_create(stocks_to_create)
         models.ProductVariantChannelListing.objects.bulk_create(listings_to_create)
@@ -919,8 +928,8 @@ class ProductVariantBulkCreate(BaseMutation):
     def post_save_actions(cls, info, instances, product):
         # Recalculate the "discounted price" for the parent product
         update_product_discounted_price_task.delay(product.pk)
-        product.search_index_dirty = True
-        product.save(update_fields=["search_index_dirty"])
+        set_product_search_index_dirty(product)
+        product.save(update_fields=SEARCH_INDEX_DIRTY_FIELDS)
 
         webhooks = get_webhooks_for_event(WebhookEventAsyncType.PRODUCT_VARIANT_CREATED)
         manager = get_plugin_manager_promise(info.context).get()
@@ -6,10 +6,15 @@ from django.core.exceptions import ValidationError
 from django.db.models import F
 from graphene.utils.str_converters import to_camel_case
 
+from ....attribute.facets import update_products_attribute_facets
 from ....core.tracing import traced_atomic_transaction
 from ....permission.enums import ProductPermissions
 from ....product import models
 from ....product.error_codes import ProductErrorCode, ProductVariantBulkErrorCode
+from ....product.search_invalidation import (
+    SEARCH_INDEX_DIRTY_FIELDS,
+    set_product_search_index_dirty,
+)
 from ....product.tasks import update_product_discounted_price_task
 from ....warehouse import models as warehouse_models
 from ....webhook.event_types import WebhookEventAsyncType
@@ -641,6 +646,7 @@ class ProductVariantBulkUpdate(BaseMutation):
         listings_to_create: list = []
         listings_to_update: list = []
         listings_to_remove: list = []
+        updated_attributes_product_ids: set = set()
 
         # prepare instances
         for variant_data in variants_data_with_errors_list:
@@ -667,7 +673,8 @@ class ProductVariantBulkUpdate(BaseMutation):
                     listings_to_remove += to_remove
 
             if attributes := cleaned_input.get("attributes"):
-                AttributeAssignmentMixin.save(variant, attributes)
+                AttributeAssignmentMixin.save(variant, attributes, update_facets=False)
+                updated_attributes_product_ids.add(variant.product_id)
 
         # perform db queries
         models.ProductVariant.objects.bulk_update(
@@ -694,6 +701,8 @@ class ProductVariantBulkUpdate(BaseMutation):
         models.ProductVariantChannelListing.objects.filter(
             id__in=listings_to_remove
         ).delete()
+        if updated_attributes_product_ids:
+            update_products_attribute_facets(updated_attributes_product_ids)
 
     @classmethod
     def post_save_actions(cls, info, instances, product):
@@ -701,8 +710,8 @@ class ProductVariantBulkUpdate(BaseMutation):
 
         # Recalculate the "discounted price" for the parent product
         update_product_discounted_price_task.delay(product.pk)
-        product.search_index_dirty = True
-        product.save(update_fields=["search_index_dirty"])
+        set_product_search_index_dirty(product)
+        product.save(update_fields=SEARCH_INDEX_DIRTY_FIELDS)
 
         webhooks = get_webhooks_for_event(WebhookEventAsyncType.PRODUCT_VARIANT_UPDATED)
         for instance in instances:
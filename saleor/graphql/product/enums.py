@@ -57,3 +57,12 @@ class VariantAttributeScope(BaseEnum):
 
     class Meta:
         doc_category = DOC_CATEGORY_PRODUCTS
+
+
+class SearchSuggestionKind(BaseEnum):
+    PRODUCT = "product"
+    CATEGORY = "category"
+    COLLECTION = "collection"
+
+    class Meta:
+        doc_category = DOC_CATEGORY_PRODUCTS
@@ -13,14 +13,8 @@ from django.db.models.functions import Cast, Coalesce
 from django.utils import timezone
 
 from ...attribute import AttributeInputType
-from ...attribute.models import (
-    AssignedProductAttribute,
-    AssignedProductAttributeValue,
-    AssignedVariantAttribute,
-    AssignedVariantAttributeValue,
-    Attribute,
-    AttributeValue,
-)
+from ...attribute.facets import get_product_ids_by_attribute_values
+from ...attribute.models import Attribute, AttributeValue, ProductAttributeFacet
 from ...channel.models import Channel
 from ...product import ProductTypeKind
 from ...product.models import (
@@ -205,65 +199,14 @@ def _clean_product_attributes_boolean_filter_input(filter_value, queries):
 
 
 def filter_products_by_attributes_values(qs, queries: T_PRODUCT_FILTER_QUERIES):
-    filters = []
-    for values in queries.values():
-        assigned_product_attribute_values = (
-            AssignedProductAttributeValue.objects.filter(value_id__in=values)
-        )
-        assigned_product_attributes = AssignedProductAttribute.objects.filter(
-            Exists(
-                assigned_product_attribute_values.filter(assignment_id=OuterRef("pk"))
-            )
-        )
-        product_attribute_filter = Q(
-            Exists(assigned_product_attributes.filter(product_id=OuterRef("pk")))
-        )
-
-        assigned_variant_attribute_values = (
-            AssignedVariantAttributeValue.objects.filter(value_id__in=values)
-        )
-        assigned_variant_attributes = AssignedVariantAttribute.objects.filter(
-            Exists(
-                assigned_variant_attribute_values.filter(assignment_id=OuterRef("pk"))
-            )
-        )
-        product_variants = ProductVariant.objects.filter(
-            Exists(assigned_variant_attributes.filter(variant_id=OuterRef("pk")))
-        )
-        variant_attribute_filter = Q(
-            Exists(product_variants.filter(product_id=OuterRef("pk")))
-        )
-
-        filters.append(product_attribute_filter | variant_attribute_filter)
-
-    return qs.filter(*filters)
+    if not queries:
+        return qs
+    return qs.filter(pk__in=get_product_ids_by_attribute_values(queries))
 
 
 def filter_products_by_attributes_values_qs(qs, values_qs):
-    assigned_product_attribute_values = AssignedProductAttributeValue.objects.filter(
-        value__in=values_qs
-    )
-    assigned_product_attributes = AssignedProductAttribute.objects.filter(
-        Exists(assigned_product_attribute_values.filter(assignment_id=OuterRef("pk")))
-    )
-    product_attribute_filter = Q(
-        Exists(assigned_product_attributes.filter(product_id=OuterRef("pk")))
-    )
-
-    assigned_variant_attribute_values = AssignedVariantAttributeValue.objects.filter(
-        value__in=values_qs
-    )
-    assigned_variant_attributes = AssignedVariantAttribute.objects.filter(
-        Exists(assigned_variant_attribute_values.filter(assignment_id=OuterRef("pk")))
-    )
-    product_variants = ProductVariant.objects.filter(
-        Exists(assigned_variant_attributes.filter(variant_id=OuterRef("pk")))
-    )
-    variant_attribute_filter = Q(
-        Exists(product_variants.filter(product_id=OuterRef("pk")))
-    )
-
-    return qs.filter(product_attribute_filter | variant_attribute_filter)
+    facets = ProductAttributeFacet.objects.filter(value__in=values_qs)
+    return qs.filter(Exists(facets.filter(product_id=OuterRef("pk"))))
 
 
 def filter_products_by_attributes(
@@ -357,7 +300,8 @@ def filter_products_by_collections(qs, collection_pks):
     return qs.filter(Exists(collection_products.filter(product_id=OuterRef("pk"))))
 
 
-def filter_products_by_stock_availability(qs, stock_availability, channel_slug):
+def get_variants_in_stock(channel_slug):
+    """Return variants having any stock available in the given channel."""
     allocations = (
         Allocation.objects.values("stock_id")
         .filter(quantity_allocated__gt=0, stock_id=OuterRef("pk"))
@@ -384,10 +328,13 @@ def filter_products_by_stock_availability(qs, stock_availability, channel_slug):
         )
         .values("product_variant_id")
     )
-    variants = ProductVariant.objects.filter(
+    return ProductVariant.objects.filter(
         Exists(stocks.filter(product_variant_id=OuterRef("pk")))
     ).values("product_id")
 
+
+def filter_products_by_stock_availability(qs, stock_availability, channel_slug):
+    variants = get_variants_in_stock(channel_slug)
     if stock_availability == StockAvailability.IN_STOCK:
         qs = qs.filter(Exists(variants.filter(product_id=OuterRef("pk"))))
     if stock_availability == StockAvailability.OUT_OF_STOCK:
@@ -11,6 +11,7 @@ from ....core.tracing import traced_atomic_transaction
 from ....permission.enums import ProductPermissions, ProductTypePermissions
 from ....product import models
 from ....product.error_codes import ProductErrorCode
+from ....product.search_invalidation import mark_products_search_index_dirty
 from ...attribute.mutations import (
     BaseReorderAttributesMutation,
     BaseReorderAttributeValuesMutation,
@@ -357,7 +358,7 @@ class ProductAttributeUnassign(BaseMutation):
         cls.save_field_values(product_type, "product_attributes", attribute_pks)
         cls.save_field_values(product_type, "variant_attributes", attribute_pks)
 
-        product_type.products.all().update(search_index_dirty=True)
+        mark_products_search_index_dirty(product_type.products.all())
 
         return cls(product_type=product_type)
 
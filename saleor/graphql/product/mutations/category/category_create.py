@@ -5,6 +5,7 @@ from .....core.utils.editorjs import clean_editor_js
 from .....permission.enums import ProductPermissions
 from .....product import models
 from .....product.error_codes import ProductErrorCode
+from .....product.search_suggestions import update_categories_search_suggestions
 from ....core import ResolveInfo
 from ....core.descriptions import ADDED_IN_38, RICH_CONTENT
 from ....core.doc_category import DOC_CATEGORY_PRODUCTS
@@ -102,6 +103,11 @@ class CategoryCreate(ModelMutation):
         data["input"]["parent_id"] = parent_id
         return super().perform_mutation(root, info, **data)
 
+    @classmethod
+    def save(cls, info: ResolveInfo, instance, cleaned_input):
+        super().save(info, instance, cleaned_input)
+        update_categories_search_suggestions([instance])
+
     @classmethod
     def post_save_action(cls, info: ResolveInfo, instance, _cleaned_input):
         manager = get_plugin_manager_promise(info.context).get()
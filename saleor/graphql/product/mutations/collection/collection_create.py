@@ -8,6 +8,7 @@ from .....core.utils.date_time import convert_to_utc_date_time
 from .....permission.enums import ProductPermissions
 from .....product import models
 from .....product.error_codes import CollectionErrorCode
+from .....product.search_suggestions import update_collections_search_suggestions
 from ....channel import ChannelContext
 from ....core import ResolveInfo
 from ....core.descriptions import ADDED_IN_38, DEPRECATED_IN_3X_INPUT, RICH_CONTENT
@@ -111,6 +112,11 @@ class CollectionCreate(ModelMutation):
         clean_seo_fields(cleaned_input)
         return cleaned_input
 
+    @classmethod
+    def save(cls, info: ResolveInfo, instance, cleaned_input):
+        super().save(info, instance, cleaned_input)
+        update_collections_search_suggestions([instance])
+
     @classmethod
     def post_save_action(cls, info: ResolveInfo, instance, cleaned_input):
         manager = get_plugin_manager_promise(info.context).get()
@@ -9,6 +9,7 @@ from .....core.utils.editorjs import clean_editor_js
 from .....permission.enums import ProductPermissions
 from .....product import models
 from .....product.error_codes import ProductErrorCode
+from .....product.search_invalidation import set_product_search_index_dirty
 from .....product.tasks import update_product_discounted_price_task
 from ....attribute.types import AttributeValueInput
 from ....attribute.utils import AttributeAssignmentMixin, AttrValuesInput
@@ -205,7 +206,7 @@ class ProductCreate(ModelMutation):
     @classmethod
     def save(cls, info: ResolveInfo, instance, cleaned_input):
         with traced_atomic_transaction():
-            instance.search_index_dirty = True
+            set_product_search_index_dirty(instance)
             instance.save()
             attributes = cleaned_input.get("attributes")
             if attributes:
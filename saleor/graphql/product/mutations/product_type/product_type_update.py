@@ -2,6 +2,7 @@ import graphene
 
 from .....permission.enums import ProductTypePermissions
 from .....product import models
+from .....product.search_invalidation import mark_products_search_index_dirty
 from .....product.tasks import update_variants_names
 from ....core import ResolveInfo
 from ....core.types import ProductError
@@ -43,6 +44,6 @@ class ProductTypeUpdate(ProductTypeCreate):
             "product_attributes" in cleaned_input
             or "variant_attributes" in cleaned_input
         ):
-            models.Product.objects.filter(product_type=instance).update(
-                search_index_dirty=True
+            mark_products_search_index_dirty(
+                models.Product.objects.filter(product_type=instance)
             )
@@ -11,6 +11,10 @@ from .....core.tracing import traced_atomic_transaction
 from .....permission.enums import ProductPermissions
 from .....product import models
 from .....product.error_codes import ProductErrorCode
+from .....product.search_invalidation import (
+    SEARCH_INDEX_DIRTY_FIELDS,
+    set_product_search_index_dirty,
+)
 from .....product.tasks import update_product_discounted_price_task
 from .....product.utils.variants import generate_and_set_variant_name
 from ....attribute.types import AttributeValueInput
@@ -328,8 +332,8 @@ class ProductVariantCreate(ModelMutation):
                 generate_and_set_variant_name(instance, cleaned_input.get("sku"))
 
             manager = get_plugin_manager_promise(info.context).get()
-            instance.product.search_index_dirty = True
-            instance.product.save(update_fields=["search_index_dirty"])
+            set_product_search_index_dirty(instance.product)
+            instance.product.save(update_fields=SEARCH_INDEX_DIRTY_FIELDS)
             event_to_call = (
                 manager.product_variant_created
                 if new_variant
@@ -12,6 +12,10 @@ from .....order import models as order_models
 from .....order.tasks import recalculate_orders_task
 from .....permission.enums import ProductPermissions
 from .....product import models
+from .....product.search_invalidation import (
+    SEARCH_INDEX_DIRTY_FIELDS,
+    set_product_search_index_dirty,
+)
 from .....product.tasks import update_product_discounted_price_task
 from ....app.dataloaders import get_app_promise
 from ....channel import ChannelContext
@@ -53,8 +57,8 @@ class ProductVariantDelete(ModelDeleteMutation, ModelWithExtRefMutation):
         # Update the "discounted_prices" of the parent product
         update_product_discounted_price_task.delay(instance.product_id)
         product = models.Product.objects.get(id=instance.product_id)
-        product.search_index_dirty = True
-        product.save(update_fields=["search_index_dirty"])
+        set_product_search_index_dirty(product)
+        product.save(update_fields=SEARCH_INDEX_DIRTY_FIELDS)
         # if the product default variant has been removed set the new one
         if not product.default_variant:
             product.default_variant = product.variants.first()
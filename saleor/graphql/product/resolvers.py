@@ -6,7 +6,8 @@ from ...order.models import Order
 from ...permission.utils import has_one_of_permissions
 from ...product import models
 from ...product.models import ALL_PRODUCTS_PERMISSIONS
-from ..channel import ChannelQsContext
+from ...product.search_suggestions import get_search_suggestions
+from ..channel import ChannelContext, ChannelQsContext
 from ..core import ResolveInfo
 from ..core.context import get_database_connection_name
 from ..core.tracing import traced_resolver
@@ -215,3 +216,19 @@ def resolve_report_product_sales(info, period, channel_slug) -> ChannelQsContext
     qs = qs.order_by("-quantity_ordered")
 
     return ChannelQsContext(qs=qs, channel_slug=channel_slug)
+
+
+@traced_resolver
+def resolve_search_suggestions(
+    info: ResolveInfo, requestor, search: str, channel_slug, limit: int
+):
+    suggestions = get_search_suggestions(
+        search,
+        resolve_products(info, requestor, channel_slug=channel_slug).qs,
+        resolve_collections(info, channel_slug).qs,
+        limit,
+    )
+    return [
+        ChannelContext(node=suggestion, channel_slug=channel_slug)
+        for suggestion in suggestions
+    ]
@@ -1,4 +1,5 @@
 import graphene
+from graphql.error import GraphQLError
 
 from ...permission.enums import ProductPermissions
 from ...permission.utils import has_one_of_permissions
@@ -8,7 +9,12 @@ from ..channel import ChannelContext, ChannelQsContext
 from ..channel.utils import get_default_channel_slug_or_graphql_error
 from ..core import ResolveInfo
 from ..core.connection import create_connection_slice, filter_connection_queryset
-from ..core.descriptions import ADDED_IN_310, ADDED_IN_314, PREVIEW_FEATURE
+from ..core.descriptions import (
+    ADDED_IN_310,
+    ADDED_IN_314,
+    ADDED_IN_315,
+    PREVIEW_FEATURE,
+)
 from ..core.doc_category import DOC_CATEGORY_PRODUCTS
 from ..core.enums import ReportingPeriod
 from ..core.fields import (
@@ -117,6 +123,7 @@ from .resolvers import (
     resolve_product_variants,
     resolve_products,
     resolve_report_product_sales,
+    resolve_search_suggestions,
     resolve_variant,
 )
 from .sorters import (
@@ -140,8 +147,12 @@ from .types import (
     ProductVariant,
     ProductVariantCountableConnection,
 )
+from .types.search_suggestions import SearchSuggestion
 from .utils import check_for_sorting_by_rank
 
+DEFAULT_SEARCH_SUGGESTIONS_LIMIT = 10
+MAX_SEARCH_SUGGESTIONS_LIMIT = 50
+
 
 class ProductQueries(graphene.ObjectType):
     digital_content = PermissionsField(
@@ -317,6 +328,32 @@ class ProductQueries(graphene.ObjectType):
         ),
         doc_category=DOC_CATEGORY_PRODUCTS,
     )
+    search_suggestions = BaseField(
+        NonNullList(SearchSuggestion),
+        search=graphene.String(
+            required=True, description="Search value typed by the customer."
+        ),
+        channel=graphene.String(
+            description="Slug of a channel for which the data should be returned."
+        ),
+        first=graphene.Int(
+            description=(
+                "Number of suggestions to return, up to "
+                f"{MAX_SEARCH_SUGGESTIONS_LIMIT}. Defaults to "
+                f"{DEFAULT_SEARCH_SUGGESTIONS_LIMIT}."
+            )
+        ),
+        description=(
+            "Products, categories and collections completing the search value, "
+            "matched by the prefix of their names, SKUs and attribute values, or "
+            "by similarity when there are not enough of them. Requires one of the "
+            "following permissions to include the unpublished items: "
+            f"{', '.join([p.name for p in ALL_PRODUCTS_PERMISSIONS])}."
+            + ADDED_IN_315
+            + PREVIEW_FEATURE
+        ),
+        doc_category=DOC_CATEGORY_PRODUCTS,
+    )
     report_product_sales = ConnectionField(
         ProductVariantCountableConnection,
         period=graphene.Argument(
@@ -525,6 +562,24 @@ class ProductQueries(graphene.ObjectType):
             qs, info, kwargs, ProductVariantCountableConnection
         )
 
+    @staticmethod
+    def resolve_search_suggestions(
+        _root, info: ResolveInfo, *, search, channel=None, first=None
+    ):
+        limit = DEFAULT_SEARCH_SUGGESTIONS_LIMIT if first is None else first
+        if not 0 < limit <= MAX_SEARCH_SUGGESTIONS_LIMIT:
+            raise GraphQLError(
+                "The `first` argument must be between 1 and "
+                f"{MAX_SEARCH_SUGGESTIONS_LIMIT}."
+            )
+        requestor = get_user_or_app_from_context(info.context)
+        has_required_permissions = has_one_of_permissions(
+            requestor, ALL_PRODUCTS_PERMISSIONS
+        )
+        if channel is None and not has_required_permissions:
+            channel = get_default_channel_slug_or_graphql_error()
+        return resolve_search_suggestions(info, requestor, search, channel, limit)
+
     @staticmethod
     @traced_resolver
     def resolve_report_product_sales(
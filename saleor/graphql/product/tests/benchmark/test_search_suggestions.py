@@ -0,0 +1,42 @@
+import pytest
+
+from .....product.search_suggestions import (
+    update_categories_search_suggestions,
+    update_products_search_suggestions,
+)
+from ....tests.utils import get_graphql_content
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_search_suggestions(
+    api_client, product_list, category, count_queries, channel_USD
+):
+    update_products_search_suggestions(product_list)
+    update_categories_search_suggestions([category])
+    query = """
+        query ($search: String!, $channel: String) {
+          searchSuggestions(search: $search, channel: $channel, first: 5) {
+            kind
+            term
+            product {
+              id
+              name
+              slug
+            }
+            category {
+              id
+              name
+              slug
+            }
+            collection {
+              id
+              name
+              slug
+            }
+          }
+        }
+    """
+    variables = {"search": "tes", "channel": channel_USD.slug}
+    content = get_graphql_content(api_client.post_graphql(query, variables))
+    assert len(content["data"]["searchSuggestions"]) == 3
@@ -18,6 +18,7 @@ from .....product.models import (
 )
 from .....tests.utils import dummy_editorjs
 from .....thumbnail.models import Thumbnail
+from .....thumbnail.utils import cache_thumbnails
 from .....warehouse.models import Allocation, Stock
 from ....core.enums import ThumbnailFormatEnum
 from ....tests.utils import get_graphql_content, get_graphql_content_from_response
@@ -568,6 +569,35 @@ def test_query_product_thumbnail_with_size_and_thumbnail_url_returned(
     )
 
 
+def test_query_product_thumbnail_url_returned_from_cache(
+    staff_api_client, product_with_image, channel_USD, site_settings
+):
+    # given
+    product_media = product_with_image.media.first()
+    thumbnail_name = "thumbnails/cached_thumbnail_128.jpg"
+    cache_thumbnails(
+        [Thumbnail(product_media=product_media, size=128, image=thumbnail_name)]
+    )
+
+    id = graphene.Node.to_global_id("Product", product_with_image.pk)
+    variables = {
+        "id": id,
+        "size": 120,
+        "channel": channel_USD.slug,
+    }
+
+    # when
+    response = staff_api_client.post_graphql(QUERY_PRODUCT_BY_ID_WITH_MEDIA, variables)
+
+    # then
+    content = get_graphql_content(response)
+    data = content["data"]["product"]
+    assert (
+        data["thumbnail"]["url"]
+        == f"http://{site_settings.site.domain}/media/{thumbnail_name}"
+    )
+
+
 def test_query_product_thumbnail_only_format_provided_default_size_is_used(
     staff_api_client, product_with_image, channel_USD, site_settings
 ):
@@ -2373,7 +2403,8 @@ def test_fetch_all_products_with_availability_data(
     product_1_qty_allocated = 1
     product_1_stock = product_1.variants.first().stocks.first()
     product_1_stock.quantity = product_1_qty
-    product_1_stock.save(update_fields=["quantity"])
+    product_1_stock.quantity_allocated = product_1_qty_allocated
+    product_1_stock.save(update_fields=["quantity", "quantity_allocated"])
     allocations.append(
         Allocation(
             order_line=order_line,
@@ -2386,7 +2417,8 @@ def test_fetch_all_products_with_availability_data(
     product_2_qty_allocated = 2
     product_2_stock = product_2.variants.first().stocks.first()
     product_2_stock.quantity = product_2_qty
-    product_2_stock.save(update_fields=["quantity"])
+    product_2_stock.quantity_allocated = product_2_qty_allocated
+    product_2_stock.save(update_fields=["quantity", "quantity_allocated"])
     allocations.append(
         Allocation(
             order_line=order_line,
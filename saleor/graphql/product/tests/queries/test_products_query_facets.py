@@ -0,0 +1,101 @@
+import graphene
+
+from .....warehouse.models import Stock
+from ....tests.utils import get_graphql_content
+
+QUERY_PRODUCTS_FACETS = """
+    query (
+        $channel: String
+        $filter: ProductFilterInput
+        $attributes: [ID!]
+        $priceRanges: [PriceRangeInput!]
+    ) {
+        products(first: 1, channel: $channel, filter: $filter) {
+            totalCount
+            facets(attributes: $attributes, priceRanges: $priceRanges) {
+                attributes {
+                    attribute {
+                        slug
+                    }
+                    values {
+                        value {
+                            slug
+                        }
+                        count
+                    }
+                }
+                priceRanges {
+                    gte
+                    lte
+                    count
+                }
+                stockAvailability {
+                    availability
+                    count
+                }
+            }
+        }
+    }
+"""
+
+
+def test_products_query_facets(user_api_client, product_list, channel_USD):
+    # given
+    Stock.objects.filter(product_variant__product=product_list[2]).update(quantity=0)
+    attribute = product_list[0].product_type.product_attributes.first()
+    attribute_value = attribute.values.first()
+    variables = {
+        "channel": channel_USD.slug,
+        "attributes": [graphene.Node.to_global_id("Attribute", attribute.pk)],
+        "priceRanges": [{"lte": 15}, {"gte": 15, "lte": 30}, {"gte": 100}],
+    }
+
+    # when
+    response = user_api_client.post_graphql(QUERY_PRODUCTS_FACETS, variables)
+
+    # then
+    content = get_graphql_content(response)
+    data = content["data"]["products"]
+    assert data["totalCount"] == 3
+    assert data["facets"]["attributes"] == [
+        {
+            "attribute": {"slug": attribute.slug},
+            "values": [{"value": {"slug": attribute_value.slug}, "count": 3}],
+        }
+    ]
+    assert data["facets"]["priceRanges"] == [
+        {"gte": None, "lte": 15, "count": 1},
+        {"gte": 15, "lte": 30, "count": 2},
+        {"gte": 100, "lte": None, "count": 0},
+    ]
+    assert data["facets"]["stockAvailability"] == [
+        {"availability": "IN_STOCK", "count": 2},
+        {"availability": "OUT_OF_STOCK", "count": 1},
+    ]
+
+
+def test_products_query_facets_for_filtered_products(
+    user_api_client, product_list, channel_USD
+):
+    # given
+    variables = {
+        "channel": channel_USD.slug,
+        "filter": {"minimalPrice": {"gte": 15}},
+        "priceRanges": [{"lte": 15}, {"gte": 15}],
+    }
+
+    # when
+    response = user_api_client.post_graphql(QUERY_PRODUCTS_FACETS, variables)
+
+    # then
+    content = get_graphql_content(response)
+    facets = content["data"]["products"]["facets"]
+    assert facets["priceRanges"] == [
+        {"gte": None, "lte": 15, "count": 0},
+        {"gte": 15, "lte": None, "count": 2},
+    ]
+    assert facets["stockAvailability"] == [
+        {"availability": "IN_STOCK", "count": 2},
+        {"availability": "OUT_OF_STOCK", "count": 0},
+    ]
+    assert [value["count"] for value in facets["attributes"][0]["values"]] == [2]
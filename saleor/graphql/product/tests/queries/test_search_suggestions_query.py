@@ -0,0 +1,140 @@
+import graphene
+
+from .....product.models import ProductChannelListing
+from .....product.search_suggestions import (
+    update_categories_search_suggestions,
+    update_collections_search_suggestions,
+    update_products_search_suggestions,
+)
+from ....tests.utils import assert_graphql_error_with_message, get_graphql_content
+
+QUERY_SEARCH_SUGGESTIONS = """
+    query ($search: String!, $channel: String, $first: Int) {
+        searchSuggestions(search: $search, channel: $channel, first: $first) {
+            kind
+            term
+            product {
+                id
+            }
+            category {
+                id
+            }
+            collection {
+                id
+            }
+        }
+    }
+"""
+
+
+def test_search_suggestions(
+    api_client, product_list, category, published_collection, channel_USD
+):
+    # given
+    update_products_search_suggestions(product_list)
+    update_categories_search_suggestions([category])
+    update_collections_search_suggestions([published_collection])
+    variables = {"search": "test product 2", "channel": channel_USD.slug}
+
+    # when
+    response = api_client.post_graphql(QUERY_SEARCH_SUGGESTIONS, variables)
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["searchSuggestions"][0] == {
+        "kind": "PRODUCT",
+        "term": "test product 2",
+        "product": {"id": graphene.Node.to_global_id("Product", product_list[1].pk)},
+        "category": None,
+        "collection": None,
+    }
+
+
+def test_search_suggestions_of_category_and_collection(
+    api_client, category, published_collection, channel_USD
+):
+    # given
+    category.name = "Collection category"
+    category.save(update_fields=["name"])
+    update_categories_search_suggestions([category])
+    update_collections_search_suggestions([published_collection])
+    variables = {"search": "coll", "channel": channel_USD.slug}
+
+    # when
+    response = api_client.post_graphql(QUERY_SEARCH_SUGGESTIONS, variables)
+
+    # then
+    content = get_graphql_content(response)
+    suggestions = content["data"]["searchSuggestions"]
+    assert {suggestion["kind"] for suggestion in suggestions} == {
+        "CATEGORY",
+        "COLLECTION",
+    }
+
+
+def test_search_suggestions_skip_not_published_products(
+    api_client, product_list, channel_USD
+):
+    # given
+    update_products_search_suggestions(product_list)
+    ProductChannelListing.objects.filter(product=product_list[0]).update(
+        is_published=False
+    )
+    variables = {"search": "test product", "channel": channel_USD.slug}
+
+    # when
+    response = api_client.post_graphql(QUERY_SEARCH_SUGGESTIONS, variables)
+
+    # then
+    content = get_graphql_content(response)
+    assert {
+        suggestion["product"]["id"]
+        for suggestion in content["data"]["searchSuggestions"]
+    } == {
+        graphene.Node.to_global_id("Product", product.pk)
+        for product in product_list[1:]
+    }
+
+
+def test_search_suggestions_category_updated_by_mutation(
+    staff_api_client, category, permission_manage_products
+):
+    # given
+    query = """
+        mutation ($id: ID!, $name: String!) {
+            categoryUpdate(id: $id, input: {name: $name}) {
+                errors {
+                    field
+                }
+            }
+        }
+    """
+    variables = {
+        "id": graphene.Node.to_global_id("Category", category.pk),
+        "name": "Summer Shoes",
+    }
+
+    # when
+    response = staff_api_client.post_graphql(
+        query, variables, permissions=[permission_manage_products]
+    )
+
+    # then
+    get_graphql_content(response)
+    assert set(category.search_suggestions.values_list("term", flat=True)) == {
+        "summer shoes",
+        "shoes",
+    }
+
+
+def test_search_suggestions_invalid_first(api_client, channel_USD):
+    # given
+    variables = {"search": "test", "channel": channel_USD.slug, "first": 0}
+
+    # when
+    response = api_client.post_graphql(QUERY_SEARCH_SUGGESTIONS, variables)
+
+    # then
+    assert_graphql_error_with_message(
+        response, "The `first` argument must be between 1 and 50."
+    )
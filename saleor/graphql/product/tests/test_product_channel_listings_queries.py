@@ -5,6 +5,7 @@ import graphene
 import pytest
 
 from ....tax import TaxCalculationStrategy
+from ....tax.lookup import get_country_tax_rates
 from ....tax.models import TaxClassCountryRate, TaxConfigurationPerCountry
 from ....tax.utils import get_display_gross_prices
 from ....warehouse.models import Warehouse
@@ -155,9 +156,12 @@ query FetchProduct($id: ID, $channel: String) {
 """
 
 
-@mock.patch("saleor.graphql.product.types.products.get_tax_rate_for_tax_class")
+@mock.patch(
+    "saleor.graphql.tax.dataloaders.get_country_tax_rates",
+    wraps=get_country_tax_rates,
+)
 def test_product_channel_listing_pricing_field_no_address(
-    mock_get_tax_rate_for_tax_class,
+    mock_get_country_tax_rates,
     staff_api_client,
     permission_manage_products,
     channel_USD,
@@ -181,9 +185,7 @@ def test_product_channel_listing_pricing_field_no_address(
     )
 
     # then
-    assert (
-        mock_get_tax_rate_for_tax_class.call_args[0][3] == channel_USD.default_country
-    )
+    assert mock_get_country_tax_rates.call_args[0][0] == [channel_USD.default_country]
 
 
 FRAGMENT_PRICE = """
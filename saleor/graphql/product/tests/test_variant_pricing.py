@@ -8,6 +8,7 @@ from prices import Money, TaxedMoney
 from ....product.models import ProductVariant, ProductVariantChannelListing
 from ....product.utils.availability import get_variant_availability
 from ....tax import TaxCalculationStrategy
+from ....tax.lookup import get_country_tax_rates
 from ....tax.models import TaxClassCountryRate, TaxConfigurationPerCountry
 from ...tests.utils import get_graphql_content
 
@@ -380,10 +381,11 @@ QUERY_GET_PRODUCT_VARIANTS_PRICING_NO_ADDRESS = """
 
 
 @patch(
-    "saleor.graphql.product.types.products.get_tax_rate_for_tax_class",
+    "saleor.graphql.tax.dataloaders.get_country_tax_rates",
+    wraps=get_country_tax_rates,
 )
 def test_product_variant_price_no_address(
-    mock_get_tax_rate_for_tax_class, user_api_client, variant, stock, channel_USD
+    mock_get_country_tax_rates, user_api_client, variant, stock, channel_USD
 ):
     channel_USD.default_country = "FR"
     channel_USD.save()
@@ -392,9 +394,7 @@ def test_product_variant_price_no_address(
     user_api_client.post_graphql(
         QUERY_GET_PRODUCT_VARIANTS_PRICING_NO_ADDRESS, variables
     )
-    assert (
-        mock_get_tax_rate_for_tax_class.call_args[0][3] == channel_USD.default_country
-    )
+    assert mock_get_country_tax_rates.call_args[0][0] == [channel_USD.default_country]
 
 
 FRAGMENT_PRICE = """
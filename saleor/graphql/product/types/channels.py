@@ -1,5 +1,4 @@
 from dataclasses import asdict
-from decimal import Decimal
 from typing import List, Optional
 
 import graphene
@@ -14,11 +13,6 @@ from ....product.utils.costs import (
     get_margin_for_variant_channel_listing,
     get_product_costs_data,
 )
-from ....tax.utils import (
-    get_display_gross_prices,
-    get_tax_calculation_strategy,
-    get_tax_rate_for_tax_class,
-)
 from ...account import types as account_types
 from ...channel.dataloaders import ChannelByIdLoader
 from ...channel.types import Channel
@@ -29,11 +23,9 @@ from ...core.scalars import Date
 from ...core.tracing import traced_resolver
 from ...core.types import BaseObjectType, ModelObjectType
 from ...tax.dataloaders import (
+    CountryTaxRatesByCountryCodeLoader,
     TaxClassByProductIdLoader,
-    TaxClassCountryRateByTaxClassIDLoader,
-    TaxClassDefaultRateByCountryLoader,
-    TaxConfigurationByChannelId,
-    TaxConfigurationPerCountryByTaxConfigurationIDLoader,
+    TaxConfigurationSnapshotByChannelIdLoader,
 )
 from ..dataloaders import (
     ProductByIdLoader,
@@ -232,97 +224,51 @@ class ProductChannelListing(ModelObjectType[models.ProductChannelListing]):
         channel = ChannelByIdLoader(context).load(root.channel_id)
         product = ProductByIdLoader(context).load(root.product_id)
 
-        def load_tax_configuration(data):
+        def load_tax_data(data):
             channel, product = data
             country_code = get_active_country(channel, address_data=address)
 
-            def load_tax_country_exceptions(tax_config):
-                tax_class = TaxClassByProductIdLoader(info.context).load(product.id)
-                tax_configs_per_country = (
-                    TaxConfigurationPerCountryByTaxConfigurationIDLoader(context).load(
-                        tax_config.id
-                    )
-                )
-
-                def load_variant_channel_listings(data):
-                    tax_class, tax_configs_per_country = data
-
-                    def load_default_tax_rate(variants_channel_listing):
-                        if not variants_channel_listing:
-                            return None
-
-                        def calculate_pricing_info(data):
-                            country_rates, default_country_rate_obj = data
-
-                            tax_config_country = next(
-                                (
-                                    tc
-                                    for tc in tax_configs_per_country
-                                    if tc.country.code == country_code
-                                ),
-                                None,
-                            )
-                            display_gross_prices = get_display_gross_prices(
-                                tax_config,
-                                tax_config_country,
-                            )
-                            tax_calculation_strategy = get_tax_calculation_strategy(
-                                tax_config, tax_config_country
-                            )
-                            default_tax_rate = (
-                                default_country_rate_obj.rate
-                                if default_country_rate_obj
-                                else Decimal(0)
-                            )
-                            tax_rate = get_tax_rate_for_tax_class(
-                                tax_class, country_rates, default_tax_rate, country_code
-                            )
-                            prices_entered_with_tax = tax_config.prices_entered_with_tax
-
-                            availability = get_product_availability(
-                                product_channel_listing=root,
-                                variants_channel_listing=variants_channel_listing,
-                                prices_entered_with_tax=prices_entered_with_tax,
-                                tax_calculation_strategy=tax_calculation_strategy,
-                                tax_rate=tax_rate,
-                            )
-                            from .products import ProductPricingInfo
-
-                            pricing_info = asdict(availability)
-                            pricing_info["display_gross_prices"] = display_gross_prices
-                            return ProductPricingInfo(**pricing_info)
-
-                        country_rates = (
-                            TaxClassCountryRateByTaxClassIDLoader(context).load(
-                                tax_class.pk
-                            )
-                            if tax_class
-                            else []
-                        )
-                        default_country_rate = TaxClassDefaultRateByCountryLoader(
-                            context
-                        ).load(country_code)
-                        return Promise.all([country_rates, default_country_rate]).then(
-                            calculate_pricing_info
-                        )
-
-                    return (
-                        VariantsChannelListingByProductIdAndChannelSlugLoader(context)
-                        .load((root.product_id, channel.slug))
-                        .then(load_default_tax_rate)
-                    )
-
-                return Promise.all([tax_class, tax_configs_per_country]).then(
-                    load_variant_channel_listings
+            def calculate_pricing_info(data):
+                (
+                    tax_config,
+                    country_tax_rates,
+                    tax_class,
+                    variants_channel_listing,
+                ) = data
+                if not variants_channel_listing:
+                    return None
+
+                availability = get_product_availability(
+                    product_channel_listing=root,
+                    variants_channel_listing=variants_channel_listing,
+                    prices_entered_with_tax=tax_config.prices_entered_with_tax,
+                    tax_calculation_strategy=tax_config.get_tax_calculation_strategy(
+                        country_code
+                    ),
+                    tax_rate=country_tax_rates.get_rate(
+                        tax_class.pk if tax_class else None
+                    ),
                 )
+                from .products import ProductPricingInfo
+
+                pricing_info = asdict(availability)
+                pricing_info[
+                    "display_gross_prices"
+                ] = tax_config.get_display_gross_prices(country_code)
+                return ProductPricingInfo(**pricing_info)
+
+            return Promise.all(
+                [
+                    TaxConfigurationSnapshotByChannelIdLoader(context).load(channel.id),
+                    CountryTaxRatesByCountryCodeLoader(context).load(country_code),
+                    TaxClassByProductIdLoader(context).load(product.id),
+                    VariantsChannelListingByProductIdAndChannelSlugLoader(context).load(
+                        (root.product_id, channel.slug)
+                    ),
+                ]
+            ).then(calculate_pricing_info)
 
-            return (
-                TaxConfigurationByChannelId(context)
-                .load(channel.id)
-                .then(load_tax_country_exceptions)
-            )
-
-        return Promise.all([channel, product]).then(load_tax_configuration)
+        return Promise.all([channel, product]).then(load_tax_data)
 
 
 class PreorderThreshold(BaseObjectType):
@@ -0,0 +1,209 @@
+from typing import List, Optional
+
+import graphene
+from django.db.models import Count, Exists, OuterRef, Q, Subquery
+
+from ....attribute import models as attribute_models
+from ....attribute.facets import get_attribute_facet_counts
+from ....product import models
+from ...attribute.dataloaders import AttributesByAttributeId, AttributeValueByIdLoader
+from ...attribute.types import Attribute, AttributeValue
+from ...channel import ChannelQsContext
+from ...core.descriptions import ADDED_IN_315, PREVIEW_FEATURE
+from ...core.doc_category import DOC_CATEGORY_PRODUCTS
+from ...core.types import BaseObjectType, NonNullList
+from ...utils import get_user_or_app_from_context, resolve_global_ids_to_primary_keys
+from ..enums import StockAvailability
+from ..filters import get_variants_in_stock
+
+
+class AttributeValueFacet(BaseObjectType):
+    value = graphene.Field(
+        AttributeValue, required=True, description="The attribute value."
+    )
+    count = graphene.Int(
+        required=True, description="Number of products with the value."
+    )
+
+    class Meta:
+        doc_category = DOC_CATEGORY_PRODUCTS
+        description = (
+            "Number of products with an attribute value."
+            + ADDED_IN_315
+            + PREVIEW_FEATURE
+        )
+
+    @staticmethod
+    def resolve_value(root, info):
+        return AttributeValueByIdLoader(info.context).load(root["value_id"])
+
+
+class AttributeFacet(BaseObjectType):
+    attribute = graphene.Field(Attribute, required=True, description="The attribute.")
+    values = NonNullList(
+        AttributeValueFacet,
+        required=True,
+        description="Number of products for each value of the attribute.",
+    )
+
+    class Meta:
+        doc_category = DOC_CATEGORY_PRODUCTS
+        description = (
+            "Number of products for each value of an attribute."
+            + ADDED_IN_315
+            + PREVIEW_FEATURE
+        )
+
+    @staticmethod
+    def resolve_attribute(root, info):
+        return AttributesByAttributeId(info.context).load(root["attribute_id"])
+
+
+class PriceRangeFacet(BaseObjectType):
+    gte = graphene.Float(description="Price greater than or equal to.")
+    lte = graphene.Float(description="Price less than or equal to.")
+    count = graphene.Int(
+        required=True, description="Number of products with a price in the range."
+    )
+
+    class Meta:
+        doc_category = DOC_CATEGORY_PRODUCTS
+        description = (
+            "Number of products with a price in a range."
+            + ADDED_IN_315
+            + PREVIEW_FEATURE
+        )
+
+
+class StockAvailabilityFacet(BaseObjectType):
+    availability = StockAvailability(required=True, description="Stock availability.")
+    count = graphene.Int(
+        required=True, description="Number of products with the availability."
+    )
+
+    class Meta:
+        doc_category = DOC_CATEGORY_PRODUCTS
+        description = (
+            "Number of products with a stock availability."
+            + ADDED_IN_315
+            + PREVIEW_FEATURE
+        )
+
+
+class ProductFacets(BaseObjectType):
+    attributes = NonNullList(
+        AttributeFacet,
+        required=True,
+        description="Number of products for each value of the requested attributes.",
+    )
+    price_ranges = NonNullList(
+        PriceRangeFacet,
+        required=True,
+        description=(
+            "Number of products for each requested price range. The discounted "
+            "price of a product in the channel is used. Empty without a channel."
+        ),
+    )
+    stock_availability = NonNullList(
+        StockAvailabilityFacet,
+        required=True,
+        description=(
+            "Number of products in stock and out of stock in the channel. "
+            "Empty without a channel."
+        ),
+    )
+
+    class Meta:
+        doc_category = DOC_CATEGORY_PRODUCTS
+        description = (
+            "Facet counts of the filtered products." + ADDED_IN_315 + PREVIEW_FEATURE
+        )
+
+
+def resolve_product_facets(
+    info,
+    channel_qs: ChannelQsContext,
+    attributes: Optional[List[str]] = None,
+    price_ranges: Optional[List[dict]] = None,
+):
+    """Count the filtered products by attribute values, prices and stock.
+
+    Attribute counts come from the facet table in a single grouped query, price
+    buckets and stock availability are computed in one aggregate over the
+    filtered products.
+    """
+    qs = channel_qs.qs.order_by()
+    channel_slug = channel_qs.channel_slug
+    price_ranges = price_ranges or []
+
+    requestor = get_user_or_app_from_context(info.context)
+    visible_attributes = attribute_models.Attribute.objects.using(
+        qs.db
+    ).get_visible_to_user(requestor)
+    if attributes is not None:
+        _, attribute_pks = resolve_global_ids_to_primary_keys(attributes, Attribute)
+        visible_attributes = visible_attributes.filter(pk__in=attribute_pks)
+    attribute_counts = get_attribute_facet_counts(
+        qs, attribute_ids=visible_attributes.values("pk")
+    )
+
+    facets = {
+        "attributes": [
+            {
+                "attribute_id": attribute_id,
+                "values": [
+                    {"value_id": value_id, "count": count}
+                    for value_id, count in value_counts.items()
+                ],
+            }
+            for attribute_id, value_counts in attribute_counts.items()
+        ],
+        "price_ranges": [],
+        "stock_availability": [],
+    }
+    if not channel_slug:
+        return facets
+
+    listings = models.ProductChannelListing.objects.filter(
+        channel__slug=channel_slug, product_id=OuterRef("pk")
+    ).values("discounted_price_amount")[:1]
+    variants_in_stock = get_variants_in_stock(channel_slug)
+    aggregates = {
+        f"price_range_{index}": Count(
+            "pk",
+            filter=Q(
+                **{
+                    f"facet_price__{lookup}": price_range[lookup]
+                    for lookup in ("gte", "lte")
+                    if price_range.get(lookup) is not None
+                },
+                facet_price__isnull=False,
+            ),
+        )
+        for index, price_range in enumerate(price_ranges)
+    }
+    aggregates["in_stock"] = Count("pk", filter=Q(facet_in_stock=True))
+    aggregates["total"] = Count("pk")
+    # Subqueries referencing the product are annotated first, as the aggregate
+    # may be computed over the filtered products wrapped in a subquery.
+    counts = qs.annotate(
+        facet_price=Subquery(listings),
+        facet_in_stock=Exists(variants_in_stock.filter(product_id=OuterRef("pk"))),
+    ).aggregate(**aggregates)
+
+    facets["price_ranges"] = [
+        {
+            "gte": price_range.get("gte"),
+            "lte": price_range.get("lte"),
+            "count": counts[f"price_range_{index}"],
+        }
+        for index, price_range in enumerate(price_ranges)
+    ]
+    facets["stock_availability"] = [
+        {"availability": StockAvailability.IN_STOCK, "count": counts["in_stock"]},
+        {
+            "availability": StockAvailability.OUT_OF_STOCK,
+            "count": counts["total"] - counts["in_stock"],
+        },
+    ]
+    return facets
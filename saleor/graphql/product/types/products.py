@@ -1,7 +1,6 @@
 import sys
 from collections import defaultdict
 from dataclasses import asdict
-from decimal import Decimal
 from typing import List, Optional
 
 import graphene
@@ -23,11 +22,6 @@ from ....product.utils.availability import (
     get_variant_availability,
 )
 from ....product.utils.variants import get_variant_selection_attributes
-from ....tax.utils import (
-    get_display_gross_prices,
-    get_tax_calculation_strategy,
-    get_tax_rate_for_tax_class,
-)
 from ....thumbnail.utils import (
     get_image_or_proxy_url,
     get_thumbnail_format,
@@ -59,8 +53,10 @@ from ...core.descriptions import (
     ADDED_IN_39,
     ADDED_IN_310,
     ADDED_IN_312,
+    ADDED_IN_315,
     DEPRECATED_IN_3X_FIELD,
     DEPRECATED_IN_3X_INPUT,
+    PREVIEW_FEATURE,
     RICH_CONTENT,
 )
 from ...core.doc_category import DOC_CATEGORY_PRODUCTS
@@ -79,6 +75,7 @@ from ...core.types import (
     Image,
     ModelObjectType,
     NonNullList,
+    PriceRangeInput,
     TaxedMoney,
     TaxedMoneyRange,
     TaxType,
@@ -99,14 +96,12 @@ from ...product.dataloaders.products import (
 )
 from ...site.dataloaders import load_site_callback
 from ...tax.dataloaders import (
+    CountryTaxRatesByCountryCodeLoader,
     ProductChargeTaxesByTaxClassIdLoader,
     TaxClassByIdLoader,
     TaxClassByProductIdLoader,
     TaxClassByVariantIdLoader,
-    TaxClassCountryRateByTaxClassIDLoader,
-    TaxClassDefaultRateByCountryLoader,
-    TaxConfigurationByChannelId,
-    TaxConfigurationPerCountryByTaxConfigurationIDLoader,
+    TaxConfigurationSnapshotByChannelIdLoader,
 )
 from ...tax.types import TaxClass
 from ...translations.fields import TranslationField
@@ -147,6 +142,7 @@ from ..resolvers import resolve_product_variants, resolve_products
 from ..sorters import MediaSortingInput
 from .channels import ProductChannelListing, ProductVariantChannelListing
 from .digital_contents import DigitalContent
+from .facets import ProductFacets, resolve_product_facets
 
 destination_address_argument = graphene.Argument(
     account_types.AddressInput,
@@ -614,7 +610,7 @@ class ProductVariant(ChannelContextTypeWithMetadata[models.ProductVariant]):
         channel = ChannelBySlugLoader(context).load(channel_slug)
         tax_class = TaxClassByVariantIdLoader(context).load(root.node.id)
 
-        def load_tax_configuration(data):
+        def load_tax_data(data):
             (
                 product_channel_listing,
                 variant_channel_listing,
@@ -626,69 +622,31 @@ class ProductVariant(ChannelContextTypeWithMetadata[models.ProductVariant]):
                 return None
             country_code = get_active_country(channel, address_data=address)
 
-            def load_tax_country_exceptions(tax_config):
-                def load_default_tax_rate(tax_configs_per_country):
-                    def calculate_pricing_info(data):
-                        country_rates, default_country_rate_obj = data
-
-                        tax_config_country = next(
-                            (
-                                tc
-                                for tc in tax_configs_per_country
-                                if tc.country.code == country_code
-                            ),
-                            None,
-                        )
-                        tax_calculation_strategy = get_tax_calculation_strategy(
-                            tax_config, tax_config_country
-                        )
-
-                        default_tax_rate = (
-                            default_country_rate_obj.rate
-                            if default_country_rate_obj
-                            else Decimal(0)
-                        )
-                        tax_rate = get_tax_rate_for_tax_class(
-                            tax_class, country_rates, default_tax_rate, country_code
-                        )
-
-                        availability = get_variant_availability(
-                            variant_channel_listing=variant_channel_listing,
-                            product_channel_listing=product_channel_listing,
-                            prices_entered_with_tax=tax_config.prices_entered_with_tax,
-                            tax_calculation_strategy=tax_calculation_strategy,
-                            tax_rate=tax_rate,
-                        )
-                        return (
-                            VariantPricingInfo(**asdict(availability))
-                            if availability
-                            else None
-                        )
-
-                    country_rates = (
-                        TaxClassCountryRateByTaxClassIDLoader(context).load(
-                            tax_class.pk
-                        )
-                        if tax_class
-                        else []
-                    )
-                    default_rate = TaxClassDefaultRateByCountryLoader(context).load(
+            def calculate_pricing_info(data):
+                tax_config, country_tax_rates = data
+                availability = get_variant_availability(
+                    variant_channel_listing=variant_channel_listing,
+                    product_channel_listing=product_channel_listing,
+                    prices_entered_with_tax=tax_config.prices_entered_with_tax,
+                    tax_calculation_strategy=tax_config.get_tax_calculation_strategy(
                         country_code
-                    )
-                    return Promise.all([country_rates, default_rate]).then(
-                        calculate_pricing_info
-                    )
-
+                    ),
+                    tax_rate=country_tax_rates.get_rate(
+                        tax_class.pk if tax_class else None
+                    ),
+                )
                 return (
-                    TaxConfigurationPerCountryByTaxConfigurationIDLoader(context)
-                    .load(tax_config.id)
-                    .then(load_default_tax_rate)
+                    VariantPricingInfo(**asdict(availability)) if availability else None
                 )
 
-            return (
-                TaxConfigurationByChannelId(context)
-                .load(channel.id)
-                .then(load_tax_country_exceptions)
+            tax_config = TaxConfigurationSnapshotByChannelIdLoader(context).load(
+                channel.id
+            )
+            country_tax_rates = CountryTaxRatesByCountryCodeLoader(context).load(
+                country_code
+            )
+            return Promise.all([tax_config, country_tax_rates]).then(
+                calculate_pricing_info
             )
 
         return Promise.all(
@@ -698,7 +656,7 @@ class ProductVariant(ChannelContextTypeWithMetadata[models.ProductVariant]):
                 channel,
                 tax_class,
             ]
-        ).then(load_tax_configuration)
+        ).then(load_tax_data)
 
     @staticmethod
     def resolve_product(root: ChannelContext[models.ProductVariant], info):
@@ -1122,7 +1080,7 @@ class Product(ChannelContextTypeWithMetadata[models.Product]):
         )
         tax_class = TaxClassByProductIdLoader(context).load(root.node.id)
 
-        def load_tax_configuration(data):
+        def load_tax_data(data):
             (
                 channel,
                 product_channel_listing,
@@ -1134,71 +1092,33 @@ class Product(ChannelContextTypeWithMetadata[models.Product]):
                 return None
             country_code = get_active_country(channel, address_data=address)
 
-            def load_tax_country_exceptions(tax_config):
-                def load_default_tax_rate(tax_configs_per_country):
-                    def calculate_pricing_info(data):
-                        country_rates, default_country_rate_obj = data
-                        tax_config_country = next(
-                            (
-                                tc
-                                for tc in tax_configs_per_country
-                                if tc.country.code == country_code
-                            ),
-                            None,
-                        )
-                        display_gross_prices = get_display_gross_prices(
-                            tax_config,
-                            tax_config_country,
-                        )
-                        tax_calculation_strategy = get_tax_calculation_strategy(
-                            tax_config, tax_config_country
-                        )
-
-                        default_tax_rate = (
-                            default_country_rate_obj.rate
-                            if default_country_rate_obj
-                            else Decimal(0)
-                        )
-                        tax_rate = get_tax_rate_for_tax_class(
-                            tax_class, country_rates, default_tax_rate, country_code
-                        )
-
-                        availability = get_product_availability(
-                            product_channel_listing=product_channel_listing,
-                            variants_channel_listing=variants_channel_listing,
-                            prices_entered_with_tax=tax_config.prices_entered_with_tax,
-                            tax_calculation_strategy=tax_calculation_strategy,
-                            tax_rate=tax_rate,
-                        )
-
-                        pricing_info = asdict(availability)
-                        pricing_info["display_gross_prices"] = display_gross_prices
-                        return ProductPricingInfo(**pricing_info)
-
-                    country_rates = (
-                        TaxClassCountryRateByTaxClassIDLoader(context).load(
-                            tax_class.pk
-                        )
-                        if tax_class
-                        else []
-                    )
-                    default_rate = TaxClassDefaultRateByCountryLoader(context).load(
+            def calculate_pricing_info(data):
+                tax_config, country_tax_rates = data
+                availability = get_product_availability(
+                    product_channel_listing=product_channel_listing,
+                    variants_channel_listing=variants_channel_listing,
+                    prices_entered_with_tax=tax_config.prices_entered_with_tax,
+                    tax_calculation_strategy=tax_config.get_tax_calculation_strategy(
                         country_code
-                    )
-                    return Promise.all([country_rates, default_rate]).then(
-                        calculate_pricing_info
-                    )
-
-                return (
-                    TaxConfigurationPerCountryByTaxConfigurationIDLoader(context)
-                    .load(tax_config.id)
-                    .then(load_default_tax_rate)
+                    ),
+                    tax_rate=country_tax_rates.get_rate(
+                        tax_class.pk if tax_class else None
+                    ),
                 )
-
-            return (
-                TaxConfigurationByChannelId(context)
-                .load(channel.id)
-                .then(load_tax_country_exceptions)
+                pricing_info = asdict(availability)
+                pricing_info[
+                    "display_gross_prices"
+                ] = tax_config.get_display_gross_prices(country_code)
+                return ProductPricingInfo(**pricing_info)
+
+            tax_config = TaxConfigurationSnapshotByChannelIdLoader(context).load(
+                channel.id
+            )
+            country_tax_rates = CountryTaxRatesByCountryCodeLoader(context).load(
+                country_code
+            )
+            return Promise.all([tax_config, country_tax_rates]).then(
+                calculate_pricing_info
             )
 
         return Promise.all(
@@ -1208,7 +1128,7 @@ class Product(ChannelContextTypeWithMetadata[models.Product]):
                 variants_channel_listing,
                 tax_class,
             ]
-        ).then(load_tax_configuration)
+        ).then(load_tax_data)
 
     @staticmethod
     @traced_resolver
@@ -1586,10 +1506,37 @@ class Product(ChannelContextTypeWithMetadata[models.Product]):
 
 
 class ProductCountableConnection(CountableConnection):
+    facets = graphene.Field(
+        ProductFacets,
+        attributes=NonNullList(
+            graphene.ID,
+            description=(
+                "IDs of attributes to count the values of. "
+                "All attributes are counted when not provided."
+            ),
+        ),
+        price_ranges=NonNullList(
+            PriceRangeInput, description="Price ranges to count the products in."
+        ),
+        description=(
+            "Number of products for attribute values, price ranges and stock "
+            "availability, computed over all filtered products."
+            + ADDED_IN_315
+            + PREVIEW_FEATURE
+        ),
+    )
+
     class Meta:
         doc_category = DOC_CATEGORY_PRODUCTS
         node = Product
 
+    @staticmethod
+    def resolve_facets(root, info, *, attributes=None, price_ranges=None):
+        channel_qs = getattr(root, "channel_qs", None)
+        if channel_qs is None:
+            return None
+        return resolve_product_facets(info, channel_qs, attributes, price_ranges)
+
 
 @federated_entity("id")
 class ProductType(ModelObjectType[models.ProductType]):
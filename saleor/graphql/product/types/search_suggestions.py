@@ -0,0 +1,63 @@
+import graphene
+
+from ...channel import ChannelContext
+from ...core.descriptions import ADDED_IN_315, PREVIEW_FEATURE
+from ...core.doc_category import DOC_CATEGORY_PRODUCTS
+from ...core.types import BaseObjectType
+from ..enums import SearchSuggestionKind
+from .categories import Category
+from .collections import Collection
+from .products import Product
+
+
+class SearchSuggestion(BaseObjectType):
+    kind = SearchSuggestionKind(
+        required=True, description="Type of the suggested object."
+    )
+    term = graphene.String(
+        required=True,
+        description="Normalized text of the object completing the search value.",
+    )
+    product = graphene.Field(Product, description="The suggested product.")
+    category = graphene.Field(Category, description="The suggested category.")
+    collection = graphene.Field(Collection, description="The suggested collection.")
+
+    class Meta:
+        doc_category = DOC_CATEGORY_PRODUCTS
+        description = (
+            "Product, category or collection completing the search value."
+            + ADDED_IN_315
+            + PREVIEW_FEATURE
+        )
+
+    @staticmethod
+    def resolve_kind(root: ChannelContext, _info):
+        if root.node.product_id:
+            return SearchSuggestionKind.PRODUCT
+        if root.node.category_id:
+            return SearchSuggestionKind.CATEGORY
+        return SearchSuggestionKind.COLLECTION
+
+    @staticmethod
+    def resolve_term(root: ChannelContext, _info):
+        return root.node.term
+
+    @staticmethod
+    def resolve_product(root: ChannelContext, _info):
+        if root.node.product_id:
+            return ChannelContext(
+                node=root.node.product, channel_slug=root.channel_slug
+            )
+        return None
+
+    @staticmethod
+    def resolve_category(root: ChannelContext, _info):
+        return root.node.category
+
+    @staticmethod
+    def resolve_collection(root: ChannelContext, _info):
+        if root.node.collection_id:
+            return ChannelContext(
+                node=root.node.collection, channel_slug=root.channel_slug
+            )
+        return None
@@ -5,6 +5,12 @@ from typing import List
 from django.db.models import Exists, OuterRef
 from promise import Promise
 
+from ...tax.lookup import (
+    CountryTaxRates,
+    TaxConfigurationSnapshot,
+    get_country_tax_rates,
+    get_tax_configuration_snapshots,
+)
 from ...tax.models import (
     TaxClass,
     TaxClassCountryRate,
@@ -39,12 +45,36 @@ class TaxConfigurationByChannelId(DataLoader[int, TaxConfiguration]):
     context_key = "tax_configuration_by_channel_id"
 
     def batch_load(self, keys):
-        tax_configs = TaxConfiguration.objects.using(
-            self.database_connection_name
-        ).in_bulk(keys, field_name="channel_id")
+        tax_configs = (
+            TaxConfiguration.objects.using(self.database_connection_name)
+            .prefetch_related("country_exceptions")
+            .in_bulk(keys, field_name="channel_id")
+        )
         return [tax_configs[key] for key in keys]
 
 
+class TaxConfigurationSnapshotByChannelIdLoader(
+    DataLoader[int, TaxConfigurationSnapshot]
+):
+    context_key = "tax_configuration_snapshot_by_channel_id"
+
+    def batch_load(self, keys):
+        snapshots = get_tax_configuration_snapshots(
+            keys, database_connection_name=self.database_connection_name
+        )
+        return [snapshots[key] for key in keys]
+
+
+class CountryTaxRatesByCountryCodeLoader(DataLoader[str, CountryTaxRates]):
+    context_key = "country_tax_rates_by_country_code"
+
+    def batch_load(self, keys):
+        country_tax_rates = get_country_tax_rates(
+            keys, database_connection_name=self.database_connection_name
+        )
+        return [country_tax_rates[key] for key in keys]
+
+
 class TaxClassCountryRateByTaxClassIDLoader(DataLoader[int, List[TaxClassCountryRate]]):
     context_key = "tax_class_country_rate_by_tax_class_id"
 
@@ -60,17 +90,6 @@ class TaxClassCountryRateByTaxClassIDLoader(DataLoader[int, List[TaxClassCountry
         return [one_to_many[key] for key in keys]
 
 
-class TaxClassDefaultRateByCountryLoader(DataLoader):
-    context_key = "tax_class_default_rate_by_country"
-
-    def batch_load(self, keys):
-        tax_rates = TaxClassCountryRate.objects.using(
-            self.database_connection_name
-        ).filter(tax_class=None, country__in=keys)
-        tax_rates_map = {rate.country: rate for rate in tax_rates}
-        return [tax_rates_map.get(key) for key in keys]
-
-
 class TaxClassByIdLoader(DataLoader):
     context_key = "tax_class_by_id"
 
@@ -2,6 +2,7 @@ import graphene
 
 from ....permission.enums import CheckoutPermissions
 from ....tax import error_codes, models
+from ....tax.lookup import invalidate_tax_data_cache
 from ...account.enums import CountryCodeEnum
 from ...core.descriptions import ADDED_IN_39
 from ...core.doc_category import DOC_CATEGORY_TAXES
@@ -80,3 +81,4 @@ class TaxClassCreate(ModelMutation):
         instance.save()
         create_country_rates = cleaned_input.get("create_country_rates", [])
         cls.create_country_rates(instance, create_country_rates)
+        invalidate_tax_data_cache()
@@ -2,6 +2,7 @@ import graphene
 
 from ....permission.enums import CheckoutPermissions
 from ....tax import error_codes, models
+from ....tax.lookup import invalidate_tax_data_cache
 from ...core.descriptions import ADDED_IN_39
 from ...core.doc_category import DOC_CATEGORY_TAXES
 from ...core.mutations import ModelDeleteMutation
@@ -33,3 +34,7 @@ class TaxClassDelete(ModelDeleteMutation):
         model = models.TaxClass
         object_type = TaxClass
         permissions = (CheckoutPermissions.MANAGE_TAXES,)
+
+    @classmethod
+    def post_save_action(cls, info, instance, cleaned_input):
+        invalidate_tax_data_cache()
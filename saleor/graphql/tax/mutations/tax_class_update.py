@@ -3,6 +3,7 @@ from django.core.exceptions import ValidationError
 
 from ....permission.enums import CheckoutPermissions
 from ....tax import error_codes, models
+from ....tax.lookup import invalidate_tax_data_cache
 from ...account.enums import CountryCodeEnum
 from ...core import ResolveInfo
 from ...core.descriptions import ADDED_IN_39
@@ -145,3 +146,4 @@ class TaxClassUpdate(ModelMutation):
         remove_country_rates = cleaned_input.get("remove_country_rates", [])
         cls.update_country_rates(instance, update_country_rates)
         cls.remove_country_rates(remove_country_rates)
+        invalidate_tax_data_cache()
@@ -3,6 +3,7 @@ from django.core.exceptions import ValidationError
 
 from ....permission.enums import CheckoutPermissions
 from ....tax import error_codes, models
+from ....tax.lookup import invalidate_tax_data_cache
 from ...account.enums import CountryCodeEnum
 from ...core import ResolveInfo
 from ...core.descriptions import ADDED_IN_39
@@ -193,3 +194,4 @@ class TaxConfigurationUpdate(ModelMutation):
         )
         cls.update_countries_configuration(instance, update_countries_configuration)
         cls.remove_countries_configuration(remove_countries_configuration)
+        invalidate_tax_data_cache()
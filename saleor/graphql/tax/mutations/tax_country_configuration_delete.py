@@ -3,6 +3,7 @@ from django_countries.fields import Country
 
 from ....permission.enums import CheckoutPermissions
 from ....tax import error_codes, models
+from ....tax.lookup import invalidate_tax_data_cache
 from ...account.enums import CountryCodeEnum
 from ...core import ResolveInfo
 from ...core.descriptions import ADDED_IN_39
@@ -48,6 +49,7 @@ class TaxCountryConfigurationDelete(BaseMutation):
         country_code = data["country_code"]
         rates = models.TaxClassCountryRate.objects.filter(country=country_code)
         rates.delete()
+        invalidate_tax_data_cache()
         country_config = TaxCountryConfiguration(
             country=Country(country_code), tax_class_country_rates=[]
         )
@@ -8,6 +8,7 @@ from graphql import GraphQLError
 
 from ....permission.enums import CheckoutPermissions
 from ....tax import error_codes, models
+from ....tax.lookup import invalidate_tax_data_cache
 from ...account.enums import CountryCodeEnum
 from ...core import ResolveInfo
 from ...core.descriptions import ADDED_IN_39
@@ -230,6 +231,7 @@ class TaxCountryConfigurationUpdate(BaseMutation):
         cleaned_data = cls.clean_input(**data)
         cls.update_default_rate(country_code, cleaned_data)
         cls.update_and_create_country_rates(country_code, cleaned_data)
+        invalidate_tax_data_cache()
 
         tax_classes_lookup = Q(tax_class_id__in=cleaned_data.keys())
         if None in cleaned_data:
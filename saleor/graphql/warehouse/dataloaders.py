@@ -127,7 +127,7 @@ class AvailableQuantityByProductVariantIdCountryCodeAndChannelSlugLoader(
             | Q(warehouse_id__in=cc_warehouses.values("id"))
         )
 
-        stocks = stocks.annotate_available_quantity()
+        stocks = stocks.annotate_available_quantity_from_counter()
 
         stocks_reservations = self.prepare_stocks_reservations_map(variant_ids)
 
@@ -14,8 +14,7 @@ from ..tax import TaxCalculationStrategy
 from ..tax.calculations.order import update_order_prices_with_flat_rates
 from ..tax.utils import (
     calculate_tax_rate,
-    get_charge_taxes_for_order,
-    get_tax_calculation_strategy_for_order,
+    get_tax_configuration_for_order,
     normalize_tax_rate_for_db,
 )
 from . import ORDER_EDITABLE_STATUS
@@ -196,10 +195,12 @@ def fetch_order_prices_if_expired(
     if not force_update and not order.should_refresh_prices:
         return order, lines
 
-    tax_configuration = order.channel.tax_configuration
-    tax_calculation_strategy = get_tax_calculation_strategy_for_order(order)
+    tax_configuration, country_code = get_tax_configuration_for_order(order)
+    tax_calculation_strategy = tax_configuration.get_tax_calculation_strategy(
+        country_code
+    )
     prices_entered_with_tax = tax_configuration.prices_entered_with_tax
-    charge_taxes = get_charge_taxes_for_order(order)
+    charge_taxes = tax_configuration.get_charge_taxes(country_code)
     should_charge_tax = charge_taxes and not order.tax_exemption
 
     if lines is None:
@@ -7,12 +7,23 @@ from django.db.models import F, Q, Value, prefetch_related_objects
 
 from ..account.search import generate_address_search_vector_value
 from ..core.postgres import FlatConcatSearchVector, NoValidationSearchVector
+from ..core.search import SearchEntity, get_search_backend
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet
 
     from .models import Order
 
+ORDER_FIELDS_TO_PREFETCH = [
+    "user",
+    "billing_address",
+    "shipping_address",
+    "payments",
+    "discounts",
+    "lines",
+    "payment_transactions__events",
+]
+
 
 def update_order_search_vector(order: "Order", *, save: bool = True):
     order.search_vector = FlatConcatSearchVector(
@@ -26,16 +37,7 @@ def prepare_order_search_vector_value(
     order: "Order", *, already_prefetched=False
 ) -> List[NoValidationSearchVector]:
     if not already_prefetched:
-        prefetch_related_objects(
-            [order],
-            "user",
-            "billing_address",
-            "shipping_address",
-            "payments",
-            "discounts",
-            "lines",
-            "payment_transactions__events",
-        )
+        prefetch_related_objects([order], *ORDER_FIELDS_TO_PREFETCH)
     search_vectors = [
         NoValidationSearchVector(Value(str(order.number)), config="simple", weight="A")
     ]
@@ -214,6 +216,12 @@ def generate_order_lines_search_vector_value(
 
 
 def search_orders(qs: "QuerySet[Order]", value) -> "QuerySet[Order]":
+    if value:
+        qs = get_search_backend(SearchEntity.ORDER).search(qs, value)
+    return qs
+
+
+def search_orders_in_postgres(qs: "QuerySet[Order]", value) -> "QuerySet[Order]":
     if value:
         query = SearchQuery(value, search_type="websearch", config="simple")
         lookup = Q(search_vector=query)
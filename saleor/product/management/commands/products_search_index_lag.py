@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from ...search_invalidation import get_products_search_index_lag
+
+
+class Command(BaseCommand):
+    help = (
+        "Show the number of products waiting for the search index update and how "
+        "long the longest waiting one is stale, for every priority."
+    )
+
+    def handle(self, *args, **options):
+        lags = get_products_search_index_lag()
+        if not lags:
+            self.stdout.write("The products search index is up to date.")
+            return
+        for lag in lags:
+            self.stdout.write(
+                f"Priority {lag.priority}: {lag.stale_count} stale products, "
+                f"lag {lag.lag if lag.lag is not None else 'unknown'}."
+            )
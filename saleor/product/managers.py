@@ -2,17 +2,13 @@ import datetime
 from typing import Union
 
 import pytz
-from django.contrib.postgres.aggregates import StringAgg
 from django.db import models
 from django.db.models import (
     BooleanField,
     Case,
-    Count,
     DateTimeField,
     Exists,
     ExpressionWrapper,
-    F,
-    FilteredRelation,
     OuterRef,
     Q,
     Subquery,
@@ -140,7 +136,7 @@ class ProductsQueryset(models.QuerySet):
                              to sort by.
         :param descending: The sorting direction.
         """
-        from ..attribute.models import AttributeProduct, AttributeValue
+        from ..attribute.models import AttributeProduct, ProductAttributeSortKey
 
         qs: models.QuerySet = self
         # If the passed attribute ID is valid, execute the sorting
@@ -152,15 +148,14 @@ class ProductsQueryset(models.QuerySet):
                 concatenated_values=Value(None, output_field=models.CharField()),
             )
 
-        # Retrieve all the products' attribute data IDs (assignments) and
-        # product types that have the given attribute associated to them
-        associated_values = tuple(
+        # Retrieve the product types that have the given attribute associated to them
+        product_types_associated_to_attribute = tuple(
             AttributeProduct.objects.filter(attribute_id=attribute_pk).values_list(
-                "pk", "product_type_id"
+                "product_type_id", flat=True
             )
         )
 
-        if not associated_values:
+        if not product_types_associated_to_attribute:
             qs = qs.annotate(
                 concatenated_values_order=Value(
                     None, output_field=models.IntegerField()
@@ -169,39 +164,23 @@ class ProductsQueryset(models.QuerySet):
             )
 
         else:
-            attribute_associations, product_types_associated_to_attribute = zip(
-                *associated_values
-            )
+            # The attribute's values of each product are kept concatenated in
+            # their order in `ProductAttributeSortKey`, so they're joined by
+            # the `(product, attribute)` index instead of being aggregated.
+            sort_keys = ProductAttributeSortKey.objects.filter(
+                product_id=OuterRef("pk"), attribute_id=attribute_pk
+            ).values("value_names")[:1]
 
             qs = qs.annotate(
-                # Contains to retrieve the attribute data (singular) of each product
-                # Refer to `AttributeProduct`.
-                filtered_attribute=FilteredRelation(
-                    relation_name="attributes",
-                    condition=Q(attributes__assignment_id__in=attribute_associations),
-                ),
-                # Implicit `GROUP BY` required for the `StringAgg` aggregation
-                grouped_ids=Count("id"),
-                # String aggregation of the attribute's values to efficiently sort them
                 concatenated_values=Case(
-                    # If the product has no association data but has
-                    # the given attribute associated to its product type,
-                    # then consider the concatenated values as empty (non-null).
+                    # If the product has no values but has the given attribute
+                    # associated to its product type, then consider the concatenated
+                    # values as empty (non-null).
                     When(
-                        Q(product_type_id__in=product_types_associated_to_attribute)
-                        & Q(filtered_attribute=None),
-                        then=models.Value(""),
-                    ),
-                    default=StringAgg(
-                        F("filtered_attribute__values__name"),
-                        delimiter=",",
-                        ordering=(
-                            [
-                                f"filtered_attribute__values__{field_name}"
-                                for field_name in AttributeValue._meta.ordering or []
-                            ]
-                        ),
+                        product_type_id__in=product_types_associated_to_attribute,
+                        then=Coalesce(Subquery(sort_keys), Value("")),
                     ),
+                    default=Value(None),
                     output_field=models.CharField(),
                 ),
                 concatenated_values_order=Case(
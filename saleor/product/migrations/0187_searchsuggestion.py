@@ -0,0 +1,121 @@
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Suggestions of the names and SKUs are created with set-based inserts, so the
+# suggestions work right after the migration. Product attribute values are
+# suggested once products are indexed again with `rebuild_search_index product`.
+POPULATE_NAME_SUGGESTIONS = r"""
+    INSERT INTO product_searchsuggestion (term, weight, {field}_id)
+    SELECT
+        left(array_to_string(named.words[position:], ' '), 255),
+        CASE WHEN position = 1 THEN 1.0 ELSE 0.9 END,
+        named.id
+    FROM (
+        SELECT id, regexp_split_to_array(lower(trim(name)), '\s+') AS words
+        FROM {table}
+        WHERE trim(name) <> ''
+    ) named
+    CROSS JOIN LATERAL generate_series(
+        1, least(array_length(named.words, 1), 8)
+    ) AS position;
+"""
+
+POPULATE_SKU_SUGGESTIONS = r"""
+    INSERT INTO product_searchsuggestion (term, weight, product_id)
+    SELECT DISTINCT
+        left(regexp_replace(lower(trim(sku)), '\s+', ' ', 'g'), 255),
+        0.8,
+        product_id
+    FROM product_productvariant
+    WHERE trim(sku) <> '';
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("product", "0186_remove_product_charge_taxes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchSuggestion",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=255)),
+                ("weight", models.FloatField()),
+                (
+                    "category",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_suggestions",
+                        to="product.category",
+                    ),
+                ),
+                (
+                    "collection",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_suggestions",
+                        to="product.collection",
+                    ),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_suggestions",
+                        to="product.product",
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunSQL(
+            POPULATE_NAME_SUGGESTIONS.format(field="product", table="product_product"),
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            POPULATE_NAME_SUGGESTIONS.format(
+                field="category", table="product_category"
+            ),
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            POPULATE_NAME_SUGGESTIONS.format(
+                field="collection", table="product_collection"
+            ),
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(POPULATE_SKU_SUGGESTIONS, reverse_sql=migrations.RunSQL.noop),
+        # Indexes are created after the rows are inserted, which is faster.
+        migrations.AddIndex(
+            model_name="searchsuggestion",
+            index=django.contrib.postgres.indexes.BTreeIndex(
+                fields=["term"],
+                name="search_suggestion_term_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="searchsuggestion",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["term"],
+                name="search_suggestion_term_gin",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
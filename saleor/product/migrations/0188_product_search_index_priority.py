@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("product", "0187_searchsuggestion"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="search_index_priority",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="search_index_dirty_since",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunSQL(
+            """
+            UPDATE product_product
+            SET search_index_dirty_since = now()
+            WHERE search_index_dirty;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
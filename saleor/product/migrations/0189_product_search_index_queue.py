@@ -0,0 +1,19 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("product", "0188_product_search_index_priority"),
+    ]
+    atomic = False
+    operations = [
+        AddIndexConcurrently(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(search_index_dirty=True),
+                fields=["-search_index_priority", "search_index_dirty_since"],
+                name="product_search_index_queue",
+            ),
+        ),
+    ]
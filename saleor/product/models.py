@@ -187,6 +187,9 @@ class Product(SeoModel, ModelWithMetadata, ModelWithExternalReference):
     search_document = models.TextField(blank=True, default="")
     search_vector = SearchVectorField(blank=True, null=True)
     search_index_dirty = models.BooleanField(default=False, db_index=True)
+    # Order in which products marked with `search_index_dirty` are indexed.
+    search_index_priority = models.PositiveSmallIntegerField(default=0)
+    search_index_dirty_since = models.DateTimeField(null=True, blank=True)
 
     category = models.ForeignKey(
         Category,
@@ -242,6 +245,11 @@ class Product(SeoModel, ModelWithMetadata, ModelWithExternalReference):
                 fields=["name", "slug"],
                 opclasses=["gin_trgm_ops"] * 2,
             ),
+            models.Index(
+                name="product_search_index_queue",
+                fields=["-search_index_priority", "search_index_dirty_since"],
+                condition=models.Q(search_index_dirty=True),
+            ),
         ]
         indexes.extend(ModelWithMetadata.Meta.indexes)
 
@@ -727,3 +735,49 @@ class CollectionTranslation(SeoModelTranslation):
             }
         )
         return translated_keys
+
+
+class SearchSuggestion(models.Model):
+    """A normalized text completing the search value typed by a customer.
+
+    Every row belongs to exactly one product, category or collection.
+    """
+
+    term = models.CharField(max_length=255)
+    weight = models.FloatField()
+    product = models.ForeignKey(
+        Product,
+        null=True,
+        blank=True,
+        related_name="search_suggestions",
+        on_delete=models.CASCADE,
+    )
+    category = models.ForeignKey(
+        Category,
+        null=True,
+        blank=True,
+        related_name="search_suggestions",
+        on_delete=models.CASCADE,
+    )
+    collection = models.ForeignKey(
+        Collection,
+        null=True,
+        blank=True,
+        related_name="search_suggestions",
+        on_delete=models.CASCADE,
+    )
+
+    class Meta:
+        indexes = [
+            BTreeIndex(
+                name="search_suggestion_term_idx",
+                fields=["term"],
+                # Allows using the index for `LIKE 'value%'` lookups.
+                opclasses=["varchar_pattern_ops"],
+            ),
+            GinIndex(
+                name="search_suggestion_term_gin",
+                fields=["term"],
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
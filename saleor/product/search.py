@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Optional, Union
 
 from django.conf import settings
 from django.contrib.postgres.search import SearchQuery, SearchRank
@@ -6,12 +6,16 @@ from django.db.models import F, Q, Value, prefetch_related_objects
 
 from ..attribute import AttributeInputType
 from ..core.postgres import FlatConcatSearchVector, NoValidationSearchVector
+from ..core.search import SearchEntity, get_search_backend
 from ..core.utils.editorjs import clean_editor_js
 from .models import Product
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet
 
+    from ..attribute.models import AttributeValue
+    from .search_index import AttributeValueSearchData
+
 PRODUCT_SEARCH_FIELDS = ["name", "description_plaintext"]
 PRODUCT_FIELDS_TO_PREFETCH = [
     "variants__attributes__values",
@@ -104,55 +108,49 @@ def generate_attributes_search_vector_value(
     search_vectors = []
     for assigned_attribute in assigned_attributes:
         attribute = assigned_attribute.assignment.attribute
-
-        input_type = attribute.input_type
         values = assigned_attribute.values.all()[
             : settings.PRODUCT_MAX_INDEXED_ATTRIBUTE_VALUES
         ]
-        if input_type in [AttributeInputType.DROPDOWN, AttributeInputType.MULTISELECT]:
-            search_vectors += [
-                NoValidationSearchVector(Value(value.name), config="simple", weight="B")
-                for value in values
-            ]
-        elif input_type == AttributeInputType.RICH_TEXT:
-            search_vectors += [
-                NoValidationSearchVector(
-                    Value(clean_editor_js(value.rich_text, to_string=True)),
-                    config="simple",
-                    weight="B",
-                )
-                for value in values
-            ]
-        elif input_type == AttributeInputType.PLAIN_TEXT:
-            search_vectors += [
-                NoValidationSearchVector(
-                    Value(value.plain_text), config="simple", weight="B"
-                )
-                for value in values
-            ]
-        elif input_type == AttributeInputType.NUMERIC:
-            unit = attribute.unit
-            search_vectors += [
-                NoValidationSearchVector(
-                    Value(value.name + " " + unit if unit else value.name),
-                    config="simple",
-                    weight="B",
-                )
-                for value in values
-            ]
-        elif input_type in [AttributeInputType.DATE, AttributeInputType.DATE_TIME]:
-            search_vectors += [
-                NoValidationSearchVector(
-                    Value(value.date_time.strftime("%Y-%m-%d %H:%M:%S")),
-                    config="simple",
-                    weight="B",
+        for value in values:
+            text = get_attribute_value_search_text(
+                attribute.input_type, attribute.unit, value
+            )
+            if text is not None:
+                search_vectors.append(
+                    NoValidationSearchVector(Value(text), config="simple", weight="B")
                 )
-                for value in values
-            ]
     return search_vectors
 
 
+def get_attribute_value_search_text(
+    input_type: str,
+    unit: Optional[str],
+    value: Union["AttributeValue", "AttributeValueSearchData"],
+) -> Optional[str]:
+    """Return the searchable text of an attribute value.
+
+    Values of input types which are not searchable return `None`.
+    """
+    if input_type in [AttributeInputType.DROPDOWN, AttributeInputType.MULTISELECT]:
+        return value.name
+    if input_type == AttributeInputType.RICH_TEXT:
+        return clean_editor_js(value.rich_text, to_string=True)
+    if input_type == AttributeInputType.PLAIN_TEXT:
+        return value.plain_text
+    if input_type == AttributeInputType.NUMERIC:
+        return value.name + " " + unit if unit else value.name
+    if input_type in [AttributeInputType.DATE, AttributeInputType.DATE_TIME]:
+        return value.date_time.strftime("%Y-%m-%d %H:%M:%S")
+    return None
+
+
 def search_products(qs, value):
+    if value:
+        qs = get_search_backend(SearchEntity.PRODUCT).search(qs, value)
+    return qs
+
+
+def search_products_in_postgres(qs, value):
     if value:
         query = SearchQuery(value, search_type="websearch", config="simple")
         lookup = Q(search_vector=query)
@@ -0,0 +1,231 @@
+"""Indexing of products for search from flat queries.
+
+Searchable texts are read with `values_list` queries instead of model instances
+with prefetched relations, and every batch is written with a single
+`UPDATE ... FROM (VALUES ...)` statement, so the memory used depends only on the
+batch size. Texts match the ones of `prepare_product_search_vector_value`, with
+texts of the same weight joined together.
+"""
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, DefaultDict, Dict, Iterable, List, NamedTuple, Optional
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from ..attribute.models import (
+    AssignedProductAttributeValue,
+    AssignedVariantAttributeValue,
+)
+from .models import Product, ProductVariant
+from .search import get_attribute_value_search_text
+from .search_suggestions import (
+    SUGGESTED_ATTRIBUTE_INPUT_TYPES,
+    prepare_search_suggestion_terms,
+    replace_search_suggestions,
+)
+
+SEARCH_VECTOR_WEIGHTS = ["A", "B", "C"]
+# Fields of the assigned attribute values, the last ones are the value's texts.
+ATTRIBUTE_VALUE_FIELDS = [
+    "assignment_id",
+    "assignment__assignment__attribute__input_type",
+    "assignment__assignment__attribute__unit",
+    "value__name",
+    "value__rich_text",
+    "value__plain_text",
+    "value__date_time",
+]
+
+UPDATE_SEARCH_VECTORS_SQL = """
+    UPDATE product_product AS product
+    SET
+        search_vector = (
+            setweight(to_tsvector('simple', data.a), 'A')
+            || setweight(to_tsvector('simple', data.b), 'B')
+            || setweight(to_tsvector('simple', data.c), 'C')
+        ),
+        search_index_dirty = false
+    FROM (VALUES {rows}) AS data (id, a, b, c)
+    WHERE product.id = data.id
+"""
+UPDATE_SEARCH_VECTORS_ROW_SQL = "(%s::integer, %s::text, %s::text, %s::text)"
+
+
+class AttributeValueSearchData(NamedTuple):
+    name: str
+    rich_text: Optional[Any]
+    plain_text: Optional[str]
+    date_time: Optional[datetime]
+
+
+@dataclass
+class ProductSearchData:
+    name: str
+    texts: DefaultDict[str, List[str]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    skus: List[str] = field(default_factory=list)
+    suggested_attribute_value_names: List[str] = field(default_factory=list)
+
+
+def load_products_search_data(
+    product_ids: Iterable[int],
+) -> Dict[int, ProductSearchData]:
+    """Return searchable texts of the products, read with flat queries."""
+    products: Dict[int, ProductSearchData] = {}
+    for pk, name, description_plaintext in Product.objects.filter(
+        pk__in=product_ids
+    ).values_list("pk", "name", "description_plaintext"):
+        products[pk] = ProductSearchData(name=name)
+        products[pk].texts["A"].append(name)
+        products[pk].texts["C"].append(description_plaintext)
+    if not products:
+        return products
+
+    _load_product_attribute_values(products)
+    variant_product_ids = _load_variants(products)
+    if variant_product_ids:
+        _load_variant_attribute_values(products, variant_product_ids)
+    return products
+
+
+def _load_variants(products: Dict[int, ProductSearchData]) -> Dict[int, int]:
+    """Load texts of the products' variants.
+
+    Return product ids of the variants whose attributes should be indexed.
+
+    Like in `generate_variants_search_vector_value`, attributes of the variants
+    are indexed only when the product has a variant with a name or a SKU.
+    """
+    variant_product_ids: Dict[int, int] = {}
+    variants_count: DefaultDict[int, int] = defaultdict(int)
+    products_with_texts = set()
+    for pk, product_id, sku, name in (
+        ProductVariant.objects.filter(product_id__in=list(products))
+        .order_by("product_id", "pk")
+        .values_list("pk", "product_id", "sku", "name")
+    ):
+        if variants_count[product_id] >= settings.PRODUCT_MAX_INDEXED_VARIANTS:
+            continue
+        variants_count[product_id] += 1
+        variant_product_ids[pk] = product_id
+        if sku or name:
+            products_with_texts.add(product_id)
+            products[product_id].texts["A"] += [sku or "", name]
+        if sku:
+            products[product_id].skus.append(sku)
+    return {
+        pk: product_id
+        for pk, product_id in variant_product_ids.items()
+        if product_id in products_with_texts
+    }
+
+
+def _add_attribute_values(
+    product: ProductSearchData,
+    values_count: DefaultDict[int, int],
+    assignment_id: int,
+    input_type: str,
+    unit: Optional[str],
+    value: AttributeValueSearchData,
+    suggested: bool,
+):
+    # Attributes are limited per product and values per assigned attribute.
+    if assignment_id not in values_count:
+        if len(values_count) >= settings.PRODUCT_MAX_INDEXED_ATTRIBUTES:
+            return
+    elif values_count[assignment_id] >= settings.PRODUCT_MAX_INDEXED_ATTRIBUTE_VALUES:
+        return
+    values_count[assignment_id] += 1
+
+    text = get_attribute_value_search_text(input_type, unit, value)
+    if text is not None:
+        product.texts["B"].append(text)
+    if suggested and input_type in SUGGESTED_ATTRIBUTE_INPUT_TYPES:
+        product.suggested_attribute_value_names.append(value.name)
+
+
+def _load_product_attribute_values(products: Dict[int, ProductSearchData]):
+    values_count: DefaultDict[int, DefaultDict[int, int]] = defaultdict(
+        lambda: defaultdict(int)
+    )
+    for product_id, assignment_id, input_type, unit, *value in (
+        AssignedProductAttributeValue.objects.filter(
+            assignment__product_id__in=list(products)
+        )
+        .order_by("assignment_id", "value__sort_order", "value_id")
+        .values_list("assignment__product_id", *ATTRIBUTE_VALUE_FIELDS)
+    ):
+        _add_attribute_values(
+            products[product_id],
+            values_count[product_id],
+            assignment_id,
+            input_type,
+            unit,
+            AttributeValueSearchData(*value),
+            suggested=True,
+        )
+
+
+def _load_variant_attribute_values(
+    products: Dict[int, ProductSearchData], variant_product_ids: Dict[int, int]
+):
+    values_count: DefaultDict[int, DefaultDict[int, int]] = defaultdict(
+        lambda: defaultdict(int)
+    )
+    for variant_id, assignment_id, input_type, unit, *value in (
+        AssignedVariantAttributeValue.objects.filter(
+            assignment__variant_id__in=list(variant_product_ids)
+        )
+        .order_by("assignment_id", "value__sort_order", "value_id")
+        .values_list("assignment__variant_id", *ATTRIBUTE_VALUE_FIELDS)
+    ):
+        _add_attribute_values(
+            products[variant_product_ids[variant_id]],
+            values_count[variant_id],
+            assignment_id,
+            input_type,
+            unit,
+            AttributeValueSearchData(*value),
+            suggested=False,
+        )
+
+
+def write_products_search_vectors(products: Dict[int, ProductSearchData]):
+    """Set search vectors of the products and clear their dirty flag."""
+    if not products:
+        return
+    params: List[Any] = []
+    for pk, product in products.items():
+        params.append(pk)
+        params += [
+            " ".join(text for text in product.texts[weight] if text)
+            for weight in SEARCH_VECTOR_WEIGHTS
+        ]
+    sql = UPDATE_SEARCH_VECTORS_SQL.format(
+        rows=", ".join([UPDATE_SEARCH_VECTORS_ROW_SQL] * len(products))
+    )
+    with connections[Product.objects.db].cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+def update_products_search_index(product_ids: List[int]) -> int:
+    """Index the products for search and update their suggestions.
+
+    Return the number of indexed products.
+    """
+    products = load_products_search_data(product_ids)
+    with transaction.atomic():
+        write_products_search_vectors(products)
+        replace_search_suggestions(
+            "product",
+            {
+                pk: prepare_search_suggestion_terms(
+                    product.name, product.skus, product.suggested_attribute_value_names
+                )
+                for pk, product in products.items()
+            },
+        )
+    return len(products)
@@ -0,0 +1,184 @@
+"""Marking products whose search index is out of date.
+
+Stale products have the `search_index_dirty` flag set, with a priority and the
+time since which they are stale. `update_products_search_vector_task` indexes
+them from the highest priority and the longest waiting, so changes of a single
+product are not delayed by changes of objects shared by many products.
+
+Changes of related objects are mapped to the products using them, so only these
+products are indexed again.
+"""
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Iterable, List, Optional, Union
+
+from django.db.models import (
+    Case,
+    Count,
+    Exists,
+    F,
+    Min,
+    OuterRef,
+    Q,
+    QuerySet,
+    Value,
+    When,
+)
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from ..attribute.models import (
+    AssignedProductAttributeValue,
+    AssignedVariantAttributeValue,
+)
+from .models import Product, ProductVariant
+
+MARK_DIRTY_BATCH_SIZE = 10000
+SEARCH_INDEX_DIRTY_FIELDS = [
+    "search_index_dirty",
+    "search_index_priority",
+    "search_index_dirty_since",
+]
+# Fields of attribute values used in the products' search documents.
+SEARCHABLE_ATTRIBUTE_VALUE_FIELDS = {"name", "rich_text", "plain_text", "date_time"}
+
+
+class SearchIndexPriority:
+    # Changes of objects shared by many products, like attribute values.
+    LOW = 0
+    # Changes of the product's own data.
+    HIGH = 10
+
+
+@dataclass
+class SearchIndexLag:
+    priority: int
+    stale_count: int
+    # Time since the longest waiting product is stale.
+    lag: Optional[timedelta]
+
+
+def set_product_search_index_dirty(
+    product: Product, priority: int = SearchIndexPriority.HIGH
+):
+    """Mark the product instance as stale.
+
+    The product should be saved afterwards with `SEARCH_INDEX_DIRTY_FIELDS`.
+    """
+    if product.search_index_dirty and product.search_index_dirty_since:
+        product.search_index_priority = max(product.search_index_priority, priority)
+    else:
+        product.search_index_priority = priority
+        product.search_index_dirty_since = timezone.now()
+    product.search_index_dirty = True
+
+
+def mark_products_search_index_dirty(
+    products: Union[QuerySet[Product], Iterable[int]],
+    priority: int = SearchIndexPriority.HIGH,
+) -> int:
+    """Mark the products as stale and return their number.
+
+    Products are updated in batches ordered by the primary key, to lock rows in a
+    consistent order and not to lock all products of large changes at once.
+    Products which are already stale keep their higher priority and the time
+    since they are stale.
+    """
+    if not isinstance(products, QuerySet):
+        products = Product.objects.filter(pk__in=list(products))
+    qs = products.order_by("pk")
+    marked_count = 0
+    last_pk = 0
+    while True:
+        pks = list(
+            qs.filter(pk__gt=last_pk).values_list("pk", flat=True)[
+                :MARK_DIRTY_BATCH_SIZE
+            ]
+        )
+        if not pks:
+            break
+        marked_count += Product.objects.filter(pk__in=pks).update(
+            search_index_dirty=True,
+            search_index_priority=Case(
+                When(
+                    search_index_dirty=True,
+                    then=Greatest("search_index_priority", Value(priority)),
+                ),
+                default=Value(priority),
+            ),
+            search_index_dirty_since=Case(
+                When(
+                    search_index_dirty=True,
+                    search_index_dirty_since__isnull=False,
+                    then=F("search_index_dirty_since"),
+                ),
+                default=Value(timezone.now()),
+            ),
+        )
+        last_pk = pks[-1]
+    return marked_count
+
+
+def get_products_with_attribute_values(value_ids: Iterable[int]) -> QuerySet[Product]:
+    """Return products with the values assigned to them or their variants."""
+    value_ids = list(value_ids)
+    variants = ProductVariant.objects.filter(
+        Exists(
+            AssignedVariantAttributeValue.objects.filter(
+                value_id__in=value_ids, assignment__variant_id=OuterRef("id")
+            )
+        )
+    )
+    return Product.objects.filter(
+        Q(
+            Exists(
+                AssignedProductAttributeValue.objects.filter(
+                    value_id__in=value_ids, assignment__product_id=OuterRef("id")
+                )
+            )
+        )
+        | Q(Exists(variants.filter(product_id=OuterRef("id"))))
+    )
+
+
+def get_products_with_attributes(attribute_ids: Iterable[int]) -> QuerySet[Product]:
+    """Return products with values of the attributes."""
+    attribute_ids = list(attribute_ids)
+    variants = ProductVariant.objects.filter(
+        Exists(
+            AssignedVariantAttributeValue.objects.filter(
+                value__attribute_id__in=attribute_ids,
+                assignment__variant_id=OuterRef("id"),
+            )
+        )
+    )
+    return Product.objects.filter(
+        Q(
+            Exists(
+                AssignedProductAttributeValue.objects.filter(
+                    value__attribute_id__in=attribute_ids,
+                    assignment__product_id=OuterRef("id"),
+                )
+            )
+        )
+        | Q(Exists(variants.filter(product_id=OuterRef("id"))))
+    )
+
+
+def get_products_search_index_lag() -> List[SearchIndexLag]:
+    """Return the number of stale products and their lag for every priority."""
+    now = timezone.now()
+    rows = (
+        Product.objects.filter(search_index_dirty=True)
+        .values("search_index_priority")
+        .annotate(stale_count=Count("pk"), dirty_since=Min("search_index_dirty_since"))
+        .order_by("-search_index_priority")
+    )
+    return [
+        SearchIndexLag(
+            priority=row["search_index_priority"],
+            stale_count=row["stale_count"],
+            lag=now - row["dirty_since"] if row["dirty_since"] else None,
+        )
+        for row in rows
+    ]
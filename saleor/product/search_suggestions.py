@@ -0,0 +1,216 @@
+"""Suggestions completing the search value while it's being typed.
+
+Every product, category and collection has rows with the normalized texts it can
+be found by: its name, the name without the leading words, and for products
+also the SKUs and attribute values. Rows are looked up by the prefix of the text
+first, and by trigram similarity when there are not enough of them, so partial
+words and typos are found without scanning the products table.
+"""
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q, prefetch_related_objects
+
+from ..attribute import AttributeInputType
+from .models import Category, Collection, Product, SearchSuggestion
+from .search import PRODUCT_FIELDS_TO_PREFETCH
+
+if TYPE_CHECKING:
+    from django.db.models import Model, QuerySet
+
+NAME_WEIGHT = 1.0
+NAME_SUFFIX_WEIGHT = 0.9
+SKU_WEIGHT = 0.8
+ATTRIBUTE_VALUE_WEIGHT = 0.5
+# Names are also suggested without the leading words, up to this number of words.
+MAX_NAME_SUFFIX_WORDS = 8
+MAX_TERM_LENGTH = 255
+MIN_TRIGRAM_SEARCH_LENGTH = 3
+# Number of rows fetched for every returned suggestion, to choose the best of them.
+CANDIDATES_PER_SUGGESTION = 5
+SUGGESTED_ATTRIBUTE_INPUT_TYPES = [
+    AttributeInputType.DROPDOWN,
+    AttributeInputType.MULTISELECT,
+    AttributeInputType.SWATCH,
+]
+
+SuggestionTerms = Dict[str, float]
+
+
+def normalize_suggestion_term(text: str) -> str:
+    return " ".join(text.lower().split())[:MAX_TERM_LENGTH]
+
+
+def _add_name_terms(terms: SuggestionTerms, name: str):
+    words = normalize_suggestion_term(name).split(" ")
+    for index in range(min(len(words), MAX_NAME_SUFFIX_WORDS)):
+        weight = NAME_WEIGHT if index == 0 else NAME_SUFFIX_WEIGHT
+        _add_term(terms, " ".join(words[index:]), weight)
+
+
+def _add_term(terms: SuggestionTerms, text: str, weight: float):
+    if term := normalize_suggestion_term(text):
+        terms[term] = max(terms.get(term, 0.0), weight)
+
+
+def prepare_product_search_suggestion_terms(product: "Product") -> SuggestionTerms:
+    """Return the texts suggesting the product with their weights.
+
+    The product should have the `PRODUCT_FIELDS_TO_PREFETCH` fields prefetched.
+    """
+    skus = [
+        variant.sku
+        for variant in product.variants.all()[: settings.PRODUCT_MAX_INDEXED_VARIANTS]
+        if variant.sku
+    ]
+    attribute_value_names = [
+        value.name
+        for assigned_attribute in product.attributes.all()[
+            : settings.PRODUCT_MAX_INDEXED_ATTRIBUTES
+        ]
+        if assigned_attribute.assignment.attribute.input_type
+        in SUGGESTED_ATTRIBUTE_INPUT_TYPES
+        for value in assigned_attribute.values.all()[
+            : settings.PRODUCT_MAX_INDEXED_ATTRIBUTE_VALUES
+        ]
+    ]
+    return prepare_search_suggestion_terms(product.name, skus, attribute_value_names)
+
+
+def prepare_search_suggestion_terms(
+    name: str, skus: Iterable[str], attribute_value_names: Iterable[str]
+) -> SuggestionTerms:
+    terms: SuggestionTerms = {}
+    _add_name_terms(terms, name)
+    for sku in skus:
+        _add_term(terms, sku, SKU_WEIGHT)
+    for value_name in attribute_value_names:
+        _add_term(terms, value_name, ATTRIBUTE_VALUE_WEIGHT)
+    return terms
+
+
+def prepare_name_search_suggestion_terms(instance: "Model") -> SuggestionTerms:
+    terms: SuggestionTerms = {}
+    _add_name_terms(terms, instance.name)  # type: ignore[attr-defined]
+    return terms
+
+
+def _update_search_suggestions(
+    field_name: str,
+    instances: Iterable["Model"],
+    prepare_terms: Callable[["Model"], SuggestionTerms],
+):
+    replace_search_suggestions(
+        field_name, {instance.pk: prepare_terms(instance) for instance in instances}
+    )
+
+
+def replace_search_suggestions(
+    field_name: str, terms_by_pk: Dict[int, SuggestionTerms]
+):
+    """Replace the suggestions of the objects with the given primary keys."""
+    suggestions = [
+        SearchSuggestion(term=term, weight=weight, **{f"{field_name}_id": pk})
+        for pk, terms in terms_by_pk.items()
+        for term, weight in terms.items()
+    ]
+    with transaction.atomic():
+        SearchSuggestion.objects.filter(
+            **{f"{field_name}_id__in": list(terms_by_pk)}
+        ).delete()
+        SearchSuggestion.objects.bulk_create(suggestions)
+
+
+def update_products_search_suggestions(products: List["Product"]):
+    prefetch_related_objects(products, *PRODUCT_FIELDS_TO_PREFETCH)
+    _update_search_suggestions(
+        "product", products, prepare_product_search_suggestion_terms
+    )
+
+
+def update_categories_search_suggestions(categories: Iterable["Category"]):
+    _update_search_suggestions(
+        "category", categories, prepare_name_search_suggestion_terms
+    )
+
+
+def update_collections_search_suggestions(collections: Iterable["Collection"]):
+    _update_search_suggestions(
+        "collection", collections, prepare_name_search_suggestion_terms
+    )
+
+
+def _get_suggestion_key(suggestion: SearchSuggestion) -> Tuple[int, int, int]:
+    return (
+        suggestion.product_id or 0,
+        suggestion.category_id or 0,
+        suggestion.collection_id or 0,
+    )
+
+
+def _add_best_suggestions(
+    found: List[SearchSuggestion],
+    candidates: Iterable[SearchSuggestion],
+    limit: int,
+):
+    """Add candidates to the found suggestions, one per object, up to the limit."""
+    found_keys = {_get_suggestion_key(suggestion) for suggestion in found}
+    for suggestion in candidates:
+        if len(found) >= limit:
+            break
+        key = _get_suggestion_key(suggestion)
+        if key not in found_keys:
+            found_keys.add(key)
+            found.append(suggestion)
+
+
+def get_search_suggestions(
+    value: str,
+    products: "QuerySet[Product]",
+    collections: "QuerySet[Collection]",
+    limit: int,
+) -> List[SearchSuggestion]:
+    """Return suggestions of the given products, collections and all categories.
+
+    The querysets limit the suggested objects to the ones visible to the
+    requestor.
+    """
+    term = normalize_suggestion_term(value)
+    if not term or limit < 1:
+        return []
+
+    suggestions = (
+        SearchSuggestion.objects.using(products.db)
+        .filter(
+            Exists(products.filter(pk=OuterRef("product_id")))
+            | Exists(collections.filter(pk=OuterRef("collection_id")))
+            | Q(category_id__isnull=False)
+        )
+        .select_related("product", "category", "collection")
+    )
+    candidates_count = limit * CANDIDATES_PER_SUGGESTION
+
+    # Rows are read in the order of the prefix index and the best of them are
+    # chosen afterwards, so short prefixes don't sort all matching rows.
+    candidates = suggestions.filter(term__startswith=term).order_by("term")[
+        :candidates_count
+    ]
+    found: List[SearchSuggestion] = []
+    _add_best_suggestions(
+        found,
+        sorted(
+            candidates, key=lambda suggestion: (-suggestion.weight, suggestion.term)
+        ),
+        limit,
+    )
+
+    if len(found) < limit and len(term) >= MIN_TRIGRAM_SEARCH_LENGTH:
+        similar_candidates = (
+            suggestions.filter(term__trigram_similar=term)
+            .annotate(similarity=TrigramSimilarity("term", term))
+            .order_by("-similarity", "-weight")[:candidates_count]
+        )
+        _add_best_suggestions(found, similar_candidates, limit)
+    return found
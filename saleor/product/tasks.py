@@ -9,10 +9,12 @@ from django.utils import timezone
 from ..attribute.models import Attribute
 from ..celeryconf import app
 from ..core.exceptions import PreorderAllocationError
+from ..core.search import SearchEntity, get_search_backend
 from ..discount.models import Sale
 from ..warehouse.management import deactivate_preorder_for_variant
 from .models import Product, ProductType, ProductVariant
-from .search import PRODUCTS_BATCH_SIZE, update_products_search_vector
+from .search import PRODUCTS_BATCH_SIZE
+from .search_invalidation import get_products_search_index_lag
 from .utils.variant_prices import (
     update_products_discounted_price,
     update_products_discounted_prices,
@@ -136,7 +138,13 @@ def _get_preorder_variants_to_clean():
     expires=settings.BEAT_UPDATE_SEARCH_EXPIRE_AFTER_SEC,
 )
 def update_products_search_vector_task():
-    products = Product.objects.filter(search_index_dirty=True).order_by()[
-        :PRODUCTS_BATCH_SIZE
-    ]
-    update_products_search_vector(products, use_batches=False)
+    get_search_backend(SearchEntity.PRODUCT).update_stale_index(PRODUCTS_BATCH_SIZE)
+    for lag in get_products_search_index_lag():
+        if lag.lag and lag.lag > settings.PRODUCT_SEARCH_INDEX_MAX_LAG:
+            task_logger.warning(
+                "%s products with search index priority %s are waiting for the "
+                "search index update for %s.",
+                lag.stale_count,
+                lag.priority,
+                lag.lag,
+            )
@@ -0,0 +1,62 @@
+from ..models import Product
+from ..search import search_products_in_postgres
+from ..search_index import load_products_search_data, update_products_search_index
+
+
+def test_load_products_search_data(product_list):
+    # given
+    product = product_list[0]
+    variant = product.variants.get()
+    attribute_value = product.attributes.get().values.get()
+
+    # when
+    products = load_products_search_data([product.pk])
+
+    # then
+    data = products[product.pk]
+    assert data.name == product.name
+    assert product.name in data.texts["A"]
+    assert variant.sku in data.texts["A"]
+    assert data.texts["B"] == [attribute_value.name]
+    assert data.texts["C"] == [product.description_plaintext]
+    assert data.skus == [variant.sku]
+    assert data.suggested_attribute_value_names == [attribute_value.name]
+
+
+def test_load_products_search_data_with_variant_attributes(
+    product_with_variant_with_two_attributes,
+):
+    # given
+    product = product_with_variant_with_two_attributes
+    variant_values = [
+        value.name
+        for assigned_attribute in product.variants.get().attributes.all()
+        for value in assigned_attribute.values.all()
+    ]
+
+    # when
+    products = load_products_search_data([product.pk])
+
+    # then
+    data = products[product.pk]
+    assert set(variant_values) <= set(data.texts["B"])
+    assert data.suggested_attribute_value_names == []
+
+
+def test_update_products_search_index(product_list):
+    # given
+    Product.objects.update(search_vector=None, search_index_dirty=True)
+    product = product_list[1]
+    sku = product.variants.get().sku
+
+    # when
+    indexed_count = update_products_search_index([p.pk for p in product_list])
+
+    # then
+    assert indexed_count == 3
+    assert not Product.objects.filter(search_index_dirty=True).exists()
+    qs = Product.objects.all()
+    assert list(search_products_in_postgres(qs, "orange")) == [product]
+    assert list(search_products_in_postgres(qs, sku)) == [product]
+    assert search_products_in_postgres(qs, "big").count() == 2
+    assert product.search_suggestions.filter(term=sku.lower()).exists()
@@ -0,0 +1,146 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from freezegun import freeze_time
+
+from ...core.search import SearchEntity, get_search_backend
+from ..models import Product
+from ..search_invalidation import (
+    SearchIndexPriority,
+    get_products_search_index_lag,
+    get_products_with_attribute_values,
+    get_products_with_attributes,
+    mark_products_search_index_dirty,
+    set_product_search_index_dirty,
+)
+
+
+def test_set_product_search_index_dirty(product):
+    # given
+    product.search_index_dirty = False
+
+    now = timezone.now()
+
+    # when
+    with freeze_time(now):
+        set_product_search_index_dirty(product, SearchIndexPriority.LOW)
+
+    # then
+    assert product.search_index_dirty is True
+    assert product.search_index_priority == SearchIndexPriority.LOW
+    assert product.search_index_dirty_since == now
+
+
+def test_set_product_search_index_dirty_keeps_dirty_since(product):
+    # given
+    dirty_since = timezone.now() - timedelta(hours=1)
+    product.search_index_dirty = True
+    product.search_index_priority = SearchIndexPriority.LOW
+    product.search_index_dirty_since = dirty_since
+
+    # when
+    set_product_search_index_dirty(product)
+
+    # then
+    assert product.search_index_priority == SearchIndexPriority.HIGH
+    assert product.search_index_dirty_since == dirty_since
+
+
+def test_mark_products_search_index_dirty(product_list):
+    # given
+    dirty_since = timezone.now() - timedelta(hours=1)
+    Product.objects.update(search_index_dirty=False)
+    Product.objects.filter(pk=product_list[0].pk).update(
+        search_index_dirty=True,
+        search_index_priority=SearchIndexPriority.HIGH,
+        search_index_dirty_since=dirty_since,
+    )
+
+    # when
+    marked_count = mark_products_search_index_dirty(
+        [product.pk for product in product_list[:2]], SearchIndexPriority.LOW
+    )
+
+    # then
+    assert marked_count == 2
+    product_1, product_2, product_3 = Product.objects.order_by("pk")
+    assert product_1.search_index_priority == SearchIndexPriority.HIGH
+    assert product_1.search_index_dirty_since == dirty_since
+    assert product_2.search_index_dirty is True
+    assert product_2.search_index_priority == SearchIndexPriority.LOW
+    assert product_2.search_index_dirty_since > dirty_since
+    assert product_3.search_index_dirty is False
+
+
+def test_update_stale_index_starts_with_highest_priority(product_list):
+    # given
+    now = timezone.now()
+    Product.objects.update(
+        search_index_dirty=True,
+        search_index_priority=SearchIndexPriority.LOW,
+        search_index_dirty_since=now - timedelta(hours=1),
+    )
+    Product.objects.filter(pk=product_list[2].pk).update(
+        search_index_priority=SearchIndexPriority.HIGH, search_index_dirty_since=now
+    )
+
+    # when
+    get_search_backend(SearchEntity.PRODUCT).update_stale_index(batch_size=1)
+
+    # then
+    assert list(
+        Product.objects.filter(search_index_dirty=False).values_list("pk", flat=True)
+    ) == [product_list[2].pk]
+
+
+def test_get_products_with_attribute_values(product):
+    # given
+    product_value = product.attributes.get().values.get()
+    variant_value = product.variants.get().attributes.get().values.get()
+
+    # when
+    products_by_product_value = get_products_with_attribute_values([product_value.pk])
+    products_by_variant_value = get_products_with_attribute_values([variant_value.pk])
+
+    # then
+    assert product in products_by_product_value
+    assert product in products_by_variant_value
+
+
+def test_get_products_with_attributes(product, attribute_without_values):
+    # given
+    attribute_id = product.attributes.get().values.get().attribute_id
+
+    # when
+    products = get_products_with_attributes([attribute_id])
+    products_without_values = get_products_with_attributes(
+        [attribute_without_values.pk]
+    )
+
+    # then
+    assert product in products
+    assert not products_without_values.exists()
+
+
+def test_get_products_search_index_lag(product_list):
+    # given
+    now = timezone.now()
+    Product.objects.update(
+        search_index_dirty=True,
+        search_index_priority=SearchIndexPriority.LOW,
+        search_index_dirty_since=now - timedelta(minutes=30),
+    )
+    Product.objects.filter(pk=product_list[0].pk).update(
+        search_index_priority=SearchIndexPriority.HIGH,
+        search_index_dirty_since=now - timedelta(minutes=5),
+    )
+
+    # when
+    with freeze_time(now):
+        lags = get_products_search_index_lag()
+
+    # then
+    assert [(lag.priority, lag.stale_count, lag.lag) for lag in lags] == [
+        (SearchIndexPriority.HIGH, 1, timedelta(minutes=5)),
+        (SearchIndexPriority.LOW, 2, timedelta(minutes=30)),
+    ]
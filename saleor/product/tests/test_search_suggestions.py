@@ -0,0 +1,106 @@
+from ..models import Collection, Product, SearchSuggestion
+from ..search_suggestions import (
+    ATTRIBUTE_VALUE_WEIGHT,
+    NAME_SUFFIX_WEIGHT,
+    NAME_WEIGHT,
+    SKU_WEIGHT,
+    get_search_suggestions,
+    prepare_product_search_suggestion_terms,
+    update_categories_search_suggestions,
+    update_products_search_suggestions,
+)
+
+
+def test_prepare_product_search_suggestion_terms(product_list):
+    # given
+    product = product_list[0]
+    variant = product.variants.get()
+    attribute_value = product.attributes.get().values.get()
+
+    # when
+    terms = prepare_product_search_suggestion_terms(product)
+
+    # then
+    assert terms == {
+        "test product 1": NAME_WEIGHT,
+        "product 1": NAME_SUFFIX_WEIGHT,
+        "1": NAME_SUFFIX_WEIGHT,
+        variant.sku.lower(): SKU_WEIGHT,
+        attribute_value.name.lower(): ATTRIBUTE_VALUE_WEIGHT,
+    }
+
+
+def test_update_products_search_suggestions_replaces_old_terms(product_list):
+    # given
+    product = product_list[0]
+    update_products_search_suggestions([product])
+    product.name = "Renamed"
+    product.save(update_fields=["name"])
+
+    # when
+    update_products_search_suggestions([product])
+
+    # then
+    terms = set(product.search_suggestions.values_list("term", flat=True))
+    assert "renamed" in terms
+    assert "test product 1" not in terms
+
+
+def test_get_search_suggestions_by_prefix(product_list, category):
+    # given
+    update_products_search_suggestions(product_list)
+    update_categories_search_suggestions([category])
+
+    # when
+    suggestions = get_search_suggestions(
+        "Test  PROD", Product.objects.all(), Collection.objects.all(), limit=2
+    )
+
+    # then
+    assert [suggestion.product for suggestion in suggestions] == product_list[:2]
+
+
+def test_get_search_suggestions_by_word_prefix(product_list):
+    # given
+    update_products_search_suggestions(product_list)
+
+    # when
+    suggestions = get_search_suggestions(
+        "product 3", Product.objects.all(), Collection.objects.all(), limit=5
+    )
+
+    # then
+    assert [suggestion.product for suggestion in suggestions] == [product_list[2]]
+
+
+def test_get_search_suggestions_with_typo(product_list):
+    # given
+    update_products_search_suggestions(product_list)
+
+    # when
+    suggestions = get_search_suggestions(
+        "tset product 3", Product.objects.all(), Collection.objects.all(), limit=1
+    )
+
+    # then
+    assert [suggestion.product for suggestion in suggestions] == [product_list[2]]
+
+
+def test_get_search_suggestions_of_not_visible_products(product_list, category):
+    # given
+    update_products_search_suggestions(product_list)
+    update_categories_search_suggestions([category])
+    SearchSuggestion.objects.filter(category=category).update(term="test category")
+
+    # when
+    suggestions = get_search_suggestions(
+        "test",
+        Product.objects.exclude(pk=product_list[0].pk),
+        Collection.objects.none(),
+        limit=5,
+    )
+
+    # then
+    assert {
+        suggestion.product or suggestion.category for suggestion in suggestions
+    } == {product_list[1], product_list[2], category}
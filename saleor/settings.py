@@ -533,6 +533,10 @@ EXPORT_FILES_TIMEDELTA = timedelta(
     seconds=parse(os.environ.get("EXPORT_FILES_TIMEDELTA", "30 days"))
 )
 
+# Exports of more objects than the part size are split into parts exported
+# concurrently by separate Celery tasks; 0 disables splitting
+EXPORT_FILE_PART_SIZE = int(os.environ.get("EXPORT_FILE_PART_SIZE", 100_000))
+
 # CELERY SETTINGS
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_BROKER_URL = (
@@ -559,6 +563,15 @@ BEAT_EXPIRE_ORDERS_AFTER_TIMEDELTA = timedelta(
     seconds=parse(os.environ.get("BEAT_EXPIRE_ORDERS_AFTER_TIMEDELTA", "5 minutes"))
 )
 
+# Defines how often expired checkout reservations are deleted, the Celery beat entry
+# 'delete-expired-reservations' expires after the same time if it wasn't picked up
+# by a worker.
+BEAT_DELETE_EXPIRED_RESERVATIONS_AFTER_TIMEDELTA = timedelta(
+    seconds=parse(
+        os.environ.get("BEAT_DELETE_EXPIRED_RESERVATIONS_AFTER_TIMEDELTA", "10 seconds")
+    )
+)
+
 # Defines after how many seconds should the task triggered by the Celery beat
 # entry 'update-products-search-vectors' expire if it wasn't picked up by a worker.
 BEAT_UPDATE_SEARCH_EXPIRE_AFTER_SEC = 20
@@ -582,8 +595,11 @@ CELERY_BEAT_SCHEDULE = {
     },
     "delete-expired-reservations": {
         "task": "saleor.warehouse.tasks.delete_expired_reservations_task",
-        "schedule": timedelta(days=1),
-        "options": {"queue": CELERY_TASK_DEFAULT_QUEUE}
+        "schedule": BEAT_DELETE_EXPIRED_RESERVATIONS_AFTER_TIMEDELTA,
+        "options": {
+            "expires": BEAT_DELETE_EXPIRED_RESERVATIONS_AFTER_TIMEDELTA.total_seconds(),
+            "queue": CELERY_TASK_DEFAULT_QUEUE,
+        },
     },
     "delete-expired-checkouts": {
         "task": "saleor.checkout.tasks.delete_expired_checkouts",
@@ -625,6 +641,14 @@ CELERY_BEAT_SCHEDULE = {
         "schedule": timedelta(seconds=20),
         "options": {"expires": BEAT_UPDATE_SEARCH_EXPIRE_AFTER_SEC, "queue": CELERY_TASK_DEFAULT_QUEUE},
     },
+    "update-search-indexes": {
+        "task": "saleor.core.search_tasks.update_search_indexes_task",
+        "schedule": timedelta(seconds=20),
+        "options": {
+            "expires": BEAT_UPDATE_SEARCH_EXPIRE_AFTER_SEC,
+            "queue": CELERY_TASK_DEFAULT_QUEUE,
+        },
+    },
     "update-gift-cards-search-vectors": {
         "task": "saleor.giftcard.tasks.update_gift_cards_search_vector_task",
         "schedule": timedelta(seconds=20),
@@ -852,6 +876,18 @@ WEBHOOK_SYNC_TIMEOUT = COMMON_REQUESTS_TIMEOUT
 # time of the reservation in seconds.
 RESERVE_DURATION = 45
 
+# Allocate stocks with conditional updates of the `Stock.quantity_allocated` counters
+# instead of locking all stocks of the allocated variants upfront. It reduces the lock
+# contention when many orders for the same variants are placed at once.
+OPTIMISTIC_STOCK_ALLOCATION = get_bool_from_env("OPTIMISTIC_STOCK_ALLOCATION", False)
+
+# Run the actions following the order creation in `checkoutComplete` (order events,
+# plugin and webhook calls, order confirmation and the order search vector update)
+# in a Celery task, instead of after the transaction commits within the request.
+CHECKOUT_COMPLETE_DEFER_ORDER_ACTIONS = get_bool_from_env(
+    "CHECKOUT_COMPLETE_DEFER_ORDER_ACTIONS", False
+)
+
 # Initialize a simple and basic Jaeger Tracing integration
 # for open-tracing if enabled.
 #
@@ -883,6 +919,11 @@ if REDIS_URL:
 CACHES = {"default": django_cache_url.config()}
 CACHES["default"]["TIMEOUT"] = parse(os.environ.get("CACHE_TIMEOUT", "7 days"))
 
+# Seconds for which tax rates and channel tax configurations are shared between
+# requests through the cache. Disabled by default; when enabled, changes made outside
+# of the tax mutations become visible after this time.
+TAX_DATA_CACHE_TIMEOUT = parse(os.environ.get("TAX_DATA_CACHE_TIMEOUT", "0 seconds"))
+
 JWT_EXPIRE = True
 JWT_TTL_ACCESS = timedelta(seconds=parse(os.environ.get("JWT_TTL_ACCESS", "5 minutes")))
 JWT_TTL_APP_ACCESS = timedelta(
@@ -924,6 +965,29 @@ SEARCH_ORDERS_MAX_INDEXED_LINES = 100
 PRODUCT_MAX_INDEXED_ATTRIBUTES = 1000
 PRODUCT_MAX_INDEXED_ATTRIBUTE_VALUES = 100
 PRODUCT_MAX_INDEXED_VARIANTS = 1000
+# Products waiting for the search index update longer than this are logged
+PRODUCT_SEARCH_INDEX_MAX_LAG = timedelta(
+    seconds=parse(os.environ.get("PRODUCT_SEARCH_INDEX_MAX_LAG", "15 minutes"))
+)
+
+# Search backend of each searchable entity, as a dotted path to the backend class.
+# The default one uses the search columns of the entity's table, the local index
+# one keeps an inverted index in a file of `SEARCH_LOCAL_INDEX_DIR` built by the
+# worker. The local index directory must be shared by the API and the worker.
+POSTGRES_SEARCH_BACKEND = "saleor.core.search.postgres.PostgresSearchBackend"
+LOCAL_INDEX_SEARCH_BACKEND = "saleor.core.search.local.LocalIndexSearchBackend"
+SEARCH_BACKENDS = {
+    "product": os.environ.get("PRODUCT_SEARCH_BACKEND", POSTGRES_SEARCH_BACKEND),
+    "order": os.environ.get("ORDER_SEARCH_BACKEND", POSTGRES_SEARCH_BACKEND),
+    "user": os.environ.get("USER_SEARCH_BACKEND", POSTGRES_SEARCH_BACKEND),
+}
+SEARCH_LOCAL_INDEX_DIR = os.environ.get(
+    "SEARCH_LOCAL_INDEX_DIR", os.path.join(PROJECT_ROOT, "search_index")
+)
+# The maximum number of the best matching objects returned by the local index
+SEARCH_LOCAL_INDEX_MAX_RESULTS = int(
+    os.environ.get("SEARCH_LOCAL_INDEX_MAX_RESULTS", 1000)
+)
 
 
 # Patch SubscriberExecutionContext class from `graphql-core-legacy` package
@@ -940,6 +1004,19 @@ UPDATE_SEARCH_VECTOR_INDEX_QUEUE_NAME = os.environ.get(
 )
 # Queue name for "async webhook" events
 WEBHOOK_CELERY_QUEUE_NAME = os.environ.get("WEBHOOK_CELERY_QUEUE_NAME", None)
+# Queue name for thumbnail generation; the concurrency of workers consuming it
+# limits the number of thumbnails generated at the same time
+THUMBNAIL_CELERY_QUEUE_NAME = os.environ.get("THUMBNAIL_CELERY_QUEUE_NAME", None)
+
+# Seconds after which the lock of a thumbnail being generated expires, so the
+# thumbnail is scheduled again when its worker didn't finish
+THUMBNAIL_LOCK_TIMEOUT = int(os.environ.get("THUMBNAIL_LOCK_TIMEOUT", 60))
+
+# Create thumbnails of all sizes and formats when product images are uploaded,
+# instead of when they are requested for the first time
+CREATE_PRODUCT_MEDIA_THUMBNAILS_ON_UPLOAD = get_bool_from_env(
+    "CREATE_PRODUCT_MEDIA_THUMBNAILS_ON_UPLOAD", True
+)
 
 # Lock time for request password reset mutation per user (seconds)
 RESET_PASSWORD_LOCK_TIME = parse(
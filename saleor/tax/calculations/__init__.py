@@ -1,5 +1,7 @@
-from decimal import Decimal
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, Iterable, List, Tuple
 
+from babel.numbers import get_currency_precision
 from prices import Money, TaxedMoney
 
 
@@ -18,3 +20,40 @@ def calculate_flat_rate_tax(
     return TaxedMoney(
         net=Money(net_amount, currency), gross=Money(gross_amount, currency)
     )
+
+
+def calculate_flat_rate_tax_amounts(
+    amounts: Iterable[Decimal],
+    tax_rates: Iterable[Decimal],
+    prices_entered_with_tax: bool,
+) -> Tuple[List[Decimal], List[Decimal]]:
+    """Calculate net and gross amounts for many prices in one pass.
+
+    Batched equivalent of `calculate_flat_rate_tax` that works on plain decimal
+    amounts instead of `Money` objects. Returns a list of net amounts and a list of
+    gross amounts, in the order of the given amounts.
+    """
+    multipliers: Dict[Decimal, Decimal] = {}
+    net_amounts = []
+    gross_amounts = []
+    for amount, tax_rate in zip(amounts, tax_rates):
+        multiplier = multipliers.get(tax_rate)
+        if multiplier is None:
+            multiplier = multipliers[tax_rate] = Decimal(1 + tax_rate / 100)
+        if prices_entered_with_tax:
+            net_amounts.append(amount / multiplier)
+            gross_amounts.append(amount)
+        else:
+            net_amounts.append(amount)
+            gross_amounts.append(amount * multiplier)
+    return net_amounts, gross_amounts
+
+
+def get_quantize_exponent(currency: str) -> Decimal:
+    """Return the exponent used by `quantize_amount` for the given currency."""
+    return Decimal(10) ** -get_currency_precision(currency)
+
+
+def quantize_amount(amount: Decimal, exponent: Decimal) -> Decimal:
+    """Round the amount the same way as `quantize_price` rounds `Money` objects."""
+    return amount.quantize(exponent, rounding=ROUND_HALF_UP)
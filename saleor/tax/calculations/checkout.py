@@ -1,15 +1,20 @@
 from decimal import Decimal
 from typing import TYPE_CHECKING, Iterable, Optional
 
-from prices import TaxedMoney
+from prices import Money, TaxedMoney
 
 from ...checkout import base_calculations
 from ...core.prices import quantize_price
 from ...core.taxes import zero_taxed_money
 from ...core.utils.country import get_active_country
-from ..models import TaxClassCountryRate
-from ..utils import get_tax_rate_for_tax_class, normalize_tax_rate_for_db
-from . import calculate_flat_rate_tax
+from ..lookup import get_country_tax_rates
+from ..utils import normalize_tax_rate_for_db
+from . import (
+    calculate_flat_rate_tax,
+    calculate_flat_rate_tax_amounts,
+    get_quantize_exponent,
+    quantize_amount,
+)
 
 if TYPE_CHECKING:
     from ...account.models import Address
@@ -25,43 +30,37 @@ def update_checkout_prices_with_flat_rates(
     address: Optional["Address"] = None,
 ):
     country_code = get_active_country(checkout_info.channel, address)
-    default_country_rate_obj = TaxClassCountryRate.objects.filter(
-        country=country_code, tax_class=None
-    ).first()
-    default_tax_rate = (
-        default_country_rate_obj.rate if default_country_rate_obj else Decimal(0)
-    )
+    country_tax_rates = get_country_tax_rates([country_code])[country_code]
     currency = checkout.currency
 
     # Calculate checkout line totals.
+    lines = list(lines)
+    tax_rates = []
+    base_total_amounts = []
     for line_info in lines:
-        line = line_info.line
         tax_class = line_info.tax_class
-        tax_rate = get_tax_rate_for_tax_class(
-            tax_class,
-            tax_class.country_rates.all() if tax_class else [],
-            default_tax_rate,
-            country_code,
+        tax_rates.append(
+            country_tax_rates.get_rate(tax_class.pk if tax_class else None)
         )
-        line_total_price = calculate_checkout_line_total(
-            checkout_info,
-            lines,
-            line_info,
-            tax_rate,
-            prices_entered_with_tax,
+        base_total_amounts.append(
+            _get_checkout_line_base_total(checkout_info, lines, line_info).amount
         )
-        line.total_price = line_total_price
+    exponent = get_quantize_exponent(currency)
+    net_amounts, gross_amounts = calculate_flat_rate_tax_amounts(
+        base_total_amounts, tax_rates, prices_entered_with_tax
+    )
+    for line_info, tax_rate, net_amount, gross_amount in zip(
+        lines, tax_rates, net_amounts, gross_amounts
+    ):
+        line = line_info.line
+        line.total_price_net_amount = quantize_amount(net_amount, exponent)
+        line.total_price_gross_amount = quantize_amount(gross_amount, exponent)
         line.tax_rate = normalize_tax_rate_for_db(tax_rate)
 
     # Calculate shipping price.
     shipping_method = checkout_info.delivery_method_info.delivery_method
     tax_class = getattr(shipping_method, "tax_class", None)
-    shipping_tax_rate = get_tax_rate_for_tax_class(
-        tax_class,
-        tax_class.country_rates.all() if tax_class else [],
-        default_tax_rate,
-        country_code,
-    )
+    shipping_tax_rate = country_tax_rates.get_rate(tax_class.pk if tax_class else None)
     shipping_price = calculate_checkout_shipping(
         checkout_info, lines, shipping_tax_rate, prices_entered_with_tax
     )
@@ -98,17 +97,27 @@ def calculate_checkout_line_total(
     tax_rate: Decimal,
     prices_entered_with_tax: bool,
 ) -> TaxedMoney:
+    total_price = _get_checkout_line_base_total(
+        checkout_info, lines, checkout_line_info
+    )
+    total_price = calculate_flat_rate_tax(
+        total_price, tax_rate, prices_entered_with_tax
+    )
+    return quantize_price(total_price, total_price.currency)
+
+
+def _get_checkout_line_base_total(
+    checkout_info: "CheckoutInfo",
+    lines: Iterable["CheckoutLineInfo"],
+    checkout_line_info: "CheckoutLineInfo",
+) -> Money:
     base_total_price = base_calculations.calculate_base_line_total_price(
         checkout_line_info,
         checkout_info.channel,
     )
-    total_price = base_calculations.apply_checkout_discount_on_checkout_line(
+    return base_calculations.apply_checkout_discount_on_checkout_line(
         checkout_info,
         lines,
         checkout_line_info,
         base_total_price,
     )
-    total_price = calculate_flat_rate_tax(
-        total_price, tax_rate, prices_entered_with_tax
-    )
-    return quantize_price(total_price, total_price.currency)
@@ -1,23 +1,24 @@
 from decimal import Decimal
-from typing import TYPE_CHECKING, Iterable, Tuple
+from typing import TYPE_CHECKING, Iterable, Optional, Tuple
 
 from prices import Money, TaxedMoney
 
 from ...core.prices import quantize_price
-from ...core.taxes import zero_money, zero_taxed_money
+from ...core.taxes import zero_taxed_money
 from ...discount import DiscountType
 from ...order import base_calculations
 from ...order.utils import (
     get_order_country,
     get_total_order_discount_excluding_shipping,
 )
-from ..models import TaxClassCountryRate
-from ..utils import (
-    denormalize_tax_rate_from_db,
-    get_tax_rate_for_tax_class,
-    normalize_tax_rate_for_db,
+from ..lookup import CountryTaxRates, get_country_tax_rates
+from ..utils import denormalize_tax_rate_from_db, normalize_tax_rate_for_db
+from . import (
+    calculate_flat_rate_tax,
+    calculate_flat_rate_tax_amounts,
+    get_quantize_exponent,
+    quantize_amount,
 )
-from . import calculate_flat_rate_tax
 
 if TYPE_CHECKING:
     from ...order.models import Order, OrderLine
@@ -29,27 +30,25 @@ def update_order_prices_with_flat_rates(
     prices_entered_with_tax: bool,
 ):
     country_code = get_order_country(order)
-    default_country_rate_obj = TaxClassCountryRate.objects.filter(
-        country=country_code, tax_class=None
-    ).first()
-    default_tax_rate = (
-        default_country_rate_obj.rate if default_country_rate_obj else Decimal(0)
-    )
+    country_tax_rates = get_country_tax_rates([country_code])[country_code]
+    default_tax_rate = country_tax_rates.default_rate
 
     # Calculate order line totals.
     _, undiscounted_subtotal = update_taxes_for_order_lines(
-        order, lines, country_code, default_tax_rate, prices_entered_with_tax
+        order,
+        lines,
+        country_code,
+        default_tax_rate,
+        prices_entered_with_tax,
+        country_tax_rates=country_tax_rates,
     )
 
     # Calculate order shipping.
     shipping_method = order.shipping_method
     shipping_tax_class = getattr(shipping_method, "tax_class", None)
     if shipping_tax_class:
-        shipping_tax_rate = get_tax_rate_for_tax_class(
-            shipping_tax_class,
-            shipping_tax_class.country_rates.all(),
-            default_tax_rate,
-            country_code,
+        shipping_tax_rate = country_tax_rates.get_rate(
+            shipping_tax_class.pk, default_tax_rate
         )
     elif (
         order.shipping_tax_class_name is not None
@@ -113,44 +112,45 @@ def update_taxes_for_order_lines(
     country_code: str,
     default_tax_rate: Decimal,
     prices_entered_with_tax: bool,
+    country_tax_rates: Optional[CountryTaxRates] = None,
 ) -> Tuple[Iterable["OrderLine"], TaxedMoney]:
+    """Calculate flat rate prices and tax rates of order lines.
+
+    Prices are calculated on plain decimal amounts for all lines at once and
+    assigned directly to the amount fields of the lines; the rounding is the same
+    as when calculating with `Money` objects.
+    """
     currency = order.currency
+    exponent = get_quantize_exponent(currency)
     lines = list(lines)
+    if country_tax_rates is None:
+        country_tax_rates = get_country_tax_rates([country_code])[country_code]
 
     total_discount_amount = get_total_order_discount_excluding_shipping(order).amount
     order_total_price = sum(
-        [line.base_unit_price.amount * line.quantity for line in lines]
+        [line.base_unit_price_amount * line.quantity for line in lines]
     )
     total_line_discounts = 0
 
-    undiscounted_subtotal = zero_taxed_money(order.currency)
+    undiscounted_subtotal_amount = Decimal(0)
+    taxed_lines = []
+    tax_rates = []
+    discounted_amounts = []
+    undiscounted_amounts = []
 
     for line in lines:
         variant = line.variant
         if not variant:
             continue
 
-        tax_class = line.tax_class
-        if tax_class:
-            tax_rate = get_tax_rate_for_tax_class(
-                tax_class,
-                tax_class.country_rates.all() if tax_class else [],
-                default_tax_rate,
-                country_code,
-            )
-        elif line.tax_class_name is not None and line.tax_rate is not None:
-            # If tax_class is None but tax_class_name is set, the tax class was set
-            # for this line before, but is now removed from the system. In this case
-            # try to use line.tax_rate which stores the denormalized tax rate value
-            # that was originally provided by the tax class.
-            tax_rate = denormalize_tax_rate_from_db(line.tax_rate)
-        else:
-            tax_rate = default_tax_rate
-
-        line_total_price = line.base_unit_price * line.quantity
-        undiscounted_subtotal += line_total_price
-
-        price_with_discounts = line.base_unit_price
+        tax_rate = _get_tax_rate_for_order_line(
+            line, country_tax_rates, default_tax_rate
+        )
+
+        line_total_amount = line.base_unit_price_amount * line.quantity
+        undiscounted_subtotal_amount += line_total_amount
+
+        price_with_discounts_amount = line.base_unit_price_amount
         if total_discount_amount:
             if line is lines[-1]:
                 # for the last line applied remaining discount
@@ -159,34 +159,80 @@ def update_taxes_for_order_lines(
                 # calculate discount proportionally to the rate of total line price
                 # to order total price.
                 discount_amount = quantize_price(
-                    line_total_price.amount / order_total_price * total_discount_amount,
+                    line_total_amount / order_total_price * total_discount_amount,
                     currency,
                 )
-            price_with_discounts = max(
-                quantize_price(
-                    (line_total_price - Money(discount_amount, currency))
-                    / line.quantity,
-                    currency,
+            price_with_discounts_amount = max(
+                quantize_amount(
+                    (line_total_amount - discount_amount) / line.quantity, exponent
                 ),
-                zero_money(currency),
+                Decimal(0),
             )
             # sum already applied discounts
             total_line_discounts += discount_amount
 
-        unit_price = calculate_flat_rate_tax(
-            price_with_discounts, tax_rate, prices_entered_with_tax
-        )
-        undiscounted_unit_price = calculate_flat_rate_tax(
-            line.undiscounted_base_unit_price, tax_rate, prices_entered_with_tax
-        )
+        taxed_lines.append(line)
+        tax_rates.append(tax_rate)
+        discounted_amounts.append(price_with_discounts_amount)
+        undiscounted_amounts.append(line.undiscounted_base_unit_price_amount)
 
-        line.unit_price = quantize_price(unit_price, currency)
-        line.undiscounted_unit_price = quantize_price(undiscounted_unit_price, currency)
+    unit_net_amounts, unit_gross_amounts = calculate_flat_rate_tax_amounts(
+        discounted_amounts, tax_rates, prices_entered_with_tax
+    )
+    (
+        undiscounted_unit_net_amounts,
+        undiscounted_unit_gross_amounts,
+    ) = calculate_flat_rate_tax_amounts(
+        undiscounted_amounts, tax_rates, prices_entered_with_tax
+    )
 
-        line.total_price = quantize_price(unit_price * line.quantity, currency)
-        line.undiscounted_total_price = quantize_price(
-            undiscounted_unit_price * line.quantity, currency
+    for (
+        line,
+        tax_rate,
+        unit_net,
+        unit_gross,
+        undiscounted_unit_net,
+        undiscounted_unit_gross,
+    ) in zip(
+        taxed_lines,
+        tax_rates,
+        unit_net_amounts,
+        unit_gross_amounts,
+        undiscounted_unit_net_amounts,
+        undiscounted_unit_gross_amounts,
+    ):
+        quantity = line.quantity
+        line.unit_price_net_amount = quantize_amount(unit_net, exponent)
+        line.unit_price_gross_amount = quantize_amount(unit_gross, exponent)
+        line.undiscounted_unit_price_net_amount = quantize_amount(
+            undiscounted_unit_net, exponent
+        )
+        line.undiscounted_unit_price_gross_amount = quantize_amount(
+            undiscounted_unit_gross, exponent
+        )
+        line.total_price_net_amount = quantize_amount(unit_net * quantity, exponent)
+        line.total_price_gross_amount = quantize_amount(unit_gross * quantity, exponent)
+        line.undiscounted_total_price_net_amount = quantize_amount(
+            undiscounted_unit_net * quantity, exponent
+        )
+        line.undiscounted_total_price_gross_amount = quantize_amount(
+            undiscounted_unit_gross * quantity, exponent
         )
         line.tax_rate = normalize_tax_rate_for_db(tax_rate)
 
-    return lines, undiscounted_subtotal
+    undiscounted_subtotal = Money(undiscounted_subtotal_amount, currency)
+    return lines, TaxedMoney(net=undiscounted_subtotal, gross=undiscounted_subtotal)
+
+
+def _get_tax_rate_for_order_line(
+    line: "OrderLine", country_tax_rates: CountryTaxRates, default_tax_rate: Decimal
+) -> Decimal:
+    if line.tax_class_id:
+        return country_tax_rates.get_rate(line.tax_class_id, default_tax_rate)
+    if line.tax_class_name is not None and line.tax_rate is not None:
+        # If tax_class is None but tax_class_name is set, the tax class was set
+        # for this line before, but is now removed from the system. In this case
+        # try to use line.tax_rate which stores the denormalized tax rate value
+        # that was originally provided by the tax class.
+        return denormalize_tax_rate_from_db(line.tax_rate)
+    return default_tax_rate
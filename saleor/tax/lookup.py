@@ -0,0 +1,225 @@
+"""Precomputed tax rates and tax configurations.
+
+Flat rates calculations for checkouts and orders and the GraphQL pricing resolvers
+need the same data: a tax rate for a (tax class, country) pair and the tax
+configuration of a channel with its per-country exceptions. The structures defined
+here are built with a single query per batch and can be shared between requests
+through the Django cache, when `TAX_DATA_CACHE_TIMEOUT` is set.
+"""
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from . import TaxCalculationStrategy
+from .models import TaxClassCountryRate, TaxConfiguration
+
+TAX_DATA_VERSION_CACHE_KEY = "tax_data_version"
+COUNTRY_TAX_RATES_CACHE_KEY = "country_tax_rates"
+TAX_CONFIGURATION_CACHE_KEY = "tax_configuration_snapshot"
+
+
+@dataclass(frozen=True)
+class CountryTaxRates:
+    """Tax rates of all tax classes in a single country."""
+
+    country_code: str
+    default_rate: Decimal = Decimal(0)
+    tax_class_rates: Dict[int, Decimal] = field(default_factory=dict)
+
+    def get_rate(
+        self, tax_class_id: Optional[int], default: Optional[Decimal] = None
+    ) -> Decimal:
+        """Return the rate for the tax class.
+
+        Fall back to `default`, or to the default rate of the country, when the tax
+        class is not given or has no rate in the country.
+        """
+        if default is None:
+            default = self.default_rate
+        if tax_class_id is None:
+            return default
+        return self.tax_class_rates.get(tax_class_id, default)
+
+
+@dataclass(frozen=True)
+class CountryTaxConfigurationSnapshot:
+    country_code: str
+    charge_taxes: bool
+    tax_calculation_strategy: Optional[str]
+    display_gross_prices: bool
+
+
+@dataclass(frozen=True)
+class TaxConfigurationSnapshot:
+    """Immutable copy of a channel tax configuration and its country exceptions.
+
+    The attribute names match the `TaxConfiguration` and `TaxConfigurationPerCountry`
+    models, so the snapshots can be passed to the helpers from `saleor.tax.utils`.
+    """
+
+    id: int
+    channel_id: int
+    charge_taxes: bool
+    tax_calculation_strategy: Optional[str]
+    display_gross_prices: bool
+    prices_entered_with_tax: bool
+    country_exceptions: Dict[str, CountryTaxConfigurationSnapshot] = field(
+        default_factory=dict
+    )
+
+    @classmethod
+    def from_tax_configuration(
+        cls, tax_configuration: TaxConfiguration
+    ) -> "TaxConfigurationSnapshot":
+        return cls(
+            id=tax_configuration.pk,
+            channel_id=tax_configuration.channel_id,
+            charge_taxes=tax_configuration.charge_taxes,
+            tax_calculation_strategy=tax_configuration.tax_calculation_strategy,
+            display_gross_prices=tax_configuration.display_gross_prices,
+            prices_entered_with_tax=tax_configuration.prices_entered_with_tax,
+            country_exceptions={
+                exception.country.code: CountryTaxConfigurationSnapshot(
+                    country_code=exception.country.code,
+                    charge_taxes=exception.charge_taxes,
+                    tax_calculation_strategy=exception.tax_calculation_strategy,
+                    display_gross_prices=exception.display_gross_prices,
+                )
+                for exception in tax_configuration.country_exceptions.all()
+            },
+        )
+
+    def get_country_exception(
+        self, country_code: str
+    ) -> Optional[CountryTaxConfigurationSnapshot]:
+        return self.country_exceptions.get(country_code)
+
+    def get_charge_taxes(self, country_code: str) -> bool:
+        country_exception = self.get_country_exception(country_code)
+        if country_exception:
+            return country_exception.charge_taxes
+        return self.charge_taxes
+
+    def get_tax_calculation_strategy(self, country_code: str) -> str:
+        country_exception = self.get_country_exception(country_code)
+        strategy = (
+            country_exception.tax_calculation_strategy
+            if country_exception
+            else self.tax_calculation_strategy
+        )
+        return strategy or TaxCalculationStrategy.FLAT_RATES
+
+    def get_display_gross_prices(self, country_code: str) -> bool:
+        country_exception = self.get_country_exception(country_code)
+        if country_exception:
+            return country_exception.display_gross_prices
+        return self.display_gross_prices
+
+
+def get_country_tax_rates(
+    country_codes: Iterable[str],
+    database_connection_name: str = settings.DATABASE_CONNECTION_DEFAULT_NAME,
+) -> Dict[str, CountryTaxRates]:
+    """Return tax rates for the given countries, keyed by country code."""
+    country_codes = set(country_codes)
+    results = _get_from_cache(COUNTRY_TAX_RATES_CACHE_KEY, country_codes)
+    missing = country_codes - results.keys()
+    if not missing:
+        return results
+
+    default_rates: Dict[str, Decimal] = {}
+    tax_class_rates: Dict[str, Dict[int, Decimal]] = {code: {} for code in missing}
+    rates = (
+        TaxClassCountryRate.objects.using(database_connection_name)
+        .filter(country__in=missing)
+        .values_list("country", "tax_class_id", "rate")
+    )
+    for country_code, tax_class_id, rate in rates:
+        if tax_class_id is None:
+            default_rates[country_code] = rate
+        else:
+            tax_class_rates[country_code][tax_class_id] = rate
+
+    fetched = {
+        code: CountryTaxRates(
+            country_code=code,
+            default_rate=default_rates.get(code, Decimal(0)),
+            tax_class_rates=tax_class_rates[code],
+        )
+        for code in missing
+    }
+    _set_in_cache(COUNTRY_TAX_RATES_CACHE_KEY, fetched)
+    results.update(fetched)
+    return results
+
+
+def get_tax_configuration_snapshots(
+    channel_ids: Iterable[int],
+    database_connection_name: str = settings.DATABASE_CONNECTION_DEFAULT_NAME,
+) -> Dict[int, TaxConfigurationSnapshot]:
+    """Return tax configuration snapshots of the given channels, keyed by channel id."""
+    channel_ids = set(channel_ids)
+    results = _get_from_cache(TAX_CONFIGURATION_CACHE_KEY, channel_ids)
+    missing = channel_ids - results.keys()
+    if not missing:
+        return results
+
+    tax_configurations = (
+        TaxConfiguration.objects.using(database_connection_name)
+        .filter(channel_id__in=missing)
+        .prefetch_related("country_exceptions")
+    )
+    fetched = {
+        tax_configuration.channel_id: TaxConfigurationSnapshot.from_tax_configuration(
+            tax_configuration
+        )
+        for tax_configuration in tax_configurations
+    }
+    _set_in_cache(TAX_CONFIGURATION_CACHE_KEY, fetched)
+    results.update(fetched)
+    return results
+
+
+def invalidate_tax_data_cache():
+    """Make cached tax rates and configurations stale after the transaction commits.
+
+    Must be called whenever `TaxClassCountryRate`, `TaxConfiguration` or
+    `TaxConfigurationPerCountry` objects are changed.
+    """
+    if not settings.TAX_DATA_CACHE_TIMEOUT:
+        return
+    transaction.on_commit(_bump_tax_data_version)
+
+
+def _bump_tax_data_version():
+    try:
+        cache.incr(TAX_DATA_VERSION_CACHE_KEY)
+    except ValueError:
+        cache.set(TAX_DATA_VERSION_CACHE_KEY, 1, timeout=None)
+
+
+def _get_cache_keys(prefix: str, keys: Iterable) -> Dict[str, object]:
+    version = cache.get(TAX_DATA_VERSION_CACHE_KEY, 0)
+    return {f"{prefix}:{version}:{key}": key for key in keys}
+
+
+def _get_from_cache(prefix: str, keys: Iterable) -> dict:
+    if not settings.TAX_DATA_CACHE_TIMEOUT:
+        return {}
+    cache_keys = _get_cache_keys(prefix, keys)
+    cached = cache.get_many(cache_keys.keys())
+    return {cache_keys[cache_key]: value for cache_key, value in cached.items()}
+
+
+def _set_in_cache(prefix: str, values: dict):
+    if not settings.TAX_DATA_CACHE_TIMEOUT or not values:
+        return
+    cache_keys = _get_cache_keys(prefix, values.keys())
+    cache.set_many(
+        {cache_key: values[key] for cache_key, key in cache_keys.items()},
+        timeout=settings.TAX_DATA_CACHE_TIMEOUT,
+    )
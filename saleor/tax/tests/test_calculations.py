@@ -4,7 +4,12 @@ import pytest
 from prices import Money
 
 from ...core.prices import quantize_price
-from ..calculations import calculate_flat_rate_tax
+from ..calculations import (
+    calculate_flat_rate_tax,
+    calculate_flat_rate_tax_amounts,
+    get_quantize_exponent,
+    quantize_amount,
+)
 
 
 @pytest.mark.parametrize(
@@ -20,3 +25,42 @@ def test_calculate_flat_tax_rate(amount, net, gross, rate, prices_entered_with_t
     taxed_money = calculate_flat_rate_tax(money, rate, prices_entered_with_tax)
     assert quantize_price(taxed_money.net.amount, currency) == Decimal(net)
     assert quantize_price(taxed_money.gross.amount, currency) == Decimal(gross)
+
+
+@pytest.mark.parametrize("prices_entered_with_tax", [True, False])
+@pytest.mark.parametrize("currency", ["USD", "JPY", "KWD"])
+def test_calculate_flat_rate_tax_amounts_matches_calculate_flat_rate_tax(
+    prices_entered_with_tax, currency
+):
+    # given
+    amounts = [
+        Decimal(cents) / 100 * quantity
+        for cents in (1, 5, 99, 1005, 123457, 9999999)
+        for quantity in (1, 3, 7)
+    ]
+    tax_rates = [
+        rate
+        for rate in (Decimal(0), Decimal(5), Decimal("7.5"), Decimal(23), 19)
+        for _ in range(len(amounts) // 5 + 1)
+    ][: len(amounts)]
+    exponent = get_quantize_exponent(currency)
+
+    # when
+    net_amounts, gross_amounts = calculate_flat_rate_tax_amounts(
+        amounts, tax_rates, prices_entered_with_tax
+    )
+
+    # then
+    for amount, tax_rate, net_amount, gross_amount in zip(
+        amounts, tax_rates, net_amounts, gross_amounts
+    ):
+        expected = calculate_flat_rate_tax(
+            Money(amount, currency), tax_rate, prices_entered_with_tax
+        )
+        assert net_amount == expected.net.amount
+        assert gross_amount == expected.gross.amount
+        expected = quantize_price(expected, currency)
+        assert str(quantize_amount(net_amount, exponent)) == str(expected.net.amount)
+        assert str(quantize_amount(gross_amount, exponent)) == str(
+            expected.gross.amount
+        )
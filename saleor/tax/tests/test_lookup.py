@@ -0,0 +1,106 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+
+from .. import TaxCalculationStrategy
+from ..lookup import (
+    TAX_DATA_VERSION_CACHE_KEY,
+    CountryTaxRates,
+    TaxConfigurationSnapshot,
+    get_country_tax_rates,
+    get_tax_configuration_snapshots,
+    invalidate_tax_data_cache,
+)
+from ..models import TaxClassCountryRate
+
+
+def test_country_tax_rates_get_rate():
+    # given
+    country_tax_rates = CountryTaxRates(
+        country_code="PL", default_rate=Decimal(8), tax_class_rates={1: Decimal(23)}
+    )
+
+    # then
+    assert country_tax_rates.get_rate(1) == Decimal(23)
+    assert country_tax_rates.get_rate(2) == Decimal(8)
+    assert country_tax_rates.get_rate(None) == Decimal(8)
+    assert country_tax_rates.get_rate(2, Decimal(5)) == Decimal(5)
+
+
+def test_get_country_tax_rates(
+    default_tax_class, tax_classes, django_assert_num_queries
+):
+    # given
+    TaxClassCountryRate.objects.create(country="PL", rate=8)
+
+    # when
+    with django_assert_num_queries(1):
+        rates = get_country_tax_rates(["PL", "DE", "US"])
+
+    # then
+    assert rates["PL"].default_rate == Decimal(8)
+    assert rates["PL"].get_rate(default_tax_class.pk) == Decimal(23)
+    assert rates["DE"].default_rate == Decimal(0)
+    assert rates["DE"].get_rate(tax_classes[0].pk) == Decimal(19)
+    assert rates["US"] == CountryTaxRates(country_code="US")
+
+
+def test_get_country_tax_rates_cached(
+    default_tax_class,
+    settings,
+    django_assert_num_queries,
+    django_capture_on_commit_callbacks,
+):
+    # given
+    settings.TAX_DATA_CACHE_TIMEOUT = 60
+    cache.delete(TAX_DATA_VERSION_CACHE_KEY)
+    get_country_tax_rates(["PL"])
+    TaxClassCountryRate.objects.filter(country="PL").update(rate=10)
+
+    # when
+    with django_assert_num_queries(0):
+        rates = get_country_tax_rates(["PL"])
+
+    # then
+    assert rates["PL"].get_rate(default_tax_class.pk) == Decimal(23)
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        invalidate_tax_data_cache()
+    rates = get_country_tax_rates(["PL"])
+
+    # then
+    assert rates["PL"].get_rate(default_tax_class.pk) == Decimal(10)
+
+
+def test_get_tax_configuration_snapshots(channel_USD, channel_PLN):
+    # given
+    tax_configuration = channel_USD.tax_configuration
+    tax_configuration.tax_calculation_strategy = None
+    tax_configuration.save(update_fields=["tax_calculation_strategy"])
+    tax_configuration.country_exceptions.all().delete()
+    tax_configuration.country_exceptions.create(
+        country="PL",
+        charge_taxes=False,
+        tax_calculation_strategy=TaxCalculationStrategy.TAX_APP,
+        display_gross_prices=not tax_configuration.display_gross_prices,
+    )
+
+    # when
+    snapshots = get_tax_configuration_snapshots([channel_USD.pk, channel_PLN.pk])
+
+    # then
+    snapshot = snapshots[channel_USD.pk]
+    assert snapshot == TaxConfigurationSnapshot.from_tax_configuration(
+        tax_configuration
+    )
+    assert snapshots[channel_PLN.pk].channel_id == channel_PLN.pk
+    assert snapshot.get_charge_taxes("PL") is False
+    assert snapshot.get_charge_taxes("US") == tax_configuration.charge_taxes
+    assert snapshot.get_tax_calculation_strategy("PL") == TaxCalculationStrategy.TAX_APP
+    assert (
+        snapshot.get_tax_calculation_strategy("US") == TaxCalculationStrategy.FLAT_RATES
+    )
+    assert snapshot.get_display_gross_prices("PL") is not (
+        tax_configuration.display_gross_prices
+    )
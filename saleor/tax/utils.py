@@ -10,6 +10,7 @@ if TYPE_CHECKING:
     from ..checkout.fetch import CheckoutInfo, CheckoutLineInfo
     from ..order.models import Order
     from ..tax.models import TaxClass, TaxClassCountryRate
+    from .lookup import TaxConfigurationSnapshot
     from .models import TaxConfiguration, TaxConfigurationPerCountry
 
 
@@ -64,44 +65,32 @@ def get_tax_calculation_strategy(
     ) or TaxCalculationStrategy.FLAT_RATES
 
 
-def get_charge_taxes_for_order(order: "Order") -> bool:
-    """Get charge_taxes value for order."""
+def get_tax_configuration_for_order(
+    order: "Order",
+) -> Tuple["TaxConfigurationSnapshot", str]:
+    """Return the tax configuration of the order channel and the order country."""
+    from .lookup import get_tax_configuration_snapshots
+
     channel = order.channel
-    tax_configuration = channel.tax_configuration
     country_code = get_active_country(
         channel,
         order.shipping_address,
         order.billing_address,
     )
-    country_tax_configuration = next(
-        (
-            tc
-            for tc in tax_configuration.country_exceptions.all()
-            if tc.country.code == country_code
-        ),
-        None,
-    )
-    return get_charge_taxes(tax_configuration, country_tax_configuration)
+    tax_configuration = get_tax_configuration_snapshots([channel.pk])[channel.pk]
+    return tax_configuration, country_code
+
+
+def get_charge_taxes_for_order(order: "Order") -> bool:
+    """Get charge_taxes value for order."""
+    tax_configuration, country_code = get_tax_configuration_for_order(order)
+    return tax_configuration.get_charge_taxes(country_code)
 
 
 def get_tax_calculation_strategy_for_order(order: "Order"):
     """Get tax_calculation_strategy value for order."""
-    channel = order.channel
-    tax_configuration = channel.tax_configuration
-    country_code = get_active_country(
-        channel,
-        order.shipping_address,
-        order.billing_address,
-    )
-    country_tax_configuration = next(
-        (
-            tc
-            for tc in tax_configuration.country_exceptions.all()
-            if tc.country.code == country_code
-        ),
-        None,
-    )
-    return get_tax_calculation_strategy(tax_configuration, country_tax_configuration)
+    tax_configuration, country_code = get_tax_configuration_for_order(order)
+    return tax_configuration.get_tax_calculation_strategy(country_code)
 
 
 def _get_tax_configuration_for_checkout(
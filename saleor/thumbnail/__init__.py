@@ -22,6 +22,10 @@ class ThumbnailFormat:
 
 ALLOWED_THUMBNAIL_FORMATS = {ThumbnailFormat.AVIF, ThumbnailFormat.WEBP}
 
+# Formats of the thumbnails created when product media are uploaded;
+# None stands for the format of the original image
+PRODUCT_MEDIA_THUMBNAIL_FORMATS = [None, ThumbnailFormat.WEBP, ThumbnailFormat.AVIF]
+
 # PIL-supported file formats as found here:
 # https://pillow.readthedocs.io/en/stable/handbook/image-file-formats.html
 # Dict structure: {<mime-type>: <PIL-identifier>}
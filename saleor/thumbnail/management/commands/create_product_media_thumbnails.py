@@ -0,0 +1,96 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from ....product.models import ProductMedia
+from ...tasks import create_product_media_thumbnails
+
+DEFAULT_BATCH_SIZE = 100
+
+
+def create_thumbnails_batch(media_ids: List[int]) -> Tuple[int, List[int]]:
+    """Create thumbnails of the media in a worker process.
+
+    Return the number of created thumbnails and ids of media which failed.
+    """
+    thumbnails_count = 0
+    failed_ids = []
+    for media in ProductMedia.objects.filter(pk__in=media_ids):
+        try:
+            thumbnails_count += len(create_product_media_thumbnails(media))
+        except ValueError:
+            failed_ids.append(media.pk)
+    return thumbnails_count, failed_ids
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the missing thumbnails of product images in all sizes and formats. "
+        "Existing thumbnails are skipped, so the command can be run again when "
+        "interrupted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Number of images processed by a worker at once.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of processes creating thumbnails at the same time.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("Batch size must be a positive number.")
+        workers = options["workers"]
+        if workers < 1:
+            raise CommandError("Number of workers must be a positive number.")
+
+        media_ids = list(
+            ProductMedia.objects.exclude(image="")
+            .exclude(image__isnull=True)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        batches = [
+            media_ids[index : index + batch_size]
+            for index in range(0, len(media_ids), batch_size)
+        ]
+        self.stdout.write(f"Creating thumbnails of {len(media_ids)} product images")
+
+        if workers == 1:
+            results = map(create_thumbnails_batch, batches)
+            thumbnails_count, failed_ids = self.collect_results(results)
+        else:
+            # Forked workers can't share the database connections of this process.
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("fork")
+            ) as executor:
+                thumbnails_count, failed_ids = self.collect_results(
+                    executor.map(create_thumbnails_batch, batches)
+                )
+
+        self.stdout.write(f"Created {thumbnails_count} thumbnails.")
+        if failed_ids:
+            self.stderr.write(
+                "Cannot process images of media: "
+                + ", ".join(str(pk) for pk in failed_ids)
+            )
+
+    def collect_results(self, results) -> Tuple[int, List[int]]:
+        thumbnails_count = 0
+        failed_ids: List[int] = []
+        for batch_count, batch_failed_ids in results:
+            thumbnails_count += batch_count
+            failed_ids += batch_failed_ids
+        return thumbnails_count, failed_ids
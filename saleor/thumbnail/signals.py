@@ -1,6 +1,8 @@
 from ..core.tasks import delete_from_storage_task
+from .utils import uncache_thumbnail
 
 
 def delete_thumbnail_image(sender, instance, **kwargs):
+    uncache_thumbnail(instance)
     if image := instance.image:
         delete_from_storage_task.delay(image.name)
@@ -0,0 +1,223 @@
+import logging
+from collections import namedtuple
+from typing import Iterable, List, Optional
+
+from celery.utils.log import get_task_logger
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from ..account.models import User
+from ..app.models import App, AppInstallation
+from ..celeryconf import app
+from ..core.utils.events import call_event
+from ..plugins.manager import get_plugins_manager
+from ..product.models import Category, Collection, ProductMedia
+from . import PRODUCT_MEDIA_THUMBNAIL_FORMATS, THUMBNAIL_SIZES
+from .models import Thumbnail
+from .utils import (
+    ProcessedIconImage,
+    ProcessedImage,
+    cache_thumbnails,
+    create_thumbnail_files,
+    prepare_thumbnail_file_name,
+)
+
+task_logger: logging.Logger = get_task_logger(__name__)
+
+ModelData = namedtuple("ModelData", ["model", "image_field", "thumbnail_field"])
+
+ICON_TYPE_TO_MODEL_DATA_MAPPING = {
+    "App": ModelData(App, "brand_logo_default", "app"),
+    "AppInstallation": ModelData(
+        AppInstallation, "brand_logo_default", "app_installation"
+    ),
+}
+TYPE_TO_MODEL_DATA_MAPPING = {
+    "User": ModelData(User, "avatar", "user"),
+    "Category": ModelData(Category, "background_image", "category"),
+    "Collection": ModelData(Collection, "background_image", "collection"),
+    "ProductMedia": ModelData(ProductMedia, "image", "product_media"),
+    **ICON_TYPE_TO_MODEL_DATA_MAPPING,
+}
+UUID_IDENTIFIABLE_TYPES = ["User", "App", "AppInstallation"]
+
+
+def get_instance_id_lookup(object_type: str) -> str:
+    """Return the `Thumbnail` lookup of the instance's identifier."""
+    model_data = TYPE_TO_MODEL_DATA_MAPPING[object_type]
+    if object_type in UUID_IDENTIFIABLE_TYPES:
+        return model_data.thumbnail_field + "__uuid"
+    return model_data.thumbnail_field + "_id"
+
+
+def get_thumbnail_lock_key(
+    object_type: str, pk: str, size: int, format: Optional[str]
+) -> str:
+    return f"thumbnail-lock:{object_type}:{pk}:{size}:{format or ''}"
+
+
+def acquire_thumbnail_lock(
+    object_type: str, pk: str, size: int, format: Optional[str]
+) -> bool:
+    """Return whether the caller should generate the thumbnail.
+
+    The lock expires after `THUMBNAIL_LOCK_TIMEOUT`, so the thumbnail is generated
+    again when the worker holding the lock dies.
+    """
+    return cache.add(
+        get_thumbnail_lock_key(object_type, pk, size, format),
+        True,
+        settings.THUMBNAIL_LOCK_TIMEOUT,
+    )
+
+
+def release_thumbnail_lock(object_type: str, pk: str, size: int, format: Optional[str]):
+    cache.delete(get_thumbnail_lock_key(object_type, pk, size, format))
+
+
+def save_thumbnail_image(thumbnail: Thumbnail, image_name: str, thumbnail_file):
+    """Save the thumbnail file under a name derived from the original image name.
+
+    A file left with the same name is replaced, so the storage doesn't make the
+    name unique with a random suffix.
+    """
+    file_name = prepare_thumbnail_file_name(
+        image_name, thumbnail.size, thumbnail.format
+    )
+    storage_name = thumbnail.image.field.generate_filename(thumbnail, file_name)
+    if thumbnail.image.storage.exists(storage_name):
+        thumbnail.image.storage.delete(storage_name)
+    thumbnail.image.save(file_name, thumbnail_file, save=False)
+
+
+def create_thumbnail(
+    object_type: str, instance, image, size: int, format: Optional[str]
+) -> Thumbnail:
+    """Create the thumbnail of the instance's image and save it to the storage.
+
+    Raise `ValueError` when the image can't be processed.
+    """
+    model_data = TYPE_TO_MODEL_DATA_MAPPING[object_type]
+    if object_type in ICON_TYPE_TO_MODEL_DATA_MAPPING:
+        processed_image: ProcessedImage = ProcessedIconImage(image.name, size, format)
+    else:
+        processed_image = ProcessedImage(image.name, size, format)
+    thumbnail_file, _ = processed_image.create_thumbnail()
+
+    thumbnail = Thumbnail(
+        size=size, format=format, **{model_data.thumbnail_field: instance}
+    )
+    save_thumbnail_image(thumbnail, image.name, thumbnail_file)
+    thumbnail.save()
+    cache_thumbnails([thumbnail])
+
+    # set additional `instance` attribute, to easily get instance data
+    # for ThumbnailCreated subscription type
+    setattr(thumbnail, "instance", instance)
+    manager = get_plugins_manager(allow_replica=False)
+    call_event(manager.thumbnail_created, thumbnail)
+    return thumbnail
+
+
+@app.task(queue=settings.THUMBNAIL_CELERY_QUEUE_NAME)
+def create_thumbnail_task(
+    object_type: str, pk: str, size: int, format: Optional[str]
+) -> Optional[str]:
+    """Create the thumbnail and release its lock.
+
+    Return the thumbnail URL, or None when the image can't be processed.
+    """
+    try:
+        existing_thumbnail = Thumbnail.objects.filter(
+            format=format, size=size, **{get_instance_id_lookup(object_type): pk}
+        ).first()
+        if existing_thumbnail:
+            cache_thumbnails([existing_thumbnail])
+            return existing_thumbnail.image.url
+
+        model_data = TYPE_TO_MODEL_DATA_MAPPING[object_type]
+        lookup = "uuid" if object_type in UUID_IDENTIFIABLE_TYPES else "id"
+        instance = model_data.model.objects.filter(**{lookup: pk}).first()
+        image = getattr(instance, model_data.image_field, None)
+        if not image:
+            task_logger.info(
+                "Skipping thumbnail of %s %s without an image.", object_type, pk
+            )
+            return None
+
+        try:
+            thumbnail = create_thumbnail(object_type, instance, image, size, format)
+        except ValueError as error:
+            task_logger.info(str(error))
+            return None
+        return thumbnail.image.url
+    finally:
+        release_thumbnail_lock(object_type, pk, size, format)
+
+
+def create_product_media_thumbnails(media: ProductMedia) -> List[Thumbnail]:
+    """Create the missing thumbnails of the media in all sizes and formats.
+
+    Thumbnails which are being created by other workers are skipped. Raise
+    `ValueError` when the image can't be processed.
+    """
+    if not media.image:
+        return []
+    pk = str(media.pk)
+    existing = set(media.thumbnails.values_list("size", "format"))
+    missing = [
+        (size, format)
+        for size in THUMBNAIL_SIZES
+        for format in PRODUCT_MEDIA_THUMBNAIL_FORMATS
+        if (size, format) not in existing
+        and acquire_thumbnail_lock("ProductMedia", pk, size, format)
+    ]
+    if not missing:
+        return []
+    try:
+        thumbnails = []
+        missing_set = set(missing)
+        for size, format, thumbnail_file in create_thumbnail_files(
+            media.image.name,
+            {size for size, _ in missing},
+            {format for _, format in missing},
+        ):
+            if (size, format) not in missing_set:
+                continue
+            thumbnail = Thumbnail(size=size, format=format, product_media=media)
+            save_thumbnail_image(thumbnail, media.image.name, thumbnail_file)
+            thumbnails.append(thumbnail)
+        Thumbnail.objects.bulk_create(thumbnails)
+        cache_thumbnails(thumbnails)
+    finally:
+        for size, format in missing:
+            release_thumbnail_lock("ProductMedia", pk, size, format)
+
+    manager = get_plugins_manager(allow_replica=False)
+    for thumbnail in thumbnails:
+        setattr(thumbnail, "instance", media)
+        call_event(manager.thumbnail_created, thumbnail)
+    return thumbnails
+
+
+@app.task(queue=settings.THUMBNAIL_CELERY_QUEUE_NAME)
+def create_product_media_thumbnails_task(media_ids: Iterable[int]):
+    for media in ProductMedia.objects.filter(pk__in=media_ids):
+        try:
+            create_product_media_thumbnails(media)
+        except ValueError as error:
+            task_logger.info(
+                "Cannot create thumbnails of media %s: %s", media.pk, error
+            )
+
+
+def schedule_product_media_thumbnails(media: Iterable[ProductMedia]):
+    """Create thumbnails of the uploaded images once the transaction is committed."""
+    if not settings.CREATE_PRODUCT_MEDIA_THUMBNAILS_ON_UPLOAD:
+        return
+    media_ids = [media_item.pk for media_item in media if media_item.image]
+    if media_ids:
+        transaction.on_commit(
+            lambda: create_product_media_thumbnails_task.delay(media_ids)
+        )
@@ -0,0 +1,31 @@
+from unittest.mock import patch
+
+import graphene
+import pytest
+
+from ... import ThumbnailFormat
+from ...models import Thumbnail
+from ...tasks import release_thumbnail_lock
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+@patch("saleor.thumbnail.views.create_thumbnail_task.delay")
+def test_thumbnail_view_cold_cache_burst(
+    create_thumbnail_task_mock, client, product_with_image, count_queries
+):
+    # given
+    size = 128
+    media = product_with_image.media.first()
+    media_id = graphene.Node.to_global_id("ProductMedia", media.id)
+
+    # when
+    responses = [client.get(f"/thumbnail/{media_id}/{size}/webp/") for _ in range(50)]
+
+    # then
+    assert {response.url for response in responses} == {media.image.url}
+    create_thumbnail_task_mock.assert_called_once_with(
+        "ProductMedia", str(media.id), size, ThumbnailFormat.WEBP
+    )
+    assert not Thumbnail.objects.exists()
+    release_thumbnail_lock("ProductMedia", str(media.id), size, ThumbnailFormat.WEBP)
@@ -0,0 +1,132 @@
+from unittest.mock import patch
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+
+from .. import PRODUCT_MEDIA_THUMBNAIL_FORMATS, THUMBNAIL_SIZES, ThumbnailFormat
+from ..models import Thumbnail
+from ..tasks import (
+    acquire_thumbnail_lock,
+    create_product_media_thumbnails,
+    create_thumbnail_task,
+    release_thumbnail_lock,
+    save_thumbnail_image,
+)
+
+
+def test_create_thumbnail_task(category_with_image):
+    # given
+    pk = str(category_with_image.pk)
+    acquire_thumbnail_lock("Category", pk, 128, ThumbnailFormat.WEBP)
+
+    # when
+    thumbnail_url = create_thumbnail_task("Category", pk, 128, ThumbnailFormat.WEBP)
+
+    # then
+    thumbnail = Thumbnail.objects.get(category=category_with_image)
+    assert thumbnail_url == thumbnail.image.url
+    assert thumbnail.size == 128
+    assert thumbnail.format == ThumbnailFormat.WEBP
+    # the lock is released
+    assert acquire_thumbnail_lock("Category", pk, 128, ThumbnailFormat.WEBP)
+    release_thumbnail_lock("Category", pk, 128, ThumbnailFormat.WEBP)
+
+
+def test_create_thumbnail_task_thumbnail_already_exists(
+    category_with_image, thumbnail_category
+):
+    # when
+    thumbnail_url = create_thumbnail_task(
+        "Category",
+        str(category_with_image.pk),
+        thumbnail_category.size,
+        thumbnail_category.format,
+    )
+
+    # then
+    assert thumbnail_url == thumbnail_category.image.url
+    assert Thumbnail.objects.count() == 1
+
+
+@patch("saleor.thumbnail.utils.magic.from_buffer")
+def test_create_thumbnail_task_invalid_image(from_buffer_mock, category_with_image):
+    # given
+    from_buffer_mock.return_value = "application/x-empty"
+    pk = str(category_with_image.pk)
+    acquire_thumbnail_lock("Category", pk, 128, None)
+
+    # when
+    thumbnail_url = create_thumbnail_task("Category", pk, 128, None)
+
+    # then
+    assert thumbnail_url is None
+    assert not Thumbnail.objects.exists()
+    assert acquire_thumbnail_lock("Category", pk, 128, None)
+    release_thumbnail_lock("Category", pk, 128, None)
+
+
+def test_create_product_media_thumbnails(product_with_image):
+    # given
+    media = product_with_image.media.get()
+    Thumbnail.objects.create(
+        product_media=media, size=128, format=None, image=media.image.name
+    )
+
+    # when
+    thumbnails = create_product_media_thumbnails(media)
+
+    # then
+    expected_count = len(THUMBNAIL_SIZES) * len(PRODUCT_MEDIA_THUMBNAIL_FORMATS)
+    assert len(thumbnails) == expected_count - 1
+    assert set(media.thumbnails.values_list("size", "format")) == {
+        (size, format)
+        for size in THUMBNAIL_SIZES
+        for format in PRODUCT_MEDIA_THUMBNAIL_FORMATS
+    }
+
+
+def test_create_product_media_thumbnails_skips_locked_thumbnails(product_with_image):
+    # given
+    media = product_with_image.media.get()
+    pk = str(media.pk)
+    acquire_thumbnail_lock("ProductMedia", pk, 256, ThumbnailFormat.AVIF)
+
+    # when
+    create_product_media_thumbnails(media)
+
+    # then
+    assert not media.thumbnails.filter(size=256, format=ThumbnailFormat.AVIF).exists()
+    release_thumbnail_lock("ProductMedia", pk, 256, ThumbnailFormat.AVIF)
+
+
+def test_create_product_media_thumbnails_command(product_with_image):
+    # given
+    media = product_with_image.media.get()
+
+    # when
+    call_command("create_product_media_thumbnails")
+
+    # then
+    assert media.thumbnails.count() == len(THUMBNAIL_SIZES) * len(
+        PRODUCT_MEDIA_THUMBNAIL_FORMATS
+    )
+
+
+def test_save_thumbnail_image_replaces_leftover_file(category_with_image):
+    # given
+    image_name = category_with_image.background_image.name
+    file_name, _ = image_name.rsplit(".", 1)
+    thumbnail_name = f"thumbnails/{file_name}_thumbnail_128.webp"
+    default_storage.save(thumbnail_name, ContentFile(b"leftover"))
+    thumbnail = Thumbnail(
+        category=category_with_image, size=128, format=ThumbnailFormat.WEBP
+    )
+
+    # when
+    save_thumbnail_image(thumbnail, image_name, ContentFile(b"thumbnail"))
+
+    # then
+    assert thumbnail.image.name == thumbnail_name
+    with default_storage.open(thumbnail_name) as thumbnail_file:
+        assert thumbnail_file.read() == b"thumbnail"
@@ -1,15 +1,21 @@
+from io import BytesIO
 from unittest.mock import MagicMock
 
 import graphene
 import pytest
 from django.core.files import File
+from PIL import Image
 
 from .. import FILE_NAME_MAX_LENGTH, ThumbnailFormat
 from ..models import Thumbnail
 from ..utils import (
     ProcessedImage,
+    cache_thumbnails,
+    create_thumbnail_files,
+    get_cached_thumbnail_names,
     get_filename_from_url,
     get_image_or_proxy_url,
+    get_thumbnail_cache_key,
     get_thumbnail_size,
     prepare_image_proxy_url,
     prepare_thumbnail_file_name,
@@ -162,3 +168,60 @@ def test_get_filename_from_url_with_short_name_is_not_trimmed():
     assert result.endswith(file_format)
     assert result != f"{file_name}.{file_format}"
     assert len(result.split("_")[0]) < FILE_NAME_MAX_LENGTH
+
+
+def test_create_thumbnail_files():
+    # given
+    image_data = BytesIO()
+    Image.new("RGB", size=(600, 300)).save(image_data, format="JPEG")
+    image_data.seek(0)
+    image_file = File(image_data, "product.jpg")
+
+    # when
+    thumbnails = list(
+        create_thumbnail_files(image_file, [128, 512], [None, ThumbnailFormat.WEBP])
+    )
+
+    # then
+    assert [(size, format) for size, format, _ in thumbnails] == [
+        (512, None),
+        (512, ThumbnailFormat.WEBP),
+        (128, None),
+        (128, ThumbnailFormat.WEBP),
+    ]
+    images = [Image.open(thumbnail_file) for _, _, thumbnail_file in thumbnails]
+    assert [(image.format, image.size) for image in images] == [
+        ("JPEG", (512, 256)),
+        ("WEBP", (512, 256)),
+        ("JPEG", (128, 64)),
+        ("WEBP", (128, 64)),
+    ]
+
+
+def test_cache_thumbnails(thumbnail_category):
+    # given
+    cache_key = get_thumbnail_cache_key(
+        "category", thumbnail_category.category_id, thumbnail_category.size, None
+    )
+
+    # when
+    cache_thumbnails([thumbnail_category])
+
+    # then
+    assert get_cached_thumbnail_names([cache_key]) == {
+        cache_key: thumbnail_category.image.name
+    }
+
+
+def test_cached_thumbnail_removed_on_delete(thumbnail_category):
+    # given
+    cache_key = get_thumbnail_cache_key(
+        "category", thumbnail_category.category_id, thumbnail_category.size, None
+    )
+    cache_thumbnails([thumbnail_category])
+
+    # when
+    thumbnail_category.delete()
+
+    # then
+    assert get_cached_thumbnail_names([cache_key]) == {}
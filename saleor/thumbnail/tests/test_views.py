@@ -5,6 +5,8 @@ from PIL import Image
 
 from .. import IconThumbnailFormat, ThumbnailFormat
 from ..models import Thumbnail
+from ..tasks import acquire_thumbnail_lock, release_thumbnail_lock
+from ..utils import cache_thumbnails
 
 
 def test_handle_thumbnail_view_with_format(client, category_with_image, settings):
@@ -392,3 +394,50 @@ def test_handle_thumbnail_view_for_app_installation_logo_default_thumbnail_exist
     assert response.status_code == 302
     assert response.url == thumbnail.image.url
     assert Thumbnail.objects.count() == thumbnail_count
+
+
+@patch("saleor.thumbnail.views.create_thumbnail_task.delay")
+def test_handle_thumbnail_view_thumbnail_being_generated(
+    create_thumbnail_task_mock, client, category_with_image
+):
+    # given
+    size = 60
+    category_id = graphene.Node.to_global_id("Category", category_with_image.id)
+    acquire_thumbnail_lock("Category", str(category_with_image.id), 64, None)
+
+    # when
+    response = client.get(f"/thumbnail/{category_id}/{size}/")
+
+    # then
+    assert response.status_code == 302
+    assert response.url == category_with_image.background_image.url
+    assert response["Cache-Control"] == "no-store"
+    create_thumbnail_task_mock.assert_not_called()
+    release_thumbnail_lock("Category", str(category_with_image.id), 64, None)
+
+
+def test_handle_thumbnail_view_cached_thumbnail(
+    client, product_with_image, settings, django_assert_num_queries
+):
+    # given
+    product_media = product_with_image.media.first()
+    thumbnail_name = "thumbnails/cached_thumbnail_128.webp"
+    cache_thumbnails(
+        [
+            Thumbnail(
+                product_media=product_media,
+                size=128,
+                format=ThumbnailFormat.WEBP,
+                image=thumbnail_name,
+            )
+        ]
+    )
+    product_media_id = graphene.Node.to_global_id("ProductMedia", product_media.id)
+
+    # when
+    with django_assert_num_queries(0):
+        response = client.get(f"/thumbnail/{product_media_id}/128/webp/")
+
+    # then
+    assert response.status_code == 302
+    assert response.url == settings.MEDIA_URL + thumbnail_name
@@ -1,10 +1,11 @@
 import os
 import secrets
 from io import BytesIO
-from typing import TYPE_CHECKING, Optional, Union
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, Optional, Tuple, Union
 
 import graphene
 import magic
+from django.core.cache import cache
 from django.core.files import File
 from django.core.files.storage import default_storage
 from django.urls import reverse
@@ -87,6 +88,57 @@ def prepare_thumbnail_file_name(
     return file_path + f"_thumbnail_{size}." + file_ext
 
 
+# Fields of `Thumbnail` pointing to the instance of the original image.
+THUMBNAIL_INSTANCE_FIELDS = [
+    "category",
+    "collection",
+    "product_media",
+    "user",
+    "app",
+    "app_installation",
+]
+
+
+def get_thumbnail_cache_key(
+    instance_field: str, instance_id: Union[int, str], size: int, format: Optional[str]
+) -> str:
+    """Return the cache key of the thumbnail's file name.
+
+    Thumbnails stored in the cache are served without database queries.
+    """
+    format = get_thumbnail_format(format)
+    return f"thumbnail:{instance_field}:{instance_id}:{size}:{format or ''}"
+
+
+def _get_thumbnail_cache_key_of(thumbnail: "Thumbnail") -> Optional[str]:
+    for field in THUMBNAIL_INSTANCE_FIELDS:
+        if instance_id := getattr(thumbnail, f"{field}_id"):
+            return get_thumbnail_cache_key(
+                field, instance_id, thumbnail.size, thumbnail.format
+            )
+    return None
+
+
+def cache_thumbnails(thumbnails: Iterable["Thumbnail"]):
+    """Store file names of the thumbnails in the cache."""
+    names_by_key = {}
+    for thumbnail in thumbnails:
+        if key := _get_thumbnail_cache_key_of(thumbnail):
+            names_by_key[key] = thumbnail.image.name
+    if names_by_key:
+        cache.set_many(names_by_key)
+
+
+def uncache_thumbnail(thumbnail: "Thumbnail"):
+    if key := _get_thumbnail_cache_key_of(thumbnail):
+        cache.delete(key)
+
+
+def get_cached_thumbnail_names(keys: Iterable[str]) -> Dict[str, str]:
+    """Return file names of the cached thumbnails by their cache keys."""
+    return cache.get_many(list(keys))
+
+
 class ProcessedImage:
     EXIF_ORIENTATION_KEY = 274
     # Whether to create progressive JPEGs. Read more about progressive JPEGs
@@ -171,27 +223,32 @@ class ProcessedImage:
         format = self.format or image_format
         save_kwargs = {"format": format}
 
-        # Ensuring image is properly rotated
+        image = self.fix_orientation(image)
+
+        # Ensure any embedded ICC profile is preserved
+        save_kwargs["icc_profile"] = image.info.get("icc_profile")
+
+        if hasattr(self, f"preprocess_{format}"):
+            image, addl_save_kwargs = getattr(self, f"preprocess_{format}")(image=image)
+            save_kwargs.update(addl_save_kwargs)
+
+        return image, save_kwargs
+
+    @classmethod
+    def fix_orientation(cls, image):
+        """Return the image rotated according to its EXIF orientation."""
         if hasattr(image, "_getexif"):
             exif_datadict = image._getexif()  # returns None if no EXIF data
             if exif_datadict is not None:
                 exif = dict(exif_datadict.items())
-                orientation = exif.get(self.EXIF_ORIENTATION_KEY, None)
+                orientation = exif.get(cls.EXIF_ORIENTATION_KEY, None)
                 if orientation == 3:
                     image = image.transpose(Image.ROTATE_180)
                 elif orientation == 6:
                     image = image.transpose(Image.ROTATE_270)
                 elif orientation == 8:
                     image = image.transpose(Image.ROTATE_90)
-
-        # Ensure any embedded ICC profile is preserved
-        save_kwargs["icc_profile"] = image.info.get("icc_profile")
-
-        if hasattr(self, f"preprocess_{format}"):
-            image, addl_save_kwargs = getattr(self, f"preprocess_{format}")(image=image)
-            save_kwargs.update(addl_save_kwargs)
-
-        return image, save_kwargs
+        return image
 
     def preprocess_AVIF(self, image):
         """Receive a PIL Image instance of an AVIF and return 2-tuple."""
@@ -245,6 +302,38 @@ class ProcessedIconImage(ProcessedImage):
     LOSSLESS_WEBP = True
 
 
+def create_thumbnail_files(
+    image_source: Union[str, File],
+    sizes: Iterable[int],
+    formats: Iterable[Optional[str]],
+    storage=default_storage,
+) -> Iterator[Tuple[int, Optional[str], BytesIO]]:
+    """Yield thumbnails of the image in all combinations of sizes and formats.
+
+    The original is read and decoded once, and every size is downscaled from the
+    previous, larger one instead of the original, which makes small sizes of
+    large images much cheaper. Raise `ValueError` when the image can't be
+    processed.
+    """
+    sizes = sorted(set(sizes), reverse=True)
+    formats = list(formats)
+    if not sizes or not formats:
+        return
+    source = ProcessedImage(image_source, sizes[0], storage=storage)
+    image, image_format = source.retrieve_image()
+    # Let the decoder of formats like JPEG scale the image down while decoding.
+    image.draft(image.mode, (sizes[0], sizes[0]))
+    image = ProcessedImage.fix_orientation(image)
+    for size in sizes:
+        image = image.copy()
+        image.thumbnail((size, size))
+        for format in formats:
+            processed_image = ProcessedImage(image_source, size, format)
+            processed, save_kwargs = processed_image.preprocess(image, image_format)
+            image_file, _ = processed_image.process_image(processed, save_kwargs)
+            yield size, format, image_file
+
+
 def get_filename_from_url(url: str) -> str:
     """Prepare a unique filename for file from the URL to avoid overwriting."""
     file_name = os.path.basename(url)
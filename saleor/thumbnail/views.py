@@ -1,7 +1,7 @@
 import logging
-from collections import namedtuple
 from typing import Optional
 
+from celery.result import EagerResult
 from django.core.exceptions import ObjectDoesNotExist
 from django.http import (
     HttpResponseBadRequest,
@@ -10,48 +10,35 @@ from django.http import (
 )
 from graphql.error import GraphQLError
 
-from ..account.models import User
-from ..app.models import App, AppInstallation
-from ..core.utils.events import call_event
 from ..graphql.core.utils import from_global_id_or_error
-from ..plugins.manager import get_plugins_manager
-from ..product.models import Category, Collection, ProductMedia
 from ..thumbnail.models import Thumbnail
 from . import ALLOWED_ICON_THUMBNAIL_FORMATS, ALLOWED_THUMBNAIL_FORMATS
+from .tasks import (
+    ICON_TYPE_TO_MODEL_DATA_MAPPING,
+    TYPE_TO_MODEL_DATA_MAPPING,
+    UUID_IDENTIFIABLE_TYPES,
+    acquire_thumbnail_lock,
+    create_thumbnail_task,
+    get_instance_id_lookup,
+)
 from .utils import (
-    ProcessedIconImage,
-    ProcessedImage,
+    cache_thumbnails,
+    get_cached_thumbnail_names,
+    get_thumbnail_cache_key,
     get_thumbnail_size,
-    prepare_thumbnail_file_name,
 )
 
 logger = logging.getLogger(__name__)
 
-ModelData = namedtuple("ModelData", ["model", "image_field", "thumbnail_field"])
-
-ICON_TYPE_TO_MODEL_DATA_MAPPING = {
-    "App": ModelData(App, "brand_logo_default", "app"),
-    "AppInstallation": ModelData(
-        AppInstallation, "brand_logo_default", "app_installation"
-    ),
-}
-TYPE_TO_MODEL_DATA_MAPPING = {
-    "User": ModelData(User, "avatar", "user"),
-    "Category": ModelData(Category, "background_image", "category"),
-    "Collection": ModelData(Collection, "background_image", "collection"),
-    "ProductMedia": ModelData(ProductMedia, "image", "product_media"),
-    **ICON_TYPE_TO_MODEL_DATA_MAPPING,
-}
-UUID_IDENTIFIABLE_TYPES = ["User", "App", "AppInstallation"]
-
 
 def handle_thumbnail(
     request, instance_id: str, size: str, format: Optional[str] = None
 ):
-    """Create and return thumbnail for given instance in provided size and format.
+    """Return thumbnail for given instance in provided size and format.
 
     If the provided size is not in the available resolution list, the thumbnail with
-    the closest available size is created and returned, if it does not exist.
+    the closest available size is returned. When the thumbnail does not exist, its
+    creation is scheduled and the request is redirected to the original image.
     """
     # try to find corresponding instance based on given instance_id
     try:
@@ -77,14 +64,16 @@ def handle_thumbnail(
 
     # return the thumbnail if it's already exist
     model_data = TYPE_TO_MODEL_DATA_MAPPING[object_type]
-    if object_type in UUID_IDENTIFIABLE_TYPES:
-        instance_id_lookup = model_data.thumbnail_field + "__uuid"
-    else:
-        instance_id_lookup = model_data.thumbnail_field + "_id"
-
+    if object_type not in UUID_IDENTIFIABLE_TYPES:
+        cache_key = get_thumbnail_cache_key(
+            model_data.thumbnail_field, pk, size_px, format
+        )
+        if thumbnail_name := get_cached_thumbnail_names([cache_key]).get(cache_key):
+            return HttpResponseRedirect(Thumbnail(image=thumbnail_name).image.url)
     if thumbnail := Thumbnail.objects.filter(
-        format=format, size=size_px, **{instance_id_lookup: pk}
+        format=format, size=size_px, **{get_instance_id_lookup(object_type): pk}
     ).first():
+        cache_thumbnails([thumbnail])
         return HttpResponseRedirect(thumbnail.image.url)
 
     try:
@@ -99,32 +88,17 @@ def handle_thumbnail(
     if not bool(image):
         return HttpResponseNotFound("There is no image for provided instance.")
 
-    # prepare thumbnail
-    if object_type in ICON_TYPE_TO_MODEL_DATA_MAPPING:
-        processed_image: ProcessedImage = ProcessedIconImage(
-            image.name, size_px, format
-        )
-    else:
-        processed_image = ProcessedImage(image.name, size_px, format)
-    try:
-        thumbnail_file, _ = processed_image.create_thumbnail()
-    except ValueError as error:
-        logger.info(str(error))
-        return HttpResponseBadRequest("Invalid image.")
-
-    thumbnail_file_name = prepare_thumbnail_file_name(image.name, size_px, format)
-
-    # save image thumbnail
-    thumbnail = Thumbnail(
-        size=size_px, format=format, **{model_data.thumbnail_field: instance}
-    )
-    thumbnail.image.save(thumbnail_file_name, thumbnail_file)
-    thumbnail.save()
-
-    # set additional `instance` attribute, to easily get instance data
-    # for ThumbnailCreated subscription type
-    setattr(thumbnail, "instance", instance)
-    manager = get_plugins_manager(allow_replica=False)
-    call_event(manager.thumbnail_created, thumbnail)
-
-    return HttpResponseRedirect(thumbnail.image.url)
+    # Thumbnails are created by workers; only the first request for a thumbnail
+    # schedules it, the next ones are redirected to the original image meanwhile.
+    if acquire_thumbnail_lock(object_type, pk, size_px, format):
+        result = create_thumbnail_task.delay(object_type, pk, size_px, format)
+        # The task runs in the request when there is no Celery broker.
+        if isinstance(result, EagerResult):
+            if thumbnail_url := result.get():
+                return HttpResponseRedirect(thumbnail_url)
+            return HttpResponseBadRequest("Invalid image.")
+
+    response = HttpResponseRedirect(image.url)
+    # The redirect is temporary and mustn't be cached until the thumbnail exists.
+    response["Cache-Control"] = "no-store"
+    return response
@@ -12,15 +12,23 @@ from typing import (
 )
 
 from django.core.exceptions import ValidationError
-from django.db.models import F, QuerySet, Sum
+from django.db.models import (
+    Count,
+    Expression,
+    F,
+    IntegerField,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+)
 from django.db.models.functions import Coalesce
 
 from ..checkout.error_codes import CheckoutErrorCode
 from ..checkout.fetch import DeliveryMethodBase
 from ..core.exceptions import InsufficientStock, InsufficientStockData
 from ..product.models import ProductVariantChannelListing
-from .models import Reservation, Stock, StockQuerySet
-from .reservations import get_listings_reservations
+from .models import Allocation, PreorderReservation, Reservation, Stock, StockQuerySet
 
 if TYPE_CHECKING:
     from ..checkout.fetch import CheckoutLineInfo
@@ -37,28 +45,93 @@ class ChannelListingPreorderAvailbilityInfo(NamedTuple):
 class VariantsChannelAvailbilityInfo(NamedTuple):
     variants_channel_availability: Dict[int, ChannelListingPreorderAvailbilityInfo]
     variants_global_allocations: Dict[int, int]
-    all_variants_channel_listings: QuerySet[ProductVariantChannelListing]
+    listings_reservations: Dict[int, int]
     variant_channels: Dict[int, List[ProductVariantChannelListing]]
 
 
+class VariantStockAvailabilityInfo(NamedTuple):
+    stocks_count: int
+    available_quantity: int
+
+
+def _get_stock_available_quantity_expression(
+    checkout_lines: Optional[Iterable["CheckoutLine"]] = None,
+    check_reservations: bool = False,
+) -> Expression:
+    """Return the expression computing the available quantity of a single stock.
+
+    The allocated and reserved quantities are summed up in correlated subqueries,
+    so the expression can be aggregated without multiplying the stock rows.
+    """
+    allocations = (
+        Allocation.objects.values("stock_id")
+        .filter(quantity_allocated__gt=0, stock_id=OuterRef("pk"))
+        .values_list(Sum("quantity_allocated"))
+    )
+    available_quantity = F("quantity") - Coalesce(
+        Subquery(queryset=allocations, output_field=IntegerField()), 0
+    )
+    if not check_reservations:
+        return available_quantity
+
+    reservations = (
+        Reservation.objects.values("stock_id")
+        .filter(quantity_reserved__gt=0, stock_id=OuterRef("pk"))
+        .not_expired()
+        .exclude_checkout_lines(checkout_lines)
+        .values_list(Sum("quantity_reserved"))
+    )
+    return available_quantity - Coalesce(
+        Subquery(queryset=reservations, output_field=IntegerField()), 0
+    )
+
+
 def _get_available_quantity(
     stocks: StockQuerySet,
     checkout_lines: Optional[List["CheckoutLine"]] = None,
     check_reservations: bool = False,
 ) -> int:
-    results = stocks.aggregate(
-        total_quantity=Coalesce(Sum("quantity", distinct=True), 0),
-        quantity_allocated=Coalesce(Sum("allocations__quantity_allocated"), 0),
+    result = stocks.aggregate(
+        available_quantity=Coalesce(
+            Sum(
+                _get_stock_available_quantity_expression(
+                    checkout_lines, check_reservations
+                )
+            ),
+            0,
+        )
     )
-    total_quantity = results["total_quantity"]
-    quantity_allocated = results["quantity_allocated"]
+    return max(result["available_quantity"], 0)
 
-    if check_reservations:
-        quantity_reserved = get_reserved_stock_quantity(stocks, checkout_lines)
-    else:
-        quantity_reserved = 0
 
-    return max(total_quantity - quantity_allocated - quantity_reserved, 0)
+def get_variants_stock_availability(
+    stocks: StockQuerySet,
+    checkout_lines: Optional[Iterable["CheckoutLine"]] = None,
+    check_reservations: bool = False,
+) -> Dict[int, VariantStockAvailabilityInfo]:
+    """Return the number of stocks and the available quantity for each variant.
+
+    The result for all variants of the given stocks is computed with a single
+    aggregated query. Variants without any stock are not included.
+    """
+    results = (
+        stocks.order_by()
+        .values("product_variant_id")
+        .annotate(
+            stocks_count=Count("pk"),
+            available_quantity=Sum(
+                _get_stock_available_quantity_expression(
+                    checkout_lines, check_reservations
+                )
+            ),
+        )
+    )
+    return {
+        result["product_variant_id"]: VariantStockAvailabilityInfo(
+            result["stocks_count"], max(result["available_quantity"], 0)
+        )
+        for result in results
+    }
 
 
 def check_stock_and_preorder_quantity(
@@ -106,15 +179,10 @@ def check_stock_quantity(
         stocks = Stock.objects.get_variant_stocks_for_country(
             country_code, channel_slug, variant
         )
-        if not stocks:
-            raise InsufficientStock(
-                [InsufficientStockData(variant=variant, available_quantity=0)]
-            )
-
-        available_quantity = _get_available_quantity(
+        availability = get_variants_stock_availability(
             stocks, checkout_lines, check_reservations
-        )
-        if quantity > available_quantity:
+        ).get(variant.pk)
+        if not availability or quantity > availability.available_quantity:
             raise InsufficientStock(
                 [InsufficientStockData(variant=variant, available_quantity=0)]
             )
@@ -168,6 +236,53 @@ def check_stock_and_preorder_quantity_bulk(
         )
 
 
+def check_stock_and_preorder_quantity_in_orders(
+    variants: Iterable["ProductVariant"],
+    quantities: Iterable[int],
+    country_code: str,
+    channel_slug: str,
+):
+    """Validate if there is stock/preorder available for given variants.
+
+    It is used in orders, every quantity is validated separately and no quantity
+    limits are applied. The stock of all variants is fetched with a single query.
+    :raises InsufficientStock: when there is not enough items in stock for a variant
+    or there is not enough available preorder items for a variant.
+    """
+    (
+        stock_variants,
+        stock_quantities,
+        preorder_variants,
+        preorder_quantities,
+    ) = _split_lines_for_trackable_and_preorder(variants, quantities)
+
+    insufficient_stocks: List[InsufficientStockData] = []
+    if stock_variants:
+        stocks = Stock.objects.get_variants_stocks_for_country(
+            country_code, channel_slug, stock_variants
+        )
+        variants_availability = get_variants_stock_availability(stocks)
+        for variant, quantity in zip(stock_variants, stock_quantities):
+            if not variant.track_inventory:
+                continue
+            availability = variants_availability.get(variant.pk)
+            if not availability or quantity > availability.available_quantity:
+                insufficient_stocks.append(
+                    InsufficientStockData(variant=variant, available_quantity=0)
+                )
+
+    for variant, quantity in zip(preorder_variants, preorder_quantities):
+        try:
+            check_preorder_threshold_in_orders(
+                variant, quantity, channel_slug, None, False
+            )
+        except InsufficientStock as e:
+            insufficient_stocks.extend(e.items)
+
+    if insufficient_stocks:
+        raise InsufficientStock(insufficient_stocks)
+
+
 def _split_lines_for_trackable_and_preorder(
     variants: Iterable["ProductVariant"], quantities: Iterable[int]
 ) -> Tuple[
@@ -251,19 +366,11 @@ def check_stock_quantity_bulk(
         )
     )
 
-    all_variants_stocks = stocks.filter(**filter_lookup).annotate_available_quantity()
-
-    variant_stocks: Dict[int, List[Stock]] = defaultdict(list)
-    for stock in all_variants_stocks:
-        variant_stocks[stock.product_variant_id].append(stock)
-
-    if check_reservations:
-        variant_reservations = get_reserved_stock_quantity_bulk(
-            all_variants_stocks,
-            [line.line for line in existing_lines] if existing_lines else [],
-        )
-    else:
-        variant_reservations = defaultdict(int)
+    variants_availability = get_variants_stock_availability(
+        stocks.filter(**filter_lookup),
+        [line.line for line in existing_lines] if existing_lines else [],
+        check_reservations,
+    )
 
     insufficient_stocks: List[InsufficientStockData] = []
     variants_quantities = {
@@ -273,16 +380,13 @@ def check_stock_quantity_bulk(
         if not replace:
             quantity += variants_quantities.get(variant.pk, 0)
 
-        stocks = variant_stocks.get(variant.pk, [])
-        available_quantity = sum([stock.available_quantity for stock in stocks])
-        available_quantity = max(
-            available_quantity - variant_reservations[variant.pk], 0
-        )
+        availability = variants_availability.get(variant.pk)
+        available_quantity = availability.available_quantity if availability else 0
 
         if quantity > 0:
             _check_quantity_limits(variant, quantity, global_quantity_limit)
 
-            if not stocks:
+            if not availability:
                 insufficient_stocks.append(
                     InsufficientStockData(
                         variant=variant, available_quantity=available_quantity
@@ -303,13 +407,33 @@ def check_stock_quantity_bulk(
 def _get_variants_channel_availbility_info(
     variants: Iterable["ProductVariant"],
     channel_slug: str,
+    checkout_lines: Optional[Iterable["CheckoutLine"]] = None,
+    check_reservations: bool = False,
 ) -> VariantsChannelAvailbilityInfo:
+    if check_reservations:
+        reservations = (
+            PreorderReservation.objects.values("product_variant_channel_listing_id")
+            .filter(
+                quantity_reserved__gt=0,
+                product_variant_channel_listing_id=OuterRef("pk"),
+            )
+            .not_expired()
+            .exclude_checkout_lines(checkout_lines)
+            .values_list(Sum("quantity_reserved"))
+        )
+        quantity_reserved = Coalesce(
+            Subquery(queryset=reservations, output_field=IntegerField()), 0
+        )
+    else:
+        quantity_reserved = Value(0, output_field=IntegerField())
+
     all_variants_channel_listings = (
         ProductVariantChannelListing.objects.filter(variant__in=variants)
         .annotate_preorder_quantity_allocated()
         .annotate(
             available_preorder_quantity=F("preorder_quantity_threshold")
             - Coalesce(Sum("preorder_allocations__quantity"), 0),
+            preorder_quantity_reserved=quantity_reserved,
         )
         .select_related("channel")
     )
@@ -324,8 +448,12 @@ def _get_variants_channel_availbility_info(
     }
 
     variant_channels: Dict[int, List[ProductVariantChannelListing]] = defaultdict(list)
+    listings_reservations: Dict[int, int] = defaultdict(int)
     for channel_listing in all_variants_channel_listings:
         variant_channels[channel_listing.variant_id].append(channel_listing)
+        listings_reservations[
+            channel_listing.id
+        ] = channel_listing.preorder_quantity_reserved  # type: ignore
 
     variants_global_allocations = {
         variant_id: sum(
@@ -337,7 +465,7 @@ def _get_variants_channel_availbility_info(
     return VariantsChannelAvailbilityInfo(
         variants_channel_availability,
         variants_global_allocations,
-        all_variants_channel_listings,
+        listings_reservations,
         variant_channels,
     )
 
@@ -357,16 +485,11 @@ def check_preorder_threshold_in_orders(
     (
         variants_channel_availability,
         variants_global_allocations,
-        all_variants_channel_listings,
+        listings_reservations,
         variant_channels,
-    ) = _get_variants_channel_availbility_info([variant], channel_slug)
-
-    if check_reservations:
-        listings_reservations = get_listings_reservations(
-            checkout_lines, all_variants_channel_listings
-        )
-    else:
-        listings_reservations = defaultdict(int)
+    ) = _get_variants_channel_availbility_info(
+        [variant], channel_slug, checkout_lines, check_reservations
+    )
 
     insufficient_stocks: List[InsufficientStockData] = []
 
@@ -425,16 +548,14 @@ def check_preorder_threshold_bulk(
     (
         variants_channel_availability,
         variants_global_allocations,
-        all_variants_channel_listings,
+        listings_reservations,
         variant_channels,
-    ) = _get_variants_channel_availbility_info(variants, channel_slug)
-
-    if check_reservations:
-        listings_reservations = get_listings_reservations(
-            [line.line for line in existing_lines or []], all_variants_channel_listings
-        )
-    else:
-        listings_reservations = defaultdict(int)
+    ) = _get_variants_channel_availbility_info(
+        variants,
+        channel_slug,
+        [line.line for line in existing_lines or []],
+        check_reservations,
+    )
 
     insufficient_stocks: List[InsufficientStockData] = []
     variants_quantities = {
@@ -498,8 +619,6 @@ def get_available_quantity(
     stocks = Stock.objects.get_variant_stocks_for_country(
         country_code, channel_slug, variant
     )
-    if not stocks:
-        return 0
     return _get_available_quantity(stocks, checkout_lines, check_reservations)
 
 
@@ -509,51 +628,5 @@ def is_product_in_stock(
     """Check if there is any variant of given product available in given country."""
     stocks = Stock.objects.get_product_stocks_for_country_and_channel(
         country_code, channel_slug, product
-    ).annotate_available_quantity()
+    ).annotate_available_quantity_from_counter()
     return any(stocks.values_list("available_quantity", flat=True))
-
-
-def get_reserved_stock_quantity(
-    stocks: StockQuerySet, lines: Optional[List["CheckoutLine"]] = None
-) -> int:
-    result = (
-        Reservation.objects.filter(
-            stock__in=stocks,
-        )
-        .not_expired()
-        .exclude_checkout_lines(lines)
-        .aggregate(
-            quantity_reserved=Coalesce(Sum("quantity_reserved"), 0),
-        )
-    )
-
-    return result["quantity_reserved"]
-
-
-def get_reserved_stock_quantity_bulk(
-    stocks: Iterable[Stock],
-    checkout_lines: Iterable["CheckoutLine"],
-) -> Dict[int, int]:
-    reservations: Dict[int, int] = defaultdict(int)
-    if not stocks:
-        return reservations
-
-    result = (
-        Reservation.objects.filter(
-            stock__in=stocks,
-        )
-        .not_expired()
-        .exclude_checkout_lines(checkout_lines)
-        .values("stock_id")
-        .annotate(
-            quantity_reserved=Coalesce(Sum("quantity_reserved"), 0),
-        )
-    )
-
-    stocks_variants = {stock.id: stock.product_variant_id for stock in stocks}
-    for stock_reservations in result:
-        variant_id = stocks_variants.get(stock_reservations["stock_id"])
-        if variant_id:
-            reservations[variant_id] += stock_reservations["quantity_reserved"]
-
-    return reservations
@@ -3,6 +3,7 @@ from collections import defaultdict, namedtuple
 from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, cast
 from uuid import UUID
 
+from django.conf import settings
 from django.db import transaction
 from django.db.models import F, Sum
 from django.db.models.expressions import Exists, OuterRef
@@ -38,6 +39,10 @@ if TYPE_CHECKING:
 
 StockData = namedtuple("StockData", ["pk", "quantity"])
 
+# Number of attempts of the optimistic allocation. The stocks are locked before
+# the last attempt, so it can't fail because of concurrent allocations.
+OPTIMISTIC_ALLOCATION_MAX_ATTEMPTS = 3
+
 
 @traced_atomic_transaction()
 def allocate_stocks(
@@ -58,6 +63,11 @@ def allocate_stocks(
     Iterate by stocks and allocate as many items as needed or available in stock
     for order line, until allocated all required quantity for the order line.
     If there is less quantity in stocks then rise InsufficientStock exception.
+
+    With `OPTIMISTIC_STOCK_ALLOCATION` enabled, the stocks are not locked upfront.
+    The allocated quantities are applied as conditional updates of the stocks
+    `quantity_allocated` counters instead, ordered by the stocks pk, so only the
+    stocks that are actually allocated get locked.
     """
     # allocation only applied to order lines with variants with track inventory
     # set to True
@@ -81,31 +91,47 @@ def allocate_stocks(
         else Stock.objects.for_channel_and_country(channel_slug, country_code)
     )
 
+    optimistic_allocation = settings.OPTIMISTIC_STOCK_ALLOCATION
+    stocks = stocks.filter(**filter_lookup).order_by("pk")
+    if not optimistic_allocation:
+        stocks = stocks.select_for_update(of=("self",))
     stocks = list(
-        stocks.select_for_update(of=("self",))
-        .filter(**filter_lookup)
-        .order_by("pk")
-        .values("id", "product_variant", "pk", "quantity", "warehouse_id")
+        stocks.values(
+            "id",
+            "product_variant",
+            "pk",
+            "quantity",
+            "quantity_allocated",
+            "warehouse_id",
+        )
     )
-    stocks_id = (stock.pop("id") for stock in stocks)
+    stocks_id = [stock.pop("id") for stock in stocks]
+    stocks_quantity_allocated = {
+        stock["pk"]: stock.pop("quantity_allocated") for stock in stocks
+    }
 
     quantity_reservation_for_stocks: Dict = _prepare_stock_to_reserved_quantity_map(
         checkout_lines, check_reservations, stocks_id
     )
 
-    quantity_allocation_list = list(
-        Allocation.objects.filter(
-            stock_id__in=stocks_id,
-            quantity_allocated__gt=0,
-        )
-        .values("stock")
-        .annotate(quantity_allocated_sum=Sum("quantity_allocated"))
-    )
     quantity_allocation_for_stocks: Dict = defaultdict(int)
-    for allocation_data in quantity_allocation_list:
-        quantity_allocation_for_stocks[allocation_data["stock"]] += allocation_data[
-            "quantity_allocated_sum"
-        ]
+    if optimistic_allocation:
+        # the counters are only used to choose the stocks, the available quantity
+        # is verified again by the conditional updates
+        quantity_allocation_for_stocks.update(stocks_quantity_allocated)
+    else:
+        quantity_allocation_list = list(
+            Allocation.objects.filter(
+                stock_id__in=stocks_id,
+                quantity_allocated__gt=0,
+            )
+            .values("stock")
+            .annotate(quantity_allocated_sum=Sum("quantity_allocated"))
+        )
+        for allocation_data in quantity_allocation_list:
+            quantity_allocation_for_stocks[allocation_data["stock"]] += allocation_data[
+                "quantity_allocated_sum"
+            ]
 
     stocks = sort_stocks(
         channel.allocation_strategy,
@@ -122,42 +148,42 @@ def allocate_stocks(
 
     insufficient_stock: List[InsufficientStockData] = []
     allocations: List[Allocation] = []
-    for line_info in order_lines_info:
-        line_info.variant = cast(ProductVariant, line_info.variant)
-        stock_allocations = variant_to_stocks[line_info.variant.pk]
-        insufficient_stock, allocation_items = _create_allocations(
-            line_info,
-            stock_allocations,
+    if optimistic_allocation:
+        insufficient_stock, allocations = _create_allocations_with_conditional_updates(
+            order_lines_info,
+            variant_to_stocks,
             quantity_allocation_for_stocks,
             quantity_reservation_for_stocks,
-            insufficient_stock,
         )
-        allocations.extend(allocation_items)
+    else:
+        for line_info in order_lines_info:
+            line_info.variant = cast(ProductVariant, line_info.variant)
+            stock_allocations = variant_to_stocks[line_info.variant.pk]
+            insufficient_stock, allocation_items = _create_allocations(
+                line_info,
+                stock_allocations,
+                quantity_allocation_for_stocks,
+                quantity_reservation_for_stocks,
+                insufficient_stock,
+            )
+            allocations.extend(allocation_items)
 
     if insufficient_stock:
         raise InsufficientStock(insufficient_stock)
 
     if allocations:
-        stocks_to_update = []
+        stocks_quantity_allocated_diff: Dict[int, int] = defaultdict(int)
         for alloc in Allocation.objects.bulk_create(allocations):
-            stock = alloc.stock
-            stock.quantity_allocated = (
-                F("quantity_allocated") + alloc.quantity_allocated
-            )
-            stocks_to_update.append(stock)
-        Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
-
-        for allocation in allocations:
-            allocated_stock = (
-                Allocation.objects.filter(stock_id=allocation.stock_id).aggregate(
-                    Sum("quantity_allocated")
-                )["quantity_allocated__sum"]
-                or 0
-            )
-            if not max(allocation.stock.quantity - allocated_stock, 0):
-                transaction.on_commit(
-                    lambda: manager.product_variant_out_of_stock(allocation.stock)
-                )
+            stocks_quantity_allocated_diff[alloc.stock_id] += alloc.quantity_allocated
+        if not optimistic_allocation:
+            update_stocks_quantity_allocated(stocks_quantity_allocated_diff)
+
+        out_of_stock = (
+            Stock.objects.filter(pk__in=stocks_quantity_allocated_diff.keys())
+            .annotate_available_quantity()
+            .filter(available_quantity__lte=0)
+        )
+        _trigger_stock_events(manager, out_of_stock=out_of_stock)
 
 
 def _prepare_stock_to_reserved_quantity_map(
@@ -275,6 +301,118 @@ def _create_allocations(
         return insufficient_stock, []
 
 
+def _create_allocations_with_conditional_updates(
+    order_lines_info: List["OrderLineInfo"],
+    variant_to_stocks: Dict[int, List[StockData]],
+    stocks_allocations: dict,
+    stocks_reservations: dict,
+) -> Tuple[List[InsufficientStockData], List[Allocation]]:
+    """Create allocations for the lines, applying them to the stocks counters at once.
+
+    Unlike `_create_allocations`, the `quantity_allocated` counters of the stocks
+    are increased here, so the caller must not update them again. The counters are
+    increased in the order of the stocks pk, so concurrent allocations lock the
+    stocks in the same order and can't deadlock. When a stock doesn't have enough
+    quantity available anymore because of a concurrent allocation, the updates are
+    rolled back, which also releases the locks, and the allocations are chosen
+    again from the current counters. Before the last attempt the stocks are locked
+    as they are without `OPTIMISTIC_STOCK_ALLOCATION`.
+    """
+    for attempt in range(1, OPTIMISTIC_ALLOCATION_MAX_ATTEMPTS + 1):
+        planned_allocations: Dict[int, int] = defaultdict(int, stocks_allocations)
+        insufficient_stock: List[InsufficientStockData] = []
+        allocations: List[Allocation] = []
+        for line_info in order_lines_info:
+            line_info.variant = cast(ProductVariant, line_info.variant)
+            insufficient_stock, allocation_items = _create_allocations(
+                line_info,
+                variant_to_stocks[line_info.variant.pk],
+                planned_allocations,
+                stocks_reservations,
+                insufficient_stock,
+            )
+            for allocation in allocation_items:
+                planned_allocations[
+                    allocation.stock_id
+                ] += allocation.quantity_allocated
+            allocations.extend(allocation_items)
+
+        if insufficient_stock:
+            return insufficient_stock, []
+
+        stocks_quantity_allocated_diff: Dict[int, int] = defaultdict(int)
+        for allocation in allocations:
+            stocks_quantity_allocated_diff[
+                allocation.stock_id
+            ] += allocation.quantity_allocated
+
+        savepoint_id = transaction.savepoint()
+        if all(
+            _increase_stock_quantity_allocated(
+                stock_pk,
+                stocks_quantity_allocated_diff[stock_pk],
+                stocks_reservations.get(stock_pk, 0),
+            )
+            for stock_pk in sorted(stocks_quantity_allocated_diff)
+        ):
+            transaction.savepoint_commit(savepoint_id)
+            return insufficient_stock, allocations
+        transaction.savepoint_rollback(savepoint_id)
+        if attempt == OPTIMISTIC_ALLOCATION_MAX_ATTEMPTS:
+            break
+
+        stocks_pks = [
+            stock_data.pk
+            for stocks in variant_to_stocks.values()
+            for stock_data in stocks
+        ]
+        stocks_qs = Stock.objects.filter(pk__in=stocks_pks).order_by("pk")
+        if attempt + 1 == OPTIMISTIC_ALLOCATION_MAX_ATTEMPTS:
+            stocks_qs = stocks_qs.select_for_update(of=("self",))
+        current_stocks = {
+            pk: (quantity, quantity_allocated)
+            for pk, quantity, quantity_allocated in stocks_qs.values_list(
+                "pk", "quantity", "quantity_allocated"
+            )
+        }
+        for variant_pk, stocks in variant_to_stocks.items():
+            variant_to_stocks[variant_pk] = [
+                StockData(stock_data.pk, current_stocks[stock_data.pk][0])
+                for stock_data in stocks
+                if stock_data.pk in current_stocks
+            ]
+        stocks_allocations.update(
+            (pk, quantity_allocated)
+            for pk, (_, quantity_allocated) in current_stocks.items()
+        )
+
+    # the stocks are locked for the last attempt, so the updates fail only when
+    # the quantity available changed in the same transaction
+    return [
+        InsufficientStockData(
+            variant=line_info.variant,
+            order_line=line_info.line,
+            available_quantity=0,
+        )
+        for line_info in order_lines_info
+    ], []
+
+
+def _increase_stock_quantity_allocated(
+    stock_pk: int, quantity: int, quantity_reserved: int
+) -> bool:
+    """Increase the stock `quantity_allocated` counter by given quantity.
+
+    The counter is increased only if the stock still has enough quantity available.
+    Return whether the counter was increased.
+    """
+    updated = Stock.objects.filter(
+        pk=stock_pk,
+        quantity__gte=F("quantity_allocated") + quantity_reserved + quantity,
+    ).update(quantity_allocated=F("quantity_allocated") + quantity)
+    return bool(updated)
+
+
 def deallocate_stock(
     order_lines_data: Iterable["OrderLineInfo"], manager: PluginsManager
 ):
@@ -304,7 +442,7 @@ def deallocate_stock(
         line_to_allocations[allocation.order_line_id].append(allocation)
 
     allocations_to_update = []
-    stocks_to_update = []
+    stocks_quantity_allocated_diff: Dict[int, int] = defaultdict(int)
     not_dellocated_lines = []
     for line_info in order_lines_data:
         order_line = line_info.line
@@ -319,11 +457,9 @@ def deallocate_stock(
                 allocation.quantity_allocated = (
                     allocation.quantity_allocated - quantity_to_deallocate
                 )
-                stock = allocation.stock
-                stock.quantity_allocated = (
-                    F("quantity_allocated") - quantity_to_deallocate
-                )
-                stocks_to_update.append(stock)
+                stocks_quantity_allocated_diff[
+                    allocation.stock_id
+                ] -= quantity_to_deallocate
                 quantity_dealocated += quantity_to_deallocate
                 allocations_to_update.append(allocation)
                 if quantity_dealocated == quantity:
@@ -331,29 +467,11 @@ def deallocate_stock(
         if not quantity_dealocated == quantity:
             not_dellocated_lines.append(order_line)
 
-    allocations_before_update = list(
-        Allocation.objects.filter(
-            id__in=[a.id for a in allocations_to_update]
-        ).annotate_stock_available_quantity()
-    )
+    back_in_stock = _get_stocks_back_in_stock(stocks_quantity_allocated_diff)
 
     Allocation.objects.bulk_update(allocations_to_update, ["quantity_allocated"])
-
-    for allocation_before_update in allocations_before_update:
-        available_stock_now = Allocation.objects.available_quantity_for_stock(
-            allocation_before_update.stock
-        )
-        if (
-            allocation_before_update.stock_available_quantity <= 0
-            and available_stock_now > 0
-        ):
-            transaction.on_commit(
-                lambda: manager.product_variant_back_in_stock(
-                    allocation_before_update.stock
-                )
-            )
-
-    Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+    update_stocks_quantity_allocated(stocks_quantity_allocated_diff)
+    _trigger_stock_events(manager, back_in_stock=back_in_stock)
 
     if not_dellocated_lines:
         raise AllocationError(not_dellocated_lines)
@@ -424,13 +542,11 @@ def increase_allocations(
         # line_info.quantity resembles amount to add, sum it with already allocated.
         line_info.quantity += allocated
 
-    stocks_to_update = []
+    stocks_quantity_allocated_diff: Dict[int, int] = defaultdict(int)
     for alloc in allocations:
-        stock = alloc.stock
-        stock.quantity_allocated = F("quantity_allocated") - alloc.quantity_allocated
-        stocks_to_update.append(stock)
+        stocks_quantity_allocated_diff[alloc.stock_id] -= alloc.quantity_allocated
     Allocation.objects.filter(pk__in=allocation_pks_to_delete).delete()
-    Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+    update_stocks_quantity_allocated(stocks_quantity_allocated_diff)
 
     allocate_stocks(
         lines_info,
@@ -471,9 +587,16 @@ def decrease_stock(
     try:
         deallocate_stock(order_lines_info, manager)
     except AllocationError as exc:
-        Allocation.objects.filter(order_line__in=exc.order_lines).update(
-            quantity_allocated=0
+        allocations = Allocation.objects.filter(
+            order_line__in=exc.order_lines, quantity_allocated__gt=0
         )
+        stocks_quantity_allocated_diff: Dict[int, int] = defaultdict(int)
+        for stock_id, quantity_allocated in allocations.values_list(
+            "stock_id", "quantity_allocated"
+        ):
+            stocks_quantity_allocated_diff[stock_id] -= quantity_allocated
+        allocations.update(quantity_allocated=0)
+        update_stocks_quantity_allocated(stocks_quantity_allocated_diff)
 
     stocks = (
         Stock.objects.select_for_update(of=("self",))
@@ -504,21 +627,21 @@ def decrease_stock(
             quantity_allocation_for_stocks[allocation["stock"]] += allocation[
                 "quantity_allocated__sum"
             ]
-        _decrease_stocks_quantity(
+        updated_stocks = _decrease_stocks_quantity(
             order_lines_info,
             variant_and_warehouse_to_stock,
             quantity_allocation_for_stocks,
             allow_stock_to_be_exceeded,
         )
 
-        stock_ids = (s.id for s in stocks)
-        for stock in Stock.objects.filter(
-            id__in=stock_ids
-        ).annotate_available_quantity():
-            if stock.available_quantity <= 0:
-                transaction.on_commit(
-                    lambda: manager.product_variant_out_of_stock(stock)
-                )
+        # the stocks are locked, so the available quantity can be computed from
+        # the decreased quantities and the allocations fetched above
+        out_of_stock = {
+            stock.pk: stock
+            for stock in updated_stocks
+            if stock.quantity - quantity_allocation_for_stocks.get(stock.pk, 0) <= 0
+        }
+        _trigger_stock_events(manager, out_of_stock=out_of_stock.values())
 
 
 def _decrease_stocks_quantity(
@@ -526,7 +649,7 @@ def _decrease_stocks_quantity(
     variant_and_warehouse_to_stock: Dict[int, Dict[UUID, Stock]],
     quantity_allocation_for_stocks: Dict[int, int],
     allow_stock_to_be_exceeded: bool = False,
-):
+) -> List[Stock]:
     insufficient_stocks: List[InsufficientStockData] = []
     stocks_to_update = []
     for line_info in order_lines_info:
@@ -573,6 +696,73 @@ def _decrease_stocks_quantity(
         raise InsufficientStock(insufficient_stocks)
 
     Stock.objects.bulk_update(stocks_to_update, ["quantity"])
+    return stocks_to_update
+
+
+def update_stocks_quantity_allocated(stocks_quantity_allocated_diff: Dict[int, int]):
+    """Change the `quantity_allocated` counters of stocks by given values.
+
+    `Stock.quantity_allocated` is a materialized sum of the stock allocations used
+    for availability reads, so it must be changed together with the allocations.
+    The changes are grouped by stock, as a single bulk update cannot apply many
+    changes to the same row.
+    """
+    stocks_to_update = [
+        Stock(pk=stock_pk, quantity_allocated=F("quantity_allocated") + diff)
+        for stock_pk, diff in sorted(stocks_quantity_allocated_diff.items())
+        if diff
+    ]
+    if stocks_to_update:
+        Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+
+
+def _get_stocks_back_in_stock(
+    stocks_quantity_allocated_diff: Dict[int, int], require_available: bool = True
+) -> List[Stock]:
+    """Return the stocks that become available after decreasing their allocations.
+
+    Must be called before the allocations are changed. The available quantities
+    after the change are derived from the given diff, so all stocks are checked
+    with a single query. With `require_available` set to False, all stocks that
+    were unavailable before the change are returned, even the oversold ones which
+    stay unavailable.
+    """
+    stock_ids = [pk for pk, diff in stocks_quantity_allocated_diff.items() if diff]
+    if not stock_ids:
+        return []
+    stocks = Stock.objects.filter(pk__in=stock_ids).annotate_available_quantity()
+    return [
+        stock
+        for stock in stocks
+        if stock.available_quantity <= 0
+        and (
+            not require_available
+            or stock.available_quantity - stocks_quantity_allocated_diff[stock.pk] > 0
+        )
+    ]
+
+
+def _trigger_stock_events(
+    manager: PluginsManager,
+    out_of_stock: Iterable[Stock] = (),
+    back_in_stock: Iterable[Stock] = (),
+):
+    """Send the out of stock and back in stock events for the given stocks.
+
+    All events are sent from a single callback run after the transaction commits.
+    """
+    out_of_stock = list(out_of_stock)
+    back_in_stock = list(back_in_stock)
+    if not out_of_stock and not back_in_stock:
+        return
+
+    def _trigger_events():
+        for stock in out_of_stock:
+            manager.product_variant_out_of_stock(stock)
+        for stock in back_in_stock:
+            manager.product_variant_back_in_stock(stock)
+
+    transaction.on_commit(_trigger_events)
 
 
 def get_order_lines_with_track_inventory(
@@ -594,22 +784,20 @@ def deallocate_stock_for_order(order: "Order", manager: PluginsManager):
     lines = OrderLine.objects.filter(order_id=order.id)
     allocations = Allocation.objects.filter(
         Exists(lines.filter(id=OuterRef("order_line_id"))), quantity_allocated__gt=0
-    ).select_related("stock")
+    )
 
-    stocks_to_update = []
+    stocks_quantity_allocated_diff: Dict[int, int] = defaultdict(int)
     for alloc in allocations:
-        stock = alloc.stock
-        stock.quantity_allocated = F("quantity_allocated") - alloc.quantity_allocated
-        stocks_to_update.append(stock)
+        stocks_quantity_allocated_diff[alloc.stock_id] -= alloc.quantity_allocated
 
-    for allocation in allocations.annotate_stock_available_quantity():
-        if allocation.stock_available_quantity <= 0:
-            transaction.on_commit(
-                lambda: manager.product_variant_back_in_stock(allocation.stock)
-            )
+    # the event is sent for all stocks unavailable before removing the allocations
+    back_in_stock = _get_stocks_back_in_stock(
+        stocks_quantity_allocated_diff, require_available=False
+    )
 
     allocations.update(quantity_allocated=0)
-    Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+    update_stocks_quantity_allocated(stocks_quantity_allocated_diff)
+    _trigger_stock_events(manager, back_in_stock=back_in_stock)
 
 
 @traced_atomic_transaction()
@@ -618,22 +806,20 @@ def deallocate_stock_for_orders(orders_id, manager: PluginsManager):
     lines = OrderLine.objects.filter(order_id__in=orders_id)
     allocations = Allocation.objects.filter(
         Exists(lines.filter(id=OuterRef("order_line_id"))), quantity_allocated__gt=0
-    ).select_related("stock")
+    )
 
-    stocks_to_update = []
+    stocks_quantity_allocated_diff: Dict[int, int] = defaultdict(int)
     for alloc in allocations:
-        stock = alloc.stock
-        stock.quantity_allocated = F("quantity_allocated") - alloc.quantity_allocated
-        stocks_to_update.append(stock)
+        stocks_quantity_allocated_diff[alloc.stock_id] -= alloc.quantity_allocated
 
-    for allocation in allocations.annotate_stock_available_quantity():
-        if allocation.stock_available_quantity <= 0:
-            transaction.on_commit(
-                lambda: manager.product_variant_back_in_stock(allocation.stock)
-            )
+    # the event is sent for all stocks unavailable before removing the allocations
+    back_in_stock = _get_stocks_back_in_stock(
+        stocks_quantity_allocated_diff, require_available=False
+    )
 
     allocations.update(quantity_allocated=0)
-    Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+    update_stocks_quantity_allocated(stocks_quantity_allocated_diff)
+    _trigger_stock_events(manager, back_in_stock=back_in_stock)
 
 
 @traced_atomic_transaction()
@@ -0,0 +1,37 @@
+# Generated by Django 3.2.22 on 2026-10-19 10:12
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("warehouse", "0033_warehouse_external_reference"),
+    ]
+    atomic = False
+    operations = [
+        AddIndexConcurrently(
+            model_name="preorderreservation",
+            index=models.Index(
+                fields=["product_variant_channel_listing", "reserved_until"],
+                include=["quantity_reserved"],
+                name="preorderres_listing_until_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="preorderreservation",
+            index=models.Index(fields=["reserved_until"], name="preorderres_until_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="reservation",
+            index=models.Index(
+                fields=["stock", "reserved_until"],
+                include=["quantity_reserved"],
+                name="reservation_stock_until_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="reservation",
+            index=models.Index(fields=["reserved_until"], name="reservation_until_idx"),
+        ),
+    ]
@@ -246,6 +246,19 @@ class StockQuerySet(models.QuerySet["Stock"]):
             ),
         )
 
+    def annotate_available_quantity_from_counter(
+        self,
+    ) -> QuerySet[StockWithAvailableQuantity]:
+        """Annotate the available quantity using the `quantity_allocated` counter.
+
+        Unlike `annotate_available_quantity` it doesn't join the allocations, so the
+        stocks are neither aggregated nor deduplicated by grouping.
+        """
+        return cast(
+            QuerySet[StockWithAvailableQuantity],
+            self.annotate(available_quantity=F("quantity") - F("quantity_allocated")),
+        )
+
     def annotate_reserved_quantity(self):
         return self.annotate(
             reserved_quantity=Coalesce(
@@ -507,6 +520,12 @@ class PreorderReservation(models.Model):
         unique_together = [["checkout_line", "product_variant_channel_listing"]]
         indexes = [
             models.Index(fields=["checkout_line", "reserved_until"]),
+            models.Index(
+                fields=["product_variant_channel_listing", "reserved_until"],
+                include=["quantity_reserved"],
+                name="preorderres_listing_until_idx",
+            ),
+            models.Index(fields=["reserved_until"], name="preorderres_until_idx"),
         ]
         ordering = ("pk",)
 
@@ -535,5 +554,11 @@ class Reservation(models.Model):
         unique_together = [["checkout_line", "stock"]]
         indexes = [
             models.Index(fields=["checkout_line", "reserved_until"]),
+            models.Index(
+                fields=["stock", "reserved_until"],
+                include=["quantity_reserved"],
+                name="reservation_stock_until_idx",
+            ),
+            models.Index(fields=["reserved_until"], name="reservation_until_idx"),
         ]
         ordering = ("pk",)
@@ -1,5 +1,10 @@
+from datetime import datetime
+from typing import Type, Union
+
 from celery.utils.log import get_task_logger
-from django.db.models import F, Sum
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, IntegerField, OuterRef, Subquery, Sum
 from django.db.models.functions import Coalesce
 from django.utils import timezone
 
@@ -8,6 +13,9 @@ from .models import Allocation, PreorderReservation, Reservation, Stock
 
 task_logger = get_task_logger(__name__)
 
+UPDATE_STOCKS_BATCH_SIZE = 1000
+DELETE_EXPIRED_RESERVATIONS_BATCH_SIZE = 1000
+
 
 @app.task
 def delete_empty_allocations_task():
@@ -16,14 +24,26 @@ def delete_empty_allocations_task():
         task_logger.debug("Removed %s allocations", count)
 
 
-@app.task
-def delete_expired_reservations_task():
-    stock_reservations, _ = Reservation.objects.filter(
-        reserved_until__lt=timezone.now()
-    ).delete()
-    preorder_reservations, _ = PreorderReservation.objects.filter(
-        reserved_until__lt=timezone.now()
-    ).delete()
+@app.task(
+    expires=settings.BEAT_DELETE_EXPIRED_RESERVATIONS_AFTER_TIMEDELTA.total_seconds()
+)
+def delete_expired_reservations_task(
+    batch_size: int = DELETE_EXPIRED_RESERVATIONS_BATCH_SIZE,
+    batch_count: int = 10,
+):
+    """Delete expired stock and preorder reservations.
+
+    The task is run every few seconds by the Celery beat, so a single run deletes
+    at most `batch_size * batch_count` reservations of each kind and leaves
+    the rest for the next runs, keeping every ``DELETE FROM`` statement short.
+    """
+    now = timezone.now()
+    stock_reservations = _delete_expired_reservations(
+        Reservation, now, batch_size, batch_count
+    )
+    preorder_reservations = _delete_expired_reservations(
+        PreorderReservation, now, batch_size, batch_count
+    )
 
     if stock_reservations or preorder_reservations:
         task_logger.debug(
@@ -33,27 +53,83 @@ def delete_expired_reservations_task():
         )
 
 
+def _delete_expired_reservations(
+    model: Type[Union[Reservation, PreorderReservation]],
+    now: datetime,
+    batch_size: int,
+    batch_count: int,
+) -> int:
+    expired = model.objects.filter(reserved_until__lt=now).order_by()[:batch_size]
+
+    total_deleted = 0
+    for batch_number in range(batch_count):
+        deleted_count, _ = model.objects.filter(
+            pk__in=expired.values_list("pk")
+        ).delete()
+        total_deleted += deleted_count
+        if deleted_count < batch_size:
+            break
+    return total_deleted
+
+
+def _annotate_allocations_allocated(stocks):
+    allocations = (
+        Allocation.objects.values("stock_id")
+        .filter(stock_id=OuterRef("pk"))
+        .values_list(Sum("quantity_allocated"))
+    )
+    return stocks.annotate(
+        allocations_allocated=Coalesce(
+            Subquery(queryset=allocations, output_field=IntegerField()), 0
+        )
+    )
+
+
 @app.task
 def update_stocks_quantity_allocated_task():
-    stocks_to_update = []
-    for mismatched_stock in Stock.objects.annotate(
-        allocations_allocated=Coalesce(Sum("allocations__quantity_allocated"), 0)
-    ).exclude(quantity_allocated=F("allocations_allocated")):
-        allocations_allocated = getattr(
-            mismatched_stock, "allocations_allocated"
-        )  # annotation
-        task_logger.info(
-            "Mismatch updating quantity_allocated: stock %d had "
-            "%d allocated, but should have %d.",
-            mismatched_stock.pk,
-            mismatched_stock.quantity_allocated,
-            allocations_allocated,
-        )
-        mismatched_stock.quantity_allocated = allocations_allocated
-        stocks_to_update.append(mismatched_stock)
+    """Reconcile `Stock.quantity_allocated` counters with the allocations.
+
+    The counters are used for the availability reads, so the mismatched stocks are
+    locked and recalculated in batches, to not override the counter changes made
+    by the concurrent allocations.
+    """
+    mismatched_stock_ids = list(
+        _annotate_allocations_allocated(Stock.objects.all())
+        .exclude(quantity_allocated=F("allocations_allocated"))
+        .values_list("pk", flat=True)
+    )
+    corrected_count = 0
+    for index in range(0, len(mismatched_stock_ids), UPDATE_STOCKS_BATCH_SIZE):
+        ids = mismatched_stock_ids[index : index + UPDATE_STOCKS_BATCH_SIZE]
+        with transaction.atomic():
+            stocks = list(
+                Stock.objects.select_for_update(of=("self",))
+                .filter(pk__in=ids)
+                .order_by("pk")
+            )
+            allocations_allocated = dict(
+                _annotate_allocations_allocated(
+                    Stock.objects.filter(pk__in=ids)
+                ).values_list("pk", "allocations_allocated")
+            )
+            stocks_to_update = []
+            for mismatched_stock in stocks:
+                quantity_allocated = allocations_allocated[mismatched_stock.pk]
+                if mismatched_stock.quantity_allocated == quantity_allocated:
+                    continue
+                task_logger.info(
+                    "Mismatch updating quantity_allocated: stock %d had "
+                    "%d allocated, but should have %d.",
+                    mismatched_stock.pk,
+                    mismatched_stock.quantity_allocated,
+                    quantity_allocated,
+                )
+                mismatched_stock.quantity_allocated = quantity_allocated
+                stocks_to_update.append(mismatched_stock)
+            Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+        corrected_count += len(stocks_to_update)
 
-    Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
     task_logger.info(
         "Finished updating quantity_allocated on stocks, %d were corrected.",
-        len(stocks_to_update),
+        corrected_count,
     )
@@ -43,3 +43,26 @@ def test_stocks_for_country_warehouse_with_given_channel_do_not_exist(
     )
 
     assert not stock_qs.exists()
+
+
+def test_annotate_available_quantity_from_counter(allocation):
+    # given
+    stock = allocation.stock
+    stock.quantity = 10
+    stock.quantity_allocated = allocation.quantity_allocated
+    stock.save(update_fields=["quantity", "quantity_allocated"])
+
+    # when
+    stock_with_counter = Stock.objects.annotate_available_quantity_from_counter().get(
+        pk=stock.pk
+    )
+
+    # then
+    stock_with_allocations = Stock.objects.annotate_available_quantity().get(
+        pk=stock.pk
+    )
+    assert (
+        stock_with_counter.available_quantity
+        == stock_with_allocations.available_quantity
+        == 10 - allocation.quantity_allocated
+    )
@@ -3,12 +3,15 @@ import pytest
 from ...checkout.fetch import fetch_checkout_lines
 from ...core.exceptions import InsufficientStock
 from ..availability import (
+    VariantStockAvailabilityInfo,
     _get_available_quantity,
+    check_stock_and_preorder_quantity_in_orders,
     check_stock_quantity,
     check_stock_quantity_bulk,
     get_available_quantity,
+    get_variants_stock_availability,
 )
-from ..models import Allocation
+from ..models import Allocation, Stock
 
 COUNTRY_CODE = "US"
 
@@ -310,3 +313,70 @@ def test_check_stock_quantity_bulk_with_reservations(
         )
         is None
     )
+
+
+def test_get_variants_stock_availability(
+    variant_with_many_stocks,
+    product_with_single_variant,
+    order_line_with_allocation_in_many_stocks,
+    checkout_line_with_reservation_in_many_stocks,
+    channel_USD,
+    django_assert_num_queries,
+):
+    # given
+    variants = [variant_with_many_stocks, product_with_single_variant.variants.get()]
+    stocks = Stock.objects.get_variants_stocks_for_country(
+        COUNTRY_CODE, channel_USD.slug, variants
+    )
+
+    # when
+    with django_assert_num_queries(1):
+        availability = get_variants_stock_availability(stocks, check_reservations=True)
+
+    # then
+    for variant_obj in variants:
+        variant_stocks = stocks.filter(product_variant=variant_obj)
+        assert availability[variant_obj.pk] == VariantStockAvailabilityInfo(
+            stocks_count=variant_stocks.count(),
+            available_quantity=get_available_quantity(
+                variant_obj, COUNTRY_CODE, channel_USD.slug, check_reservations=True
+            ),
+        )
+
+
+def test_get_variants_stock_availability_without_stocks(
+    variant_with_many_stocks, channel_USD
+):
+    # given
+    variant_with_many_stocks.stocks.all().delete()
+    stocks = Stock.objects.get_variants_stocks_for_country(
+        COUNTRY_CODE, channel_USD.slug, [variant_with_many_stocks]
+    )
+
+    # when
+    availability = get_variants_stock_availability(stocks)
+
+    # then
+    assert availability == {}
+
+
+def test_check_stock_and_preorder_quantity_in_orders(
+    variant_with_many_stocks, channel_USD
+):
+    # given
+    available_quantity = get_available_quantity(
+        variant_with_many_stocks, COUNTRY_CODE, channel_USD.slug
+    )
+
+    # when
+    with pytest.raises(InsufficientStock) as exc:
+        check_stock_and_preorder_quantity_in_orders(
+            [variant_with_many_stocks, variant_with_many_stocks],
+            [available_quantity, available_quantity + 1],
+            COUNTRY_CODE,
+            channel_USD.slug,
+        )
+
+    # then
+    assert len(exc.value.items) == 1
+    assert exc.value.items[0].variant == variant_with_many_stocks
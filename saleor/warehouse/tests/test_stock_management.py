@@ -1,8 +1,10 @@
 from unittest import mock
 
 import pytest
+from django.db import connection
 from django.db.models import Sum
 from django.db.models.functions import Coalesce
+from django.test.utils import CaptureQueriesContext
 
 from ...channel import AllocationStrategy
 from ...core.exceptions import InsufficientStock
@@ -12,6 +14,8 @@ from ...plugins.manager import get_plugins_manager
 from ...tests.utils import flush_post_commit_hooks
 from ...warehouse.models import Stock
 from ..management import (
+    OPTIMISTIC_ALLOCATION_MAX_ATTEMPTS,
+    _increase_stock_quantity_allocated,
     allocate_preorders,
     allocate_stocks,
     deallocate_stock,
@@ -19,6 +23,7 @@ from ..management import (
     decrease_stock,
     increase_allocations,
     increase_stock,
+    update_stocks_quantity_allocated,
 )
 from ..models import Allocation, ChannelWarehouse, PreorderAllocation
 
@@ -45,6 +50,193 @@ def test_allocate_stocks(order_line, stock, channel_USD):
     assert allocation.quantity_allocated == stock.quantity_allocated == 50
 
 
+@mock.patch("saleor.plugins.manager.PluginsManager.product_variant_out_of_stock")
+def test_allocate_stocks_out_of_stock_event_sent_once_per_stock(
+    product_variant_out_of_stock_mock, order_line, stock, channel_USD
+):
+    # given
+    stock.quantity = 3
+    stock.save(update_fields=["quantity"])
+    second_order_line = OrderLine.objects.get(pk=order_line.pk)
+    second_order_line.pk = None
+    second_order_line.save()
+    lines_info = [
+        OrderLineInfo(line=line, variant=line.variant, quantity=quantity)
+        for line, quantity in [(order_line, 1), (second_order_line, 2)]
+    ]
+
+    # when
+    allocate_stocks(
+        lines_info,
+        COUNTRY_CODE,
+        channel_USD,
+        manager=get_plugins_manager(allow_replica=False),
+    )
+    flush_post_commit_hooks()
+
+    # then
+    product_variant_out_of_stock_mock.assert_called_once_with(stock)
+
+
+def test_allocate_stocks_optimistic_allocation(
+    order_line, stock, channel_USD, settings
+):
+    # given
+    settings.OPTIMISTIC_STOCK_ALLOCATION = True
+    stock.quantity = 100
+    stock.quantity_allocated = 40
+    stock.save(update_fields=["quantity", "quantity_allocated"])
+
+    line_data = OrderLineInfo(line=order_line, variant=order_line.variant, quantity=50)
+
+    # when
+    allocate_stocks(
+        [line_data],
+        COUNTRY_CODE,
+        channel_USD,
+        manager=get_plugins_manager(allow_replica=False),
+    )
+
+    # then
+    stock.refresh_from_db()
+    assert stock.quantity == 100
+    assert stock.quantity_allocated == 90
+    allocation = Allocation.objects.get(order_line=order_line, stock=stock)
+    assert allocation.quantity_allocated == 50
+
+
+def test_allocate_stocks_optimistic_allocation_insufficient_stock(
+    order_line, stock, channel_USD, settings
+):
+    # given
+    settings.OPTIMISTIC_STOCK_ALLOCATION = True
+    stock.quantity = 100
+    stock.quantity_allocated = 60
+    stock.save(update_fields=["quantity", "quantity_allocated"])
+
+    line_data = OrderLineInfo(line=order_line, variant=order_line.variant, quantity=50)
+
+    # when
+    with pytest.raises(InsufficientStock):
+        allocate_stocks(
+            [line_data],
+            COUNTRY_CODE,
+            channel_USD,
+            manager=get_plugins_manager(allow_replica=False),
+        )
+
+    # then
+    stock.refresh_from_db()
+    assert stock.quantity_allocated == 60
+    assert not Allocation.objects.filter(order_line=order_line).exists()
+
+
+def test_increase_stock_quantity_allocated_concurrent_allocation(stock):
+    # given
+    stock.quantity = 10
+    stock.quantity_allocated = 8
+    stock.save(update_fields=["quantity", "quantity_allocated"])
+
+    # when
+    increased = _increase_stock_quantity_allocated(stock.pk, 5, 0)
+
+    # then
+    assert not increased
+    stock.refresh_from_db()
+    assert stock.quantity_allocated == 8
+
+
+def test_allocate_stocks_optimistic_allocation_updates_stocks_in_pk_order(
+    order_line, product, stock, channel_USD, settings
+):
+    # given
+    settings.OPTIMISTIC_STOCK_ALLOCATION = True
+    variant_2 = product.variants.first()
+    stock_2 = Stock.objects.get(product_variant=variant_2)
+    order_line_2 = OrderLine.objects.get(pk=order_line.pk)
+    order_line_2.pk = None
+    order_line_2.variant = variant_2
+    order_line_2.save()
+    lines_info = [
+        OrderLineInfo(line=order_line_2, variant=variant_2, quantity=1),
+        OrderLineInfo(line=order_line, variant=order_line.variant, quantity=1),
+    ]
+
+    # when
+    with mock.patch(
+        "saleor.warehouse.management._increase_stock_quantity_allocated",
+        wraps=_increase_stock_quantity_allocated,
+    ) as increase_mock:
+        allocate_stocks(
+            lines_info,
+            COUNTRY_CODE,
+            channel_USD,
+            manager=get_plugins_manager(allow_replica=False),
+        )
+
+    # then
+    stocks_pks = [call.args[0] for call in increase_mock.call_args_list]
+    assert stocks_pks == sorted([stock.pk, stock_2.pk])
+
+
+def test_allocate_stocks_optimistic_allocation_retries_failed_update(
+    order_line, stock, channel_USD, settings
+):
+    # given
+    settings.OPTIMISTIC_STOCK_ALLOCATION = True
+    stock.quantity = 10
+    stock.quantity_allocated = 2
+    stock.save(update_fields=["quantity", "quantity_allocated"])
+    line_data = OrderLineInfo(line=order_line, variant=order_line.variant, quantity=5)
+
+    # when
+    # the first update fails as if the stock was allocated concurrently
+    with mock.patch(
+        "saleor.warehouse.management._increase_stock_quantity_allocated",
+        side_effect=[False, True],
+    ) as increase_mock:
+        allocate_stocks(
+            [line_data],
+            COUNTRY_CODE,
+            channel_USD,
+            manager=get_plugins_manager(allow_replica=False),
+        )
+
+    # then
+    assert increase_mock.call_count == 2
+    allocation = Allocation.objects.get(order_line=order_line, stock=stock)
+    assert allocation.quantity_allocated == 5
+
+
+def test_allocate_stocks_optimistic_allocation_locks_stocks_for_last_attempt(
+    order_line, stock, channel_USD, settings
+):
+    # given
+    settings.OPTIMISTIC_STOCK_ALLOCATION = True
+    stock.quantity = 10
+    stock.save(update_fields=["quantity"])
+    line_data = OrderLineInfo(line=order_line, variant=order_line.variant, quantity=5)
+
+    # when
+    # every update fails as if the stock was allocated concurrently
+    with mock.patch(
+        "saleor.warehouse.management._increase_stock_quantity_allocated",
+        return_value=False,
+    ) as increase_mock, CaptureQueriesContext(connection) as queries:
+        with pytest.raises(InsufficientStock):
+            allocate_stocks(
+                [line_data],
+                COUNTRY_CODE,
+                channel_USD,
+                manager=get_plugins_manager(allow_replica=False),
+            )
+
+    # then
+    assert increase_mock.call_count == OPTIMISTIC_ALLOCATION_MAX_ATTEMPTS
+    assert any("FOR UPDATE" in query["sql"] for query in queries.captured_queries)
+    assert not Allocation.objects.filter(order_line=order_line).exists()
+
+
 def test_allocate_stocks_multiple_lines_the_highest_stock_strategy(
     order_line, order, product, stock, channel_USD
 ):
@@ -491,6 +683,61 @@ def test_deallocate_stock(allocation):
     assert allocation.quantity_allocated == 0
 
 
+def test_deallocate_stock_many_lines_in_the_same_stock(allocations, stock):
+    # given
+    stock.quantity_allocated = sum(
+        allocation.quantity_allocated for allocation in allocations
+    )
+    stock.save(update_fields=["quantity_allocated"])
+
+    # when
+    deallocate_stock(
+        [
+            OrderLineInfo(
+                line=allocation.order_line,
+                quantity=allocation.quantity_allocated,
+                variant=stock.product_variant,
+            )
+            for allocation in allocations
+        ],
+        manager=get_plugins_manager(allow_replica=False),
+    )
+
+    # then
+    stock.refresh_from_db()
+    assert stock.quantity_allocated == 0
+    assert not Allocation.objects.filter(quantity_allocated__gt=0).exists()
+
+
+@mock.patch("saleor.plugins.manager.PluginsManager.product_variant_back_in_stock")
+def test_deallocate_stock_back_in_stock_event_sent_once_per_stock(
+    product_variant_back_in_stock_mock, allocations, stock
+):
+    # given
+    stock.quantity_allocated = sum(
+        allocation.quantity_allocated for allocation in allocations
+    )
+    stock.quantity = stock.quantity_allocated
+    stock.save(update_fields=["quantity", "quantity_allocated"])
+
+    # when
+    deallocate_stock(
+        [
+            OrderLineInfo(
+                line=allocation.order_line,
+                quantity=allocation.quantity_allocated,
+                variant=stock.product_variant,
+            )
+            for allocation in allocations
+        ],
+        manager=get_plugins_manager(allow_replica=False),
+    )
+    flush_post_commit_hooks()
+
+    # then
+    product_variant_back_in_stock_mock.assert_called_once_with(stock)
+
+
 def test_deallocate_stock_when_quantity_less_than_zero(allocation):
     stock = allocation.stock
     stock.quantity = -10
@@ -1002,6 +1249,27 @@ def test_decrease_stock_insufficient_stock(allocation):
     assert allocation.quantity_allocated == 80
 
 
+@mock.patch("saleor.plugins.manager.PluginsManager.product_variant_back_in_stock")
+def test_deallocate_stock_for_order_back_in_stock_event_for_oversold_stock(
+    product_variant_back_in_stock_mock, allocation
+):
+    # given
+    stock = allocation.stock
+    stock.quantity = 0
+    stock.quantity_allocated = allocation.quantity_allocated
+    stock.save(update_fields=["quantity", "quantity_allocated"])
+    order = allocation.order_line.order
+
+    # when
+    deallocate_stock_for_order(order, manager=get_plugins_manager(allow_replica=False))
+    flush_post_commit_hooks()
+
+    # then
+    stock.refresh_from_db()
+    assert stock.quantity_allocated == 0
+    product_variant_back_in_stock_mock.assert_called_once_with(stock)
+
+
 def test_deallocate_stock_for_order(order_line_with_allocation_in_many_stocks):
     order_line = order_line_with_allocation_in_many_stocks
     order = order_line.order
@@ -1231,3 +1499,17 @@ def test_allocate_preorders_with_global_reservations(
         check_reservations=True,
         checkout_lines=[checkout_line_with_reserved_preorder_item],
     )
+
+
+def test_update_stocks_quantity_allocated(stock, django_assert_num_queries):
+    # given
+    stock.quantity_allocated = 5
+    stock.save(update_fields=["quantity_allocated"])
+
+    # when
+    with django_assert_num_queries(1):
+        update_stocks_quantity_allocated({stock.pk: -2, 0: 0})
+
+    # then
+    stock.refresh_from_db()
+    assert stock.quantity_allocated == 3
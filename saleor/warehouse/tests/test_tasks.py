@@ -27,6 +27,26 @@ def test_delete_expired_reservations_task_skips_active_stock_reservations(
     assert Reservation.objects.count() == reservations_count
 
 
+def test_delete_expired_reservations_task_deletes_in_batches(
+    checkout_line_with_reservation_in_many_stocks,
+):
+    # given
+    reservations_count = Reservation.objects.count()
+    Reservation.objects.update(reserved_until=timezone.now() - timedelta(seconds=1))
+
+    # when
+    delete_expired_reservations_task(batch_size=1, batch_count=1)
+
+    # then
+    assert Reservation.objects.count() == reservations_count - 1
+
+    # when
+    delete_expired_reservations_task(batch_size=1, batch_count=reservations_count)
+
+    # then
+    assert not Reservation.objects.exists()
+
+
 def test_delete_expired_reservations_task_deletes_expired_preorder_reservations(
     checkout_line_with_reserved_preorder_item,
 ):